@@ -0,0 +1,66 @@
+"""Performance benchmarks for the COVID-19 data pipeline.
+
+Benchmarks run against synthetic data shaped like the JHU time series files,
+so they need no network access. Each benchmark is a runnable module:
+
+Usage Examples:
+    # Compare the CSV reader backends on the real file shape
+    $ python -m benchmarks.bench_csv_readers
+
+    # Smaller run for a quick check
+    $ python -m benchmarks.bench_csv_readers --locations 50 --days 200
+
+    # Compare the melt-based and vectorized wide-to-long reshapes
+    $ python -m benchmarks.bench_reshape
+
+    # Compare memory of the pandas and SQL UNPIVOT ingestion modes
+    $ python -m benchmarks.bench_ingestion_modes
+
+    # Compare a full rebuild with an incremental load of one new day
+    $ python -m benchmarks.bench_incremental_load
+
+    # Compare a rerun over unchanged files with and without the load manifest skip
+    $ python -m benchmarks.bench_load_manifest
+
+    # Compare sequential, thread pool and process pool processing of the data types
+    $ python -m benchmarks.bench_parallel_processing
+
+    # Compare window functions with the rolling metrics engine
+    $ python -m benchmarks.bench_rolling_metrics
+
+    # Compare per-file pandas loads of the daily reports with the sources' loads
+    $ python -m benchmarks.bench_sources
+
+    # Load-test the query service with and without its result cache
+    $ python -m benchmarks.bench_query_service
+
+    # Compare dbt CLI subprocesses with the in-process dbt runner
+    $ python -m benchmarks.bench_dbt_runner
+
+    # Time every pipeline stage and flag regressions against an earlier run
+    $ python -m benchmarks.bench_pipeline --output results.json
+    $ python -m benchmarks.bench_pipeline --baseline results.json
+
+Module Structure:
+    synthetic_data.py - Generator for JHU-format wide CSV files
+    common.py - Timing and peak-memory measurement helpers
+    bench_csv_readers.py - pandas vs DuckDB CSV reader backends
+    bench_reshape.py - melt-based vs vectorized wide-to-long reshape
+    bench_ingestion_modes.py - pandas vs SQL UNPIVOT ingestion modes
+    bench_incremental_load.py - full vs incremental daily loads
+    bench_load_manifest.py - reloads vs fingerprint skips of unchanged files
+    bench_parallel_processing.py - sequential vs pooled per-data-type processing
+    bench_validate_clean.py - separate vs fused validation and cleaning
+    bench_parquet_landing.py - CSV vs DuckDB tables vs Parquet landing zone
+    bench_storage_schema.py - previous column types vs declared storage schema
+    bench_location_key.py - location names vs location_id join keys
+    bench_reporting_queries.py - reporting views vs tables over daily_rollup
+    bench_rolling_metrics.py - window functions vs the rolling metrics engine,
+        full history and daily update
+    bench_sources.py - per-file pandas loads vs the daily reports source,
+        backfill and new report, and the US county series load
+    bench_query_service.py - query service latency and throughput, with and
+        without the result cache
+    bench_dbt_runner.py - dbt CLI subprocesses vs in-process DbtRunner
+    bench_pipeline.py - per-stage timings of the whole pipeline, as JSON
+"""
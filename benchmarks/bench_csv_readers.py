@@ -0,0 +1,40 @@
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.utils.csv_readers import CSV_READERS, read_time_series_csv
+
+
+def _read(path: Path, reader: str) -> None:
+    read_time_series_csv(path, reader, logging.getLogger(__name__))
+
+
+def main() -> None:
+    """Compare parse time and peak memory of the CSV reader backends."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_jhu_csv(
+            Path(tmp_dir) / 'confirmed.csv', locations=args.locations, days=args.days
+        )
+        results = {
+            reader: measure(_read, path, reader, repeat=args.repeat)
+            for reader in CSV_READERS
+        }
+
+    print_table(
+        f"CSV reader backends ({args.locations} locations x {args.days} days)", results
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import shutil
+import subprocess
+import tempfile
+import time
+
+# Local imports
+from benchmarks.common import print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from covid_dagster.dbt_runner import DBT_PROJECT_DIR, DbtRunner
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+
+
+def copy_dbt_project(root: Path, without_packages: bool) -> Path:
+    """Copy the dbt project into a workspace.
+
+    The copy keeps the repository layout (src/dbt and data/processed) so the
+    relative database path in profiles.yml resolves inside the workspace.
+
+    Args:
+        root: Workspace directory
+        without_packages: Empty packages.yml so no download is needed
+
+    Returns:
+        Path: The copied project directory
+    """
+    project_dir = root / 'src' / 'dbt'
+    shutil.copytree(
+        DBT_PROJECT_DIR, project_dir, ignore=shutil.ignore_patterns('target', 'logs')
+    )
+    if without_packages:
+        # No package is used by the models; lets the benchmark run offline
+        (project_dir / 'packages.yml').write_text('packages: []\n')
+        (project_dir / 'package-lock.yml').unlink(missing_ok=True)
+    return project_dir
+
+
+def prepare_workspace(root: Path, locations: int, days: int, without_packages: bool) -> Path:
+    """Copy the dbt project and load synthetic raw tables next to it."""
+    project_dir = copy_dbt_project(root, without_packages)
+
+    raw_dir = root / 'data' / 'raw'
+    raw_dir.mkdir(parents=True)
+    for data_type in DATA_TYPES:
+        write_jhu_csv(raw_dir / f'{data_type}_20240101.csv', locations=locations, days=days)
+    CovidDataIngestion(
+        config=IngestionConfig(
+            base_url='',
+            data_types={data_type: f'{data_type}.csv' for data_type in DATA_TYPES},
+            raw_data_path=raw_dir,
+            db_path=str(root / 'data' / 'processed' / 'covid_analysis_dev.duckdb'),
+        )
+    ).load_to_duckdb()
+    return project_dir
+
+
+def _run_cli(project_dir: Path) -> dict:
+    """The previous approach: one dbt CLI process per command."""
+    timings = {}
+    for command in ['deps', 'compile', 'run', 'test']:
+        start = time.perf_counter()
+        subprocess.run(
+            ['dbt', command], cwd=project_dir, capture_output=True, text=True, check=True
+        )
+        timings[command] = time.perf_counter() - start
+    return timings
+
+
+def _run_in_process(project_dir: Path) -> dict:
+    """The DbtRunner approach: one process, one parse, deps only when needed."""
+    runner = DbtRunner(project_dir)
+    runner.deps()
+    runner.parse()
+    runner.run()
+    runner.test()
+    return runner.phase_timings
+
+
+def main() -> None:
+    """Compare dbt CLI subprocesses with the in-process DbtRunner."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--without-packages', action='store_true',
+        help='empty packages.yml in the copied project so no download is needed',
+    )
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        project_dir = prepare_workspace(
+            Path(tmp_dir), args.locations, args.days, args.without_packages
+        )
+
+        results = {}
+        for name, func in [('cli subprocesses', _run_cli), ('in-process', _run_in_process)]:
+            # The first run installs packages and writes the partial parse file
+            func(project_dir)
+            runs = [func(project_dir) for _ in range(args.repeat)]
+            best = min(runs, key=lambda timings: sum(timings.values()))
+            results[name] = {'seconds': sum(best.values()), 'peak_mib': 0.0}
+            print(f"{name}: " + ", ".join(f"{phase} {s:.2f}s" for phase, s in best.items()))
+
+    print_table(
+        f"dbt deps/parse/run/test, steady state ({args.locations} locations x "
+        f"{args.days} days; memory not measured)", results
+    )
+
+
+if __name__ == '__main__':
+    main()
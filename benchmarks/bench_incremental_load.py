@@ -0,0 +1,80 @@
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import shutil
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import INGESTION_MODES, CovidDataIngestion
+
+
+def _config(raw_dir: Path, db_path: Path, ingestion_mode: str, load_mode: str) -> IngestionConfig:
+    return IngestionConfig(
+        base_url='',
+        data_types={'confirmed': 'confirmed.csv'},
+        raw_data_path=raw_dir,
+        db_path=str(db_path),
+        ingestion_mode=ingestion_mode,
+        load_mode=load_mode,
+    )
+
+
+def _load_next_day(
+    raw_dir: Path, loaded_db: Path, db_path: Path, ingestion_mode: str, load_mode: str
+) -> None:
+    # Start from a copy of the database holding every day but the last one
+    logging.disable(logging.WARNING)
+    shutil.copy(loaded_db, db_path)
+    CovidDataIngestion(config=_config(raw_dir, db_path, ingestion_mode, load_mode)).load_to_duckdb()
+
+
+def main() -> None:
+    """Compare a full rebuild with an incremental load of one new day."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, nargs='+', default=[365, 730, 1143])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    for days in args.days:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = Path(tmp_dir)
+            (tmp / 'yesterday').mkdir()
+            (tmp / 'today').mkdir()
+            # Today's file has one more day; its values differ from yesterday's,
+            # so every cell in the revision window is also a revision
+            write_jhu_csv(
+                tmp / 'yesterday' / 'confirmed_20240101.csv',
+                locations=args.locations, days=days - 1,
+            )
+            write_jhu_csv(
+                tmp / 'today' / 'confirmed_20240102.csv',
+                locations=args.locations, days=days,
+            )
+
+            results = {}
+            for ingestion_mode in INGESTION_MODES:
+                loaded_db = tmp / f'{ingestion_mode}_loaded.duckdb'
+                CovidDataIngestion(
+                    config=_config(tmp / 'yesterday', loaded_db, ingestion_mode, 'full')
+                ).load_to_duckdb()
+                for load_mode in ['full', 'incremental']:
+                    results[f'{ingestion_mode}/{load_mode}'] = measure(
+                        _load_next_day, tmp / 'today', loaded_db,
+                        tmp / f'{ingestion_mode}_{load_mode}.duckdb',
+                        ingestion_mode, load_mode, repeat=args.repeat,
+                    )
+
+        print_table(
+            f"Loading day {days} ({args.locations} locations, "
+            "times include copying the loaded database)", results
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, measure_in_process, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import INGESTION_MODES, CovidDataIngestion
+
+
+def _load(raw_dir: Path, db_path: Path, mode: str) -> None:
+    # Runs in a fresh process too, where pipeline logging would flood the output
+    logging.disable(logging.WARNING)
+    config = IngestionConfig(
+        base_url='',
+        data_types={'confirmed': 'confirmed.csv'},
+        raw_data_path=raw_dir,
+        db_path=str(db_path),
+        ingestion_mode=mode,
+        # Every repetition reloads the same file into the same database
+        skip_unchanged_files=False,
+    )
+    CovidDataIngestion(config=config).load_to_duckdb()
+
+
+def main() -> None:
+    """Compare load time and peak memory of the pandas and SQL ingestion modes."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_dir = Path(tmp_dir) / 'raw'
+        raw_dir.mkdir()
+        write_jhu_csv(
+            raw_dir / 'confirmed_20240101.csv', locations=args.locations, days=args.days
+        )
+        results = {
+            mode: measure(
+                _load, raw_dir, Path(tmp_dir) / f'{mode}.duckdb', mode, repeat=args.repeat
+            )
+            for mode in INGESTION_MODES
+        }
+        # Python heap only: shows how much of the data passes through Python
+        heap_results = {
+            mode: measure_in_process(
+                _load, raw_dir, Path(tmp_dir) / f'{mode}.duckdb', mode, repeat=1
+            )
+            for mode in INGESTION_MODES
+        }
+
+    shape = f"{args.locations} locations x {args.days} days"
+    print_table(f"Ingestion modes, process RSS ({shape})", results)
+    print_table(f"Ingestion modes, Python heap ({shape})", heap_results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import shutil
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+
+
+def _config(raw_dir: Path, db_path: Path, skip_unchanged_files: bool) -> IngestionConfig:
+    return IngestionConfig(
+        base_url='',
+        data_types={data_type: f'{data_type}.csv' for data_type in DATA_TYPES},
+        raw_data_path=raw_dir,
+        db_path=str(db_path),
+        skip_unchanged_files=skip_unchanged_files,
+    )
+
+
+def _rerun(raw_dir: Path, loaded_db: Path, db_path: Path, skip_unchanged_files: bool) -> None:
+    # Start from a copy of the database already loaded from the same files
+    logging.disable(logging.WARNING)
+    shutil.copy(loaded_db, db_path)
+    CovidDataIngestion(config=_config(raw_dir, db_path, skip_unchanged_files)).load_to_duckdb()
+
+
+def main() -> None:
+    """Compare a rerun over unchanged raw files with and without the load manifest."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        raw_dir = tmp / 'raw'
+        raw_dir.mkdir()
+        for data_type in DATA_TYPES:
+            write_jhu_csv(
+                raw_dir / f'{data_type}_20240101.csv',
+                locations=args.locations, days=args.days,
+            )
+        loaded_db = tmp / 'loaded.duckdb'
+        CovidDataIngestion(config=_config(raw_dir, loaded_db, True)).load_to_duckdb()
+
+        results = {
+            'reload': measure(
+                _rerun, raw_dir, loaded_db, tmp / 'reload.duckdb', False,
+                repeat=args.repeat,
+            ),
+            'fingerprint skip': measure(
+                _rerun, raw_dir, loaded_db, tmp / 'skip.duckdb', True,
+                repeat=args.repeat,
+            ),
+        }
+
+    print_table(
+        f"Rerun over unchanged files ({len(DATA_TYPES)} data types, {args.locations} "
+        f"locations x {args.days} days, times include copying the loaded database)",
+        results,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import tempfile
+
+# Local imports
+from benchmarks.bench_storage_schema import (
+    DATA_TYPES, STAGING_JOIN, STORAGE_TYPES, denormalized_copy,
+)
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+
+
+# The three-way join of stg_covid_metrics on location_id
+KEYED_JOIN = """
+    SELECT count(*), sum(c.confirmed), sum(d.deaths), sum(r.recovered)
+    FROM raw_confirmed c
+    JOIN dim_location l ON c.location_id = l.location_id
+    LEFT JOIN raw_deaths d
+        ON c.date = d.date AND c.location_id = d.location_id
+    LEFT JOIN raw_recovered r
+        ON c.date = r.date AND c.location_id = r.location_id
+"""
+# Output columns of stg_covid_metrics, computed from the joined metrics
+STAGING_COLUMNS = """
+        date, province_state, country_region, latitude, longitude,
+        confirmed_cases, death_count, recovered_count,
+        confirmed_cases - COALESCE(recovered_count, 0) - COALESCE(death_count, 0)
+            AS active_cases,
+        CASE WHEN confirmed_cases > 0
+            THEN (100.0 * death_count / confirmed_cases)::DECIMAL(18, 2) END
+            AS mortality_rate,
+        CASE WHEN confirmed_cases > 0
+            THEN (100.0 * recovered_count / confirmed_cases)::DECIMAL(18, 2) END
+            AS recovery_rate
+"""
+# Full build of stg_covid_metrics before and after the location key
+NAMED_STAGING = f"""
+    CREATE TABLE stg_covid_metrics AS
+    SELECT {STAGING_COLUMNS}
+    FROM (
+        SELECT
+            c.date,
+            c."Province/State" AS province_state,
+            c."Country/Region" AS country_region,
+            c."Lat" AS latitude,
+            c."Long" AS longitude,
+            c.confirmed AS confirmed_cases,
+            d.deaths AS death_count,
+            r.recovered AS recovered_count
+        FROM raw_confirmed c
+        LEFT JOIN raw_deaths d
+            ON c.date = d.date
+            AND COALESCE(c."Province/State", '') = COALESCE(d."Province/State", '')
+            AND c."Country/Region" = d."Country/Region"
+        LEFT JOIN raw_recovered r
+            ON c.date = r.date
+            AND COALESCE(c."Province/State", '') = COALESCE(r."Province/State", '')
+            AND c."Country/Region" = r."Country/Region"
+    )
+"""
+KEYED_STAGING = f"""
+    CREATE TABLE stg_covid_metrics AS
+    SELECT {STAGING_COLUMNS}
+    FROM (
+        SELECT
+            c.date,
+            l."Province/State" AS province_state,
+            l."Country/Region" AS country_region,
+            l."Lat" AS latitude,
+            l."Long" AS longitude,
+            c.confirmed AS confirmed_cases,
+            d.deaths AS death_count,
+            r.recovered AS recovered_count
+        FROM raw_confirmed c
+        JOIN dim_location l ON c.location_id = l.location_id
+        LEFT JOIN raw_deaths d
+            ON c.date = d.date AND c.location_id = d.location_id
+        LEFT JOIN raw_recovered r
+            ON c.date = r.date AND c.location_id = r.location_id
+    )
+"""
+
+
+def _query(db_path: Path, query: str) -> None:
+    conn = duckdb.connect(str(db_path), read_only=True)
+    conn.execute(query).fetchall()
+    conn.close()
+
+
+def _build_staging(db_path: Path, query: str) -> None:
+    # Build into an in-memory copy so every repetition starts from the same file
+    conn = duckdb.connect()
+    conn.execute(f"ATTACH '{db_path}' AS raw (READ_ONLY)")
+    conn.execute("USE raw")
+    conn.execute(query.replace("CREATE TABLE ", "CREATE TABLE memory.main."))
+    conn.close()
+
+
+def main() -> None:
+    """Compare raw tables keyed by location names with the location_id key."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for seed, data_type in enumerate(DATA_TYPES):
+            write_jhu_csv(
+                tmp / 'raw' / f'{data_type}_20240101.csv',
+                locations=args.locations, days=args.days, seed=seed,
+            )
+        keyed = tmp / 'keyed.duckdb'
+        CovidDataIngestion(
+            config=IngestionConfig(
+                base_url='',
+                data_types={data_type: f'{data_type}.csv' for data_type in DATA_TYPES},
+                raw_data_path=tmp / 'raw',
+                db_path=str(keyed),
+            )
+        ).load_to_duckdb()
+        named = tmp / 'named.duckdb'
+        denormalized_copy(keyed, named, STORAGE_TYPES)
+
+        print(f"\nRaw tables of {len(DATA_TYPES)} data types "
+              f"({args.locations} locations x {args.days} days)")
+        print(f"{'variant':<24}{'file MiB':>12}")
+        for name, path in [('location names', named), ('location_id', keyed)]:
+            print(f"{name:<24}{path.stat().st_size / (1024 * 1024):>12.2f}")
+
+        joins = {
+            'location names': measure(_query, named, STAGING_JOIN, repeat=args.repeat),
+            'location_id': measure(_query, keyed, KEYED_JOIN, repeat=args.repeat),
+        }
+        builds = {
+            'location names': measure(
+                _build_staging, named, NAMED_STAGING, repeat=args.repeat
+            ),
+            'location_id': measure(
+                _build_staging, keyed, KEYED_STAGING, repeat=args.repeat
+            ),
+        }
+
+    print_table("stg_covid_metrics join, from a fresh process", joins)
+    print_table("stg_covid_metrics full build, from a fresh process", builds)
+
+
+if __name__ == '__main__':
+    main()
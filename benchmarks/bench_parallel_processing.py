@@ -0,0 +1,94 @@
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import os
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+
+
+def _config(
+    raw_dir: Path, db_path: Path, csv_reader: str, workers: int, pool: str
+) -> IngestionConfig:
+    return IngestionConfig(
+        base_url='',
+        data_types={data_type: f'{data_type}.csv' for data_type in DATA_TYPES},
+        raw_data_path=raw_dir,
+        db_path=str(db_path),
+        csv_reader=csv_reader,
+        max_processing_workers=workers,
+        processing_pool=pool,
+        # Every repetition reloads the same file into the same database
+        skip_unchanged_files=False,
+    )
+
+
+def _load(raw_dir: Path, db_path: Path, csv_reader: str, workers: int, pool: str) -> None:
+    # Runs in a fresh process too, where pipeline logging would flood the output
+    logging.disable(logging.WARNING)
+    CovidDataIngestion(
+        config=_config(raw_dir, db_path, csv_reader, workers, pool)
+    ).load_to_duckdb()
+
+
+def main() -> None:
+    """Compare sequential and parallel processing of the three data types."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    variants = {
+        'sequential': (1, 'process'),
+        'process pool': (len(DATA_TYPES), 'process'),
+        'thread pool': (len(DATA_TYPES), 'thread'),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_dir = Path(tmp_dir) / 'raw'
+        raw_dir.mkdir()
+        for data_type in DATA_TYPES:
+            write_jhu_csv(
+                raw_dir / f'{data_type}_20240101.csv',
+                locations=args.locations, days=args.days,
+            )
+
+        for csv_reader in ['pandas', 'duckdb']:
+            results = {
+                name: measure(
+                    _load, raw_dir, Path(tmp_dir) / 'bench.duckdb',
+                    csv_reader, workers, pool, repeat=args.repeat,
+                )
+                for name, (workers, pool) in variants.items()
+            }
+            print_table(
+                f"{csv_reader} reader, {len(DATA_TYPES)} data types, "
+                f"{args.locations} locations x {args.days} days, {os.cpu_count()} CPUs "
+                "(peak MiB excludes pool processes)", results
+            )
+
+        # Per-stage breakdown reported by the pipeline itself
+        ingestion = CovidDataIngestion(
+            config=_config(raw_dir, Path(tmp_dir) / 'stages.duckdb', 'pandas', 3, 'thread')
+        )
+        ingestion.load_to_duckdb()
+
+    print("\nStage timings, thread pool (seconds)")
+    stages = list(next(iter(ingestion.stage_timings.values())))
+    print(f"{'data type':<12}" + "".join(f"{stage:>10}" for stage in stages))
+    for data_type, timings in ingestion.stage_timings.items():
+        print(f"{data_type:<12}" + "".join(f"{timings[stage]:>10.3f}" for stage in stages))
+
+
+if __name__ == '__main__':
+    main()
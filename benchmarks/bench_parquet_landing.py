@@ -0,0 +1,129 @@
+# Global imports
+import duckdb
+import pandas as pd
+
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.parallel_processing import ProcessingTask, process_time_series
+from src.python.ingestion.core.parquet_landing import export_locations, export_to_parquet
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+COMPRESSIONS = ['zstd', 'snappy', 'uncompressed']
+# A typical analytical read: one metric, two columns, the last month of data
+RECENT_BY_COUNTRY = """
+    SELECT "Country/Region", max(confirmed) - min(confirmed) AS new_cases
+    FROM {relation} JOIN {locations} USING (location_id)
+    WHERE date >= (SELECT max(date) - INTERVAL 30 DAY FROM {relation})
+    GROUP BY 1
+"""
+
+
+def _size_mib(path: Path) -> float:
+    """Size of a file, or of every file below a directory, in MiB."""
+    files = [path] if path.is_file() else [p for p in path.rglob('*') if p.is_file()]
+    return sum(p.stat().st_size for p in files) / (1024 * 1024)
+
+
+def _query_csv(path: Path) -> None:
+    # What reruns did before: parse and reshape the text file again
+    frame = process_time_series(ProcessingTask('confirmed', path), 'pandas').frame
+    recent = frame[frame['date'] >= frame['date'].max() - pd.Timedelta(days=30)]
+    recent.groupby('Country/Region', observed=True)['confirmed'].agg(
+        lambda values: values.max() - values.min()
+    )
+
+
+def _query_parquet(landing_path: Path) -> None:
+    relation = (
+        f"read_parquet('{landing_path}/data_type=confirmed/*/*.parquet', "
+        "hive_partitioning = true)"
+    )
+    locations = f"read_parquet('{landing_path}/dim_location.parquet')"
+    duckdb.connect().execute(
+        RECENT_BY_COUNTRY.format(relation=relation, locations=locations)
+    ).fetchall()
+
+
+def _query_table(db_path: Path) -> None:
+    conn = duckdb.connect(str(db_path), read_only=True)
+    conn.execute(RECENT_BY_COUNTRY.format(relation='raw_confirmed', locations='dim_location')).fetchall()
+    conn.close()
+
+
+def main() -> None:
+    """Compare the storage size and scan time of the raw data formats."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for seed, data_type in enumerate(DATA_TYPES):
+            write_jhu_csv(
+                tmp / 'raw' / f'{data_type}_20240101.csv',
+                locations=args.locations, days=args.days, seed=seed,
+            )
+        db_path = tmp / 'covid.duckdb'
+        CovidDataIngestion(
+            config=IngestionConfig(
+                base_url='',
+                data_types={data_type: f'{data_type}.csv' for data_type in DATA_TYPES},
+                raw_data_path=tmp / 'raw',
+                db_path=str(db_path),
+                parquet_path=tmp / 'zstd',
+            )
+        ).load_to_duckdb()
+
+        # The same dataset with the other codecs, for comparison
+        conn = duckdb.connect(str(db_path))
+        for compression in COMPRESSIONS[1:]:
+            for data_type in DATA_TYPES:
+                export_to_parquet(
+                    conn, f'raw_{data_type}', data_type, tmp / compression,
+                    compression=compression,
+                )
+            export_locations(conn, tmp / compression, compression=compression)
+        conn.close()
+
+        print(f"\nStorage of {len(DATA_TYPES)} data types "
+              f"({args.locations} locations x {args.days} days)")
+        print(f"{'format':<24}{'MiB':>12}")
+        storage = {
+            'csv (wide)': sum(_size_mib(p) for p in (tmp / 'raw').glob('*.csv')),
+            'duckdb tables': _size_mib(db_path),
+            **{f'parquet/{c}': _size_mib(tmp / c) for c in COMPRESSIONS},
+        }
+        for name, mib in storage.items():
+            print(f"{name:<24}{mib:>12.2f}")
+
+        results = {
+            'csv re-parse': measure(
+                _query_csv, tmp / 'raw' / 'confirmed_20240101.csv', repeat=args.repeat
+            ),
+            'duckdb table': measure(_query_table, db_path, repeat=args.repeat),
+            **{
+                f'parquet/{c}': measure(_query_parquet, tmp / c, repeat=args.repeat)
+                for c in COMPRESSIONS
+            },
+        }
+
+    print_table(
+        "Last 30 days of confirmed cases by country, from a fresh process", results
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,349 @@
+# Built-in imports
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Local imports
+from benchmarks.bench_dbt_runner import copy_dbt_project
+from benchmarks.common import RssSampler
+from benchmarks.synthetic_data import write_jhu_csv
+from covid_dagster.dbt_runner import DbtRunner
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.utils import (
+    clean_data, read_time_series_csv, transform_time_series, validate_data,
+)
+
+
+# Version of the results file layout, bumped when stages are renamed
+RESULTS_VERSION = 1
+# Packages whose versions are recorded with the results
+PACKAGES = ['pandas', 'numpy', 'duckdb', 'dbt-core', 'dbt-duckdb']
+# Stages shorter than this are not reported as regressions: their timings
+# are mostly noise
+MIN_REGRESSION_SECONDS = 0.01
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request to stderr."""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def serve_directory(directory: Path) -> Iterator[str]:
+    """Serve a directory over HTTP on a free local port.
+
+    Stands in for the JHU repository, so downloads go through the real
+    downloader (connection pool, streaming, fetch metadata) without network
+    access.
+
+    Args:
+        directory: Directory whose files are served
+
+    Yields:
+        str: Base URL of the server
+    """
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0), partial(_QuietHandler, directory=str(directory))
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class StageRecorder:
+    """Wall time, CPU time and peak memory of the stages of one pipeline run.
+
+    Attributes:
+        stages (Dict[str, Dict[str, float]]): Measurements of each stage, in
+            run order: seconds, cpu_seconds and peak_rss_mib (RSS growth over
+            the value when the stage started)
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def measure(self, stage: str, func: Callable, *args) -> Any:
+        """Run a stage and record its measurements.
+
+        Args:
+            stage: Name of the stage
+            func: Function running the stage
+            *args: Arguments for func
+
+        Returns:
+            Any: What func returned
+        """
+        with RssSampler() as sampler:
+            start, cpu_start = time.perf_counter(), time.process_time()
+            result = func(*args)
+            seconds = time.perf_counter() - start
+            cpu_seconds = time.process_time() - cpu_start
+        self.record(stage, seconds, cpu_seconds, sampler.growth_bytes / (1024 * 1024))
+        return result
+
+    def record(
+        self, stage: str, seconds: float, cpu_seconds: Optional[float] = None,
+        peak_rss_mib: Optional[float] = None,
+    ) -> None:
+        """Record a stage measured elsewhere (e.g. by dbt)."""
+        self.stages[stage] = {
+            'seconds': seconds, 'cpu_seconds': cpu_seconds, 'peak_rss_mib': peak_rss_mib,
+        }
+
+
+def run_pipeline(root: Path, base_url: str, project_dir: Path) -> StageRecorder:
+    """Run every stage of the pipeline once, from download to the dbt models.
+
+    The individual pandas steps (parse, validate_data, clean_data,
+    transform_time_series) are timed on their own; duckdb_load then times
+    load_to_duckdb, which runs the fused steps of the pipeline, and its
+    load.* stages are the per-step timings it reports, summed over the
+    data types.
+
+    Args:
+        root: Workspace with the copied dbt project
+        base_url: URL serving the synthetic JHU files
+        project_dir: dbt project directory
+
+    Returns:
+        StageRecorder: Measurements of the run
+    """
+    recorder = StageRecorder()
+    config = IngestionConfig.default_config()
+    config.base_url = base_url
+    config.raw_data_path = root / 'data' / 'raw'
+    config.db_path = str(root / 'data' / 'processed' / 'covid_analysis_dev.duckdb')
+    config.parquet_path = None
+    # Every run starts from an empty workspace: no conditional requests, no
+    # existing tables
+    shutil.rmtree(config.raw_data_path, ignore_errors=True)
+    Path(config.db_path).unlink(missing_ok=True)
+    shutil.rmtree(Path(config.db_path).parent / 'snapshots', ignore_errors=True)
+    ingestion = CovidDataIngestion(config=config)
+    logger = ingestion.logger
+
+    downloads = recorder.measure('download', ingestion.download_data)
+    paths = {data_type: result.path for data_type, result in downloads.items()}
+
+    frames = recorder.measure('parse', lambda: {
+        data_type: read_time_series_csv(path, config.csv_reader, logger)
+        for data_type, path in paths.items()
+    })
+    recorder.measure('validate_data', lambda: [
+        validate_data(frame, data_type, logger) for data_type, frame in frames.items()
+    ])
+    cleaned = recorder.measure('clean_data', lambda: {
+        data_type: clean_data(frame, logger) for data_type, frame in frames.items()
+    })
+    recorder.measure('transform_time_series', lambda: {
+        data_type: transform_time_series(frame, data_type, logger)
+        for data_type, frame in cleaned.items()
+    })
+    del frames, cleaned
+
+    recorder.measure('duckdb_load', ingestion.load_to_duckdb)
+    for step in next(iter(ingestion.stage_timings.values())):
+        recorder.record(
+            f'load.{step}',
+            sum(timings.get(step, 0.0) for timings in ingestion.stage_timings.values()),
+        )
+
+    # dbt builds into the snapshot the load wrote, which is then published
+    runner = DbtRunner(project_dir, db_path=Path(ingestion.database_path))
+    recorder.measure('dbt_parse', runner.parse)
+    result = recorder.measure('dbt_run', runner.run, True)
+    for node_result in result.result.results:
+        recorder.record(f'dbt.{node_result.node.name}', node_result.execution_time)
+    recorder.measure('publish', ingestion.publish_snapshot)
+    return recorder
+
+
+def collect_results(
+    runs: List[StageRecorder], args: argparse.Namespace, dataset: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Combine the runs into one machine-readable result.
+
+    Each stage reports its best wall and CPU time over the runs, and its
+    largest peak memory growth.
+
+    Args:
+        runs: Measurements of each run
+        args: Command line arguments, recorded as the run's parameters
+        dataset: Size of the synthetic input
+
+    Returns:
+        Dict[str, Any]: JSON-serializable results, with the environment
+            (versions, commit) needed to compare them with other runs
+    """
+    stages = {}
+    for stage in runs[0].stages:
+        measurements = [run.stages[stage] for run in runs if stage in run.stages]
+        stages[stage] = {}
+        for key, best in [('seconds', min), ('cpu_seconds', min), ('peak_rss_mib', max)]:
+            values = [m[key] for m in measurements if m[key] is not None]
+            stages[stage][key] = best(values) if values else None
+    return {
+        'version': RESULTS_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': _environment(),
+        'parameters': {
+            'locations': args.locations,
+            'days': args.days,
+            'null_ratio': args.null_ratio,
+            'negative_ratio': args.negative_ratio,
+            'repeat': args.repeat,
+        },
+        'dataset': dataset,
+        'stages': stages,
+        # Lifetime high-water mark of the benchmark process (KiB on Linux)
+        'max_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def compare_results(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> Dict[str, float]:
+    """Find the stages that got slower than a baseline run.
+
+    Args:
+        results: Results of this run, as returned by collect_results
+        baseline: Results of an earlier run
+        tolerance: Allowed slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        Dict[str, float]: Ratio to the baseline of every regressed stage
+    """
+    regressions = {}
+    for stage, measurement in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous or not previous.get('seconds'):
+            continue
+        ratio = measurement['seconds'] / previous['seconds']
+        slower_by = measurement['seconds'] - previous['seconds']
+        if ratio > 1 + tolerance and slower_by > MIN_REGRESSION_SECONDS:
+            regressions[stage] = ratio
+    return regressions
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """Print the stages as an aligned table, with the change from the baseline."""
+    print(f"\n{'stage':<36}{'seconds':>10}{'cpu s':>10}{'peak MiB':>10}{'vs base':>10}")
+    for stage, m in results['stages'].items():
+        previous = (baseline or {}).get('stages', {}).get(stage, {}).get('seconds')
+        change = f"{m['seconds'] / previous - 1:+.0%}" if previous else ''
+        cpu = f"{m['cpu_seconds']:.3f}" if m['cpu_seconds'] is not None else ''
+        peak = f"{m['peak_rss_mib']:.1f}" if m['peak_rss_mib'] is not None else ''
+        print(f"{stage:<36}{m['seconds']:>10.3f}{cpu:>10}{peak:>10}{change:>10}")
+    print(f"process max RSS: {results['max_rss_mib']:.1f} MiB")
+
+
+def _environment() -> Dict[str, Any]:
+    """Machine, interpreter, package versions and commit of the run."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+        'packages': packages,
+    }
+
+
+def main() -> None:
+    """Time every stage of the pipeline, from download to the dbt models."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--null-ratio', type=float, default=0.01)
+    parser.add_argument('--negative-ratio', type=float, default=0.001)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=Path, help='write the results to this JSON file')
+    parser.add_argument('--baseline', type=Path, help='results JSON of an earlier run')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help='slowdown over the baseline reported as a regression (default 20%%)',
+    )
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        # Synthetic files named like the JHU ones, one seed per data type
+        source_dir = root / 'source'
+        config = IngestionConfig.default_config()
+        for seed, filename in enumerate(config.data_types.values()):
+            write_jhu_csv(
+                source_dir / filename, locations=args.locations, days=args.days,
+                seed=seed, null_ratio=args.null_ratio, negative_ratio=args.negative_ratio,
+            )
+        dataset = {
+            'files': len(config.data_types),
+            'bytes': sum(path.stat().st_size for path in source_dir.iterdir()),
+            'rows': args.locations,
+            'columns': args.days + 4,
+        }
+
+        # The models use no package, so the copied project needs no download
+        project_dir = copy_dbt_project(root, without_packages=True)
+        # Write the partial parse file, so dbt_parse measures the steady state
+        # of a scheduled run rather than the first parse of a checkout
+        warmup = DbtRunner(project_dir)
+        warmup.deps()
+        warmup.parse()
+        with serve_directory(source_dir) as base_url:
+            runs = [run_pipeline(root, base_url, project_dir) for _ in range(args.repeat)]
+
+    results = collect_results(runs, args, dataset)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print(f"\nPipeline stages ({args.locations} locations x {args.days} days, "
+          f"{dataset['bytes'] / (1024 * 1024):.1f} MiB of CSV, best of {args.repeat})")
+    print_results(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+        print(f"results written to {args.output}")
+    if baseline:
+        regressions = compare_results(results, baseline, args.tolerance)
+        for stage, ratio in regressions.items():
+            print(f"REGRESSION {stage}: {ratio:.2f}x the baseline")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
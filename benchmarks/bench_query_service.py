@@ -0,0 +1,208 @@
+# Built-in imports
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+import argparse
+import http.client
+import logging
+import multiprocessing
+import random
+import socket
+import tempfile
+import time
+
+# Local imports
+from benchmarks.bench_dbt_runner import prepare_workspace
+from covid_dagster.dbt_runner import DbtRunner
+from src.python.ingestion.config.serving_config import ServingConfig
+from src.python.ingestion.serving.http_server import serve
+
+
+# First date of the synthetic files
+FIRST_DATE = date(2020, 1, 22)
+
+
+def request_paths(requests: int, countries: int, days: int, seed: int = 0) -> List[str]:
+    """Request mix of a dashboard: mostly country slices, some reporting models.
+
+    Paths repeat (a handful of countries and date ranges are popular), so a
+    cache has something to hit, as it would behind a dashboard.
+
+    Args:
+        requests: Number of paths
+        countries: Number of distinct countries in the database
+        days: Number of days in the database
+        seed: Seed of the random mix
+
+    Returns:
+        List[str]: Request paths, in the order they are sent
+    """
+    rng = random.Random(seed)
+    ranges = [
+        (FIRST_DATE + timedelta(days=start), FIRST_DATE + timedelta(days=start + length))
+        for start, length in [(0, days), (days - 30, 30), (days - 90, 90), (days // 2, 60)]
+    ]
+    paths = []
+    for _ in range(requests):
+        draw = rng.random()
+        if draw < 0.1:
+            paths.append('/models/global_daily_trends')
+        elif draw < 0.15:
+            paths.append('/models/country_mortality_analysis')
+        elif draw < 0.2:
+            paths.append('/models/top_countries_by_records')
+        else:
+            # Skewed towards the first countries, like real dashboard traffic
+            country = f"Country {min(int(rng.expovariate(0.2)), countries - 1)}"
+            start, end = rng.choice(ranges)
+            query = urlencode(
+                {'country': country, 'start': start.isoformat(), 'end': end.isoformat()}
+            )
+            paths.append(f'/models/country_time_series?{query}')
+    return paths
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _serve(config: ServingConfig) -> None:
+    logging.disable(logging.WARNING)
+    serve(config)
+
+
+def _wait_until_up(url: str, timeout: float = 30.0) -> None:
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+            conn.request('GET', '/health')
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _client(url: str, paths: List[str]) -> List[float]:
+    """Send requests one after the other on a keep-alive connection."""
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    latencies = []
+    for path in paths:
+        start = time.perf_counter()
+        conn.request('GET', path)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"GET {path} returned {response.status}")
+    conn.close()
+    return latencies
+
+
+def load_test(url: str, paths: List[str], clients: int) -> Dict[str, float]:
+    """Send the paths from concurrent clients and summarize the latencies.
+
+    Args:
+        url: Base URL of a running query service
+        paths: Request paths, split round-robin between the clients
+        clients: Number of concurrent clients
+
+    Returns:
+        Dict[str, float]: Median and 99th percentile latency in milliseconds,
+            and requests per second
+    """
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        start = time.perf_counter()
+        batches = executor.map(
+            _client, [url] * clients, [paths[i::clients] for i in range(clients)]
+        )
+        latencies = sorted(latency for batch in batches for latency in batch)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'p50_ms': 1000 * latencies[len(latencies) // 2],
+        'p99_ms': 1000 * latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+        'requests_per_second': len(latencies) / elapsed,
+    }
+
+
+def _run_server(db_path: Path, cache_size: int, pool_size: int, paths: List[str], clients: int):
+    """Load-test a service started in its own process, so it has its own GIL."""
+    config = ServingConfig(
+        db_path=str(db_path), port=_free_port(), pool_size=pool_size, cache_size=cache_size
+    )
+    process = multiprocessing.get_context('spawn').Process(target=_serve, args=(config,))
+    process.start()
+    try:
+        url = f"http://{config.host}:{config.port}"
+        _wait_until_up(url)
+        return load_test(url, paths, clients)
+    finally:
+        process.terminate()
+        process.join()
+
+
+def print_results(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    """Print load-test results as an aligned text table."""
+    print(f"\n{title}")
+    print(f"{'variant':<24}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for name, result in rows.items():
+        print(
+            f"{name:<24}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{result['requests_per_second']:>10.0f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Load-test the query service with and without its result cache."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--pool-size', type=int, default=4)
+    parser.add_argument(
+        '--url', help='Load-test a running service instead of building a database'
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    paths = request_paths(args.requests, (args.locations + 2) // 3, args.days)
+    title = f"{args.requests} requests from {args.clients} clients"
+
+    if args.url:
+        print_results(title, {'running service': load_test(args.url, paths, args.clients)})
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The models use no package, so the copied project needs no download
+        project_dir = prepare_workspace(
+            Path(tmp_dir), args.locations, args.days, without_packages=True
+        )
+        runner = DbtRunner(project_dir)
+        runner.deps()
+        runner.run()
+        db_path = Path(tmp_dir) / 'data' / 'processed' / 'covid_analysis_dev.duckdb'
+
+        results = {
+            # Every request runs its query on the pool
+            'no cache': _run_server(db_path, 0, args.pool_size, paths, args.clients),
+            'result cache': _run_server(db_path, 256, args.pool_size, paths, args.clients),
+        }
+
+    print_results(
+        f"{title} ({args.locations} locations x {args.days} days)", results
+    )
+
+
+if __name__ == '__main__':
+    main()
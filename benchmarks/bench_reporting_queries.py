@@ -0,0 +1,149 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import tempfile
+
+# Local imports
+from benchmarks.bench_dbt_runner import prepare_workspace
+from benchmarks.common import measure, print_table
+from covid_dagster.dbt_runner import DbtRunner
+
+
+REPORTING_MODELS = [
+    'global_daily_trends', 'country_mortality_analysis', 'top_countries_by_records'
+]
+# The reporting models before daily_rollup: views re-aggregating the marts
+# and staging on every query
+PREVIOUS_QUERIES = {
+    'global_daily_trends': """
+        WITH global_daily_cases AS (
+            SELECT
+                date,
+                SUM(total_confirmed) as total_cases,
+                SUM(new_cases) as new_cases,
+                SUM(total_deaths) as total_deaths,
+                ROUND(AVG(growth_rate_percentage), 2) as avg_growth_rate
+            FROM main_analytics.daily_metrics
+            GROUP BY date
+        )
+        SELECT
+            *,
+            ROUND(AVG(new_cases) OVER (
+                ORDER BY date ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
+            ), 0) as cases_7day_avg
+        FROM global_daily_cases
+        ORDER BY date
+    """,
+    'country_mortality_analysis': """
+        WITH country_stats AS (
+            SELECT
+                country_region,
+                MAX(total_confirmed) as total_cases,
+                MAX(total_deaths) as total_deaths,
+                ROUND(100.0 * MAX(total_deaths) / NULLIF(MAX(total_confirmed), 0), 2)
+                    as mortality_rate
+            FROM main_analytics.daily_metrics
+            GROUP BY country_region
+            HAVING MAX(total_confirmed) > 1000
+        ),
+        ranked_stats AS (
+            SELECT
+                *,
+                ROW_NUMBER() OVER (ORDER BY total_cases DESC) as cases_rank,
+                ROW_NUMBER() OVER (ORDER BY mortality_rate DESC) as mortality_rank
+            FROM country_stats
+        )
+        SELECT
+            *,
+            CASE
+                WHEN mortality_rate > (SELECT AVG(mortality_rate) FROM country_stats)
+                THEN true
+                ELSE false
+            END as above_avg_mortality
+        FROM ranked_stats
+        ORDER BY total_cases DESC
+    """,
+    'top_countries_by_records': """
+        WITH country_metrics AS (
+            SELECT
+                country_region,
+                COUNT(*) as record_count,
+                SUM(confirmed_cases) as total_cases,
+                SUM(death_count) as total_deaths
+            FROM main_staging.stg_covid_metrics
+            GROUP BY country_region
+        ),
+        total_records AS (
+            SELECT COUNT(*) as total_count FROM main_staging.stg_covid_metrics
+        )
+        SELECT
+            country_region,
+            record_count,
+            total_cases,
+            total_deaths,
+            ROUND(100.0 * record_count / total_count, 2) as percentage_of_records,
+            ROUND(100.0 * total_deaths / NULLIF(total_cases, 0), 2) as mortality_rate
+        FROM country_metrics
+        CROSS JOIN total_records
+        ORDER BY record_count DESC
+        LIMIT 5
+    """,
+}
+
+
+def _query(db_path: Path, query: str) -> None:
+    conn = duckdb.connect(str(db_path), read_only=True)
+    conn.execute(query).fetchall()
+    conn.close()
+
+
+def _compiled_query(project_dir: Path, model: str) -> str:
+    """SELECT of a reporting model, as compiled by the last dbt run."""
+    return next(project_dir.glob(f'target/compiled/**/{model}.sql')).read_text()
+
+
+def main() -> None:
+    """Compare the latency of the reporting models before and after daily_rollup."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The models use no package, so the copied project needs no download
+        project_dir = prepare_workspace(
+            Path(tmp_dir), args.locations, args.days, without_packages=True
+        )
+        runner = DbtRunner(project_dir)
+        runner.deps()
+        runner.run()
+        db_path = Path(tmp_dir) / 'data' / 'processed' / 'covid_analysis_dev.duckdb'
+
+        for model in REPORTING_MODELS:
+            results = {
+                # What every dashboard query cost with the previous views
+                'previous view': measure(
+                    _query, db_path, PREVIOUS_QUERIES[model], repeat=args.repeat
+                ),
+                # What a dbt run pays to rebuild the model from the rollup
+                'rebuild from rollup': measure(
+                    _query, db_path, _compiled_query(project_dir, model),
+                    repeat=args.repeat,
+                ),
+                # What a dashboard query costs now
+                'read table': measure(
+                    _query, db_path, f'SELECT * FROM main_reporting.{model}',
+                    repeat=args.repeat,
+                ),
+            }
+            print_table(f"{model}, from a fresh process", results)
+
+
+if __name__ == '__main__':
+    main()
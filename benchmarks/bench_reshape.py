@@ -0,0 +1,46 @@
+# Built-in imports
+import argparse
+import logging
+
+# Local imports
+from benchmarks.common import measure_in_process, print_table
+from benchmarks.synthetic_data import make_jhu_frame
+from src.python.ingestion.utils.data_transformation import (
+    reshape_time_series,
+    transform_time_series,
+)
+
+
+def main() -> None:
+    """Compare the melt-based and vectorized wide-to-long reshapes."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logger = logging.getLogger(__name__)
+    logger.disabled = True
+    wide_df = make_jhu_frame(locations=args.locations, days=args.days)
+
+    results = {
+        'transform_time_series': measure_in_process(
+            transform_time_series, wide_df, 'confirmed', logger, repeat=args.repeat
+        ),
+        'reshape_time_series': measure_in_process(
+            reshape_time_series, wide_df, 'confirmed', logger, repeat=args.repeat
+        ),
+    }
+
+    print_table(
+        f"Wide-to-long reshape ({args.locations} locations x {args.days} days)", results
+    )
+    speedup = (
+        results['transform_time_series']['seconds']
+        / results['reshape_time_series']['seconds']
+    )
+    print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
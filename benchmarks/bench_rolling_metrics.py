@@ -0,0 +1,136 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import shutil
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.rolling_metrics import (
+    DEFAULT_WINDOWS,
+    ROLLING_METRICS_TABLE,
+    update_rolling_metrics,
+)
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+
+
+def _window_sql() -> str:
+    """The window-function approach: every average over the whole history."""
+    averages = ',\n'.join(
+        f"""ROUND(AVG({column}) OVER (
+            PARTITION BY grain, country_region ORDER BY date
+            ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW)) AS {name}_{window}day_avg"""
+        for window in DEFAULT_WINDOWS
+        for column, name in [
+            ('total_confirmed', 'confirmed'), ('total_deaths', 'deaths'), ('new_cases', 'new_cases')
+        ]
+    )
+    return f"""CREATE OR REPLACE TABLE main_analytics.rolling_metrics_sql AS
+    WITH countries AS (
+        SELECT c.date, l."Country/Region" AS country_region,
+            SUM(c.confirmed) AS total_confirmed, SUM(d.deaths) AS total_deaths
+        FROM raw_confirmed c
+        JOIN dim_location l ON c.location_id = l.location_id
+        LEFT JOIN raw_deaths d ON c.date = d.date AND c.location_id = d.location_id
+        GROUP BY ALL
+    ),
+    changes AS (
+        SELECT *, 'country' AS grain,
+            total_confirmed - COALESCE(LAG(total_confirmed) OVER (
+                PARTITION BY country_region ORDER BY date), 0) AS new_cases
+        FROM countries
+    ),
+    series AS (
+        SELECT * FROM changes
+        UNION ALL
+        SELECT date, NULL, SUM(total_confirmed), SUM(total_deaths), 'global', SUM(new_cases)
+        FROM changes GROUP BY date
+    )
+    SELECT *, {averages} FROM series"""
+
+
+def _sql_windows(loaded_db: Path, db_path: Path) -> None:
+    shutil.copy(loaded_db, db_path)
+    conn = duckdb.connect(str(db_path))
+    conn.execute("CREATE SCHEMA IF NOT EXISTS main_analytics")
+    conn.execute(_window_sql())
+    conn.close()
+
+
+def _engine(loaded_db: Path, db_path: Path) -> None:
+    shutil.copy(loaded_db, db_path)
+    conn = duckdb.connect(str(db_path))
+    update_rolling_metrics(conn)
+    conn.close()
+
+
+def main() -> None:
+    """Compare window functions over the whole history with the rolling metrics engine."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        raw_dir = tmp / 'raw'
+        raw_dir.mkdir()
+        for data_type in DATA_TYPES:
+            write_jhu_csv(
+                raw_dir / f'{data_type}_20240101.csv',
+                locations=args.locations, days=args.days,
+            )
+        loaded_db = tmp / 'loaded.duckdb'
+        CovidDataIngestion(
+            config=IngestionConfig(
+                base_url='',
+                data_types={data_type: f'{data_type}.csv' for data_type in DATA_TYPES},
+                raw_data_path=raw_dir,
+                db_path=str(loaded_db),
+            )
+        ).load_to_duckdb()
+
+        # The state of the day before: metrics computed up to the second to
+        # last day, so an update computes the new day and the lookback window
+        previous_day_db = tmp / 'previous_day.duckdb'
+        shutil.copy(loaded_db, previous_day_db)
+        conn = duckdb.connect(str(previous_day_db))
+        update_rolling_metrics(conn)
+        conn.execute(
+            f"""DELETE FROM {ROLLING_METRICS_TABLE}
+            WHERE date = (SELECT max(date) FROM {ROLLING_METRICS_TABLE})"""
+        )
+        conn.close()
+
+        results = {
+            'window functions': measure(
+                _sql_windows, loaded_db, tmp / 'sql.duckdb', repeat=args.repeat
+            ),
+            'engine, full history': measure(
+                _engine, loaded_db, tmp / 'full.duckdb', repeat=args.repeat
+            ),
+            'engine, new day': measure(
+                _engine, previous_day_db, tmp / 'new_day.duckdb', repeat=args.repeat
+            ),
+        }
+
+    print_table(
+        f"Rolling metrics, windows {'/'.join(map(str, DEFAULT_WINDOWS))} days "
+        f"({args.locations} locations x {args.days} days, times include copying the database)",
+        results,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+# Global imports
+import duckdb
+import numpy as np
+import pandas as pd
+
+# Built-in imports
+from datetime import timedelta
+from pathlib import Path
+import argparse
+import logging
+import shutil
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import FIRST_DATE, date_headers
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.sources import DailyReportsSource, USTimeSeriesSource
+from src.python.ingestion.core.sources.base import normalize_column_name
+from src.python.ingestion.core.sources.daily_reports import (
+    DAILY_REPORT_ALIASES,
+    DAILY_REPORT_SCHEMA,
+    REPORT_DATE_FORMAT,
+)
+
+
+# Header of the reports generated, the current (v4) layout
+REPORT_HEADER = [
+    'FIPS', 'Admin2', 'Province_State', 'Country_Region', 'Last_Update', 'Lat', 'Long_',
+    'Confirmed', 'Deaths', 'Recovered', 'Active', 'Combined_Key', 'Incident_Rate',
+    'Case_Fatality_Ratio',
+]
+
+
+def _write_reports(raw_dir: Path, days: int, rows: int) -> None:
+    """Write one synthetic daily report per day, every tenth in the v1 layout."""
+    rng = np.random.default_rng(0)
+    fips = np.arange(rows) + 1001
+    for offset in range(days):
+        day = FIRST_DATE + timedelta(days=offset)
+        confirmed = rng.integers(0, 100_000, rows)
+        frame = pd.DataFrame({
+            'FIPS': fips, 'Admin2': [f'County {i}' for i in range(rows)],
+            'Province_State': 'State', 'Country_Region': 'US',
+            'Last_Update': f'{day:%Y-%m-%d} 04:00:00', 'Lat': 38.5, 'Long_': -90.1,
+            'Confirmed': confirmed, 'Deaths': confirmed // 50, 'Recovered': 0,
+            'Active': confirmed, 'Combined_Key': 'County, State, US',
+            'Incident_Rate': 12.5, 'Case_Fatality_Ratio': 2.0,
+        })[REPORT_HEADER]
+        if offset % 10 == 0:
+            frame = frame.rename(columns={
+                'Province_State': 'Province/State', 'Country_Region': 'Country/Region',
+                'Last_Update': 'Last Update',
+            })[['Province/State', 'Country/Region', 'Last Update', 'Confirmed', 'Deaths', 'Recovered']]
+        frame.to_csv(raw_dir / f'{day.strftime(REPORT_DATE_FORMAT)}.csv', index=False)
+
+
+def _write_us_series(raw_dir: Path, counties: int, days: int) -> None:
+    """Write synthetic US confirmed and deaths series."""
+    rng = np.random.default_rng(0)
+    locations = pd.DataFrame({
+        'UID': 84000000 + np.arange(counties), 'iso2': 'US', 'iso3': 'USA', 'code3': 840,
+        'FIPS': (1000 + np.arange(counties)).astype(float), 'Admin2': 'County',
+        'Province_State': 'State', 'Country_Region': 'US', 'Lat': 38.5, 'Long_': -90.1,
+        'Combined_Key': 'County, State, US',
+    })
+    for data_type in ['confirmed', 'deaths']:
+        counts = np.cumsum(rng.integers(0, 20, (counties, days)), axis=1)
+        frame = pd.concat([
+            locations.assign(Population=100_000) if data_type == 'deaths' else locations,
+            pd.DataFrame(counts, columns=date_headers(days)),
+        ], axis=1)
+        frame.to_csv(raw_dir / f'time_series_covid19_{data_type}_US.csv', index=False)
+
+
+def _config(raw_dir: Path, db_path: Path) -> IngestionConfig:
+    return IngestionConfig(
+        base_url='', data_types={}, raw_data_path=raw_dir, db_path=str(db_path)
+    )
+
+
+def _pandas_per_file(raw_dir: Path, db_path: Path, days: int) -> None:
+    """Read every report with pandas, rename its columns and insert it on its own."""
+    db_path.unlink(missing_ok=True)
+    conn = duckdb.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE raw_daily_reports (report_date DATE, "
+        + ', '.join(f'{column} {storage_type}' for column, storage_type in DAILY_REPORT_SCHEMA.items())
+        + ')'
+    )
+    for offset in range(days):
+        day = FIRST_DATE + timedelta(days=offset)
+        frame = pd.read_csv(raw_dir / 'daily_reports' / f'{day.strftime(REPORT_DATE_FORMAT)}.csv')
+        frame.columns = [normalize_column_name(col, DAILY_REPORT_ALIASES) for col in frame.columns]
+        frame = frame.reindex(columns=list(DAILY_REPORT_SCHEMA))
+        frame['last_update'] = pd.to_datetime(frame['last_update'], format='mixed')
+        frame.insert(0, 'report_date', day)
+        conn.execute("INSERT INTO raw_daily_reports BY NAME SELECT * FROM frame")
+    conn.close()
+
+
+def _daily_reports_source(raw_dir: Path, db_path: Path, days: int) -> None:
+    db_path.unlink(missing_ok=True)
+    conn = duckdb.connect(str(db_path))
+    DailyReportsSource(
+        _config(raw_dir, db_path), start_date=FIRST_DATE,
+        end_date=FIRST_DATE + timedelta(days=days - 1),
+    ).load(conn)
+    conn.close()
+
+
+def _copy_and_load(source_db: Path, raw_dir: Path, db_path: Path, days: int) -> None:
+    shutil.copy(source_db, db_path)
+    conn = duckdb.connect(str(db_path))
+    DailyReportsSource(
+        _config(raw_dir, db_path), start_date=FIRST_DATE,
+        end_date=FIRST_DATE + timedelta(days=days - 1),
+    ).load(conn)
+    conn.close()
+
+
+def _us_series_source(raw_dir: Path, db_path: Path) -> None:
+    db_path.unlink(missing_ok=True)
+    conn = duckdb.connect(str(db_path))
+    USTimeSeriesSource(_config(raw_dir, db_path)).load(conn)
+    conn.close()
+
+
+def main() -> None:
+    """Compare per-file pandas loads of the daily reports with the sources' batched DuckDB loads."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--rows', type=int, default=4000)
+    parser.add_argument('--counties', type=int, default=3300)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        reports_dir = tmp / 'raw' / 'daily_reports'
+        us_dir = tmp / 'raw' / 'us_time_series'
+        reports_dir.mkdir(parents=True)
+        us_dir.mkdir(parents=True)
+        _write_reports(reports_dir, args.days, args.rows)
+        _write_us_series(us_dir, args.counties, args.days)
+
+        # The state of the day before: every report but the last one loaded
+        previous_day_db = tmp / 'previous_day.duckdb'
+        _daily_reports_source(tmp / 'raw', previous_day_db, args.days - 1)
+
+        daily_results = {
+            'pandas, per file': measure(
+                _pandas_per_file, tmp / 'raw', tmp / 'pandas.duckdb', args.days, repeat=args.repeat
+            ),
+            'source, backfill': measure(
+                _daily_reports_source, tmp / 'raw', tmp / 'source.duckdb', args.days,
+                repeat=args.repeat,
+            ),
+            'source, new report': measure(
+                _copy_and_load, previous_day_db, tmp / 'raw', tmp / 'new_day.duckdb', args.days,
+                repeat=args.repeat,
+            ),
+        }
+        us_results = {
+            'source, both series': measure(
+                _us_series_source, tmp / 'raw', tmp / 'us.duckdb', repeat=args.repeat
+            ),
+        }
+
+    print_table(
+        f"Daily reports ({args.days} reports x {args.rows} rows, new report includes copying "
+        f"the database)",
+        daily_results,
+    )
+    print_table(f"US time series ({args.counties} counties x {args.days} days)", us_results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from pathlib import Path
+import argparse
+import logging
+import tempfile
+
+# Local imports
+from benchmarks.common import measure, print_table
+from benchmarks.synthetic_data import write_jhu_csv
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+# Column types of the raw tables before the storage schema was declared
+PREVIOUS_TYPES = {
+    'Lat': 'DOUBLE',
+    'Long': 'DOUBLE',
+    'date': 'TIMESTAMP_NS',
+    'count': 'BIGINT',
+}
+# Column types of the storage schema, before locations moved to dim_location
+STORAGE_TYPES = {
+    'Lat': 'REAL',
+    'Long': 'REAL',
+    'date': 'DATE',
+    'count': 'INTEGER',
+}
+# The three-way join of stg_covid_metrics on the location names
+STAGING_JOIN = """
+    SELECT count(*), sum(c.confirmed), sum(d.deaths), sum(r.recovered)
+    FROM raw_confirmed c
+    LEFT JOIN raw_deaths d
+        ON c.date = d.date
+        AND COALESCE(c."Province/State", '') = COALESCE(d."Province/State", '')
+        AND c."Country/Region" = d."Country/Region"
+    LEFT JOIN raw_recovered r
+        ON c.date = r.date
+        AND COALESCE(c."Province/State", '') = COALESCE(r."Province/State", '')
+        AND c."Country/Region" = r."Country/Region"
+"""
+
+
+def denormalized_copy(source: Path, target: Path, types: dict) -> None:
+    """Copy the raw tables to a new database with the location columns inlined.
+
+    Rebuilds the layout the raw tables had before dim_location: every row
+    carries its Province/State, Country/Region, Lat and Long.
+
+    Args:
+        source: Database written by the ingestion
+        target: Database to create
+        types: Types of the Lat, Long, date and count columns
+    """
+    conn = duckdb.connect(str(target))
+    conn.execute(f"ATTACH '{source}' AS keyed (READ_ONLY)")
+    for data_type in DATA_TYPES:
+        conn.execute(
+            f"""CREATE TABLE raw_{data_type} AS
+            SELECT
+                l."Province/State",
+                l."Country/Region",
+                l."Lat"::{types['Lat']} AS "Lat",
+                l."Long"::{types['Long']} AS "Long",
+                r.date::{types['date']} AS date,
+                r."{data_type}"::{types['count']} AS "{data_type}"
+            FROM keyed.raw_{data_type} AS r
+            JOIN keyed.dim_location AS l USING (location_id)
+            ORDER BY r.date, r.location_id"""
+        )
+    conn.execute("CHECKPOINT")
+    conn.close()
+
+
+def _query_join(db_path: Path) -> None:
+    conn = duckdb.connect(str(db_path), read_only=True)
+    conn.execute(STAGING_JOIN).fetchall()
+    conn.close()
+
+
+def main() -> None:
+    """Compare the raw tables' previous column types with the storage schema."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for seed, data_type in enumerate(DATA_TYPES):
+            write_jhu_csv(
+                tmp / 'raw' / f'{data_type}_20240101.csv',
+                locations=args.locations, days=args.days, seed=seed,
+            )
+        keyed = tmp / 'keyed.duckdb'
+        ingestion = CovidDataIngestion(
+            config=IngestionConfig(
+                base_url='',
+                data_types={data_type: f'{data_type}.csv' for data_type in DATA_TYPES},
+                raw_data_path=tmp / 'raw',
+                db_path=str(keyed),
+            )
+        )
+        ingestion.load_to_duckdb()
+        previous = tmp / 'previous.duckdb'
+        denormalized_copy(keyed, previous, PREVIOUS_TYPES)
+        compact = tmp / 'compact.duckdb'
+        denormalized_copy(keyed, compact, STORAGE_TYPES)
+
+        print(f"\nRaw tables of {len(DATA_TYPES)} data types "
+              f"({args.locations} locations x {args.days} days)")
+        print(f"{'variant':<24}{'file MiB':>12}")
+        for name, path in [('previous types', previous), ('storage schema', compact)]:
+            print(f"{name:<24}{path.stat().st_size / (1024 * 1024):>12.2f}")
+        frame_mib = sum(ingestion.memory_footprint.values()) / (1024 * 1024)
+        print(f"in-memory frames: {frame_mib:.1f} MiB")
+
+        results = {
+            'previous types': measure(_query_join, previous, repeat=args.repeat),
+            'storage schema': measure(_query_join, compact, repeat=args.repeat),
+        }
+
+    print_table("stg_covid_metrics join, from a fresh process", results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Built-in imports
+import argparse
+import logging
+
+# Local imports
+from benchmarks.common import measure_in_process, print_table
+from benchmarks.synthetic_data import make_jhu_frame
+from src.python.ingestion.utils.data_validation import (
+    clean_data,
+    validate_and_clean_data,
+    validate_data,
+)
+
+
+def _validate_then_clean(df, data_type, logger):
+    validate_data(df, data_type, logger)
+    clean_data(df, logger)
+
+
+def main() -> None:
+    """Compare separate validate_data + clean_data passes with the fused kernel."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--locations', type=int, default=290)
+    parser.add_argument('--days', type=int, default=1143)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logger = logging.getLogger(__name__)
+    logger.disabled = True
+    wide_df = make_jhu_frame(locations=args.locations, days=args.days)
+    # Revisions in the real files leave a few negative counts and gaps
+    wide_df.iloc[::7, 10::50] = -1
+    wide_df.iloc[::11, 13::40] = None
+
+    results = {
+        'validate_data + clean_data': measure_in_process(
+            _validate_then_clean, wide_df, 'confirmed', logger, repeat=args.repeat
+        ),
+        'validate_and_clean_data': measure_in_process(
+            validate_and_clean_data, wide_df, 'confirmed', logger, repeat=args.repeat
+        ),
+    }
+
+    print_table(
+        f"Validate and clean ({args.locations} locations x {args.days} days)", results
+    )
+    speedup = (
+        results['validate_data + clean_data']['seconds']
+        / results['validate_and_clean_data']['seconds']
+    )
+    print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
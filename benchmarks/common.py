@@ -0,0 +1,93 @@
+# Built-in imports
+from typing import Any, Callable, Dict, List
+import multiprocessing
+import time
+import tracemalloc
+
+# Local imports
+from src.python.ingestion.core.metrics import RssSampler
+
+
+def _measured_call(func: Callable, args: tuple, queue: Any) -> None:
+    """Run func in a child process and report its wall time and peak RSS."""
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        func(*args)
+        seconds = time.perf_counter() - start
+    queue.put((seconds, sampler.growth_bytes))
+
+
+def measure(func: Callable, *args, repeat: int = 3) -> Dict[str, float]:
+    """Measure wall time and peak memory of a call in fresh processes.
+
+    Each repetition runs in its own spawned process so that memory peaks and
+    caches from earlier runs cannot leak into the measurement.
+
+    Args:
+        func: Importable top-level function to benchmark
+        *args: Picklable arguments for func
+        repeat: Number of repetitions
+
+    Returns:
+        Dict[str, float]: Best wall time in seconds and the largest peak RSS
+            growth in MiB across repetitions
+    """
+    context = multiprocessing.get_context('spawn')
+    timings: List[float] = []
+    peaks: List[int] = []
+
+    for _ in range(repeat):
+        queue = context.Queue()
+        process = context.Process(target=_measured_call, args=(func, args, queue))
+        process.start()
+        seconds, peak_bytes = queue.get()
+        process.join()
+        timings.append(seconds)
+        peaks.append(peak_bytes)
+
+    return {'seconds': min(timings), 'peak_mib': max(peaks) / (1024 * 1024)}
+
+
+def measure_in_process(func: Callable, *args, repeat: int = 5) -> Dict[str, float]:
+    """Measure wall time and peak traced allocations of a call in this process.
+
+    Suited to pure Python/NumPy steps whose inputs are expensive to rebuild in
+    a fresh process. Memory is measured with tracemalloc (in a separate run, so
+    tracing overhead does not distort the timings).
+
+    Args:
+        func: Function to benchmark
+        *args: Arguments for func
+        repeat: Number of timed repetitions
+
+    Returns:
+        Dict[str, float]: Best wall time in seconds and the peak traced
+            allocation in MiB
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_mib': peak_bytes / (1024 * 1024)}
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    """Print benchmark results as an aligned text table.
+
+    Args:
+        title: Heading printed above the table
+        rows: Mapping of variant name to its measurements
+    """
+    print(f"\n{title}")
+    print(f"{'variant':<24}{'seconds':>12}{'peak MiB':>12}")
+    for name, result in rows.items():
+        print(f"{name:<24}{result['seconds']:>12.3f}{result['peak_mib']:>12.1f}")
@@ -0,0 +1,94 @@
+# Global imports
+import numpy as np
+import pandas as pd
+
+# Built-in imports
+from datetime import date, timedelta
+from pathlib import Path
+
+
+# First date of the JHU time series
+FIRST_DATE = date(2020, 1, 22)
+
+
+def date_headers(days: int) -> list:
+    """Build JHU-style date column headers (e.g. '1/22/20').
+
+    Args:
+        days: Number of consecutive days starting at FIRST_DATE
+
+    Returns:
+        list: Date headers in M/D/YY format
+    """
+    headers = []
+    for offset in range(days):
+        day = FIRST_DATE + timedelta(days=offset)
+        headers.append(f"{day.month}/{day.day}/{day.strftime('%y')}")
+    return headers
+
+
+def make_jhu_frame(
+    locations: int = 290,
+    days: int = 1143,
+    scale: int = 1000,
+    seed: int = 0,
+    null_ratio: float = 0.0,
+    negative_ratio: float = 0.0,
+) -> pd.DataFrame:
+    """Generate a wide DataFrame shaped like a JHU global time series file.
+
+    Roughly a third of the locations have a province, counts are cumulative
+    and non-decreasing, and the defaults match the shape of the real files
+    (289 locations x 1143 days). Missing and negative counts, which the
+    cleaning steps repair, can be mixed in.
+
+    Args:
+        locations: Number of rows (province/country combinations)
+        days: Number of date columns
+        scale: Upper bound of the daily increments
+        seed: Random seed, so files are reproducible
+        null_ratio: Share of counts left empty
+        negative_ratio: Share of counts made negative, like upstream corrections
+
+    Returns:
+        pd.DataFrame: Wide-format data with Province/State, Country/Region,
+            Lat, Long and one column per date
+    """
+    rng = np.random.default_rng(seed)
+    geo = pd.DataFrame(
+        {
+            'Province/State': [
+                f"Province {i}" if i % 3 == 0 else None for i in range(locations)
+            ],
+            'Country/Region': [f"Country {i // 3}" for i in range(locations)],
+            'Lat': rng.uniform(-60, 70, locations).round(4),
+            'Long': rng.uniform(-180, 180, locations).round(4),
+        }
+    )
+    counts = pd.DataFrame(
+        np.cumsum(rng.integers(0, scale, (locations, days)), axis=1),
+        columns=date_headers(days),
+    )
+    # Only draw the extra random numbers when asked, so the default files
+    # stay identical for a given seed
+    if negative_ratio > 0:
+        counts = counts.mask(rng.random(counts.shape) < negative_ratio, -counts - 1)
+    if null_ratio > 0:
+        # Nullable integers, so the other counts are still written as integers
+        counts = counts.astype('Int64').mask(rng.random(counts.shape) < null_ratio)
+    return pd.concat([geo, counts], axis=1)
+
+
+def write_jhu_csv(path: Path, **kwargs) -> Path:
+    """Write a synthetic JHU time series file.
+
+    Args:
+        path: Destination CSV path
+        **kwargs: Shape options forwarded to make_jhu_frame
+
+    Returns:
+        Path: The written file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    make_jhu_frame(**kwargs).to_csv(path, index=False)
+    return path
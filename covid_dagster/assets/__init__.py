@@ -1,6 +1,11 @@
 # Local imports
-from .ingestion_assets import ingest_covid_data
-from .dbt_assets import run_dbt_models
+from .ingestion_assets import build_raw_data_asset, raw_data_assets
+from .dbt_assets import build_dbt_model_assets, dbt_model_assets
 
 
-__all__ = ["run_dbt_models", "ingest_covid_data"]
+__all__ = [
+    "dbt_model_assets",
+    "build_dbt_model_assets",
+    "raw_data_assets",
+    "build_raw_data_asset",
+]
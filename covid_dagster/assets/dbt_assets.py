@@ -2,137 +2,581 @@
 import dagster as dg
 
 # Built-in imports
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-import subprocess
-
-
-@dg.asset(
-    group_name="dbt",
-    description="""Run dbt models and tests for COVID-19 data transformation.
-    
-    This asset performs the following operations:
-    1. Installs dbt dependencies
-    2. Compiles dbt models to validate SQL
-    3. Runs dbt models to transform the data
-    4. Runs dbt tests to validate data quality
-    
+from typing import Any, Dict, Iterator, List, Optional, Set
+import json
+
+# Local imports
+from ..dbt_runner import (
+    DBT_PROJECT_DIR,
+    STATE_DIR,
+    DbtCommandError,
+    DbtRunner,
+    load_manifest,
+    summarize_results,
+)
+from ..partitions import daily_backfill_policy, daily_partitions, partition_date_range
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.snapshots import SnapshotStore
+
+
+# dbt tag of the date-keyed incremental models, partitioned by day like the raw tables
+PARTITION_TAG = "partitioned"
+# Upstream materializations seen by the unpartitioned models, kept next to
+# the last build's manifest: the last materialization read per upstream asset
+# ('cursors') and the upstream assets not yet built into every model
+# downstream of them ('pending')
+UPSTREAM_CHANGES_FILE = "upstream_changes.json"
+# Materialization records read per instance query; a backfill materializes
+# each partitioned asset once per batch
+RECORDS_PAGE_SIZE = 1000
+
+
+class DbtModelsConfig(dg.Config):
+    """Run configuration of the dbt model assets.
+
+    Attributes:
+        rebuild_all: Build every selected model, even if neither its SQL nor
+            its upstream data changed since the last build
+    """
+
+    rebuild_all: bool = False
+
+
+def is_partitioned(node: Dict[str, Any]) -> bool:
+    """Whether a manifest node is tagged as a daily-partitioned model."""
+    return PARTITION_TAG in node.get("tags", [])
+
+
+def build_dbt_model_specs(
+    manifest: Dict[str, Any], partitioned: bool = False
+) -> List[dg.AssetSpec]:
+    """Describe the dbt models of a manifest as Dagster assets.
+
+    Each model is keyed by its name and depends on the models it refs and the
+    sources it reads, a source being keyed by its table name so the raw tables
+    resolve to the ingestion assets (raw_confirmed, ...).
+
+    Args:
+        manifest: Project manifest, as returned by load_manifest
+        partitioned: Describe the models tagged 'partitioned' if True, the
+            other models if False
+
+    Returns:
+        List[dg.AssetSpec]: One spec per model, grouped by the model's
+            directory (staging, marts, reporting)
+    """
+    upstream_nodes = {**manifest["sources"], **manifest["nodes"]}
+    specs = []
+    for unique_id, node in sorted(manifest["nodes"].items()):
+        if node["resource_type"] != "model" or is_partitioned(node) != partitioned:
+            continue
+
+        deps = [
+            dg.AssetKey(upstream_nodes[dep_id]["name"])
+            for dep_id in node["depends_on"]["nodes"]
+            if upstream_nodes.get(dep_id, {}).get("resource_type") in ("model", "source")
+        ]
+        specs.append(
+            dg.AssetSpec(
+                key=node["name"],
+                deps=deps,
+                description=node.get("description") or None,
+                # fqn is [project, directory, ..., model]
+                group_name=node["fqn"][1] if len(node["fqn"]) > 2 else "dbt",
+                metadata={
+                    "owner": "Marco Ramos",
+                    "dbt_unique_id": unique_id,
+                    "materialized": node["config"]["materialized"],
+                    "relation_name": node.get("relation_name") or "",
+                },
+                # Models whose SQL and inputs are unchanged are not rebuilt
+                skippable=True,
+            )
+        )
+    return specs
+
+
+def build_dbt_model_assets(
+    manifest: Dict[str, Any],
+    project_dir: Path = DBT_PROJECT_DIR,
+    snapshots: Optional[SnapshotStore] = None,
+) -> List[dg.AssetsDefinition]:
+    """Build one Dagster asset per dbt model.
+
+    The date-keyed incremental models (tagged 'partitioned' in dbt) are
+    partitioned by day like the raw tables, and a run only rebuilds the dates
+    of its partitions. The other models aggregate over every date: a run
+    builds the ones that are stale. Both can be subset, and independent
+    models build concurrently, up to the `threads` of the dbt profile.
+
+    With snapshots, the models build into the shadow snapshot the ingestion
+    loaded, and the unpartitioned asset publishes it once every stale model
+    is built, so readers switch to the new raw tables and models at once.
+
+    Args:
+        manifest: Project manifest, as returned by load_manifest
+        project_dir: dbt project directory
+        snapshots: Snapshots of the database the models build the next one
+            of, or None to build into the profile's database in place
+
+    Returns:
+        List[dg.AssetsDefinition]: Multi-assets dbt_partitioned_models and
+            dbt_models (either left out if it has no model), keyed by model name
+
+    Example:
+        >>> dbt_model_assets = build_dbt_model_assets(load_manifest(DBT_PROJECT_DIR))
+    """
+    return [
+        build_assets(manifest, project_dir, snapshots)
+        for partitioned, build_assets in [
+            (True, _build_partitioned_model_assets),
+            (False, _build_unpartitioned_model_assets),
+        ]
+        # A multi-asset needs at least one model
+        if build_dbt_model_specs(manifest, partitioned)
+    ]
+
+
+def _build_partitioned_model_assets(
+    manifest: Dict[str, Any], project_dir: Path, snapshots: Optional[SnapshotStore]
+) -> dg.AssetsDefinition:
+    """Multi-asset of the daily-partitioned models."""
+    raw_tables = {source["name"] for source in manifest["sources"].values()}
+
+    @dg.multi_asset(
+        name="dbt_partitioned_models",
+        specs=build_dbt_model_specs(manifest, partitioned=True),
+        can_subset=True,
+        partitions_def=daily_partitions,
+        backfill_policy=daily_backfill_policy,
+        description="""Build the date-keyed dbt models for a range of days.
+
+    Partitioned by day like the raw tables. A run of one or more days builds
+    and tests the selected models with `dbt build`, in-process through dbt's
+    Python API (see DbtRunner), passing its range as the partition_start and
+    partition_end variables. The incremental models then only replace the
+    dates of the range, plus the few following days whose day-over-day and
+    7-day figures read them.
+
+    When the run also loads the raw tables, nothing is built if none of them
+    changed, and the range starts at the earliest day they replaced, which
+    includes the revision window on the run of the latest day.
+
+    Changing the SQL of one of these models requires a backfill of its partitions.
+    """,
+    )
+    def _dbt_partitioned_models(
+        context: dg.AssetExecutionContext,
+    ) -> Iterator[dg.MaterializeResult]:
+        """Build the selected models for the days of the run.
+
+        Args:
+            context: Dagster context object for logging, the selected models
+                and the partition range
+
+        Yields:
+            dg.MaterializeResult: One per model built
+
+        Raises:
+            DbtCommandError: If a dbt command fails, after reporting the models
+                that were built
+        """
+        first_date, end_date = partition_date_range(context)
+        to_build = sorted(key.path[-1] for key in context.selected_asset_keys)
+        date_vars = {
+            "partition_start": first_date.strftime("%Y-%m-%d"),
+            "partition_end": end_date.strftime("%Y-%m-%d"),
+        }
+
+        raw_loads = _raw_loads_in_run(context, raw_tables)
+        if raw_loads and not any(_change_mode(metadata) for metadata in raw_loads):
+            context.log.info("Raw tables unchanged for these days, skipping dbt build.")
+            return
+        # Revisions merged before the partition's days are rebuilt too
+        loaded_from = [
+            metadata["loaded_from"].value
+            for metadata in raw_loads
+            if "loaded_from" in metadata and metadata["loaded_from"].value
+        ]
+        date_vars["partition_start"] = min([date_vars["partition_start"], *loaded_from])
+
+        try:
+            # Published with the unpartitioned models built on top of them
+            with _shadow_database(snapshots) as db_path:
+                runner = DbtRunner(project_dir, logger=context.log, db_path=db_path)
+                runner.deps()
+                runner.parse()
+
+                context.log.info(
+                    f"Building {', '.join(to_build)} for {date_vars['partition_start']} "
+                    f"up to {date_vars['partition_end']}"
+                )
+                try:
+                    result = runner.build(select=to_build, vars=date_vars)
+                except DbtCommandError as e:
+                    # Report the models that were built before the failure
+                    if e.result is not None:
+                        yield from _model_results(e.result, False, date_vars)
+                    raise
+
+                yield from _model_results(result, False, date_vars)
+            context.log.info(
+                f"dbt build completed (phases: {runner.phase_timings}).\n"
+                f"{summarize_results(result)}"
+            )
+
+        except DbtCommandError as e:
+            context.log.error(f"dbt command failed: {str(e)}")
+            raise
+
+    return _dbt_partitioned_models
+
+
+def _build_unpartitioned_model_assets(
+    manifest: Dict[str, Any], project_dir: Path, snapshots: Optional[SnapshotStore]
+) -> dg.AssetsDefinition:
+    """Multi-asset of the models that are not partitioned, rebuilt when stale.
+
+    Selecting any subset of the models builds only that subset. Within it, only
+    the models that are stale are built: those whose definition changed since
+    the last complete build ('state:modified+') and those downstream of an
+    upstream asset materialized since, either a raw table (as recorded by the
+    load_mode metadata of the raw_* assets) or a partitioned model.
+    """
+    specs = build_dbt_model_specs(manifest, partitioned=False)
+    all_models = {spec.key.path[-1] for spec in specs}
+    # Upstream asset name -> dbt selector of it, e.g. source:covid.raw_confirmed
+    upstream_selectors = {
+        source["name"]: f"source:{source['source_name']}.{source['name']}"
+        for source in manifest["sources"].values()
+    }
+    upstream_selectors.update(
+        {
+            node["name"]: node["name"]
+            for node in manifest["nodes"].values()
+            if node["resource_type"] == "model" and is_partitioned(node)
+        }
+    )
+
+    @dg.multi_asset(
+        name="dbt_models",
+        specs=specs,
+        can_subset=True,
+        description="""Build the dbt models that span every date.
+
+    Every dbt model is its own asset. A materialization performs the following
+    operations, in-process through dbt's Python API (see DbtRunner):
+    1. Installs dbt dependencies (skipped while the package files are unchanged)
+    2. Parses the project once (partial parsing reuses the previous parse)
+    3. Selects the stale models among the requested ones: models changed since
+       the last complete build and models downstream of a raw table or
+       partitioned model materialized since
+    4. Builds and tests them with `dbt build`, in dependency order
+    5. Once every stale model is built, publishes the snapshot the raw tables
+       and models were built into, switching readers to it atomically
+
+    Models that are not stale are skipped. Incremental models are fully
+    refreshed when any raw table was rebuilt from scratch or their own SQL changed.
+
     Dependencies:
     - dbt installed and configured
     - Valid profiles.yml with database connection
-    - Successful data ingestion (ingest_covid_data)
-    
+    - Successful data ingestion (raw_confirmed, raw_deaths, raw_recovered)
+
     Expected runtime: 2-5 minutes depending on data size and model complexity.
     """,
-    metadata={
-        "owner": "Marco Ramos",
-        "expected_runtime_minutes": 5,
-        "dbt_version": ">=1.0.0",
-        "required_resources": {"memory": "1GB", "disk_space": "500MB"},
-    },
-)
-def run_dbt_models(context, ingest_covid_data):
-    """Run dbt models and tests for COVID-19 data transformation.
+    )
+    def _dbt_models(
+        context: dg.AssetExecutionContext, config: DbtModelsConfig
+    ) -> Iterator[dg.MaterializeResult]:
+        """Build the stale models among the selected ones.
 
-    Args:
-        context: Dagster context object for logging and metadata
-        ingest_covid_data: Dependency on the data ingestion asset
+        Args:
+            context: Dagster context object for logging, the selected models
+                and the materializations of the upstream assets
+            config: Run configuration
 
-    Returns:
-        bool: True if dbt operations were successful
+        Yields:
+            dg.MaterializeResult: One per model built
+
+        Raises:
+            DbtCommandError: If a dbt command fails, after reporting the models
+                that were built
+            Exception: For other unexpected errors
+        """
+        start_time = datetime.now()
+        selected = {key.path[-1] for key in context.selected_asset_keys}
+
+        try:
+            with _shadow_database(snapshots) as db_path:
+                runner = DbtRunner(project_dir, logger=context.log, db_path=db_path)
+                deps_installed = runner.deps()
+                runner.parse()
+
+                # Upstream assets materialized since the last run, plus those of
+                # earlier runs that did not build every model downstream of them
+                upstream_changes = _read_upstream_changes(runner)
+                changed = _upstream_asset_changes(
+                    context.instance, list(upstream_selectors), upstream_changes
+                )
+
+                if config.rebuild_all or not runner.has_state():
+                    # Nothing to compare against: every model may be stale
+                    stale = set(all_models)
+                    modified_incremental: List[str] = []
+                else:
+                    # Partitioned models are selected too, but built by their own asset
+                    stale = all_models & set(
+                        runner.list_models(
+                            ["state:modified+"]
+                            + [f"{upstream_selectors[name]}+" for name in changed],
+                            state=True,
+                        )
+                    )
+                    # Their earlier rows were built by the previous SQL
+                    modified_incremental = runner.list_models(
+                        ["state:modified,config.materialized:incremental"], state=True
+                    )
+
+                # Recorded first so a failed or partial build is caught up next run
+                upstream_changes["pending"] = changed if stale else {}
+                _write_upstream_changes(runner, upstream_changes)
+
+                to_build = sorted(stale & selected)
+                if to_build:
+                    yield from _build_models(
+                        context, runner, to_build, changed, modified_incremental,
+                        upstream_selectors,
+                    )
+                else:
+                    context.log.info(
+                        "Model definitions and upstream data unchanged, skipping dbt build."
+                    )
+
+                # Only a build that caught up every stale model is the new baseline
+                if to_build and stale <= selected:
+                    runner.save_state()
+                    upstream_changes["pending"] = {}
+                    _write_upstream_changes(runner, upstream_changes)
+
+            # ... and what readers switch to, together with the raw tables and
+            # partitioned models built into the same snapshot before it
+            if stale <= selected:
+                _publish_snapshot(context, snapshots)
+
+            runtime = (datetime.now() - start_time).total_seconds() / 60
+            context.log.info(
+                f"dbt models completed in {runtime:.2f} minutes "
+                f"(deps installed: {deps_installed}, phases: {runner.phase_timings})."
+            )
+
+        except DbtCommandError as e:
+            context.log.error(f"dbt command failed: {str(e)}")
+            raise
+        except Exception as e:
+            context.log.error(f"Unexpected error in dbt operations: {str(e)}")
+            raise
+
+    return _dbt_models
+
+
+def _build_models(
+    context: dg.AssetExecutionContext,
+    runner: DbtRunner,
+    to_build: List[str],
+    changed: Dict[str, str],
+    modified_incremental: List[str],
+    upstream_selectors: Dict[str, str],
+) -> Iterator[dg.MaterializeResult]:
+    """Build and test the stale models, with the tests of the changed raw tables.
 
     Raises:
-        subprocess.CalledProcessError: If dbt commands fail
-        Exception: For other unexpected errors
+        DbtCommandError: If the build fails, after reporting the models that
+            were built
     """
-    start_time = datetime.now()
-    dbt_dir = Path("src/dbt")
+    # A rebuilt upstream table may have changed any date, not just the
+    # lookback window
+    full_refresh = (
+        any(mode == "full" for mode in changed.values())
+        or bool(set(modified_incremental) & set(to_build))
+    )
 
+    context.log.info(
+        f"Building {len(to_build)} dbt models "
+        f"({'full refresh' if full_refresh else 'incremental'}): {', '.join(to_build)}"
+    )
+    # Source selectors run the tests of the changed raw tables
+    select = to_build + [
+        upstream_selectors[name]
+        for name in changed
+        if upstream_selectors[name].startswith("source:")
+    ]
     try:
-        # Install dbt dependencies
-        context.log.info("Installing dbt dependencies...")
-        deps_result = subprocess.run(
-            ["dbt", "deps"], cwd=dbt_dir, capture_output=True, text=True
-        )
+        result = runner.build(select=select, full_refresh=full_refresh)
+    except DbtCommandError as e:
+        # Report the models that were built before the failure
+        if e.result is not None:
+            yield from _model_results(e.result, full_refresh)
+        raise
 
-        if deps_result.returncode != 0:
-            context.log.error(f"dbt deps failed: {deps_result.stderr}")
-            raise subprocess.CalledProcessError(
-                deps_result.returncode,
-                deps_result.args,
-                deps_result.stdout,
-                deps_result.stderr,
-            )
+    yield from _model_results(result, full_refresh)
+    context.log.info(f"dbt build completed.\n{summarize_results(result)}")
 
-        # Compile dbt models
-        context.log.info("Compiling dbt models...")
-        compile_result = subprocess.run(
-            ["dbt", "compile"], cwd=dbt_dir, capture_output=True, text=True
-        )
 
-        if compile_result.returncode != 0:
-            context.log.error(f"dbt compile failed: {compile_result.stderr}")
-            raise subprocess.CalledProcessError(
-                compile_result.returncode,
-                compile_result.args,
-                compile_result.stdout,
-                compile_result.stderr,
-            )
-        
-        # Run dbt models
-        context.log.info("Running dbt models...")
-        run_result = subprocess.run(
-            ["dbt", "run"], cwd=dbt_dir, capture_output=True, text=True
-        )
+@contextmanager
+def _shadow_database(snapshots: Optional[SnapshotStore]) -> Iterator[Optional[Path]]:
+    """Shadow snapshot the models build into, held for the build; None to build in place."""
+    if snapshots is None:
+        yield None
+        return
+    with snapshots.shadow() as shadow_path:
+        yield shadow_path
 
-        if run_result.returncode != 0:
-            context.log.error(f"dbt run failed: {run_result.stderr}")
-            raise subprocess.CalledProcessError(
-                run_result.returncode,
-                run_result.args,
-                run_result.stdout,
-                run_result.stderr,
-            )
-        
-        # Run dbt tests
-        context.log.info("Running dbt tests...")
-        test_result = subprocess.run(
-            ["dbt", "test"], cwd=dbt_dir, capture_output=True, text=True
+
+def _publish_snapshot(
+    context: dg.AssetExecutionContext, snapshots: Optional[SnapshotStore]
+) -> None:
+    """Switch readers to the snapshot built so far, if builds use snapshots."""
+    if snapshots is None:
+        return
+    snapshot_path = snapshots.publish()
+    if snapshot_path is not None:
+        context.log.info(f"Readers switched to the snapshot {snapshot_path.name}")
+
+
+def _model_results(
+    result: Any, full_refresh: bool, date_vars: Optional[Dict[str, str]] = None
+) -> Iterator[dg.MaterializeResult]:
+    """Materializations of the models a dbt build completed successfully.
+
+    dbt reports nodes in completion order, in which a model always follows
+    the models it depends on, as Dagster requires.
+    """
+    node_results = list(getattr(result.result, "results", None) or [])
+    tests: Dict[str, List[Any]] = {}
+    for node_result in node_results:
+        if node_result.node.resource_type == "test":
+            for dep_id in node_result.node.depends_on.nodes:
+                tests.setdefault(dep_id, []).append(node_result)
+
+    for node_result in node_results:
+        node = node_result.node
+        if node.resource_type != "model" or str(node_result.status) != "success":
+            continue
+        model_tests = tests.get(node.unique_id, [])
+        yield dg.MaterializeResult(
+            asset_key=dg.AssetKey(node.name),
+            metadata={
+                "completion_time": datetime.now().isoformat(),
+                "execution_time_seconds": node_result.execution_time,
+                "full_refresh": full_refresh,
+                "tests_passed": sum(str(t.status) == "pass" for t in model_tests),
+                "tests_run": len(model_tests),
+                "dbt_message": node_result.message or "",
+                **(date_vars or {}),
+            },
         )
 
-        if test_result.returncode != 0:
-            context.log.error(f"dbt tests failed: {test_result.stderr}")
-            raise subprocess.CalledProcessError(
-                test_result.returncode,
-                test_result.args,
-                test_result.stdout,
-                test_result.stderr,
+
+def _upstream_asset_changes(
+    instance: dg.DagsterInstance, asset_names: List[str], upstream_changes: Dict[str, Any]
+) -> Dict[str, str]:
+    """Change modes of the upstream assets materialized since their cursor, merged into pending.
+
+    Reading the upstream materializations rather than asset outputs also sees
+    assets materialized in other runs (such as the batches of a backfill), and
+    in this run when only part of the models is selected. An asset rebuilt
+    from scratch at any point ('full') stays 'full'.
+
+    Args:
+        instance: Dagster instance holding the materializations
+        asset_names: Upstream asset names: the raw tables and partitioned models
+        upstream_changes: Contents of the upstream changes file; its cursors
+            are advanced past the records read
+
+    Returns:
+        Dict[str, str]: Change mode per changed upstream asset ('full',
+            'incremental' or 'range')
+    """
+    changed = dict(upstream_changes.setdefault("pending", {}))
+    cursors = upstream_changes.setdefault("cursors", {})
+    for name in asset_names:
+        cursor = None
+        while True:
+            page = instance.fetch_materializations(
+                dg.AssetRecordsFilter(
+                    asset_key=dg.AssetKey(name), after_storage_id=cursors.get(name)
+                ),
+                limit=RECORDS_PAGE_SIZE,
+                cursor=cursor,
+                ascending=True,
             )
+            for record in page.records:
+                mode = _change_mode(record.asset_materialization.metadata)
+                if mode and changed.get(name) != "full":
+                    changed[name] = mode
+                cursors[name] = record.storage_id
+            if not page.has_more:
+                break
+            cursor = page.cursor
+    return changed
 
-        end_time = datetime.now()
-        runtime = (end_time - start_time).total_seconds() / 60
-
-        # Add detailed metadata
-        context.add_output_metadata(
-            {
-                "execution_time_minutes": runtime,
-                "completion_time": end_time.isoformat(),
-                "status": "success",
-                "tests_passed": True,
-                "models_run": True,
-                "dbt_directory": str(dbt_dir),
-                "test_output": test_result.stdout,
-                "run_output": run_result.stdout,
-                "compile_output": compile_result.stdout,
-            }
-        )
 
-        context.log.info(f"dbt operations completed in {runtime:.2f} minutes.")
-        return True
+def _raw_loads_in_run(
+    context: dg.AssetExecutionContext, raw_tables: Set[str]
+) -> List[Dict[str, Any]]:
+    """Metadata of the raw table materializations of the current run.
 
-    except subprocess.CalledProcessError as e:
-        context.log.error(f"dbt command failed: {str(e)}")
-        raise
-    except Exception as e:
-        context.log.error(f"Unexpected error in dbt operations: {str(e)}")
-        raise
+    Empty when the run loads no raw table, e.g. a backfill of the models alone.
+    """
+    records = context.instance.get_records_for_run(
+        context.run.run_id, of_type=dg.DagsterEventType.ASSET_MATERIALIZATION
+    ).records
+    materializations = (record.event_log_entry.asset_materialization for record in records)
+    return [
+        materialization.metadata
+        for materialization in materializations
+        if materialization is not None and materialization.asset_key.path[-1] in raw_tables
+    ]
+
+
+def _change_mode(metadata: Dict[str, Any]) -> str:
+    """How a materialization changed its asset, empty if it did not."""
+    if "load_mode" in metadata:
+        # Raw tables; the load mode is empty when the source was unchanged
+        return metadata["load_mode"].value or ""
+    if "full_refresh" in metadata and metadata["full_refresh"].value:
+        return "full"
+    return "incremental"
+
+
+def _read_upstream_changes(runner: DbtRunner) -> Dict[str, Any]:
+    """Upstream cursors and pending upstream assets, empty before the first build."""
+    path = runner.project_dir / STATE_DIR / UPSTREAM_CHANGES_FILE
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _write_upstream_changes(runner: DbtRunner, upstream_changes: Dict[str, Any]) -> None:
+    """Record the upstream cursors and pending upstream assets."""
+    path = runner.project_dir / STATE_DIR / UPSTREAM_CHANGES_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(upstream_changes, indent=2, sort_keys=True))
+
+
+# One asset per model of the pipeline's dbt project (stg_covid_metrics, ...),
+# building into the snapshot the ingestion assets load (the dev profile's
+# database); the manifest is prepared when the image is built
+_ingestion_config = IngestionConfig.default_config()
+dbt_model_assets = build_dbt_model_assets(
+    load_manifest(DBT_PROJECT_DIR),
+    snapshots=SnapshotStore(
+        _ingestion_config.db_path,
+        retention=_ingestion_config.snapshot_retention,
+        lock_timeout_seconds=_ingestion_config.db_lock_timeout_seconds,
+    )
+    if _ingestion_config.use_snapshots
+    else None,
+)
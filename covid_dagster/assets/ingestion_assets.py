@@ -1,83 +1,207 @@
 # Global import
 import dagster as dg
 
-# Built-in import
+# Built-in imports
 from datetime import datetime
+from typing import List, Optional
+import os
 
-# Local import
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
 from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from ..partitions import daily_backfill_policy, daily_partitions, partition_date_range
 
 
-@dg.asset(
-    group_name="ingestion",
-    description="""Ingest COVID-19 data from Johns Hopkins University CSSE.
-    
-    This asset performs the following operations:
-    1. Downloads the latest COVID-19 data
-    2. Loads the data into DuckDB
-    3. Cleans up old data files
-    
+# Each data type retries on its own; a failed download or a load that gave up
+# waiting for the database does not rerun the other data types
+RAW_DATA_RETRY_POLICY = dg.RetryPolicy(
+    max_retries=3,
+    delay=30,
+    backoff=dg.Backoff.EXPONENTIAL,
+    jitter=dg.Jitter.PLUS_MINUS,
+)
+# Op tag of the ingestion assets, whose steps the executor limits on their
+# own (see definitions.py): they wait for one another at the database
+INGESTION_CONCURRENCY_TAG = "covid/ingestion"
+
+
+def build_raw_data_asset(data_type: str, filename: str) -> dg.AssetsDefinition:
+    """Build the ingestion asset of one COVID-19 data type.
+
+    Every data type is downloaded, loaded and cleaned up by its own asset, so
+    the data types materialize in parallel under the multiprocess executor
+    and a failure in one of them only retries that one.
+
+    The asset is partitioned by day: a run loads only the date columns of
+    its partitions and replaces only those dates in the raw table, so one
+    day can be reprocessed without touching the rest of the history, and a
+    backfill loads the history in parallel batches of days. The run of the
+    latest partition also replaces the revision window before it, and a
+    rerun over a file its days were already loaded from is skipped.
+
+    Args:
+        data_type: Data type to ingest (e.g., 'confirmed')
+        filename: Name of the data type's file in the JHU repository
+
+    Returns:
+        dg.AssetsDefinition: Asset named raw_<data_type>, after the DuckDB
+            table it loads
+
+    Example:
+        >>> raw_confirmed = build_raw_data_asset(
+        ...     'confirmed', 'time_series_covid19_confirmed_global.csv'
+        ... )
+    """
+
+    @dg.asset(
+        name=f"raw_{data_type}",
+        group_name="ingestion",
+        description=f"""Ingest COVID-19 {data_type} data from Johns Hopkins University CSSE.
+
+    Partitioned by day. A run over one or more days performs the following operations:
+    1. Downloads the latest {data_type} data (conditional on upstream changes)
+    2. Replaces the rows of its days in the raw_{data_type} DuckDB table with the
+       matching date columns of the file, unless they were loaded from the same
+       file before; other days are left untouched, except the recent days
+       upstream may have revised when the latest day is loaded. The table is
+       written to the shadow snapshot of the database, which readers see once
+       the dbt models are built on it and it is published
+    3. Cleans up old {data_type} data files
+
     Dependencies:
     - Internet connection for data download
     - Sufficient disk space for data storage
     - DuckDB installed and configured
-    
-    Expected runtime: 5-10 minutes depending on data size and network speed.
+
+    Expected runtime: 2-5 minutes depending on data size and network speed.
     """,
-    metadata={
-        "owner": "Marco Ramos",
-        "expected_runtime_minutes": 10,
-        "data_source": "Johns Hopkins University CSSE",
-        "data_freshness": "Daily",
-        "required_resources": {"memory": "2GB", "disk_space": "1GB"},
-    },
-)
-def ingest_covid_data(context):
-    """Ingest COVID-19 data using the existing CovidDataIngestion class.
+        metadata={
+            "owner": "Marco Ramos",
+            "expected_runtime_minutes": 5,
+            "data_source": "Johns Hopkins University CSSE",
+            "data_freshness": "Daily",
+            "data_type": data_type,
+            "required_resources": {"memory": "1GB", "disk_space": "500MB"},
+        },
+        retry_policy=RAW_DATA_RETRY_POLICY,
+        op_tags={INGESTION_CONCURRENCY_TAG: data_type},
+        partitions_def=daily_partitions,
+        backfill_policy=daily_backfill_policy,
+    )
+    def _raw_data_asset(context) -> Optional[str]:
+        """Ingest the partition's days of one COVID-19 data type.
+
+        Args:
+            context: Dagster context object for logging, metadata and the
+                partition range
+
+        Returns:
+            Optional[str]: 'range' if the days were loaded, or None if they
+                were loaded from the same file before or the file has none
+                of the days
+
+        Raises:
+            Exception: If data download or loading fails
+        """
+        start_time = datetime.now()
+        first_date, end_date = partition_date_range(context)
+
+        try:
+            # Initialize the ingestion class for this data type only; the run
+            # of the latest day also merges the revisions of the days before
+            config = IngestionConfig.default_config()
+            config.data_types = {data_type: filename}
+            config.load_mode = "incremental"
+            ingestion = CovidDataIngestion(config)
+
+            # Download data
+            context.log.info(f"Starting {data_type} data download...")
+            ingestion.download_data()
+
+            # Load the partition's days into DuckDB (skipped if unchanged);
+            # waits for the database while another data type or batch is
+            # writing to it
+            context.log.info(
+                f"Loading {data_type} data from {first_date:%Y-%m-%d} "
+                f"to {end_date:%Y-%m-%d} (exclusive) to DuckDB..."
+            )
+            loaded_types = ingestion.load_to_duckdb(date_range=(first_date, end_date))
+            load_mode = ingestion.load_modes.get(data_type) if loaded_types else None
+            load_range = (ingestion.load_ranges or {}).get(data_type)
+
+            # Clean up old files
+            context.log.info(f"Cleaning up old {data_type} files...")
+            ingestion.cleanup_old_files()
+
+            end_time = datetime.now()
+            runtime = (end_time - start_time).total_seconds() / 60
+            # Wall, CPU, peak memory and counters of each stage of this run
+            stage_metrics = ingestion.metrics.by_data_type().get(data_type, {})
+
+            # Add detailed metadata
+            context.add_output_metadata(
+                {
+                    "execution_time_minutes": runtime,
+                    "completion_time": end_time.isoformat(),
+                    "status": "success" if load_mode else "skipped",
+                    "data_changed": load_mode is not None,
+                    "load_mode": load_mode or "",
+                    "first_date": f"{first_date:%Y-%m-%d}",
+                    "end_date": f"{end_date:%Y-%m-%d}",
+                    # First date replaced, before first_date when the revision
+                    # window was merged; read by the partitioned dbt models
+                    "loaded_from": f"{load_range[0]:%Y-%m-%d}" if load_range else "",
+                    # Seconds per stage (read, validate_clean, reshape, write, export)
+                    "stage_timings": (ingestion.stage_timings or {}).get(data_type, {}),
+                    "stage_metrics": dg.MetadataValue.json(stage_metrics),
+                    "bytes_downloaded": stage_metrics.get("download", {})
+                    .get("counters", {}).get("bytes_downloaded", 0),
+                    "rows_loaded": stage_metrics.get("write", {})
+                    .get("counters", {}).get("rows_loaded", 0),
+                    "peak_rss_growth_bytes": max(
+                        (stage["peak_rss_growth_bytes"] or 0 for stage in stage_metrics.values()),
+                        default=0,
+                    ),
+                    # Memory held by the loaded long-format frame, and the
+                    # resulting database size, tracked run over run
+                    "frame_memory_bytes": (ingestion.memory_footprint or {}).get(data_type, 0),
+                    "database_size_bytes": (
+                        os.path.getsize(ingestion.database_path)
+                        if os.path.exists(ingestion.database_path)
+                        else 0
+                    ),
+                    "data_source_url": "https://github.com/CSSEGISandData/COVID-19",
+                }
+            )
+
+            context.log.info(
+                f"COVID-19 {data_type} data ingestion completed in {runtime:.2f} minutes."
+            )
+            return load_mode
+
+        except Exception as e:
+            context.log.error(f"{data_type} data ingestion failed: {str(e)}")
+            raise
+
+    return _raw_data_asset
+
+
+def build_raw_data_assets(config: Optional[IngestionConfig] = None) -> List[dg.AssetsDefinition]:
+    """Build one ingestion asset per configured data type.
 
     Args:
-        context: Dagster context object for logging and metadata
+        config: Configuration whose data_types are ingested. If None, uses the
+            default configuration (confirmed, deaths, recovered)
 
     Returns:
-        bool: True if ingestion was successful
-
-    Raises:
-        Exception: If data download or loading fails
+        List[dg.AssetsDefinition]: raw_<data_type> assets, in configuration order
     """
-    start_time = datetime.now()
-
-    try:
-        # Initialize the ingestion class
-        ingestion = CovidDataIngestion()
-
-        # Download data
-        context.log.info("Starting data download...")
-        ingestion.download_data()
-
-        # Load data into DuckDB
-        context.log.info("Loading data to DuckDB...")
-        ingestion.load_to_duckdb()
-
-        # Clean up old files
-        context.log.info("Cleaning up old files...")
-        ingestion.cleanup_old_files()
-
-        end_time = datetime.now()
-        runtime = (end_time - start_time).total_seconds() / 60
-
-        # Add detailed metadata
-        context.add_output_metadata(
-            {
-                "execution_time_minutes": runtime,
-                "completion_time": end_time.isoformat(),
-                "status": "success",
-                "data_source_url": "https://github.com/CSSEGISandData/COVID-19",
-            }
-        )
-
-        context.log.info(f"COVID-19 data ingestion completed in {runtime:.2f} minutes.")
-        return True
-
-    except Exception as e:
-        context.log.error(f"Data ingestion failed: {str(e)}")
-        raise
+    config = config or IngestionConfig.default_config()
+    return [
+        build_raw_data_asset(data_type, filename)
+        for data_type, filename in config.data_types.items()
+    ]
+
+
+# raw_confirmed, raw_deaths and raw_recovered
+raw_data_assets = build_raw_data_assets()
@@ -0,0 +1,452 @@
+# Global imports
+from dbt.adapters.duckdb.connections import DuckDBConnectionManager
+from dbt.adapters.factory import cleanup_connections
+from dbt.cli.main import dbtRunner, dbtRunnerResult
+
+# Built-in imports
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+
+
+# dbt project of the pipeline, relative to the repository root
+DBT_PROJECT_DIR = Path("src/dbt")
+# Fingerprint of the package files the installed packages were built from
+DEPS_FINGERPRINT_FILE = ".deps_fingerprint"
+# Files that decide which packages `dbt deps` installs
+PACKAGE_FILES = ["packages.yml", "package-lock.yml"]
+# Manifest written by every parse, relative to the project directory
+MANIFEST_PATH = Path("target") / "manifest.json"
+# Manifest of the last complete build, compared against by state selection
+STATE_DIR = Path("target") / "last_build"
+# Longest wait between two attempts while the database is locked
+MAX_LOCK_RETRY_DELAY = 5.0
+# Environment variable overriding the database path of the dev profile
+# (profiles.yml), set to the shadow snapshot a build writes to
+DB_PATH_ENV_VAR = "COVID_DUCKDB_PATH"
+
+
+class DbtCommandError(RuntimeError):
+    """Raised when a dbt command fails or one of its nodes errors.
+
+    Attributes:
+        command: dbt command that failed (e.g. 'run')
+        failures: Summary line of every node that did not succeed
+        result: Result of the command, with the nodes that did succeed, or
+            None if the command raised before running any node
+    """
+
+    def __init__(
+        self,
+        command: str,
+        message: str,
+        failures: Optional[List[str]] = None,
+        result: Optional[dbtRunnerResult] = None,
+    ):
+        super().__init__(f"dbt {command} failed: {message}")
+        self.command = command
+        self.failures = failures or []
+        self.result = result
+
+
+class DbtRunner:
+    """Runs dbt commands in this process instead of one subprocess each.
+
+    Launching the dbt CLI pays interpreter startup and a full project parse
+    per command. This runner parses the project once and hands the parsed
+    manifest to every later command, while dbt's partial parsing
+    (target/partial_parse.msgpack) keeps that parse cheap across runs. `dbt
+    deps` is skipped while the package files are unchanged since the last
+    install, so routine runs need no network access.
+
+    DuckDB lets a single process write to a database at a time. A command
+    that finds the database locked by another process (an ingestion load, or
+    dbt running for another batch of a backfill) is retried with exponential
+    backoff for up to lock_timeout_seconds.
+
+    With a db_path, commands build into that database instead of the one of
+    the profile (e.g. the shadow snapshot of a blue/green build, see
+    SnapshotStore), through the COVID_DUCKDB_PATH variable profiles.yml reads.
+
+    Attributes:
+        project_dir (Path): dbt project directory (holding dbt_project.yml)
+        profiles_dir (Path): Directory holding profiles.yml
+        target (Optional[str]): Profile target to use, the profile default if None
+        logger (logging.Logger): Logger recording each phase
+        lock_timeout_seconds (float): How long a command waits for the
+            database while another process holds it
+        db_path (Optional[Path]): Database the commands build into, the
+            profile's if None
+        phase_timings (Dict[str, float]): Seconds spent in each phase run so
+            far (deps, parse, run, test, build, ...), in order
+        manifest: Parsed project manifest, None until parse() ran
+
+    Example:
+        >>> runner = DbtRunner(DBT_PROJECT_DIR)
+        >>> runner.deps()
+        >>> runner.parse()
+        >>> runner.run()
+        >>> runner.test()
+        >>> print(runner.phase_timings)
+    """
+
+    def __init__(
+        self,
+        project_dir: Path = DBT_PROJECT_DIR,
+        profiles_dir: Optional[Path] = None,
+        target: Optional[str] = None,
+        logger: Optional[logging.Logger] = None,
+        lock_timeout_seconds: float = 300.0,
+        db_path: Optional[Path] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            project_dir: dbt project directory
+            profiles_dir: Directory holding profiles.yml, the project directory
+                if None
+            target: Profile target to use, the profile default if None
+            logger: Logger recording each phase, a module logger if None
+            lock_timeout_seconds: How long a command waits for the database
+                while another process holds it
+            db_path: Database the commands build into, the profile's if None
+        """
+        self.project_dir = Path(project_dir).resolve()
+        self.profiles_dir = Path(profiles_dir).resolve() if profiles_dir else self.project_dir
+        self.target = target
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.db_path = Path(db_path).resolve() if db_path else None
+        self.phase_timings: Dict[str, float] = {}
+        self.manifest: Optional[Any] = None
+
+    def deps(self) -> bool:
+        """Install dbt packages unless the installed ones are still current.
+
+        Returns:
+            bool: True if `dbt deps` ran, False if it was skipped
+
+        Raises:
+            DbtCommandError: If the install fails
+        """
+        fingerprint = self._package_fingerprint()
+        fingerprint_path = self.project_dir / "dbt_packages" / DEPS_FINGERPRINT_FILE
+        if fingerprint_path.exists() and fingerprint_path.read_text() == fingerprint:
+            self.logger.info("dbt packages unchanged since last install, skipping deps")
+            self.phase_timings["deps"] = 0.0
+            return False
+
+        self._invoke("deps", ["deps"])
+        # deps may have written package-lock.yml, so fingerprint the result
+        fingerprint_path.parent.mkdir(parents=True, exist_ok=True)
+        fingerprint_path.write_text(self._package_fingerprint())
+        return True
+
+    def parse(self) -> Any:
+        """Parse the project once so later commands reuse the manifest.
+
+        Returns:
+            Manifest: The parsed project manifest
+
+        Raises:
+            DbtCommandError: If the project fails to parse
+        """
+        self.manifest = self._invoke("parse", ["parse"]).result
+        return self.manifest
+
+    def run(self, full_refresh: bool = False) -> dbtRunnerResult:
+        """Build the models; compilation happens as part of the run.
+
+        Args:
+            full_refresh: Rebuild incremental models from scratch
+
+        Returns:
+            dbtRunnerResult: Result of the run, with one entry per model
+
+        Raises:
+            DbtCommandError: If the run fails or any model errors
+        """
+        args = ["run", "--full-refresh"] if full_refresh else ["run"]
+        return self._invoke("run", args)
+
+    def test(self) -> dbtRunnerResult:
+        """Run the data tests.
+
+        Returns:
+            dbtRunnerResult: Result of the tests, with one entry per test
+
+        Raises:
+            DbtCommandError: If the command fails or any test fails
+        """
+        return self._invoke("test", ["test"])
+
+    def build(
+        self,
+        select: Optional[List[str]] = None,
+        full_refresh: bool = False,
+        vars: Optional[Dict[str, Any]] = None,
+    ) -> dbtRunnerResult:
+        """Run and test the selected nodes in dependency order.
+
+        Unlike run followed by test, a model's tests run as soon as it is
+        built and a failing test skips the models downstream of it.
+
+        Args:
+            select: dbt selectors of the nodes to build, every node if None
+            full_refresh: Rebuild incremental models from scratch
+            vars: Project variables of this build (e.g. partition_start)
+
+        Returns:
+            dbtRunnerResult: Result of the build, with one entry per model and test
+
+        Raises:
+            DbtCommandError: If the build fails or any model or test errors
+        """
+        args = ["build"]
+        if select:
+            args += ["--select", *select]
+        if full_refresh:
+            args.append("--full-refresh")
+        if vars:
+            args += ["--vars", json.dumps(vars)]
+        return self._invoke("build", args)
+
+    def list_models(self, select: List[str], state: bool = False) -> List[str]:
+        """Resolve dbt selectors to model names without building anything.
+
+        Args:
+            select: dbt selectors (e.g. 'state:modified+')
+            state: Compare against the manifest of the last complete build
+                (see save_state), needed by 'state:' selectors
+
+        Returns:
+            List[str]: Names of the selected models, sorted
+
+        Raises:
+            DbtCommandError: If the selection cannot be resolved
+        """
+        args = ["ls", "--resource-type", "model", "--output", "name", "--select", *select]
+        if state:
+            args += ["--state", str(self.project_dir / STATE_DIR)]
+        return sorted(self._invoke("ls", args).result or [])
+
+    def has_state(self) -> bool:
+        """Whether a complete build saved a manifest to compare against."""
+        return (self.project_dir / STATE_DIR / "manifest.json").exists()
+
+    def save_state(self) -> None:
+        """Keep the manifest of the current parse as the last complete build.
+
+        Later state selection ('state:modified') only picks the models whose
+        definition changed since this call.
+        """
+        state_dir = self.project_dir / STATE_DIR
+        state_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.project_dir / MANIFEST_PATH, state_dir / "manifest.json")
+
+    def _invoke(self, phase: str, args: List[str]) -> dbtRunnerResult:
+        """Invoke a dbt command in-process and time it.
+
+        Args:
+            phase: Name the timing is recorded under
+            args: dbt command and its arguments
+
+        Returns:
+            dbtRunnerResult: Result of a successful command
+
+        Raises:
+            DbtCommandError: If the command raised or reported failure
+        """
+        self.logger.info(f"Running dbt {' '.join(args)}...")
+        cli_args = args + [
+            "--project-dir", str(self.project_dir),
+            "--profiles-dir", str(self.profiles_dir),
+        ]
+        if self.target and args[0] != "deps":
+            cli_args += ["--target", self.target]
+
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        delay = 0.5
+        while True:
+            # Paths in profiles.yml are relative to the project, as with the CLI
+            with _working_directory(self.project_dir), _database_path(self.db_path):
+                try:
+                    result = dbtRunner(manifest=self.manifest).invoke(cli_args)
+                finally:
+                    _close_duckdb()
+            if result.success or not _is_lock_error(result):
+                break
+            if time.monotonic() + delay > deadline:
+                break
+            self.logger.info(
+                f"Database is locked by another process, retrying dbt {args[0]} "
+                f"in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_LOCK_RETRY_DELAY)
+        self.phase_timings[phase] = time.perf_counter() - start
+
+        if not result.success:
+            failures = _failed_nodes(result)
+            message = str(result.exception) if result.exception else "; ".join(failures)
+            self.logger.error(f"dbt {args[0]} failed: {message}")
+            raise DbtCommandError(args[0], message, failures, result)
+
+        self.logger.info(f"dbt {args[0]} completed in {self.phase_timings[phase]:.2f}s")
+        return result
+
+    def _package_fingerprint(self) -> str:
+        """Hash of the package files, which decide what `dbt deps` installs."""
+        digest = hashlib.sha256()
+        for name in PACKAGE_FILES:
+            path = self.project_dir / name
+            digest.update(name.encode())
+            digest.update(path.read_bytes() if path.exists() else b"")
+        return digest.hexdigest()
+
+
+def load_manifest(project_dir: Path = DBT_PROJECT_DIR) -> Dict[str, Any]:
+    """Read the project manifest prepared at build or deploy time.
+
+    Loading the code location reads the manifest without running dbt, so it
+    needs neither the network (dbt deps) nor a full parse. Every parse
+    (including the one of each dbt asset run) rewrites target/manifest.json,
+    so the manifest still follows the models as they change.
+
+    Args:
+        project_dir: dbt project directory
+
+    Returns:
+        Dict[str, Any]: The manifest as written by dbt (nodes, sources, ...)
+
+    Raises:
+        FileNotFoundError: If the manifest was never prepared (see
+            prepare_manifest)
+    """
+    manifest_path = Path(project_dir) / MANIFEST_PATH
+    if not manifest_path.exists():
+        raise FileNotFoundError(
+            f"No dbt manifest at {manifest_path}, prepare it with "
+            f"`python -m covid_dagster.dbt_runner {project_dir}`"
+        )
+    return json.loads(manifest_path.read_text())
+
+
+def prepare_manifest(
+    project_dir: Path = DBT_PROJECT_DIR, logger: Optional[logging.Logger] = None
+) -> Dict[str, Any]:
+    """Install the project's packages and parse it, writing its manifest.
+
+    Run when building the image (or once in a new checkout), before the code
+    location is loaded.
+
+    Args:
+        project_dir: dbt project directory
+        logger: Logger for the commands, a module logger if None
+
+    Returns:
+        Dict[str, Any]: The manifest written by the parse
+
+    Raises:
+        DbtCommandError: If installing the packages or parsing fails
+    """
+    runner = DbtRunner(project_dir, logger=logger)
+    runner.deps()
+    runner.parse()
+    return load_manifest(project_dir)
+
+
+def summarize_results(result: dbtRunnerResult) -> str:
+    """Render one line per node of a run or test result.
+
+    Args:
+        result: Result of a dbt run or test
+
+    Returns:
+        str: Lines of '<node>: <status> (<seconds>s)'
+
+    Example:
+        >>> print(summarize_results(runner.run()))
+        model.covid_analysis.stg_covid_metrics: success (0.31s)
+    """
+    return "\n".join(
+        f"{node_result.node.unique_id}: {node_result.status} "
+        f"({node_result.execution_time:.2f}s)"
+        for node_result in _node_results(result)
+    )
+
+
+def _node_results(result: dbtRunnerResult) -> List[Any]:
+    """Per-node results of a run or test (none for other commands)."""
+    return list(getattr(result.result, "results", None) or [])
+
+
+def _failed_nodes(result: dbtRunnerResult) -> List[str]:
+    """Summaries of the nodes of a result that errored or failed."""
+    return [
+        f"{node_result.node.unique_id}: {node_result.message}"
+        for node_result in _node_results(result)
+        if str(node_result.status) in ("error", "fail", "runtime error")
+    ]
+
+
+def _close_duckdb() -> None:
+    """Close the database dbt-duckdb keeps open after a command.
+
+    dbt-duckdb holds its connection in a process-wide environment that
+    outlives the command. Left open, it keeps the database locked against
+    other processes, and a later command of this process would keep writing
+    to that database even for a project whose profile points elsewhere.
+    Closing the adapters' connections closes the database with the last of
+    them, and forgetting the environment makes the next command open its
+    own profile's database.
+    """
+    cleanup_connections()
+    DuckDBConnectionManager.close_all_connections()
+
+
+def _is_lock_error(result: dbtRunnerResult) -> bool:
+    """Whether a command failed because another process held the database."""
+    messages = [str(result.exception)] + _failed_nodes(result)
+    return any("Could not set lock" in message for message in messages)
+
+
+@contextmanager
+def _database_path(db_path: Optional[Path]) -> Iterator[None]:
+    """Temporarily point the profile at another database, if one is given."""
+    if db_path is None:
+        yield
+        return
+    previous = os.environ.get(DB_PATH_ENV_VAR)
+    os.environ[DB_PATH_ENV_VAR] = str(db_path)
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ[DB_PATH_ENV_VAR]
+        else:
+            os.environ[DB_PATH_ENV_VAR] = previous
+
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    """Temporarily change the working directory."""
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    prepare_manifest(Path(sys.argv[1]) if len(sys.argv) > 1 else DBT_PROJECT_DIR)
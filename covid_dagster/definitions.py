@@ -1,8 +1,15 @@
 # Global import
 import dagster as dg
 
-# Local import
+# Local imports
 from . import assets
+from .assets.ingestion_assets import INGESTION_CONCURRENCY_TAG
+
+
+# Ingestion assets (raw_confirmed, raw_deaths, ...) loading at the same time;
+# the other steps, e.g. the dbt models running on the threads of the dbt
+# profile, are only bounded by the executor's default (the number of CPUs)
+MAX_CONCURRENT_INGESTION_STEPS = 3
 
 # Load all assets from the assets module
 all_assets = dg.load_assets_from_modules([assets])
@@ -16,4 +23,17 @@ covid_pipeline = dg.define_asset_job(
 defs = dg.Definitions(
     assets=all_assets,
     jobs=[covid_pipeline],
+    # Run each step in its own process so the per-data-type ingestion assets
+    # (raw_confirmed, raw_deaths, raw_recovered) materialize concurrently
+    executor=dg.multiprocess_executor.configured(
+        {
+            "tag_concurrency_limits": [
+                {
+                    "key": INGESTION_CONCURRENCY_TAG,
+                    "value": {"applyLimitPerUniqueValue": False},
+                    "limit": MAX_CONCURRENT_INGESTION_STEPS,
+                }
+            ]
+        }
+    ),
 )
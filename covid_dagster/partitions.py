@@ -0,0 +1,41 @@
+# Global import
+import dagster as dg
+
+# Built-in imports
+from datetime import datetime
+from typing import Tuple
+
+
+# First date column of the JHU CSSE time series
+JHU_START_DATE = "2020-01-22"
+# JHU CSSE stopped updating the time series on 2023-03-10; the last date
+# column is 2023-03-09, so that is the last partition
+JHU_END_DATE = "2023-03-10"
+# Days materialized by one run of a backfill
+BACKFILL_BATCH_DAYS = 90
+
+# One partition per date column of the JHU files, keyed 'YYYY-MM-DD'
+daily_partitions = dg.DailyPartitionsDefinition(
+    start_date=JHU_START_DATE, end_date=JHU_END_DATE
+)
+
+# A backfill runs as one run per batch of consecutive days rather than one
+# run per day. Each run loads and builds its whole range at once, and the
+# batches run in parallel, waiting for one another at the database
+daily_backfill_policy = dg.BackfillPolicy.multi_run(
+    max_partitions_per_run=BACKFILL_BATCH_DAYS
+)
+
+
+def partition_date_range(context: dg.AssetExecutionContext) -> Tuple[datetime, datetime]:
+    """Dates covered by a partitioned run, as naive datetimes.
+
+    Args:
+        context: Context of a run of one partition or a range of partitions
+
+    Returns:
+        Tuple[datetime, datetime]: First date and the date to stop before
+            (exclusive)
+    """
+    window = context.partition_time_window
+    return window.start.replace(tzinfo=None), window.end.replace(tzinfo=None)
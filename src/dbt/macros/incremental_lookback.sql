@@ -0,0 +1,66 @@
+{#
+    First date rebuilt by an incremental run of a date-grained model.
+
+    Incremental runs reprocess every date from `lookback_days` (a project
+    variable) before the latest date already in the model, so values revised
+    upstream inside that window are picked up. The lookback must cover the
+    ingestion revision window (IngestionConfig.revision_window_days).
+
+    Args:
+        extra_days: Additional days to read before the window, e.g. 1 for
+            models whose LAG over the previous day needs one more row
+
+    Example:
+        WHERE date >= {{ incremental_lookback_start() }}
+#}
+{% macro incremental_lookback_start(extra_days=0) %}
+    (SELECT max(date) - INTERVAL '{{ var("lookback_days") + extra_days }} days' FROM {{ this }})
+{% endmacro %}
+
+
+{#
+    First date rebuilt by an incremental run, for runs that may be restricted
+    to a date range.
+
+    A run given the `partition_start` and `partition_end` variables (ISO
+    dates, end exclusive; set by the daily-partitioned Dagster assets) only
+    rebuilds that range; other runs fall back to the lookback window.
+
+    Args:
+        extra_days: Additional days to read before the first date, e.g. 1 for
+            models whose LAG over the previous day needs one more row
+
+    Example:
+        WHERE date >= {{ incremental_window_start() }}
+#}
+{% macro incremental_window_start(extra_days=0) %}
+    {%- if var("partition_start", none) -%}
+    (DATE '{{ var("partition_start") }}' - INTERVAL '{{ extra_days }} days')
+    {%- else -%}
+    {{ incremental_lookback_start(extra_days) }}
+    {%- endif -%}
+{% endmacro %}
+
+
+{#
+    Date filter of the rows an incremental run reads.
+
+    Dates from incremental_window_start(extra_days) onwards; in a run
+    restricted to a date range, also bounded by `partition_end`. Models whose
+    window functions carry a date into the following days (LAG, moving
+    averages) extend the bound by trailing_days, so the days reading a
+    rebuilt date are rebuilt with it.
+
+    Args:
+        extra_days: Additional days to read before the first rebuilt date
+        trailing_days: Days after the range that are rebuilt as well
+
+    Example:
+        WHERE {{ incremental_window_filter(extra_days=1, trailing_days=1) }}
+#}
+{% macro incremental_window_filter(extra_days=0, trailing_days=0) %}
+    date >= {{ incremental_window_start(extra_days) }}
+    {%- if var("partition_end", none) %}
+    AND date < DATE '{{ var("partition_end") }}' + INTERVAL '{{ trailing_days }} days'
+    {%- endif %}
+{% endmacro %}
@@ -1,21 +1,32 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='date',
         schema='analytics',
-        tags=['covid', 'marts']
+        tags=['covid', 'marts', 'partitioned']
     )
 }}
 
+-- Incremental runs rebuild the dates inside the lookback window, or the dates
+-- of their partition range plus the next day, whose LAG reads the range's last
+-- date; one extra day is read so LAG still finds the previous day of the first
+-- rebuilt date.
+
 -- Step 1: Calculate daily stats per country
 WITH daily_stats AS (
     SELECT
         date,
         country_region,
+        COUNT(*) as location_count,
         SUM(confirmed_cases) as total_confirmed,
         SUM(death_count) as total_deaths,
         SUM(recovered_count) as total_recovered,
         SUM(active_cases) as total_active
     FROM {{ ref('stg_covid_metrics') }}
+    {% if is_incremental() %}
+    WHERE {{ incremental_window_filter(extra_days=1, trailing_days=1) }}
+    {% endif %}
     GROUP BY date, country_region
 ),
 
@@ -24,6 +35,7 @@ previous_day AS (
     SELECT
         date,
         country_region,
+        location_count,
         total_confirmed,
         total_deaths,
         total_recovered,
@@ -39,6 +51,8 @@ final AS (
     SELECT
         date,
         country_region,
+        -- Number of locations (provinces) reporting for the country
+        location_count,
         -- Daily totals
         total_confirmed,
         total_deaths,
@@ -48,15 +62,19 @@ final AS (
         total_confirmed - COALESCE(prev_confirmed, 0) as new_cases,
         total_deaths - COALESCE(prev_deaths, 0) as new_deaths,
         total_recovered - COALESCE(prev_recovered, 0) as new_recovered,
-        -- Growth rate
+        -- Growth rate, an exact 2-decimal percentage like the staging rates
         CASE 
             WHEN prev_confirmed > 0 THEN 
-                ROUND(((total_confirmed - prev_confirmed)::FLOAT / prev_confirmed) * 100, 2)
+                (100.0 * (total_confirmed - prev_confirmed) / prev_confirmed)::DECIMAL(18, 2)
             ELSE NULL 
         END as growth_rate_percentage,
         -- Add metadata
         CURRENT_TIMESTAMP as generated_at
     FROM previous_day
+    {% if is_incremental() %}
+    -- Drop the extra day, it only served as LAG input
+    WHERE date >= {{ incremental_window_start() }}
+    {% endif %}
     ORDER BY country_region, date
 )
 
@@ -1,10 +1,17 @@
 {{
     config(
-        materialized='table',
-        tags=['covid', 'marts']
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='date',
+        tags=['covid', 'marts', 'partitioned']
     )
 }}
 
+-- Incremental runs rebuild the dates inside the lookback window, or the dates
+-- of their partition range plus the 6 following days, whose moving averages
+-- read the range; 6 extra days are read so the 7-day averages and LAG of the
+-- first rebuilt date still see their preceding days.
+
 -- Step 1: Calculate daily global totals
 WITH daily_totals AS (
     SELECT 
@@ -16,6 +23,9 @@ WITH daily_totals AS (
         AVG(mortality_rate) as avg_mortality_rate,
         AVG(recovery_rate) as avg_recovery_rate
     FROM {{ ref('stg_covid_metrics') }}
+    {% if is_incremental() %}
+    WHERE {{ incremental_window_filter(extra_days=6, trailing_days=6) }}
+    {% endif %}
     GROUP BY date
 ),
 
@@ -23,10 +33,11 @@ WITH daily_totals AS (
 daily_changes AS (
     SELECT 
         *,
-        -- Daily changes
-        global_confirmed - LAG(global_confirmed, 1) OVER (ORDER BY date) as new_confirmed,
-        global_deaths - LAG(global_deaths, 1) OVER (ORDER BY date) as new_deaths,
-        global_recovered - LAG(global_recovered, 1) OVER (ORDER BY date) as new_recovered,
+        -- Previous day's totals, each evaluated once for the daily changes
+        -- and the growth rate
+        LAG(global_confirmed, 1) OVER (ORDER BY date) as prev_confirmed,
+        LAG(global_deaths, 1) OVER (ORDER BY date) as prev_deaths,
+        LAG(global_recovered, 1) OVER (ORDER BY date) as prev_recovered,
         -- 7-day moving averages
         AVG(global_confirmed) OVER (
             ORDER BY date 
@@ -49,9 +60,9 @@ final AS (
         global_recovered,
         global_active,
         -- New cases
-        new_confirmed,
-        new_deaths,
-        new_recovered,
+        global_confirmed - prev_confirmed as new_confirmed,
+        global_deaths - prev_deaths as new_deaths,
+        global_recovered - prev_recovered as new_recovered,
         -- Moving averages
         ROUND(confirmed_7day_avg) as confirmed_7day_avg,
         ROUND(deaths_7day_avg) as deaths_7day_avg,
@@ -60,9 +71,8 @@ final AS (
         avg_recovery_rate,
         -- Growth rates
         CASE 
-            WHEN LAG(global_confirmed, 1) OVER (ORDER BY date) > 0 
-            THEN ROUND(100.0 * (global_confirmed - LAG(global_confirmed, 1) OVER (ORDER BY date)) / 
-                      LAG(global_confirmed, 1) OVER (ORDER BY date), 2)
+            WHEN prev_confirmed > 0 
+            THEN ROUND(100.0 * (global_confirmed - prev_confirmed) / prev_confirmed, 2)
             ELSE NULL 
         END as confirmed_growth_rate,
         -- Add metadata
@@ -72,4 +82,8 @@ final AS (
 )
 
 -- Step 4: Return final results
-SELECT * FROM final 
\ No newline at end of file
+SELECT * FROM final
+{% if is_incremental() %}
+-- Drop the extra days after the window functions, they only served as input
+WHERE date >= {{ incremental_window_start() }}
+{% endif %}
@@ -1,6 +1,6 @@
 {{
     config(
-        materialized='view',
+        materialized='table',
         schema='reporting',
         tags=['covid', 'reporting', 'analysis']
     )
@@ -16,6 +16,7 @@
     - Latest available data
     
     Note: Only includes countries with >1000 total cases for statistical relevance
+    Note: Reads the precomputed country rows of daily_rollup
 */
 
 WITH 
@@ -27,17 +28,20 @@ country_stats AS (
         MAX(total_deaths) as total_deaths,      -- Latest total deaths
         -- Calculate mortality rate as percentage
         ROUND(100.0 * MAX(total_deaths) / NULLIF(MAX(total_confirmed), 0), 2) as mortality_rate
-    FROM {{ ref('daily_metrics') }}
+    FROM {{ ref('daily_rollup') }}
+    WHERE grain = 'country'
     GROUP BY country_region
     HAVING MAX(total_confirmed) > 1000  -- Filter out countries with too few cases
 ),
 
--- Step 2: Add rankings for both total cases and mortality
+-- Step 2: Add rankings for both total cases and mortality, and the average
+-- mortality of all countries (one window instead of a subquery)
 ranked_stats AS (
     SELECT 
         *,
         ROW_NUMBER() OVER (ORDER BY total_cases DESC) as cases_rank,      -- Rank by size
-        ROW_NUMBER() OVER (ORDER BY mortality_rate DESC) as mortality_rank -- Rank by mortality
+        ROW_NUMBER() OVER (ORDER BY mortality_rate DESC) as mortality_rank, -- Rank by mortality
+        AVG(mortality_rate) OVER () as avg_mortality_rate
     FROM country_stats
 ),
 
@@ -52,7 +56,7 @@ final AS (
         mortality_rank,
         -- Flag countries with above-average mortality
         CASE 
-            WHEN mortality_rate > (SELECT AVG(mortality_rate) FROM country_stats)
+            WHEN mortality_rate > avg_mortality_rate
             THEN true 
             ELSE false 
         END as above_avg_mortality
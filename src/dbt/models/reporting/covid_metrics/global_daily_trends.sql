@@ -1,6 +1,6 @@
 {{
     config(
-        materialized='view',
+        materialized='table',
         schema='reporting',
         tags=['covid', 'reporting', 'trends']
     )
@@ -16,19 +16,20 @@
     - 7-day moving averages
     
     Note: Uses 7-day averages to smooth out weekend reporting dips
+    Note: Reads the precomputed global rows of daily_rollup (one per day)
 */
 
 WITH 
--- Step 1: Aggregate metrics globally for each day
+-- Step 1: Read the global metrics of each day
 global_daily_cases AS (
     SELECT 
         date,
-        SUM(total_confirmed) as total_cases,     -- Global cumulative cases
-        SUM(new_cases) as new_cases,             -- New cases reported that day
-        SUM(total_deaths) as total_deaths,       -- Global cumulative deaths
-        ROUND(AVG(growth_rate_percentage), 2) as avg_growth_rate  -- Average daily growth rate
-    FROM {{ ref('daily_metrics') }}
-    GROUP BY date
+        total_confirmed as total_cases,          -- Global cumulative cases
+        new_cases,                               -- New cases reported that day
+        total_deaths,                            -- Global cumulative deaths
+        ROUND(avg_growth_rate, 2) as avg_growth_rate  -- Average daily growth rate
+    FROM {{ ref('daily_rollup') }}
+    WHERE grain = 'global'
 ),
 
 -- Step 2: Add moving averages and format final output
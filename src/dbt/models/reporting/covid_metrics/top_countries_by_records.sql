@@ -1,6 +1,6 @@
 {{
     config(
-        materialized='view',
+        materialized='table',
         schema='reporting',
         tags=['covid', 'reporting', 'countries']
     )
@@ -16,6 +16,8 @@
     - Recovery rates
     
     Note: Updates daily with latest available data
+    Note: Reads the precomputed rows of daily_rollup, whose location_count
+    is the number of daily reports of a country (or the world) on a date
 */
 
 WITH 
@@ -23,17 +25,19 @@ WITH
 country_metrics AS (
     SELECT 
         country_region,
-        COUNT(*) as record_count,          -- Number of daily reports (1 per geographic unit)
-        SUM(confirmed_cases) as total_cases,  -- Total cases across all regions
-        SUM(death_count) as total_deaths      -- Total deaths across all regions
-    FROM {{ ref('stg_covid_metrics') }}
+        SUM(location_count)::BIGINT as record_count,  -- Number of daily reports (1 per geographic unit)
+        SUM(total_confirmed) as total_cases,  -- Total cases across all regions
+        SUM(total_deaths) as total_deaths     -- Total deaths across all regions
+    FROM {{ ref('daily_rollup') }}
+    WHERE grain = 'country'
     GROUP BY country_region
 ),
 
 -- Step 2: Get total record count for percentage calculation
 total_records AS (
-    SELECT COUNT(*) as total_count
-    FROM {{ ref('stg_covid_metrics') }}
+    SELECT SUM(location_count)::BIGINT as total_count
+    FROM {{ ref('daily_rollup') }}
+    WHERE grain = 'global'
 ),
 
 -- Step 3: Final output with percentages and mortality rate
@@ -49,7 +53,7 @@ final AS (
         ROUND(100.0 * total_deaths / NULLIF(total_cases, 0), 2) as mortality_rate
     FROM country_metrics
     CROSS JOIN total_records
-    ORDER BY record_count DESC  -- Rank by number of records
+    ORDER BY record_count DESC, country_region  -- Rank by number of records, ties by name
     LIMIT 5                     -- Show only top 5 countries
 )
 
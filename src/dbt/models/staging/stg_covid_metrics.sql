@@ -1,67 +1,90 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='date',
         schema='staging',
-        tags=['covid', 'staging']
+        tags=['covid', 'staging', 'partitioned']
     )
 }}
 
--- Step 1: Import source data and clean column names
+-- Incremental runs only rebuild the dates inside the lookback window, or the
+-- dates of their partition range (tag 'partitioned'). Whole dates are replaced
+-- (unique_key='date'), which keeps the grain of (date, location_id).
+
+-- Step 1: Import source data and clean column names; the raw tables only
+-- carry the integer location_id, names and coordinates come from dim_location
 WITH source_confirmed AS (
     SELECT 
         date,
-        "Province/State" as province_state,
-        "Country/Region" as country_region,
-        Lat as latitude,
-        Long as longitude,
+        location_id,
         confirmed as confirmed_cases
     FROM {{ source('covid', 'raw_confirmed') }}
+    {% if is_incremental() %}
+    WHERE {{ incremental_window_filter() }}
+    {% endif %}
 ),
 
 source_deaths AS (
     SELECT 
         date,
-        "Province/State" as province_state,
-        "Country/Region" as country_region,
+        location_id,
         deaths as death_count
     FROM {{ source('covid', 'raw_deaths') }}
+    {% if is_incremental() %}
+    WHERE {{ incremental_window_filter() }}
+    {% endif %}
 ),
 
 source_recovered AS (
     SELECT 
         date,
-        "Province/State" as province_state,
-        "Country/Region" as country_region,
+        location_id,
         recovered as recovered_count
     FROM {{ source('covid', 'raw_recovered') }}
+    {% if is_incremental() %}
+    WHERE {{ incremental_window_filter() }}
+    {% endif %}
+),
+
+locations AS (
+    SELECT
+        location_id,
+        "Province/State" as province_state,
+        "Country/Region" as country_region,
+        Lat as latitude,
+        Long as longitude
+    FROM {{ source('covid', 'dim_location') }}
 ),
 
--- Step 2: Join all metrics together
+-- Step 2: Join all metrics together on the two integer keys
 joined_metrics AS (
     SELECT 
         c.date,
-        c.province_state,
-        c.country_region,
-        c.latitude,
-        c.longitude,
+        c.location_id,
+        l.province_state,
+        l.country_region,
+        l.latitude,
+        l.longitude,
         c.confirmed_cases,
         d.death_count,
         r.recovered_count
     FROM source_confirmed c
+    JOIN locations l
+        ON c.location_id = l.location_id
     LEFT JOIN source_deaths d 
         ON c.date = d.date 
-        AND COALESCE(c.province_state, '') = COALESCE(d.province_state, '')
-        AND c.country_region = d.country_region
+        AND c.location_id = d.location_id
     LEFT JOIN source_recovered r
         ON c.date = r.date 
-        AND COALESCE(c.province_state, '') = COALESCE(r.province_state, '')
-        AND c.country_region = r.country_region 
+        AND c.location_id = r.location_id
 ),
 
 -- Step 3: Final output with calculated 
 final AS (
     SELECT 
         date,
+        location_id,
         province_state,
         country_region,
         latitude,
@@ -70,15 +93,16 @@ final AS (
         death_count,
         recovered_count,
         confirmed_cases - COALESCE(recovered_count, 0) - COALESCE(death_count, 0) as active_cases,
-        -- Add mortality and recovery rates
+        -- Add mortality and recovery rates, as exact 2-decimal percentages
+        -- so sums and averages downstream do not depend on row order
         CASE 
             WHEN confirmed_cases > 0 THEN 
-                ROUND((death_count::FLOAT / confirmed_cases) * 100, 2)
+                (100.0 * death_count / confirmed_cases)::DECIMAL(18, 2)
             ELSE NULL 
         END as mortality_rate,
         CASE 
             WHEN confirmed_cases > 0 THEN 
-                ROUND((recovered_count::FLOAT / confirmed_cases) * 100, 2)
+                (100.0 * recovered_count / confirmed_cases)::DECIMAL(18, 2)
             ELSE NULL 
         END as recovery_rate
     FROM joined_metrics
@@ -33,8 +33,14 @@ Usage Examples:
 Package Structure:
     core/
         covid_ingestion.py - Main ingestion implementation
+        sources/ - Daily reports and US county series sources (see
+            IngestionConfig.sources)
     config/
         ingestion_config.py - Configuration classes
+        serving_config.py - Query service configuration
+    serving/
+        query_service.py - Cached queries over the reporting models
+        http_server.py - HTTP/JSON API of the query service
     utils/
         data_validation.py - Data validation utilities
         data_transformation.py - Data transformation utilities
@@ -42,6 +48,7 @@ Package Structure:
 
 For command-line usage:
     $ python -m src.python.ingestion
+    $ python -m src.python.ingestion.serving  # serve the reporting models
 """
 
 # Local imports
@@ -1,17 +1,34 @@
+# Built-in imports
+from pathlib import Path
+from typing import List, Optional
+import argparse
+import sys
+
 # Local imports
 from .core.covid_ingestion import CovidDataIngestion
 from .utils.logging_setup import setup_logging
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main entry point for COVID-19 data ingestion pipeline.
 
     Executes the complete data ingestion process:
-    1. Downloads latest COVID-19 data from JHU
+    1. Downloads latest COVID-19 data from JHU, and the new or changed files
+       of the sources enabled in IngestionConfig.sources
     2. Validates and cleans the data
-    3. Loads data into DuckDB
+    3. Loads data into a shadow snapshot of the DuckDB database, each source
+       into its own tables
     4. Cleans up old files
 
+    The snapshot is left unpublished: readers only switch to it once the
+    dbt_models asset has built the models on it and publishes it, so they
+    never see new raw tables next to stale marts.
+
+    Args:
+        argv: Command-line arguments. With --metrics-json PATH, the wall time,
+            CPU time, peak memory and counters of every stage (see
+            StageMetrics) are written to PATH as JSON once the run succeeds
+
     Raises:
         Exception: If any step in the pipeline fails
 
@@ -28,23 +45,41 @@ def main():
            - raw_confirmed
            - raw_deaths
            - raw_recovered
+           in the shadow snapshot under data/processed/snapshots
         4. Remove files older than 7 days
 
         The process logs will be available in data/logs/ingestion.log
+
+        To also keep the metrics of every stage:
+
+        $ python -m src.python.ingestion --metrics-json data/logs/metrics.json
     """
+    parser = argparse.ArgumentParser(description="COVID-19 data ingestion pipeline")
+    parser.add_argument(
+        '--metrics-json', type=Path, default=None,
+        help="write the metrics of every stage to this JSON file",
+    )
+    args = parser.parse_args(argv or [])
     logger = setup_logging(__name__)
 
     try:
         ingestion = CovidDataIngestion()
         ingestion.download_data()
+        ingestion.download_sources()
         ingestion.load_to_duckdb()
+        ingestion.load_sources()
         ingestion.cleanup_old_files()
         logger.info("Data ingestion pipeline completed successfully!")
 
+        if args.metrics_json is not None:
+            args.metrics_json.parent.mkdir(parents=True, exist_ok=True)
+            args.metrics_json.write_text(ingestion.metrics.to_json())
+            logger.info(f"Stage metrics written to {args.metrics_json}")
+
     except Exception as e:
         logger.error(f"Data ingestion pipeline failed: {str(e)}")
         raise
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -9,6 +9,7 @@ Main Components:
         - Data type mappings
         - File paths for raw and processed data
         - Data retention policies
+    ServingConfig: Settings of the reporting query service (pool, cache, port)
 
 Usage Examples:
     # 1. Default configuration
@@ -33,9 +34,12 @@ Module Structure:
     ingestion_config.py - Core configuration class implementation
         - IngestionConfig: Main configuration dataclass
         - default_config: Factory method for default settings
+    serving_config.py - Query service configuration
+        - ServingConfig: Database, HTTP, pool and cache settings
 """
 
-# Local import
+# Local imports
 from .ingestion_config import IngestionConfig
+from .serving_config import ServingConfig
 
-__all__ = ['IngestionConfig']
+__all__ = ['IngestionConfig', 'ServingConfig']
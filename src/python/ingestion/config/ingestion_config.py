@@ -1,7 +1,7 @@
 # Built-in imports
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 
 @dataclass
@@ -17,6 +17,60 @@ class IngestionConfig:
         raw_data_path: Directory path for storing raw downloaded files
         db_path: Path to the DuckDB database file
         retention_days: Number of days to keep raw files (default: 7)
+        max_concurrent_downloads: Maximum number of files downloaded in parallel
+            (default: 3)
+        request_timeout_seconds: Timeout applied to each HTTP request (default: 30)
+        max_retries: Number of retries for transient download failures (default: 3)
+        retry_backoff_seconds: Initial backoff between retries, doubled after each
+            failed attempt (default: 1)
+        download_chunk_size: Size in bytes of the chunks streamed to disk, which
+            bounds download memory per file (default: 1 MiB)
+        csv_reader: Backend used to parse raw files, 'pandas' for default type
+            inference or 'duckdb' for DuckDB's multithreaded reader with an
+            explicit schema (default: 'pandas')
+        ingestion_mode: How raw files are turned into tables, 'pandas' to clean
+            and reshape in Python or 'sql' to let DuckDB read, clean and
+            UNPIVOT the file without the data passing through Python
+            (default: 'pandas'). csv_reader only applies to the pandas mode
+        load_mode: 'full' to rebuild every raw table from the whole file, or
+            'incremental' to merge only new dates and recent revisions into
+            the existing tables (default: 'full')
+        revision_window_days: Days before a table's watermark that are re-read
+            on an incremental load so upstream revisions are picked up; older
+            revisions need a full load (default: 14)
+        max_processing_workers: Maximum number of data types read, validated,
+            cleaned and reshaped at the same time in the pandas mode; None uses
+            one worker per data type, up to the number of CPUs (default: None)
+        processing_pool: 'thread' to run the pandas stages in a thread pool,
+            which starts instantly and overlaps the parts that release the GIL
+            (CSV parsing, NumPy kernels), or 'process' for a process pool, which
+            runs every stage in parallel but pays for starting workers and
+            copying frames back (default: 'thread')
+        db_lock_timeout_seconds: How long a load waits for the DuckDB file
+            while another process (e.g. the load of another data type) holds
+            its write lock (default: 300)
+        parquet_path: Root of the Parquet landing zone the loaded data is also
+            written to, Hive-partitioned by data type and month (see
+            export_to_parquet); None to only load DuckDB (default: None,
+            data/landing in default_config)
+        skip_unchanged_files: Skip the load of a data type whose latest raw
+            file has the fingerprint recorded in the load manifest for its
+            table, i.e. the table already holds that file (default: True)
+        use_snapshots: Load into a shadow copy of the database instead of the
+            database itself, published as a new snapshot by publish_snapshot
+            (see SnapshotStore); db_path becomes a symlink to the current
+            snapshot, which readers open without waiting for a load
+            (default: False, on in default_config)
+        snapshot_retention: Number of published snapshots kept when
+            use_snapshots is set, including the current one (default: 3)
+        rolling_windows: Moving-average windows in days of the rolling
+            metrics table updated after every load (see
+            update_rolling_metrics); empty to not maintain it (default: (),
+            (7, 14, 28) in default_config)
+        sources: Names of the sources fetched by download_sources and loaded
+            by load_sources into their own tables, next to the global time
+            series (see SOURCE_PLUGINS): 'daily_reports' for the JHU daily
+            reports, 'us_time_series' for the US county series (default: ())
     """
 
     base_url: str
@@ -24,6 +78,29 @@ class IngestionConfig:
     raw_data_path: Path
     db_path: str
     retention_days: int = 7
+    max_concurrent_downloads: int = 3
+    request_timeout_seconds: float = 30.0
+    max_retries: int = 3
+    retry_backoff_seconds: float = 1.0
+    download_chunk_size: int = 1024 * 1024
+    csv_reader: str = 'pandas'
+    ingestion_mode: str = 'pandas'
+    load_mode: str = 'full'
+    revision_window_days: int = 14
+    max_processing_workers: Optional[int] = None
+    processing_pool: str = 'thread'
+    db_lock_timeout_seconds: float = 300.0
+    parquet_path: Optional[Path] = None
+    skip_unchanged_files: bool = True
+    use_snapshots: bool = False
+    snapshot_retention: int = 3
+    rolling_windows: Tuple[int, ...] = ()
+    sources: Tuple[str, ...] = ()
+
+    @property
+    def fetch_metadata_path(self) -> Path:
+        """Location of the fetch metadata store kept next to the raw files."""
+        return self.raw_data_path / 'fetch_metadata.json'
 
     @classmethod
     def default_config(cls) -> 'IngestionConfig':
@@ -46,4 +123,7 @@ class IngestionConfig:
             },
             raw_data_path=Path('data/raw'),
             db_path='data/processed/covid_analysis_dev.duckdb',
+            parquet_path=Path('data/landing'),
+            use_snapshots=True,
+            rolling_windows=(7, 14, 28),
         )
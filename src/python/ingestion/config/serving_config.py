@@ -0,0 +1,50 @@
+# Built-in imports
+from dataclasses import dataclass
+
+
+@dataclass
+class ServingConfig:
+    """Configuration settings for the reporting query service.
+
+    Attributes:
+        db_path: Path to the DuckDB database file built by ingestion and dbt
+        host: Interface the HTTP server listens on (default: '127.0.0.1')
+        port: Port the HTTP server listens on, 0 for any free port
+            (default: 8765)
+        pool_size: Maximum number of queries run against DuckDB at the same
+            time, one read-only connection each (default: 4)
+        cache_size: Maximum number of query results kept in the LRU cache,
+            0 to disable caching (default: 256)
+        connect_timeout_seconds: How long a query waits for the database
+            while a load or dbt run holds its write lock, before a cached
+            result is served as stale or the request fails (default: 5)
+        idle_timeout_seconds: How long the pool keeps its connections open
+            without queries; an open read-only connection keeps writers out
+            of the database file, so loads and dbt runs wait at most this
+            long for an idle service (default: 2)
+        max_rows: Largest number of rows a query returns (default: 10000)
+    """
+
+    db_path: str
+    host: str = '127.0.0.1'
+    port: int = 8765
+    pool_size: int = 4
+    cache_size: int = 256
+    connect_timeout_seconds: float = 5.0
+    idle_timeout_seconds: float = 2.0
+    max_rows: int = 10000
+
+    @classmethod
+    def default_config(cls) -> 'ServingConfig':
+        """Create a default configuration instance.
+
+        Returns:
+            ServingConfig: Instance serving the database of the default
+                ingestion configuration
+
+        Example:
+            >>> config = ServingConfig.default_config()
+            >>> print(config.port)
+            8765
+        """
+        return cls(db_path='data/processed/covid_analysis_dev.duckdb')
@@ -34,15 +34,114 @@ Usage Examples:
     ingestion = CovidDataIngestion(config)
     ingestion.download_data()
 
+    # 3. Daily incremental loads (new dates and recent revisions only)
+    config = IngestionConfig.default_config()
+    config.load_mode = 'incremental'
+    CovidDataIngestion(config).load_to_duckdb()
+
+    # 4. Process the data types in a process pool and inspect stage timings
+    config = IngestionConfig.default_config()
+    config.max_processing_workers = 3
+    config.processing_pool = 'process'
+    ingestion = CovidDataIngestion(config)
+    ingestion.load_to_duckdb()
+    print(ingestion.stage_timings['confirmed'])  # {'read': 0.21, ..., 'write': 0.25}
+
+    # 5. Forward the wall time, CPU time, peak memory and counters of every stage
+    ingestion = CovidDataIngestion(config, collectors=[MyCollector()])
+    ingestion.download_data()
+    ingestion.load_to_duckdb()
+    print(ingestion.metrics.by_data_type()['confirmed']['write']['counters'])
+
+    # 6. Build into the shadow snapshot, then publish it to readers
+    config = IngestionConfig.default_config()  # use_snapshots=True
+    ingestion = CovidDataIngestion(config)
+    ingestion.load_to_duckdb()
+    ingestion.publish_snapshot()
+
+    # 7. Also ingest the JHU daily reports and US county series
+    config = IngestionConfig.default_config()
+    config.sources = ('daily_reports', 'us_time_series')
+    ingestion = CovidDataIngestion(config)
+    ingestion.download_sources()
+    ingestion.load_sources()
+    print(ingestion.source_loads['daily_reports'].header_versions)  # {'v1': 39, ...}
+
 Module Structure:
     covid_ingestion.py - Main ingestion class implementation
         - CovidDataIngestion: Core class for data pipeline
         - download_data: Method for fetching latest data
         - cleanup_old_files: Method for managing file retention
         - load_to_duckdb: Method for database loading
+    downloader.py - Concurrent HTTP download engine
+        - DataDownloader: Pooled, retrying downloader used by download_data
+        - DownloadResult: Outcome of a single file download
+    fetch_metadata.py - Persistent ETag/Last-Modified cache for conditional fetches
+        - FetchMetadata: Validators and fingerprint of the last fetched file
+        - FetchMetadataStore: JSON store kept next to the raw data files
+    incremental_load.py - Watermarks and merge logic for incremental loads
+        - get_watermark / set_watermark: Per-table state in _load_watermarks
+        - merge_staging: Upsert of staged rows by (location_id, date)
+        - replace_date_range: Replacement of the rows of a date range
+    load_manifest.py - Fingerprints of the raw files the tables were loaded from
+        - fingerprint_file: SHA-256 hash, size, row and column counts of a raw file
+        - get_loaded_fingerprint / record_load: Per-table entries in _load_manifest
+        - forget_load: Drops the entry of a table about to change
+        - get_loaded_range_fingerprint / record_range_load / forget_ranges: The same
+          per date range of a table, in _load_manifest_ranges
+    metrics.py - Per-stage instrumentation of downloads and loads
+        - StageMetrics: Wall time, CPU time, peak memory and counters of a stage
+        - MetricsCollector: Hook receiving the metrics of every stage
+        - InMemoryCollector: Collector behind CovidDataIngestion.metrics
+    parallel_processing.py - Worker pool for the pandas stages of a load
+        - ProcessingTask: Raw file (and date columns) to process
+        - ProcessedFrame: Long-format frame with per-stage metrics
+        - process_all: Processes files concurrently, yielding frames as they finish
+    parquet_landing.py - Parquet copy of the raw tables for columnar readers
+        - export_to_parquet: Rewrites the months changed by a load, Hive-partitioned
+          by data type and month
+        - export_locations: Writes dim_location next to the partitions
+    rolling_metrics.py - Moving averages and growth rates updated per day
+        - RollingWindows: Running window sums of many series, O(1) per day
+        - update_rolling_metrics: Recomputes the days a load changed into
+          main_analytics.rolling_metrics, matching the dbt models
+    snapshots.py - Blue/green snapshots of the database behind a symlink
+        - SnapshotStore: Shadow copy loads and dbt runs build into, published
+          with an atomic symlink swap and kept under a retention
+    sources/ - Pluggable sources ingested next to the global time series
+        - SourcePlugin: Lists, fetches and loads the files of a source,
+          tracking each file's fetch and load
+        - DailyReportsSource: JHU daily reports of every header layout, into
+          raw_daily_reports
+        - USTimeSeriesSource: JHU US county series, into dim_us_county,
+          raw_us_confirmed and raw_us_deaths
 """
 
-# Local import
+# Local imports
 from .covid_ingestion import CovidDataIngestion
+from .downloader import DataDownloader, DownloadResult
+from .fetch_metadata import FetchMetadata, FetchMetadataStore
+from .load_manifest import FileFingerprint, fingerprint_file
+from .metrics import InMemoryCollector, MetricsCollector, StageMetrics
+from .rolling_metrics import RollingWindows, update_rolling_metrics
+from .snapshots import SnapshotStore
+from .sources import DailyReportsSource, SourcePlugin, USTimeSeriesSource
 
-__all__ = ['CovidDataIngestion']
+__all__ = [
+    'CovidDataIngestion',
+    'DailyReportsSource',
+    'DataDownloader',
+    'DownloadResult',
+    'FetchMetadata',
+    'FetchMetadataStore',
+    'FileFingerprint',
+    'InMemoryCollector',
+    'MetricsCollector',
+    'RollingWindows',
+    'SnapshotStore',
+    'SourcePlugin',
+    'StageMetrics',
+    'USTimeSeriesSource',
+    'fingerprint_file',
+    'update_rolling_metrics',
+]
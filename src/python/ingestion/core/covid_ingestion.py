@@ -1,20 +1,62 @@
 # Global imports
-import pandas as pd
-import requests
 import duckdb
+import pandas as pd
 
 # Built-in imports
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
+import os
+import time
 
 # Local imports
 from ..config.ingestion_config import IngestionConfig
-from ..utils.data_validation import validate_data, clean_data
-from ..utils.data_transformation import transform_time_series
+from .downloader import DataDownloader, DownloadResult
+from .fetch_metadata import FetchMetadata, FetchMetadataStore
+from .metrics import InMemoryCollector, MetricsCollector, StageMetrics, measure_stage
+from .load_manifest import (
+    FileFingerprint,
+    fingerprint_file,
+    forget_load,
+    forget_ranges,
+    get_loaded_fingerprint,
+    get_loaded_range_fingerprint,
+    record_load,
+    record_range_load,
+)
+from .incremental_load import (
+    date_columns_since,
+    get_watermark,
+    merge_staging,
+    replace_date_range,
+    revision_cutoff,
+    set_watermark,
+)
+from .parallel_processing import (
+    PROCESSING_POOLS,
+    ProcessedFrame,
+    ProcessingTask,
+    process_all,
+    process_time_series,
+)
+from .parquet_landing import export_locations, export_to_parquet
+from .rolling_metrics import update_rolling_metrics
+from .snapshots import SnapshotStore
+from .sources import SourceLoadResult, SourcePlugin, create_sources
+from ..utils.csv_readers import read_header
+from ..utils.data_transformation import DATE_FORMAT
+from ..utils.locations import upsert_locations, with_location_ids
+from ..utils.sql_transformation import load_time_series_sql
+from ..utils.storage_schema import cast_to_storage_schema
 from ..utils.logging_setup import setup_logging
 
 
+# Supported values of IngestionConfig.ingestion_mode
+INGESTION_MODES = ['pandas', 'sql']
+# Supported values of IngestionConfig.load_mode
+LOAD_MODES = ['full', 'incremental']
+
+
 class CovidDataIngestion:
     """Main class for handling COVID-19 data ingestion process.
 
@@ -29,6 +71,45 @@ class CovidDataIngestion:
         logger (logging.Logger): Logging instance, automatically configured during initialization
         config (IngestionConfig): Configuration settings for the ingestion process. If not provided
             in __init__, a default configuration is created
+        download_results (Optional[Dict[str, DownloadResult]]): Outcome of the last
+            download_data call, or None if nothing was downloaded by this instance
+        load_modes (Optional[Dict[str, str]]): How each data type was loaded by the
+            last load_to_duckdb call, 'full' (table rebuilt), 'incremental'
+            (table merged) or 'range' (a date range replaced), or None if
+            nothing was loaded by this instance
+        load_ranges (Optional[Dict[str, Tuple[datetime, datetime]]]): Dates
+            replaced per data type by the last load_to_duckdb call with a
+            date_range, the range itself or the range widened to the
+            revision window, or None if nothing was loaded by this instance
+        skipped_files (Optional[Dict[str, Path]]): Data types whose load was
+            skipped by the last load_to_duckdb call because their latest raw
+            file is the one their table was loaded from (see
+            skip_unchanged_files), with that file, or None if nothing was
+            loaded by this instance
+        stage_timings (Optional[Dict[str, Dict[str, float]]]): Seconds spent in
+            each stage (read, validate_clean, reshape, write, and export when
+            parquet_path is set) per data type by the last load_to_duckdb
+            call, or None if nothing was loaded
+        memory_footprint (Optional[Dict[str, int]]): Bytes held in memory by
+            each data type's long-format frame during the last load_to_duckdb
+            call (pandas mode only, the sql mode builds no frame), or None if
+            nothing was loaded
+        metrics (InMemoryCollector): Measurements and counters of every stage
+            (download, fingerprint, read, validate_clean, reshape, write,
+            export) run by this instance, per data type (see StageMetrics)
+        collectors (List[MetricsCollector]): Additional receivers of the
+            metrics of every stage
+        snapshots (Optional[SnapshotStore]): Snapshots of the database the
+            loads build the next one of, or None if the loads write to
+            db_path in place (see use_snapshots)
+        sources (List[SourcePlugin]): Sources fetched by download_sources and
+            loaded by load_sources, next to the global time series
+        source_downloads (Optional[Dict[str, Dict[str, DownloadResult]]]):
+            Download outcome of every file fetched by the last
+            download_sources call, per source, or None if not called
+        source_loads (Optional[Dict[str, SourceLoadResult]]): Files and rows
+            loaded by the last load_sources call, per source, or None if not
+            called
 
     Example:
         >>> ingestion = CovidDataIngestion()  # Uses default config
@@ -36,19 +117,71 @@ class CovidDataIngestion:
         >>> ingestion.load_to_duckdb()
     """
 
-    def __init__(self, config: Optional[IngestionConfig] = None):
+    def __init__(
+        self,
+        config: Optional[IngestionConfig] = None,
+        collectors: Optional[List[MetricsCollector]] = None,
+        sources: Optional[List[SourcePlugin]] = None,
+    ):
         """Initialize the COVID data ingestion pipeline.
 
         Args:
             config: Optional configuration object. If None, uses default config
                    with predefined paths and settings.
+            collectors: Optional receivers of the metrics of every stage, in
+                addition to the metrics attribute
+            sources: Optional sources to ingest next to the global time
+                series. If None, the ones named in config.sources
+
+        Raises:
+            ValueError: If config.sources names an unknown source
         """
         # Set up logging for this instance
         self.logger = setup_logging(__name__)
         # Use provided config or create default one
         self.config = config or IngestionConfig.default_config()
+        # Populated by download_data, reports what was fetched and how
+        self.download_results: Optional[Dict[str, DownloadResult]] = None
+        # Populated by load_to_duckdb, tells downstream models what to rebuild
+        self.load_modes: Optional[Dict[str, str]] = None
+        # Populated by load_to_duckdb, tells partitioned models which dates changed
+        self.load_ranges: Optional[Dict[str, Tuple[datetime, datetime]]] = None
+        # Populated by load_to_duckdb, reports the loads that were not needed
+        self.skipped_files: Optional[Dict[str, Path]] = None
+        # Populated by load_to_duckdb, reports where load time was spent
+        self.stage_timings: Optional[Dict[str, Dict[str, float]]] = None
+        # Populated by load_to_duckdb, reports the size of the loaded frames
+        self.memory_footprint: Optional[Dict[str, int]] = None
+        # Populated by every stage, reports which stage of which data type
+        # the time, memory and rows went to
+        self.metrics = InMemoryCollector()
+        self.collectors: List[MetricsCollector] = list(collectors or [])
+        # Loads write to the shadow snapshot, readers keep the published one
+        self.snapshots: Optional[SnapshotStore] = (
+            SnapshotStore(
+                self.config.db_path,
+                retention=self.config.snapshot_retention,
+                lock_timeout_seconds=self.config.db_lock_timeout_seconds,
+                logger=self.logger,
+            )
+            if self.config.use_snapshots
+            else None
+        )
+        self.sources: List[SourcePlugin] = (
+            list(sources) if sources is not None else create_sources(self.config, self.logger)
+        )
+        # Populated by download_sources and load_sources
+        self.source_downloads: Optional[Dict[str, Dict[str, DownloadResult]]] = None
+        self.source_loads: Optional[Dict[str, SourceLoadResult]] = None
+
+    @property
+    def database_path(self) -> str:
+        """Database the loads write to: the shadow snapshot, or db_path in place."""
+        if self.snapshots is not None:
+            return str(self.snapshots.shadow_path)
+        return self.config.db_path
 
-    def download_data(self) -> None:
+    def download_data(self) -> Dict[str, DownloadResult]:
         """Download the latest COVID-19 data from JHU repository.
 
         Downloads three types of data:
@@ -56,7 +189,16 @@ class CovidDataIngestion:
         - Deaths
         - Recoveries
 
-        Each file is saved with a timestamp in the configured raw data directory.
+        All files are fetched concurrently over a shared connection pool (see
+        DataDownloader). Each file is saved with a timestamp in the configured
+        raw data directory.
+
+        Fetch metadata (ETag, Last-Modified, size and content hash) is persisted
+        next to the raw files, so later runs make conditional requests and keep
+        the previous copy when upstream answers 304 Not Modified.
+
+        Returns:
+            Dict[str, DownloadResult]: Download outcome for each data type
 
         Raises:
             RequestException: If download fails for any data type
@@ -64,36 +206,166 @@ class CovidDataIngestion:
         # Create raw data directory if it doesn't exist
         self.config.raw_data_path.mkdir(parents=True, exist_ok=True)
 
-        # Download each type of data (confirmed, deaths, recovered)
-        for data_type, filename in self.config.data_types.items():
-            url = f"{self.config.base_url}/{filename}"
-            self.logger.info(f"Downloading {data_type} data from {url}")
+        # Build the download targets (e.g., confirmed -> confirmed_20240315.csv)
+        timestamp = datetime.now().strftime('%Y%m%d')
+        targets = {
+            data_type: (
+                f"{self.config.base_url}/{filename}",
+                self.config.raw_data_path / f"{data_type}_{timestamp}.csv",
+            )
+            for data_type, filename in self.config.data_types.items()
+        }
 
-            try:
-                # Fetch data from JHU repository
-                response = requests.get(url)
-                response.raise_for_status()
-
-                # Save file with timestamp in name (e.g., confirmed_20240315.csv)
-                output_path = (
-                    self.config.raw_data_path
-                    / f"{data_type}_{datetime.now().strftime('%Y%m%d')}.csv"
-                )
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-                self.logger.info(
-                    f"Successfully downloaded {data_type} data to {output_path}"
+        # Only send conditional requests if the previous copy is still on disk
+        store = FetchMetadataStore(self.config.fetch_metadata_path)
+        previous: Dict[str, FetchMetadata] = {}
+        for data_type in targets:
+            metadata = store.get(data_type)
+            if metadata is not None and Path(metadata.path).exists():
+                previous[data_type] = metadata
+
+        # Download every data type at the same time
+        downloader = DataDownloader(self.config, self.logger)
+        try:
+            results = downloader.download_all(targets, previous)
+        finally:
+            downloader.close()
+
+        # Record the new validators
+        for data_type, result in results.items():
+            store.set(
+                data_type,
+                FetchMetadata(
+                    url=result.url,
+                    path=str(result.path),
+                    etag=result.etag,
+                    last_modified=result.last_modified,
+                    content_length=result.content_length,
+                    content_hash=result.content_hash,
+                    fetched_at=datetime.now().isoformat(),
+                ),
+            )
+        store.save()
+
+        for data_type, result in results.items():
+            self._record_metrics(
+                StageMetrics(
+                    data_type=data_type,
+                    stage='download',
+                    wall_seconds=result.elapsed_seconds,
+                    counters={
+                        'bytes_downloaded': result.bytes_downloaded,
+                        'attempts': result.attempts,
+                    },
                 )
+            )
+        self.download_results = results
+        return results
+
+    def download_sources(self) -> Dict[str, Dict[str, DownloadResult]]:
+        """Download the files of every source that may have changed.
+
+        The files of a source are fetched concurrently over one connection
+        pool, with conditional requests for the ones already fetched (see
+        SourcePlugin.fetch). Sources are fetched one after the other.
+
+        Returns:
+            Dict[str, Dict[str, DownloadResult]]: Download outcome of every
+                file requested, per source
+
+        Raises:
+            RequestException: If a download fails after all retries
+        """
+        results: Dict[str, Dict[str, DownloadResult]] = {}
+        if not self.sources:
+            return results
 
-            except requests.exceptions.RequestException as e:
-                self.logger.error(f"Failed to download {data_type} data: {str(e)}")
-                raise
+        downloader = DataDownloader(self.config, self.logger)
+        try:
+            for source in self.sources:
+                with measure_stage(source.name, 'download') as metrics:
+                    fetched = source.fetch(downloader)
+                    metrics.counters['files_requested'] = len(fetched)
+                    metrics.counters['files_changed'] = sum(
+                        result.changed for result in fetched.values()
+                    )
+                    metrics.counters['bytes_downloaded'] = sum(
+                        result.bytes_downloaded for result in fetched.values()
+                    )
+                self._record_metrics(metrics)
+                results[source.name] = fetched
+        finally:
+            downloader.close()
+
+        self.source_downloads = results
+        return results
+
+    def load_sources(self) -> Dict[str, SourceLoadResult]:
+        """Load the new and changed files of every source into DuckDB.
+
+        Writes to the same database as load_to_duckdb (the shadow snapshot
+        with use_snapshots), each source into its own tables. Files whose
+        content was already loaded are skipped (see SourcePlugin.load).
+
+        Returns:
+            Dict[str, SourceLoadResult]: Files and rows loaded, per source
+
+        Raises:
+            Exception: If a source fails to load
+        """
+        results: Dict[str, SourceLoadResult] = {}
+        if not self.sources:
+            return results
+
+        conn = self._connect()
+        try:
+            for source in self.sources:
+                with measure_stage(source.name, 'load', time.process_time) as metrics:
+                    result = source.load(conn)
+                    metrics.counters['files_loaded'] = len(result.files_loaded)
+                    metrics.counters['files_skipped'] = result.files_skipped
+                    metrics.counters['rows_loaded'] = result.rows_loaded
+                self._record_metrics(metrics)
+                results[source.name] = result
+        except Exception as e:
+            self.logger.error(f"Error loading sources to DuckDB: {str(e)}")
+            raise
+        finally:
+            conn.close()
+
+        self.source_loads = results
+        return results
+
+    def publish_snapshot(self) -> Optional[Path]:
+        """Publish the shadow snapshot the loads wrote to (see SnapshotStore.publish).
+
+        Readers opening db_path from then on see the loaded tables; older
+        snapshots beyond snapshot_retention are deleted.
+
+        Returns:
+            Optional[Path]: The published snapshot, or None if use_snapshots
+                is off or nothing was written since the last publication
+
+        Raises:
+            TimeoutError: If a writer still holds the shadow after
+                db_lock_timeout_seconds
+        """
+        if self.snapshots is None:
+            return None
+        try:
+            return self.snapshots.publish()
+        except Exception as e:
+            self.logger.error(f"Error publishing the snapshot of {self.config.db_path}: {str(e)}")
+            raise
 
     def cleanup_old_files(self) -> None:
         """Remove data files older than the configured retention period.
 
         Files are identified by their timestamp in the filename.
-        Files older than retention_days are deleted from the raw data directory.
+        Files older than retention_days are deleted from the raw data directory,
+        including partial downloads that were never completed. Only files of
+        the configured data types are considered, so loads of different data
+        types can clean up independently.
 
         Note:
             Files with invalid naming patterns are logged but not deleted.
@@ -105,11 +377,17 @@ class CovidDataIngestion:
         # Calculate the cutoff date based on retention period
         retention_delta = timedelta(days=self.config.retention_days)
 
-        # Check all CSV files in the raw data directory
-        for file in self.config.raw_data_path.glob("*.csv"):
+        # Check the CSV files (and leftover partial downloads) of each data type
+        files = []
+        for data_type in self.config.data_types:
+            files += list(self.config.raw_data_path.glob(f"{data_type}_*.csv"))
+            files += list(self.config.raw_data_path.glob(f"{data_type}_*.csv.part*"))
+        for file in files:
             try:
-                # Extract date from filename (expects format: type_YYYYMMDD.csv)
-                file_date = datetime.strptime(file.stem.split('_')[1], '%Y%m%d')
+                # Extract date from filename (expects format: type_YYYYMMDD.csv[.part])
+                file_date = datetime.strptime(
+                    file.name.split('.')[0].split('_')[1], '%Y%m%d'
+                )
 
                 # Delete file if it's older than retention period
                 if datetime.now() - file_date > retention_delta:
@@ -120,7 +398,9 @@ class CovidDataIngestion:
                     f"Could not parse date from filename {file}: {str(e)}"
                 )
 
-    def load_to_duckdb(self) -> None:
+    def load_to_duckdb(
+        self, date_range: Optional[Tuple[datetime, datetime]] = None
+    ) -> List[str]:
         """Load the downloaded data into DuckDB database.
 
         Process:
@@ -129,12 +409,66 @@ class CovidDataIngestion:
         3. Cleans and transforms the data
         4. Creates or replaces tables in DuckDB
 
+        With ingestion_mode 'pandas' steps 1-3 run in Python, one worker per
+        data type (see process_all and max_processing_workers), and the
+        finished frames are written over a single DuckDB connection as they
+        complete. With 'sql' DuckDB reads, cleans and unpivots each file itself
+        (see load_time_series_sql) and produces identical tables.
+
+        With load_mode 'incremental', tables that were loaded before are not
+        rebuilt: only the dates from revision_window_days before the table's
+        watermark are read and merged in (see _load_incrementally). Every load
+        records the table's watermark in the _load_watermarks table.
+
+        With parquet_path set, the months of each table changed by the load
+        are also written to the Parquet landing zone (see export_to_parquet).
+
+        The wall time, CPU time, peak memory and counters of every stage are
+        recorded in the metrics attribute and handed to the collectors (see
+        StageMetrics).
+
+        With use_snapshots, the tables are written to the shadow snapshot
+        (a copy of the current one, see SnapshotStore) and readers of db_path
+        see none of it until publish_snapshot is called, typically once dbt
+        has built the models on top of it.
+
+        With rolling_windows set, the rolling metrics table is brought up to
+        date once the tables are written (see _update_rolling_metrics).
+
+        With a date_range, only the date columns inside it are read and the
+        rows of those dates are replaced, whatever the load_mode (see
+        _load_date_range). Rows of other dates are left untouched, so loads of
+        different ranges can run one after another in any order, e.g. the
+        daily partitions of a backfill. With load_mode 'incremental', a range
+        reaching the latest date of the file is widened back to the revision
+        window of the table (see _range_to_load), so the daily run of the
+        latest partition also picks up upstream revisions of earlier days.
+
         Tables created:
         - raw_confirmed: Daily confirmed cases
         - raw_deaths: Daily death counts
         - raw_recovered: Daily recovery counts
+        - dim_location: One row per (country, province) with its coordinates;
+          the raw tables reference it by location_id (see upsert_locations)
+
+        Every raw file is fingerprinted (SHA-256 hash, size, row and column
+        counts, see fingerprint_file) and each whole load records the
+        fingerprint of its file in the _load_manifest table, each range load
+        in the _load_manifest_ranges table along with its range. With
+        skip_unchanged_files, a data type whose latest file has the
+        fingerprint its table, or a range load covering the date_range, was
+        loaded from is skipped and reported in skipped_files, e.g. on a
+        same-day rerun of a partition or after a 304 Not Modified.
+
+        Args:
+            date_range: First date and the date to stop before (exclusive) of
+                the dates to load, or None to load according to load_mode
+
+        Returns:
+            List[str]: Data types that were loaded (empty if all were skipped)
 
         Raises:
+            ValueError: If the configured ingestion or load mode is unknown
             Exception: If any step in the process fails
         """
         self.logger.info("Starting data load to DuckDB")
@@ -142,40 +476,669 @@ class CovidDataIngestion:
         # Create directory for DuckDB file if it doesn't exist
         Path(self.config.db_path).parent.mkdir(parents=True, exist_ok=True)
 
+        if self.config.ingestion_mode not in INGESTION_MODES:
+            error_msg = (
+                f"Unknown ingestion mode '{self.config.ingestion_mode}', "
+                f"expected one of {INGESTION_MODES}"
+            )
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        if self.config.processing_pool not in PROCESSING_POOLS:
+            error_msg = (
+                f"Unknown processing pool '{self.config.processing_pool}', "
+                f"expected one of {PROCESSING_POOLS}"
+            )
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        if self.config.load_mode not in LOAD_MODES:
+            error_msg = (
+                f"Unknown load mode '{self.config.load_mode}', "
+                f"expected one of {LOAD_MODES}"
+            )
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+
         try:
-            # Initialize DuckDB connection
-            conn = duckdb.connect(self.config.db_path)
-
-            # Process each type of data (confirmed, deaths, recovered)
-            for data_type in self.config.data_types.keys():
-                # Find the most recent file for this data type
-                latest_file = max(self.config.raw_data_path.glob(f"{data_type}_*.csv"))
-                self.logger.info(f"Processing {latest_file}")
-
-                # Load and validate the data
-                df = pd.read_csv(latest_file)
-                validate_data(df, data_type, self.logger)
-
-                # Apply cleaning and transformation steps
-                df = clean_data(df, self.logger)
-                transformed_df = transform_time_series(df, data_type, self.logger)
-
-                # Update or create the table in DuckDB
-                table_name = f"raw_{data_type}"
-                # Register DataFrame explicitly with DuckDB
-                conn.register('transformed_data_view', transformed_df)
-                conn.execute(f"DROP TABLE IF EXISTS {table_name}")
-                conn.execute(
-                    f"CREATE TABLE {table_name} AS SELECT * FROM transformed_data_view"
-                )
-                self.logger.info(
-                    f"Successfully loaded {data_type} data into {table_name}"
-                )
+            # Work out what to read for each type of data (confirmed, deaths,
+            # recovered); the connection is released before the slow stages so
+            # loads running in other processes can use the database meanwhile
+            conn = self._connect()
+            try:
+                tasks: Dict[str, ProcessingTask] = {}
+                watermarks: Dict[str, Optional[datetime]] = {}
+                load_ranges: Dict[str, Tuple[datetime, datetime]] = {}
+                fingerprints: Dict[str, FileFingerprint] = {}
+                skipped_files: Dict[str, Path] = {}
+                for data_type in self.config.data_types:
+                    # Find the most recent file for this data type
+                    latest_file = max(
+                        self.config.raw_data_path.glob(f"{data_type}_*.csv")
+                    )
+                    self.logger.info(f"Processing {latest_file}")
+                    fingerprint = self._fingerprint(data_type, latest_file)
+                    fingerprints[data_type] = fingerprint
+                    table_name = f"raw_{data_type}"
+                    load_range = (
+                        self._range_to_load(conn, table_name, latest_file, date_range)
+                        if date_range is not None
+                        else None
+                    )
 
-            # Clean up resources
-            conn.close()
+                    # A table loaded in full from the file holds every range of it
+                    loaded_fingerprint = get_loaded_fingerprint(conn, table_name)
+                    if load_range is not None and loaded_fingerprint != fingerprint:
+                        loaded_fingerprint = get_loaded_range_fingerprint(
+                            conn, table_name, load_range
+                        )
+                    if self.config.skip_unchanged_files and loaded_fingerprint == fingerprint:
+                        self.logger.info(
+                            f"{data_type} data unchanged since its last load "
+                            f"({latest_file.name}, sha256 {fingerprint.content_hash[:12]}), "
+                            f"skipping"
+                        )
+                        skipped_files[data_type] = latest_file
+                        continue
+
+                    if load_range is not None:
+                        # Files without a date of the range have nothing to load
+                        date_columns = self._date_columns_in_range(latest_file, load_range)
+                        if date_columns:
+                            tasks[data_type] = ProcessingTask(
+                                data_type, latest_file, date_columns
+                            )
+                            load_ranges[data_type] = load_range
+                        continue
+
+                    watermark = None
+                    if self.config.load_mode == 'incremental':
+                        watermark = get_watermark(conn, table_name)
+                    watermarks[data_type] = watermark
+                    tasks[data_type] = ProcessingTask(
+                        data_type,
+                        latest_file,
+                        self._date_columns_to_load(latest_file, watermark),
+                    )
+            finally:
+                conn.close()
+
+            # Frames are processed in parallel and written over one connection,
+            # opened when the first frame is ready
+            conn = None
+            load_modes: Dict[str, str] = {}
+            stage_timings: Dict[str, Dict[str, float]] = {}
+            memory_footprint: Dict[str, int] = {}
+            try:
+                for data_type, processed in self._process_tasks(list(tasks.values())):
+                    task = tasks[data_type]
+                    table_name = f"raw_{data_type}"
+                    frame = processed.frame if processed is not None else None
+                    stage_metrics = list(processed.metrics) if processed is not None else []
+
+                    # DuckDB does the writing in its own threads
+                    with measure_stage(data_type, 'write', time.process_time) as write:
+                        if conn is None:
+                            conn = self._connect()
+                        fingerprint = fingerprints[data_type]
+                        load_range = load_ranges.get(data_type)
+                        if get_loaded_fingerprint(conn, table_name) != fingerprint:
+                            # The table no longer matches the file it was
+                            # loaded from, until this load records its own
+                            forget_load(conn, table_name)
+                        # Nor do the ranges this load replaces
+                        forget_ranges(conn, table_name, load_range)
+                        if load_range is not None:
+                            rows_loaded = self._load_date_range(
+                                conn, task, table_name, load_range, frame
+                            )
+                            load_modes[data_type] = 'range'
+                        elif watermarks[data_type] is None:
+                            # Full rebuild: first load, or incremental loading disabled
+                            self._load_table(
+                                conn, task.path, data_type, table_name, frame=frame
+                            )
+                            rows_loaded = conn.execute(
+                                f"SELECT count(*) FROM {table_name}"
+                            ).fetchone()[0]
+                            set_watermark(conn, table_name, str(task.path), rows_loaded, 0)
+                            load_modes[data_type] = 'full'
+                        else:
+                            rows_loaded = self._load_incrementally(
+                                conn, task, table_name, watermarks[data_type], frame
+                            )
+                            load_modes[data_type] = 'incremental'
+                        if load_range is None:
+                            # Only a whole load makes the table match the file
+                            record_load(conn, table_name, str(task.path), fingerprint)
+                        else:
+                            record_range_load(
+                                conn, table_name, load_range, str(task.path), fingerprint
+                            )
+                        write.counters['rows_loaded'] = rows_loaded
+                    stage_metrics.append(write)
+
+                    if self.config.parquet_path is not None:
+                        # Written while holding the database, so concurrent
+                        # loads of the same data type export in turn
+                        with measure_stage(data_type, 'export', time.process_time) as export:
+                            export.counters['months_exported'] = self._export_to_parquet(
+                                conn, task, table_name, load_range
+                            )
+                        stage_metrics.append(export)
+
+                    for metrics in stage_metrics:
+                        self._record_metrics(metrics)
+                    timings = {metrics.stage: metrics.wall_seconds for metrics in stage_metrics}
+                    stage_timings[data_type] = timings
+                    if processed is not None:
+                        memory_footprint[data_type] = processed.memory_bytes
+                    self._log_timings(data_type, timings, processed)
+
+                if conn is not None and self.config.rolling_windows:
+                    # From the earliest date a range load replaced, or every
+                    # day after a full load
+                    self._update_rolling_metrics(
+                        conn,
+                        min(load_ranges.values()) if load_ranges else None,
+                        full_refresh='full' in load_modes.values(),
+                    )
+            finally:
+                # Clean up resources
+                if conn is not None:
+                    conn.close()
+
+            self.load_modes = load_modes
+            self.load_ranges = load_ranges
+            self.skipped_files = skipped_files
+            self.stage_timings = stage_timings
+            self.memory_footprint = memory_footprint
             self.logger.info("Data load completed successfully")
+            return list(tasks)
 
         except Exception as e:
             self.logger.error(f"Error loading data to DuckDB: {str(e)}")
             raise
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        """Open the DuckDB database, waiting while another process holds it.
+
+        DuckDB allows a single read-write process per database file, so loads
+        running in parallel processes (one Dagster asset per data type) take
+        turns. The wait is retried with exponential backoff for up to
+        db_lock_timeout_seconds. With use_snapshots, the shadow snapshot is
+        opened, created from the current snapshot if no build is pending.
+
+        Returns:
+            duckdb.DuckDBPyConnection: Open read-write connection
+
+        Raises:
+            duckdb.IOException: If the lock is still held after the timeout, or
+                the database cannot be opened for another reason
+            TimeoutError: If the snapshots stay locked past the timeout
+        """
+        deadline = time.monotonic() + self.config.db_lock_timeout_seconds
+        delay = 0.1
+        while True:
+            try:
+                if self.snapshots is None:
+                    return duckdb.connect(self.config.db_path)
+                # Opened holding the snapshot lock, so the shadow cannot be
+                # published between finding and opening it
+                with self.snapshots.shadow() as shadow_path:
+                    return duckdb.connect(str(shadow_path))
+            except duckdb.IOException as e:
+                if 'lock' not in str(e).lower() or time.monotonic() + delay > deadline:
+                    raise
+                self.logger.info(
+                    f"Database {self.database_path} is locked by another process, "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, 5.0)
+
+    def _update_rolling_metrics(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+        full_refresh: bool = False,
+    ) -> int:
+        """Update the moving averages and growth rates after a load.
+
+        Only the days a load can have changed are recomputed: the last
+        revision_window_days, from the start of the date_range of a range
+        load, or every day after a full load (see update_rolling_metrics).
+        Nothing is computed until the three raw tables are loaded.
+
+        Args:
+            conn: Open DuckDB connection holding the raw tables
+            date_range: Range of a range load, None otherwise
+            full_refresh: Whether a table was fully reloaded
+
+        Returns:
+            int: Number of rows of the rolling metrics table rewritten
+        """
+        with measure_stage('rolling_metrics', 'update', time.process_time) as metrics:
+            rows = update_rolling_metrics(
+                conn,
+                windows=self.config.rolling_windows,
+                since=date_range[0].date() if date_range is not None else None,
+                lookback_days=self.config.revision_window_days,
+                full_refresh=full_refresh,
+            )
+            metrics.counters['rows_written'] = rows
+        self._record_metrics(metrics)
+        self.logger.info(
+            f"Updated {rows} rows of rolling metrics in {metrics.wall_seconds:.2f}s "
+            f"(windows {', '.join(map(str, self.config.rolling_windows))} days)"
+        )
+        return rows
+
+    def _date_columns_to_load(
+        self, path: Path, watermark: Optional[datetime]
+    ) -> Optional[List[str]]:
+        """Select the date columns to read from a raw file.
+
+        Args:
+            path: Raw file to load
+            watermark: Latest date already loaded into the table, None for a
+                full load
+
+        Returns:
+            Optional[List[str]]: Date columns from revision_window_days before
+                the watermark onwards, or None to read every date
+        """
+        if watermark is None:
+            return None
+
+        cutoff = revision_cutoff(watermark, self.config.revision_window_days)
+        date_columns = date_columns_since(read_header(path), cutoff)
+        self.logger.info(
+            f"Incremental load of {path.name}: watermark {watermark:%Y-%m-%d}, "
+            f"reading {len(date_columns)} date columns from {cutoff:%Y-%m-%d}"
+        )
+        return date_columns
+
+    def _range_to_load(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        table_name: str,
+        path: Path,
+        date_range: Tuple[datetime, datetime],
+    ) -> Tuple[datetime, datetime]:
+        """Select the dates a range load replaces.
+
+        With load_mode 'incremental', a range reaching the latest date of the
+        file (the run of the latest partition) starts no later than
+        revision_window_days before the table's watermark, like an
+        incremental load, so revisions of the days loaded before are
+        replaced too. Other ranges are loaded as they are.
+
+        Args:
+            conn: Open DuckDB connection
+            table_name: Raw table to load into
+            path: Raw file to load
+            date_range: First date and the date to stop before (exclusive)
+
+        Returns:
+            Tuple[datetime, datetime]: First date and the date to stop before
+                (exclusive) of the dates to replace
+        """
+        start, end = date_range
+        if self.config.load_mode != 'incremental':
+            return date_range
+        watermark = get_watermark(conn, table_name)
+        date_columns = date_columns_since(read_header(path), start)
+        if watermark is None or not date_columns:
+            return date_range
+        latest = datetime.strptime(date_columns[-1], DATE_FORMAT)
+        cutoff = revision_cutoff(watermark, self.config.revision_window_days)
+        if latest >= end or cutoff >= start:
+            return date_range
+
+        self.logger.info(
+            f"Range load of {path.name} reaches its latest date {latest:%Y-%m-%d}: "
+            f"replacing from {cutoff:%Y-%m-%d}, the revision window of {table_name}"
+        )
+        return cutoff, end
+
+    def _date_columns_in_range(
+        self, path: Path, date_range: Tuple[datetime, datetime]
+    ) -> List[str]:
+        """Select the date columns of a raw file inside a date range.
+
+        Args:
+            path: Raw file to load
+            date_range: First date and the date to stop before (exclusive)
+
+        Returns:
+            List[str]: Date columns inside the range, empty if the file has none
+        """
+        start, end = date_range
+        date_columns = date_columns_since(read_header(path), start, end)
+        self.logger.info(
+            f"Range load of {path.name}: reading {len(date_columns)} date columns "
+            f"from {start:%Y-%m-%d} to {end:%Y-%m-%d} (exclusive)"
+        )
+        return date_columns
+
+    def _export_to_parquet(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        task: ProcessingTask,
+        table_name: str,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ) -> int:
+        """Write the months of a raw table changed by a load to the landing zone.
+
+        dim_location is exported along with them (see export_locations).
+
+        Args:
+            conn: Open DuckDB connection holding the table
+            task: Raw file and the date columns that were loaded
+            table_name: Raw table that was loaded
+            date_range: Range of a range load, None otherwise
+
+        Returns:
+            int: Number of months written
+        """
+        if date_range is not None:
+            since, until = date_range
+        elif task.date_columns is None:
+            # Full load: the whole data type is rewritten
+            since, until = None, None
+        elif task.date_columns:
+            since = min(datetime.strptime(col, DATE_FORMAT) for col in task.date_columns)
+            until = None
+        else:
+            # Incremental load without any date to read
+            return 0
+
+        months = export_to_parquet(
+            conn, table_name, task.data_type, self.config.parquet_path, since, until
+        )
+        # The load may have added locations or revised their coordinates
+        export_locations(conn, self.config.parquet_path)
+        self.logger.info(
+            f"Exported {len(months)} months of {table_name} to {self.config.parquet_path}"
+        )
+        return len(months)
+
+    def _process_tasks(
+        self, tasks: List[ProcessingTask]
+    ) -> Iterator[Tuple[str, Optional[ProcessedFrame]]]:
+        """Run the read, validate_clean and reshape stages for every task.
+
+        In the pandas mode the data types are processed in a worker pool (see
+        process_all) and yielded as they finish. In the sql mode DuckDB does
+        this work itself while writing, so no frame is produced.
+
+        Args:
+            tasks: Raw files to process
+
+        Yields:
+            Tuple[str, Optional[ProcessedFrame]]: Data type and its processed
+                frame, or None in the sql mode
+        """
+        if self.config.ingestion_mode == 'sql':
+            for task in tasks:
+                yield task.data_type, None
+            return
+
+        max_workers = self.config.max_processing_workers
+        if max_workers is None:
+            max_workers = max(1, min(len(tasks), os.cpu_count() or 1))
+        for processed in process_all(
+            tasks, self.config.csv_reader, max_workers, self.config.processing_pool
+        ):
+            yield processed.data_type, processed
+
+    def _fingerprint(self, data_type: str, path: Path) -> FileFingerprint:
+        """Fingerprint the raw file of a data type and record the time it took.
+
+        Args:
+            data_type: Type of data the file holds
+            path: Raw file to fingerprint
+
+        Returns:
+            FileFingerprint: Hash, size and shape of the file
+        """
+        with measure_stage(data_type, 'fingerprint') as metrics:
+            fingerprint = fingerprint_file(path)
+            metrics.counters['file_bytes'] = fingerprint.file_size
+        self._record_metrics(metrics)
+        return fingerprint
+
+    def _record_metrics(self, metrics: StageMetrics) -> None:
+        """Hand the metrics of a stage to the metrics attribute and every collector.
+
+        Args:
+            metrics: Measurements of the stage that just ended
+        """
+        self.metrics.record(metrics)
+        for collector in self.collectors:
+            collector.record(metrics)
+
+    def _log_timings(
+        self,
+        data_type: str,
+        timings: Dict[str, float],
+        processed: Optional[ProcessedFrame],
+    ) -> None:
+        """Log the time spent in each stage of a data type's load and its frame size.
+
+        Args:
+            data_type: Type of data that was loaded
+            timings: Seconds spent in each stage, in stage order
+            processed: Worker output, None when DuckDB did all the work
+        """
+        stages = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items())
+        worker = ""
+        if processed is not None:
+            worker = (
+                f" (worker {processed.worker}, "
+                f"frame {processed.memory_bytes / (1024 * 1024):.1f} MiB)"
+            )
+        self.logger.info(
+            f"Loaded {data_type} in {sum(timings.values()):.3f}s{worker}: {stages}"
+        )
+
+    def _load_incrementally(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        task: ProcessingTask,
+        table_name: str,
+        watermark: datetime,
+        frame: Optional[pd.DataFrame] = None,
+    ) -> int:
+        """Merge the recent part of a raw file into an existing table.
+
+        Only the date columns from revision_window_days before the watermark
+        onwards (task.date_columns) are loaded into a staging table; new dates
+        are inserted and revised values updated in one transaction, and the
+        watermark moves to the latest loaded date.
+
+        Args:
+            conn: Open DuckDB connection holding the table
+            task: Raw file and the date columns to read from it
+            table_name: Raw table to merge into
+            watermark: Latest date already loaded into the table
+            frame: Processed frame of the recent dates in the pandas mode,
+                None in the sql mode
+
+        Returns:
+            int: Number of rows inserted or updated
+        """
+        staging_table = f"{table_name}_staging"
+        self._load_table(
+            conn,
+            task.path,
+            task.data_type,
+            staging_table,
+            task.date_columns,
+            temporary=True,
+            frame=frame,
+        )
+
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            inserted, updated = merge_staging(
+                conn, staging_table, table_name, task.data_type
+            )
+            new_watermark = set_watermark(
+                conn, table_name, str(task.path), inserted, updated
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute(f"DROP TABLE IF EXISTS {staging_table}")
+
+        self.logger.info(
+            f"Merged into {table_name} (watermark was {watermark:%Y-%m-%d}): "
+            f"{inserted} rows inserted, {updated} rows updated, "
+            f"watermark now {new_watermark:%Y-%m-%d}"
+        )
+        return inserted + updated
+
+    def _load_date_range(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        task: ProcessingTask,
+        table_name: str,
+        date_range: Tuple[datetime, datetime],
+        frame: Optional[pd.DataFrame] = None,
+    ) -> int:
+        """Replace the rows of a date range of a raw table.
+
+        The date columns of the range (task.date_columns) are loaded into a
+        staging table, then the range's rows are deleted and the staged rows
+        inserted in one transaction (see replace_date_range). The table is
+        created if this is its first load, and the watermark follows the
+        latest date of the table.
+
+        Args:
+            conn: Open DuckDB connection
+            task: Raw file and the date columns of the range
+            table_name: Raw table to load into
+            date_range: First date and the date to stop before (exclusive)
+            frame: Processed frame of the range in the pandas mode, None in
+                the sql mode
+
+        Returns:
+            int: Number of rows inserted
+        """
+        staging_table = f"{table_name}_staging"
+        self._load_table(
+            conn,
+            task.path,
+            task.data_type,
+            staging_table,
+            task.date_columns,
+            temporary=True,
+            frame=frame,
+        )
+
+        start, end = date_range
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            inserted, deleted = replace_date_range(
+                conn, staging_table, table_name, start, end
+            )
+            # Rows replaced by themselves count as updated
+            set_watermark(
+                conn, table_name, str(task.path),
+                max(inserted - deleted, 0), min(inserted, deleted),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute(f"DROP TABLE IF EXISTS {staging_table}")
+
+        self.logger.info(
+            f"Replaced {start:%Y-%m-%d} to {end:%Y-%m-%d} (exclusive) of {table_name}: "
+            f"{deleted} rows deleted, {inserted} rows inserted"
+        )
+        return inserted
+
+    def _load_table(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        path: Path,
+        data_type: str,
+        table_name: str,
+        date_columns: Optional[List[str]] = None,
+        temporary: bool = False,
+        frame: Optional[pd.DataFrame] = None,
+    ) -> None:
+        """Build a long-format table from a raw file with the configured mode.
+
+        Args:
+            conn: Open DuckDB connection to load into
+            path: Raw file to load
+            data_type: Type of data in the file (confirmed, deaths, recovered)
+            table_name: Name of the table to create or replace
+            date_columns: Date columns to load, all of them if None
+            temporary: Create a temporary table (used for incremental staging)
+            frame: Frame already processed by a worker (pandas mode); if None
+                in the pandas mode, the file is processed here
+        """
+        if self.config.ingestion_mode == 'sql':
+            # DuckDB reads, cleans and unpivots the file by itself
+            load_time_series_sql(
+                conn, path, data_type, table_name, self.logger, date_columns, temporary
+            )
+            return
+
+        if frame is None:
+            task = ProcessingTask(data_type, path, date_columns)
+            frame = process_time_series(task, self.config.csv_reader).frame
+        self._write_frame(conn, frame, data_type, table_name, temporary)
+
+    def _write_frame(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        frame: pd.DataFrame,
+        data_type: str,
+        table_name: str,
+        temporary: bool = False,
+    ) -> None:
+        """Write a processed long-format frame to DuckDB.
+
+        New locations of the frame are added to dim_location first (see
+        upsert_locations), then the table is written with their location_id.
+
+        Args:
+            conn: Open DuckDB connection to load into
+            frame: Cleaned, long-format frame
+            data_type: Type of data in the frame (confirmed, deaths, recovered)
+            table_name: Name of the table to create or replace
+            temporary: Create a temporary table (used for incremental staging)
+
+        Raises:
+            ValueError: If a value does not fit its storage type (see
+                raw_table_schema), e.g. a count beyond the INTEGER range
+        """
+        # Update or create the table in DuckDB
+        # Register DataFrame explicitly with DuckDB
+        conn.register('transformed_data_view', frame)
+        table_kind = "TEMP TABLE" if temporary else "TABLE"
+        try:
+            # Locations are stored once in dim_location, the table only keeps
+            # their key; timestamps and int32 or float64 counts are in-memory
+            # encodings only, the table has the declared types
+            upsert_locations(conn, 'transformed_data_view', data_type)
+            conn.execute(
+                f"""CREATE OR REPLACE {table_kind} {table_name} AS
+                {cast_to_storage_schema(with_location_ids('transformed_data_view'), data_type)}"""
+            )
+        except duckdb.ConversionException as e:
+            error_msg = f"{data_type} data does not fit the storage schema: {e}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        finally:
+            conn.unregister('transformed_data_view')
+        self.logger.info(
+            f"Successfully loaded {data_type} data into {table_name}"
+        )
@@ -0,0 +1,434 @@
+# Global imports
+import requests
+from requests.adapters import HTTPAdapter
+
+# Built-in imports
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import logging
+import os
+import time
+
+# Local imports
+from ..config.ingestion_config import IngestionConfig
+from .fetch_metadata import FetchMetadata
+
+
+# HTTP status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of downloading a single data file.
+
+    Attributes:
+        data_type: Data type the file belongs to (confirmed, deaths, recovered)
+        url: Source URL the file was fetched from
+        path: Local path the file was written to
+        bytes_downloaded: Number of body bytes received by the attempt that
+            completed the file (bytes resumed from a partial file are excluded)
+        elapsed_seconds: Wall time spent on the download, including retries
+        attempts: Number of HTTP attempts needed (1 means no retries)
+        changed: False if the server answered 304 Not Modified or the content
+            hash matches the previous fetch
+        content_length: Size of the local copy in bytes
+        content_hash: SHA-256 hex digest of the local copy
+        etag: ETag header returned by the server, if any
+        last_modified: Last-Modified header returned by the server, if any
+        max_chunk_bytes: Largest chunk of the response body read at once,
+            bounded by the configured chunk size; the transfer streams
+            chunk by chunk to disk, so the body is never held whole
+    """
+
+    data_type: str
+    url: str
+    path: Path
+    bytes_downloaded: int
+    elapsed_seconds: float
+    attempts: int
+    changed: bool = True
+    content_length: int = 0
+    content_hash: str = ''
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    max_chunk_bytes: int = 0
+
+
+class DataDownloader:
+    """Concurrent HTTP download engine for the JHU data files.
+
+    All requests share a single pooled ``requests.Session`` so connections to
+    the upstream host are reused, and files are fetched in parallel by a thread
+    pool. Total wall time is therefore bounded by the slowest file instead of
+    the sum of all files.
+
+    Response bodies are streamed to disk in fixed-size chunks, so peak memory
+    per download stays constant regardless of file size. Transient failures
+    (connection errors, truncated bodies, timeouts, 429 and 5xx responses) are
+    retried with exponential backoff, resuming partial files with Range
+    requests. Other HTTP errors fail immediately.
+
+    When metadata from a previous fetch is supplied, requests are made
+    conditional (If-None-Match / If-Modified-Since) and a 304 response
+    short-circuits the download, leaving the previous copy in place.
+
+    Attributes:
+        config (IngestionConfig): Settings for concurrency, timeouts and retries
+        logger (logging.Logger): Logger used to report progress and failures
+        session (requests.Session): Pooled session shared by all downloads
+
+    Example:
+        >>> downloader = DataDownloader(config, logger)
+        >>> results = downloader.download_all(
+        ...     {'confirmed': ('https://.../confirmed.csv', Path('confirmed.csv'))}
+        ... )
+        >>> downloader.close()
+    """
+
+    def __init__(self, config: IngestionConfig, logger: logging.Logger):
+        """Initialize the downloader and its connection pool.
+
+        Args:
+            config: Ingestion configuration with download settings
+            logger: Logger instance for recording download steps
+        """
+        self.config = config
+        self.logger = logger
+
+        # Size the connection pool to the number of concurrent downloads so
+        # that no worker has to wait for (or discard) a pooled connection
+        pool_size = max(1, config.max_concurrent_downloads)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def download_all(
+        self,
+        targets: Dict[str, Tuple[str, Path]],
+        previous: Optional[Dict[str, FetchMetadata]] = None,
+        missing_ok: bool = False,
+    ) -> Dict[str, DownloadResult]:
+        """Download several files concurrently.
+
+        Args:
+            targets: Mapping of data type to a ``(url, output_path)`` tuple
+            previous: Optional metadata from earlier fetches, keyed by data type,
+                used to make conditional requests
+            missing_ok: Leave out the files upstream answers 404 Not Found
+                for instead of failing, e.g. a daily report not published yet
+
+        Returns:
+            Dict[str, DownloadResult]: Download outcome for each data type
+                (but the missing ones)
+
+        Raises:
+            RequestException: If any download fails after all retries
+        """
+        results: Dict[str, DownloadResult] = {}
+        previous = previous or {}
+        workers = max(1, min(self.config.max_concurrent_downloads, len(targets)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.download, data_type, url, output_path, previous.get(data_type)
+                ): data_type
+                for data_type, (url, output_path) in targets.items()
+            }
+            for future in as_completed(futures):
+                data_type = futures[future]
+                try:
+                    results[data_type] = future.result()
+                except requests.exceptions.RequestException as e:
+                    if missing_ok and self._is_not_found(e):
+                        self.logger.info(
+                            f"No {data_type} data published at {targets[data_type][0]}"
+                        )
+                        continue
+                    self.logger.error(f"Failed to download {data_type} data: {str(e)}")
+                    # Do not start downloads that are still queued
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+
+        return results
+
+    def download(
+        self,
+        data_type: str,
+        url: str,
+        output_path: Path,
+        previous: Optional[FetchMetadata] = None,
+    ) -> DownloadResult:
+        """Download a single file, retrying transient failures with backoff.
+
+        The response body is streamed to ``<output_path>.part`` in chunks of
+        ``download_chunk_size`` bytes and renamed to ``output_path`` only once it
+        is complete, so memory use does not grow with the file size and readers
+        never see a half-written file. If a transfer is interrupted, the next
+        attempt (or the next run) resumes the partial file with an HTTP Range
+        request guarded by If-Range.
+
+        Args:
+            data_type: Data type being downloaded, used for logging
+            url: URL of the file to fetch
+            output_path: Local path to write the file to
+            previous: Optional metadata from the last fetch of this file. Its
+                validators are sent as conditional request headers
+
+        Returns:
+            DownloadResult: Outcome of the download
+
+        Raises:
+            RequestException: If the download fails after all retries, or on a
+                non-retryable HTTP error
+        """
+        start_time = time.perf_counter()
+        max_attempts = self.config.max_retries + 1
+
+        for attempt in range(1, max_attempts + 1):
+            self.logger.info(
+                f"Downloading {data_type} data from {url} (attempt {attempt})"
+            )
+            try:
+                result = self._fetch(data_type, url, output_path, previous)
+                result.attempts = attempt
+                result.elapsed_seconds = time.perf_counter() - start_time
+                return result
+
+            except requests.exceptions.RequestException as e:
+                if attempt == max_attempts or not self._is_retryable(e):
+                    raise
+
+                # Exponential backoff: base, 2 * base, 4 * base, ...
+                delay = self.config.retry_backoff_seconds * 2 ** (attempt - 1)
+                self.logger.warning(
+                    f"Download of {data_type} data failed ({str(e)}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+        # Unreachable: the loop either returns or raises
+        raise RuntimeError(f"Download of {data_type} data did not complete")
+
+    def _fetch(
+        self,
+        data_type: str,
+        url: str,
+        output_path: Path,
+        previous: Optional[FetchMetadata],
+    ) -> DownloadResult:
+        """Perform one download attempt, resuming a partial file if possible.
+
+        Args:
+            data_type: Data type being downloaded, used for logging
+            url: URL of the file to fetch
+            output_path: Local path to write the file to
+            previous: Optional metadata from the last fetch of this file
+
+        Returns:
+            DownloadResult: Outcome of the attempt (attempts and elapsed time
+                are filled in by the caller)
+
+        Raises:
+            RequestException: If the request fails or the body is truncated
+        """
+        part_path = output_path.with_name(output_path.name + '.part')
+        validator_path = output_path.with_name(output_path.name + '.part.validator')
+
+        # Byte ranges must refer to the file as stored, so ask for no content
+        # encoding; this also makes Content-Length match the bytes written
+        headers = self._conditional_headers(previous)
+        headers['Accept-Encoding'] = 'identity'
+
+        # Resume only when we know which version of the file the partial
+        # copy belongs to; If-Range makes the server send the full file if
+        # it has changed since
+        resume_from = part_path.stat().st_size if part_path.exists() else 0
+        if resume_from and validator_path.exists():
+            headers['Range'] = f'bytes={resume_from}-'
+            headers['If-Range'] = validator_path.read_text()
+        else:
+            resume_from = 0
+
+        with self.session.get(
+            url,
+            headers=headers,
+            stream=True,
+            timeout=self.config.request_timeout_seconds,
+        ) as response:
+            # The partial copy is as long as the file upstream or longer (it
+            # shrank): retrying the range would fail again on every run, so
+            # discard the partial copy and download the whole file
+            if response.status_code == 416 and resume_from:
+                self.logger.warning(
+                    f"Range not satisfiable for {data_type} data at byte "
+                    f"{resume_from}, restarting the download"
+                )
+                response.close()
+                part_path.unlink(missing_ok=True)
+                validator_path.unlink(missing_ok=True)
+                return self._fetch(data_type, url, output_path, previous)
+
+            response.raise_for_status()
+
+            # Upstream has not changed since the last fetch: keep the old copy
+            if response.status_code == 304 and previous is not None:
+                self.logger.info(
+                    f"{data_type} data not modified since {previous.fetched_at}, "
+                    f"keeping {previous.path}"
+                )
+                part_path.unlink(missing_ok=True)
+                validator_path.unlink(missing_ok=True)
+                return DownloadResult(
+                    data_type=data_type,
+                    url=url,
+                    path=Path(previous.path),
+                    bytes_downloaded=0,
+                    elapsed_seconds=0.0,
+                    attempts=1,
+                    changed=False,
+                    content_length=previous.content_length,
+                    content_hash=previous.content_hash,
+                    etag=response.headers.get('ETag', previous.etag),
+                    last_modified=response.headers.get(
+                        'Last-Modified', previous.last_modified
+                    ),
+                )
+
+            # 206 continues the partial file, anything else starts over
+            if response.status_code != 206:
+                resume_from = 0
+            else:
+                self.logger.info(
+                    f"Resuming {data_type} download at byte {resume_from}"
+                )
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            validator = etag or last_modified
+            if validator:
+                validator_path.write_text(validator)
+            else:
+                validator_path.unlink(missing_ok=True)
+
+            # The content hash covers the whole file, including resumed bytes
+            hasher = hashlib.sha256()
+            if resume_from:
+                self._hash_file(part_path, hasher)
+
+            bytes_downloaded = 0
+            max_chunk_bytes = 0
+            with open(part_path, 'ab' if resume_from else 'wb') as f:
+                for chunk in response.iter_content(
+                    chunk_size=self.config.download_chunk_size
+                ):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    bytes_downloaded += len(chunk)
+                    max_chunk_bytes = max(max_chunk_bytes, len(chunk))
+
+            # Guard against connections that close early without an error
+            expected_length = response.headers.get('Content-Length')
+            if expected_length is not None and bytes_downloaded != int(expected_length):
+                raise requests.exceptions.ConnectionError(
+                    f"Incomplete download of {data_type} data: received "
+                    f"{bytes_downloaded} of {expected_length} bytes"
+                )
+
+        # Publish the finished file atomically
+        os.replace(part_path, output_path)
+        validator_path.unlink(missing_ok=True)
+
+        # Servers without validators still get a change check by hash
+        content_hash = hasher.hexdigest()
+        content_length = resume_from + bytes_downloaded
+        self.logger.info(
+            f"Successfully downloaded {data_type} data to {output_path} "
+            f"({content_length} bytes, largest chunk {max_chunk_bytes} bytes)"
+        )
+        return DownloadResult(
+            data_type=data_type,
+            url=url,
+            path=output_path,
+            bytes_downloaded=bytes_downloaded,
+            elapsed_seconds=0.0,
+            attempts=1,
+            changed=previous is None or previous.content_hash != content_hash,
+            content_length=content_length,
+            content_hash=content_hash,
+            etag=etag,
+            last_modified=last_modified,
+            max_chunk_bytes=max_chunk_bytes,
+        )
+
+    def _hash_file(self, path: Path, hasher: Any) -> None:
+        """Feed an existing file into a hash in fixed-size chunks.
+
+        Args:
+            path: File to hash
+            hasher: hashlib hash object to update
+        """
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.config.download_chunk_size), b''):
+                hasher.update(chunk)
+
+    def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        self.session.close()
+
+    @staticmethod
+    def _conditional_headers(previous: Optional[FetchMetadata]) -> Dict[str, str]:
+        """Build conditional request headers from a previous fetch.
+
+        Args:
+            previous: Metadata from the last fetch, or None
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers, if known
+        """
+        headers: Dict[str, str] = {}
+        if previous is None:
+            return headers
+        if previous.etag:
+            headers['If-None-Match'] = previous.etag
+        if previous.last_modified:
+            headers['If-Modified-Since'] = previous.last_modified
+        return headers
+
+    @staticmethod
+    def _is_not_found(error: requests.exceptions.RequestException) -> bool:
+        """Check whether a failed request was answered 404 Not Found."""
+        return (
+            isinstance(error, requests.exceptions.HTTPError)
+            and error.response is not None
+            and error.response.status_code == 404
+        )
+
+    @staticmethod
+    def _is_retryable(error: requests.exceptions.RequestException) -> bool:
+        """Check whether a failed request is worth retrying.
+
+        Args:
+            error: Exception raised by the request
+
+        Returns:
+            bool: True for connection errors, truncated bodies, timeouts, 429 and
+                5xx responses
+        """
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(
+            error,
+            (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout,
+            ),
+        )
@@ -0,0 +1,126 @@
+# Built-in imports
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where saves are not serialized
+    fcntl = None
+
+
+@dataclass
+class FetchMetadata:
+    """HTTP validators and fingerprint of the last fetched copy of a data file.
+
+    Attributes:
+        url: Source URL the file was fetched from
+        path: Local path of the downloaded copy
+        etag: ETag header returned by the server, if any
+        last_modified: Last-Modified header returned by the server, if any
+        content_length: Size of the file in bytes
+        content_hash: SHA-256 hex digest of the file content
+        fetched_at: ISO timestamp of the last successful fetch
+    """
+
+    url: str
+    path: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_length: int
+    content_hash: str
+    fetched_at: str
+
+
+class FetchMetadataStore:
+    """Persistent JSON store of fetch metadata, keyed by data type.
+
+    The store lives next to the raw data files and lets later runs send
+    conditional requests (If-None-Match / If-Modified-Since) and keep the
+    previous copy of data that has not changed upstream.
+
+    Several processes may share the store (one per data type when the Dagster
+    assets run in parallel), so save() only writes the entries set through
+    this instance, merging them into the current file under a file lock.
+
+    Attributes:
+        path (Path): Location of the JSON file backing the store
+
+    Example:
+        >>> store = FetchMetadataStore(Path('data/raw/fetch_metadata.json'))
+        >>> previous = store.get('confirmed')
+        >>> store.set('confirmed', metadata)
+        >>> store.save()
+    """
+
+    def __init__(self, path: Path):
+        """Load the store from disk, starting empty if the file does not exist.
+
+        Args:
+            path: Location of the JSON file backing the store
+        """
+        self.path = path
+        self._entries: Dict[str, FetchMetadata] = self._read()
+        # Data types set through this instance, the only ones save() writes
+        self._updated: Set[str] = set()
+
+    def get(self, data_type: str) -> Optional[FetchMetadata]:
+        """Return the stored metadata for a data type, if any."""
+        return self._entries.get(data_type)
+
+    def set(self, data_type: str, metadata: FetchMetadata) -> None:
+        """Record metadata for a data type (call save() to persist it)."""
+        self._entries[data_type] = metadata
+        self._updated.add(data_type)
+
+    def save(self) -> None:
+        """Write the entries set through this instance to disk atomically.
+
+        Entries written by other processes since this store was loaded are
+        kept rather than overwritten with the stale copies held here.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._locked():
+            entries = self._read()
+            entries.update({data_type: self._entries[data_type] for data_type in self._updated})
+
+            # Write to a temporary file first so a crash never leaves a
+            # half-written store behind
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(
+                    {data_type: asdict(entry) for data_type, entry in entries.items()},
+                    f,
+                    indent=2,
+                )
+            os.replace(tmp_path, self.path)
+
+        self._entries = entries
+        self._updated.clear()
+
+    def _read(self) -> Dict[str, FetchMetadata]:
+        """Load the entries currently on disk (none if the file does not exist)."""
+        if not self.path.exists():
+            return {}
+        with open(self.path) as f:
+            raw_entries = json.load(f)
+        return {
+            data_type: FetchMetadata(**entry) for data_type, entry in raw_entries.items()
+        }
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the store while reading and rewriting it."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_suffix(self.path.suffix + '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
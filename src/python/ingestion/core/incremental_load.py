@@ -0,0 +1,226 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# Local imports
+from ..utils.data_transformation import DATE_FORMAT, ID_COLUMNS
+
+
+# Table recording how far each raw table has been loaded
+WATERMARK_TABLE = '_load_watermarks'
+# Columns identifying a row of a raw table
+KEY_COLUMNS = ['location_id', 'date']
+
+
+def ensure_watermark_table(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the watermark table if it does not exist yet.
+
+    Args:
+        conn: Open DuckDB connection
+    """
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (
+            table_name VARCHAR PRIMARY KEY,
+            max_date TIMESTAMP_NS,
+            source_file VARCHAR,
+            rows_inserted BIGINT,
+            rows_updated BIGINT,
+            loaded_at TIMESTAMP
+        )"""
+    )
+
+
+def get_watermark(
+    conn: duckdb.DuckDBPyConnection, table_name: str
+) -> Optional[datetime]:
+    """Return the latest date loaded into a table, if it was loaded before.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table
+
+    Returns:
+        Optional[datetime]: Watermark of the table, or None if the table has
+            no watermark or no longer exists
+    """
+    ensure_watermark_table(conn)
+    table_exists = conn.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name = ?",
+        [table_name],
+    ).fetchone()[0]
+    if not table_exists:
+        return None
+
+    row = conn.execute(
+        f"SELECT max_date FROM {WATERMARK_TABLE} WHERE table_name = ?", [table_name]
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set_watermark(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    source_file: str,
+    rows_inserted: int,
+    rows_updated: int,
+) -> datetime:
+    """Record the latest date of a table after a load.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table that was loaded
+        source_file: Raw file the load read from
+        rows_inserted: Number of rows added by the load
+        rows_updated: Number of existing rows revised by the load
+
+    Returns:
+        datetime: The new watermark
+    """
+    ensure_watermark_table(conn)
+    max_date = conn.execute(f"SELECT max(date) FROM {table_name}").fetchone()[0]
+    conn.execute(
+        f"INSERT OR REPLACE INTO {WATERMARK_TABLE} VALUES (?, ?, ?, ?, ?, ?)",
+        [table_name, max_date, source_file, rows_inserted, rows_updated, datetime.now()],
+    )
+    return max_date
+
+
+def date_columns_since(
+    columns: List[str], since: datetime, until: Optional[datetime] = None
+) -> List[str]:
+    """Select the date columns of a wide file on or after a given date.
+
+    Only the header is parsed, so this is cheap regardless of file size.
+
+    Args:
+        columns: Column names of the wide file, in file order
+        since: First date to keep
+        until: Date to stop before (exclusive), no upper bound if None
+
+    Returns:
+        List[str]: Date column names on or after since (and before until),
+            in file order
+
+    Example:
+        >>> date_columns_since(['Lat', '1/22/20', '1/23/20'], datetime(2020, 1, 23))
+        ['1/23/20']
+    """
+    return [
+        col for col in columns
+        if col not in ID_COLUMNS
+        and since <= datetime.strptime(col, DATE_FORMAT)
+        and (until is None or datetime.strptime(col, DATE_FORMAT) < until)
+    ]
+
+
+def revision_cutoff(watermark: datetime, revision_window_days: int) -> datetime:
+    """First date that is re-read from the source on an incremental load.
+
+    Args:
+        watermark: Latest date already loaded
+        revision_window_days: Number of days before the watermark whose
+            values may still be revised upstream
+
+    Returns:
+        datetime: Cutoff date (inclusive)
+    """
+    return watermark - timedelta(days=revision_window_days)
+
+
+def merge_staging(
+    conn: duckdb.DuckDBPyConnection,
+    staging_table: str,
+    table_name: str,
+    metric_name: str,
+) -> Tuple[int, int]:
+    """Upsert staged rows into a raw table by (location_id, date).
+
+    Rows whose key already exists are updated when their value differs; rows
+    with a new key (new dates or new locations) are inserted. Rows are never
+    deleted. Revised coordinates were already applied to dim_location when
+    the staging table was written.
+
+    Only rows of the raw table from the first staged date onwards are
+    considered, so the work done tracks the size of the staged window rather
+    than the whole history.
+
+    Args:
+        conn: Open DuckDB connection, inside a transaction
+        staging_table: Table holding the freshly read rows
+        table_name: Raw table to merge into
+        metric_name: Name of the value column
+
+    Returns:
+        Tuple[int, int]: Number of rows inserted and number of rows updated
+    """
+    key_match = " AND ".join(f't."{col}" = s."{col}"' for col in KEY_COLUMNS)
+    changed_columns = [metric_name]
+    is_changed = " OR ".join(
+        f't."{col}" IS DISTINCT FROM s."{col}"' for col in changed_columns
+    )
+    assignments = ", ".join(f'"{col}" = s."{col}"' for col in changed_columns)
+
+    # A constant bound lets DuckDB skip older row groups by their date range
+    since = conn.execute(f"SELECT min(date) FROM {staging_table}").fetchone()[0]
+    if since is None:
+        return 0, 0
+
+    updated = conn.execute(
+        f"""UPDATE {table_name} AS t
+        SET {assignments}
+        FROM {staging_table} AS s
+        WHERE t.date >= ? AND {key_match} AND ({is_changed})""",
+        [since],
+    ).fetchone()[0]
+
+    inserted = conn.execute(
+        f"""INSERT INTO {table_name}
+        SELECT s.* FROM {staging_table} AS s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table_name} AS t WHERE t.date >= ? AND {key_match}
+        )""",
+        [since],
+    ).fetchone()[0]
+
+    return inserted, updated
+
+
+def replace_date_range(
+    conn: duckdb.DuckDBPyConnection,
+    staging_table: str,
+    table_name: str,
+    start: datetime,
+    end: datetime,
+) -> Tuple[int, int]:
+    """Replace the rows of a date range of a raw table with staged rows.
+
+    Unlike merge_staging, rows of the range that are no longer staged are
+    deleted, so the range ends up exactly as read from the source. Rows
+    outside the range are never touched. The table is created (empty, with
+    the staging table's columns) if it does not exist yet.
+
+    Args:
+        conn: Open DuckDB connection, inside a transaction
+        staging_table: Table holding the freshly read rows of the range
+        table_name: Raw table to replace the range of
+        start: First date of the range
+        end: Date the range stops before (exclusive)
+
+    Returns:
+        Tuple[int, int]: Number of rows inserted and number of rows deleted
+    """
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM {staging_table} LIMIT 0"
+    )
+    deleted = conn.execute(
+        f"DELETE FROM {table_name} WHERE date >= ? AND date < ?", [start, end]
+    ).fetchone()[0]
+    inserted = conn.execute(
+        f"""INSERT INTO {table_name}
+        SELECT * FROM {staging_table} WHERE date >= ? AND date < ?""",
+        [start, end],
+    ).fetchone()[0]
+    return inserted, deleted
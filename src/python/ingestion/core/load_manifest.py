@@ -0,0 +1,300 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+import csv
+import hashlib
+
+
+# Table recording which raw file each raw table was last loaded from
+MANIFEST_TABLE = '_load_manifest'
+# Table recording which raw file each date range of a raw table was last
+# loaded from, by range loads (see load_to_duckdb)
+RANGE_MANIFEST_TABLE = '_load_manifest_ranges'
+# Size of the blocks a raw file is hashed in, which bounds memory per file
+FINGERPRINT_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class FileFingerprint:
+    """Identity of a raw file's content, as recorded in the load manifest.
+
+    Two files with the same fingerprint load into identical tables, so a
+    table whose manifest entry matches the latest raw file is already up to
+    date.
+
+    Attributes:
+        content_hash: SHA-256 hex digest of the file content
+        file_size: Size of the file in bytes
+        row_count: Number of data rows (lines after the header)
+        column_count: Number of columns of the header
+    """
+
+    content_hash: str
+    file_size: int
+    row_count: int
+    column_count: int
+
+
+def fingerprint_file(path: Path) -> FileFingerprint:
+    """Hash a raw file and count its rows and columns in a single pass.
+
+    Args:
+        path: Raw CSV file
+
+    Returns:
+        FileFingerprint: Hash, size and shape of the file
+
+    Example:
+        >>> fingerprint_file(Path('data/raw/confirmed_20230310.csv'))
+        FileFingerprint(content_hash='9f2c...', file_size=1749218, row_count=289, column_count=1147)
+    """
+    hasher = hashlib.sha256()
+    file_size, line_breaks, last_byte = 0, 0, b''
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(0)
+        for chunk in iter(lambda: f.read(FINGERPRINT_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+            file_size += len(chunk)
+            line_breaks += chunk.count(b'\n')
+            last_byte = chunk[-1:]
+
+    # The last line counts even without a trailing line break
+    lines = line_breaks + (1 if last_byte not in (b'', b'\n') else 0)
+    columns = next(csv.reader([header.decode('utf-8-sig')]), [])
+    return FileFingerprint(
+        content_hash=hasher.hexdigest(),
+        file_size=file_size,
+        row_count=max(lines - 1, 0),
+        column_count=len(columns),
+    )
+
+
+def ensure_manifest_table(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the load manifest table if it does not exist yet.
+
+    Args:
+        conn: Open DuckDB connection
+    """
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            table_name VARCHAR PRIMARY KEY,
+            source_file VARCHAR,
+            content_hash VARCHAR,
+            file_size BIGINT,
+            row_count BIGINT,
+            column_count INTEGER,
+            loaded_at TIMESTAMP
+        )"""
+    )
+
+
+def get_loaded_fingerprint(
+    conn: duckdb.DuckDBPyConnection, table_name: str
+) -> Optional[FileFingerprint]:
+    """Return the fingerprint of the file a table was last loaded from.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table
+
+    Returns:
+        Optional[FileFingerprint]: Fingerprint recorded for the table, or None
+            if the table has no manifest entry or no longer exists
+    """
+    ensure_manifest_table(conn)
+    if not _table_exists(conn, table_name):
+        return None
+
+    row = conn.execute(
+        f"""SELECT content_hash, file_size, row_count, column_count
+        FROM {MANIFEST_TABLE} WHERE table_name = ?""",
+        [table_name],
+    ).fetchone()
+    if not row:
+        return None
+    return FileFingerprint(
+        content_hash=row[0], file_size=row[1], row_count=row[2], column_count=row[3]
+    )
+
+
+def record_load(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    source_file: str,
+    fingerprint: FileFingerprint,
+) -> None:
+    """Record that a table now holds the content of a raw file.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table that was loaded
+        source_file: Raw file the load read from
+        fingerprint: Fingerprint of the raw file
+    """
+    ensure_manifest_table(conn)
+    conn.execute(
+        f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            table_name,
+            source_file,
+            fingerprint.content_hash,
+            fingerprint.file_size,
+            fingerprint.row_count,
+            fingerprint.column_count,
+            datetime.now(),
+        ],
+    )
+
+
+def forget_load(conn: duckdb.DuckDBPyConnection, table_name: str) -> None:
+    """Remove a table's manifest entry, so its next load is never skipped.
+
+    Called before a table is changed, so a load that fails halfway does not
+    leave the table looking up to date.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table
+    """
+    ensure_manifest_table(conn)
+    conn.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ?", [table_name])
+
+
+def ensure_range_manifest_table(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the range load manifest table if it does not exist yet.
+
+    Args:
+        conn: Open DuckDB connection
+    """
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {RANGE_MANIFEST_TABLE} (
+            table_name VARCHAR,
+            range_start TIMESTAMP,
+            range_end TIMESTAMP,
+            source_file VARCHAR,
+            content_hash VARCHAR,
+            file_size BIGINT,
+            row_count BIGINT,
+            column_count INTEGER,
+            loaded_at TIMESTAMP,
+            PRIMARY KEY (table_name, range_start, range_end)
+        )"""
+    )
+
+
+def get_loaded_range_fingerprint(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    date_range: Tuple[datetime, datetime],
+) -> Optional[FileFingerprint]:
+    """Return the fingerprint of the file a date range of a table was loaded from.
+
+    A range counts as loaded by a range load covering it, e.g. one day of a
+    batch of days loaded at once.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table
+        date_range: First date and the date to stop before (exclusive)
+
+    Returns:
+        Optional[FileFingerprint]: Fingerprint recorded for a range load
+            covering date_range, or None if there is none or the table no
+            longer exists
+    """
+    ensure_range_manifest_table(conn)
+    if not _table_exists(conn, table_name):
+        return None
+
+    start, end = date_range
+    row = conn.execute(
+        f"""SELECT content_hash, file_size, row_count, column_count
+        FROM {RANGE_MANIFEST_TABLE}
+        WHERE table_name = ? AND range_start <= ? AND range_end >= ?
+        ORDER BY loaded_at DESC LIMIT 1""",
+        [table_name, start, end],
+    ).fetchone()
+    if not row:
+        return None
+    return FileFingerprint(
+        content_hash=row[0], file_size=row[1], row_count=row[2], column_count=row[3]
+    )
+
+
+def record_range_load(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    date_range: Tuple[datetime, datetime],
+    source_file: str,
+    fingerprint: FileFingerprint,
+) -> None:
+    """Record that a date range of a table now holds the content of a raw file.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table that was loaded
+        date_range: First date and the date to stop before (exclusive) of the
+            dates the load replaced
+        source_file: Raw file the load read from
+        fingerprint: Fingerprint of the raw file
+    """
+    ensure_range_manifest_table(conn)
+    start, end = date_range
+    conn.execute(
+        f"INSERT OR REPLACE INTO {RANGE_MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            table_name,
+            start,
+            end,
+            source_file,
+            fingerprint.content_hash,
+            fingerprint.file_size,
+            fingerprint.row_count,
+            fingerprint.column_count,
+            datetime.now(),
+        ],
+    )
+
+
+def forget_ranges(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    date_range: Optional[Tuple[datetime, datetime]] = None,
+) -> None:
+    """Remove the range manifest entries a load is about to invalidate.
+
+    Called before a table is changed, like forget_load. Every entry of the
+    table is removed when it does not exist (yet): entries left from before
+    it was dropped describe rows it no longer holds.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Name of the raw table
+        date_range: Dates about to be replaced, whose overlapping entries are
+            removed, or None for a load that may change any date
+    """
+    ensure_range_manifest_table(conn)
+    if date_range is None or not _table_exists(conn, table_name):
+        conn.execute(f"DELETE FROM {RANGE_MANIFEST_TABLE} WHERE table_name = ?", [table_name])
+        return
+
+    start, end = date_range
+    conn.execute(
+        f"""DELETE FROM {RANGE_MANIFEST_TABLE}
+        WHERE table_name = ? AND range_start < ? AND range_end > ?""",
+        [table_name, end, start],
+    )
+
+
+def _table_exists(conn: duckdb.DuckDBPyConnection, table_name: str) -> bool:
+    """Whether a table exists in the database."""
+    return bool(conn.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name = ?",
+        [table_name],
+    ).fetchone()[0])
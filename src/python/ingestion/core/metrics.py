@@ -0,0 +1,216 @@
+# Built-in imports
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import json
+import resource
+import sys
+import threading
+import time
+
+
+# Seconds between two RSS samples of a stage: short enough to catch the
+# peaks of pandas and DuckDB operations, long enough for the sampling not to
+# show in the CPU time of the stage
+STAGE_SAMPLING_INTERVAL = 0.01
+
+
+@dataclass
+class StageMetrics:
+    """Measurements of one stage of a data type's ingestion.
+
+    Stages are, in order: download, read, validate_clean and reshape (pandas
+    mode, run by the processing workers), write and export (when
+    parquet_path is set). In the sql mode DuckDB reads, cleans and reshapes
+    the file inside the write stage.
+
+    Attributes:
+        data_type: Type of data the stage worked on (confirmed, deaths, recovered)
+        stage: Name of the stage
+        wall_seconds: Wall-clock time spent in the stage
+        cpu_seconds: CPU time of the thread running the stage (pandas
+            stages), or of the whole process for the DuckDB stages, whose
+            work runs in DuckDB's own threads; None if not measured
+        peak_rss_growth_bytes: Peak growth of the resident memory of the
+            process that ran the stage over its value when the stage started
+            (see RssSampler); None if not measured
+        counters: What the stage processed, e.g. bytes_downloaded,
+            rows_parsed, columns_parsed, cells_cleaned, negatives_clamped,
+            rows_reshaped, rows_loaded
+    """
+
+    data_type: str
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: Optional[float] = None
+    peak_rss_growth_bytes: Optional[int] = None
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary of the measurements, suitable for JSON."""
+        return asdict(self)
+
+
+class MetricsCollector(ABC):
+    """Receiver of the metrics of every ingestion stage.
+
+    Pass collectors to CovidDataIngestion to forward the metrics elsewhere
+    (a metrics backend, a file, a test); subclasses implement record. It is
+    called in the process and thread that called download_data or
+    load_to_duckdb, once per stage and data type, as soon as the stage ends.
+
+    Example:
+        >>> class PrintCollector(MetricsCollector):
+        ...     def record(self, metrics):
+        ...         print(metrics.data_type, metrics.stage, metrics.wall_seconds)
+        >>> CovidDataIngestion(config, collectors=[PrintCollector()])
+    """
+
+    @abstractmethod
+    def record(self, metrics: StageMetrics) -> None:
+        """Receive the metrics of one stage.
+
+        Args:
+            metrics: Measurements of the stage that just ended
+        """
+
+
+class InMemoryCollector(MetricsCollector):
+    """Collector keeping every stage's metrics in memory.
+
+    Attributes:
+        metrics (List[StageMetrics]): Metrics in the order they were recorded
+    """
+
+    def __init__(self):
+        self.metrics: List[StageMetrics] = []
+
+    def record(self, metrics: StageMetrics) -> None:
+        self.metrics.append(metrics)
+
+    def clear(self) -> None:
+        """Forget the metrics recorded so far."""
+        self.metrics = []
+
+    def by_data_type(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Metrics grouped by data type, then stage (a later run of a stage wins).
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: For each data type, the
+                measurements of each of its stages in stage order
+
+        Example:
+            >>> collector.by_data_type()['confirmed']['read']['counters']
+            {'rows_parsed': 289, 'columns_parsed': 1147}
+        """
+        grouped: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for metrics in self.metrics:
+            stage = metrics.to_dict()
+            del stage['data_type'], stage['stage']
+            grouped.setdefault(metrics.data_type, {})[metrics.stage] = stage
+        return grouped
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Metrics grouped by data type and stage, as a JSON document."""
+        return json.dumps(self.by_data_type(), indent=indent)
+
+
+@contextmanager
+def measure_stage(
+    data_type: str, stage: str, cpu_clock: Callable[[], float] = time.thread_time
+) -> Iterator[StageMetrics]:
+    """Measure the wall time, CPU time and peak memory growth of a block.
+
+    The block can add counters to the yielded metrics. They are filled in
+    even if the block raises, but the caller only records them on success.
+    Memory is that of the whole process, so stages running at the same time
+    in threads of one process also count each other's allocations.
+
+    Args:
+        data_type: Type of data the stage works on
+        stage: Name of the stage
+        cpu_clock: CPU clock to read, time.thread_time for work done by the
+            calling thread, time.process_time for work handed to DuckDB
+
+    Yields:
+        StageMetrics: Metrics of the stage, completed when the block ends
+
+    Example:
+        >>> with measure_stage('confirmed', 'read') as metrics:
+        ...     df = read_time_series_csv(path, 'pandas', logger)
+        ...     metrics.counters['rows_parsed'] = len(df)
+    """
+    metrics = StageMetrics(data_type=data_type, stage=stage)
+    sampler = RssSampler(STAGE_SAMPLING_INTERVAL)
+    start, cpu_start = time.perf_counter(), cpu_clock()
+    try:
+        with sampler:
+            yield metrics
+    finally:
+        metrics.wall_seconds = time.perf_counter() - start
+        metrics.cpu_seconds = cpu_clock() - cpu_start
+        metrics.peak_rss_growth_bytes = sampler.growth_bytes
+
+
+class RssSampler:
+    """Track the peak resident memory of this process while a block runs.
+
+    ru_maxrss is a lifetime high-water mark, so a peak reached by an earlier
+    stage (or while importing libraries) would hide the block being
+    measured. Instead a background thread samples the current RSS and the
+    growth over the value when the block started is reported. Where the
+    current RSS cannot be read (no /proc), the growth of ru_maxrss is
+    reported, which only counts memory beyond the earlier peaks.
+
+    Attributes:
+        baseline (int): RSS when the block started, in bytes
+        peak (int): Largest RSS sampled while the block ran, in bytes
+
+    Example:
+        >>> with RssSampler() as sampler:
+        ...     df = pd.read_csv(path)
+        >>> sampler.growth_bytes
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> 'RssSampler':
+        self.baseline = self.peak = current_rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+    @property
+    def growth_bytes(self) -> int:
+        """Peak RSS growth over the value when the block started."""
+        return self.peak - self.baseline
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+
+def current_rss_bytes() -> int:
+    """Current resident memory of this process, in bytes.
+
+    Falls back to the high-water mark (ru_maxrss) where /proc is not
+    available, e.g. on macOS.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * resource.getpagesize()
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
@@ -0,0 +1,192 @@
+# Global import
+import pandas as pd
+
+# Built-in imports
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import logging
+import os
+import threading
+
+# Local imports
+from .metrics import StageMetrics, measure_stage
+from ..utils.csv_readers import read_time_series_csv
+from ..utils.data_transformation import reshape_time_series
+from ..utils.data_validation import validate_and_clean_data
+
+
+# Supported values of IngestionConfig.processing_pool
+PROCESSING_POOLS = ['process', 'thread']
+
+# Workers log through the module logger, configured by the parent process
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProcessingTask:
+    """A raw file to turn into a long-format frame.
+
+    Attributes:
+        data_type: Type of data in the file (confirmed, deaths, recovered)
+        path: Raw file to process
+        date_columns: Date columns to keep, all of them if None
+    """
+
+    data_type: str
+    path: Path
+    date_columns: Optional[List[str]] = None
+
+
+@dataclass
+class ProcessedFrame:
+    """Long-format frame produced by a worker, with its stage timings.
+
+    Attributes:
+        data_type: Type of data in the frame
+        frame: Cleaned, long-format frame ready to be written to DuckDB
+        timings: Wall-clock seconds spent in each stage (read,
+            validate_clean, reshape), in stage order
+        worker: Process id and thread name of the worker that built the frame
+        memory_bytes: Memory held by the frame, including its strings and
+            categories
+        metrics: Measurements and counters of each stage, taken in the worker
+    """
+
+    data_type: str
+    frame: pd.DataFrame
+    timings: Dict[str, float] = field(default_factory=dict)
+    worker: str = ''
+    memory_bytes: int = 0
+    metrics: List[StageMetrics] = field(default_factory=list)
+
+
+def process_time_series(task: ProcessingTask, csv_reader: str) -> ProcessedFrame:
+    """Read, validate, clean and reshape one raw file.
+
+    This is the CPU-bound part of a pandas load. It does not touch DuckDB, so
+    it can run in any worker process or thread.
+
+    Args:
+        task: Raw file to process
+        csv_reader: Backend used to parse the file ('pandas' or 'duckdb')
+
+    Returns:
+        ProcessedFrame: The long-format frame and the measurements of each
+            stage
+
+    Raises:
+        ValueError: If the file fails validation
+    """
+    metrics: List[StageMetrics] = []
+
+    with measure_stage(task.data_type, 'read') as read:
+        df = read_time_series_csv(task.path, csv_reader, logger)
+        read.counters['rows_parsed'], read.counters['columns_parsed'] = df.shape
+    metrics.append(read)
+
+    with measure_stage(task.data_type, 'validate_clean') as validate_clean:
+        # Only the requested dates go through cleaning and reshaping
+        df, negatives = validate_and_clean_data(
+            df, task.data_type, logger, task.date_columns
+        )
+        # The four identifier columns are not counts
+        validate_clean.counters['cells_cleaned'] = len(df) * (len(df.columns) - 4)
+        validate_clean.counters['negatives_clamped'] = int(sum(negatives.values()))
+    metrics.append(validate_clean)
+
+    with measure_stage(task.data_type, 'reshape') as reshape:
+        frame = reshape_time_series(df, task.data_type, logger)
+        reshape.counters['rows_reshaped'] = len(frame)
+    metrics.append(reshape)
+
+    return ProcessedFrame(
+        data_type=task.data_type,
+        frame=frame,
+        timings={stage.stage: stage.wall_seconds for stage in metrics},
+        worker=f"pid {os.getpid()}/{threading.current_thread().name}",
+        memory_bytes=int(frame.memory_usage(deep=True).sum()),
+        metrics=metrics,
+    )
+
+
+def process_all(
+    tasks: List[ProcessingTask],
+    csv_reader: str,
+    max_workers: int,
+    pool: str = 'thread',
+) -> Iterator[ProcessedFrame]:
+    """Process raw files concurrently and yield frames as they finish.
+
+    Each file is handled by its own worker, so the three data types are
+    parsed and reshaped at the same time instead of one after another. Frames
+    are yielded in completion order, letting the caller write each one while
+    the others are still being processed.
+
+    With a single worker (or a single task) the files are processed inline,
+    avoiding the cost of starting a pool.
+
+    Args:
+        tasks: Raw files to process
+        csv_reader: Backend used to parse the files ('pandas' or 'duckdb')
+        max_workers: Maximum number of files processed at the same time
+        pool: 'thread' for a thread pool, which overlaps CSV parsing and
+            NumPy work (both release the GIL) at no startup cost, or 'process'
+            for a process pool, which sidesteps the GIL for every stage but
+            pays for starting workers and pickling frames back; it only pays
+            off for large files on machines with spare cores
+
+    Yields:
+        ProcessedFrame: One frame per task, in completion order
+
+    Raises:
+        ValueError: If the pool type is unknown or max_workers is below 1
+        Exception: The first error raised by a worker; pending tasks are
+            cancelled
+
+    Example:
+        >>> tasks = [ProcessingTask('confirmed', path), ProcessingTask('deaths', path2)]
+        >>> for processed in process_all(tasks, 'pandas', max_workers=2):
+        ...     print(processed.data_type, processed.timings)
+    """
+    if pool not in PROCESSING_POOLS:
+        raise ValueError(
+            f"Unknown processing pool '{pool}', expected one of {PROCESSING_POOLS}"
+        )
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+    workers = min(max_workers, len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            yield process_time_series(task, csv_reader)
+        return
+
+    executor = _create_executor(pool, workers)
+    try:
+        futures = [
+            executor.submit(process_time_series, task, csv_reader) for task in tasks
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Stop queued work if a worker failed or the caller stopped early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _create_executor(pool: str, workers: int) -> Executor:
+    """Create the executor backing process_all."""
+    if pool == 'thread':
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ingestion')
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker_process,
+        initargs=(logging.getLogger().level, logging.root.manager.disable),
+    )
+
+
+def _init_worker_process(root_level: int, disable_level: int) -> None:
+    """Carry the parent's logging levels over to a spawned worker process."""
+    logging.getLogger().setLevel(root_level)
+    logging.disable(disable_level)
@@ -0,0 +1,168 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import os
+import shutil
+import uuid
+
+# Local import
+from ..utils.locations import DIM_LOCATION_TABLE
+
+
+# Partition column of the landing zone within a data type directory
+MONTH_COLUMN = 'year_month'
+# Codec of the landing zone files; ZSTD is smaller than Snappy at a similar
+# decoding speed
+PARQUET_COMPRESSION = 'zstd'
+
+
+def month_directory(landing_path: Path, data_type: str, month: str) -> Path:
+    """Directory holding one month of a data type in the landing zone.
+
+    Args:
+        landing_path: Root of the Parquet landing zone
+        data_type: Type of data (confirmed, deaths, recovered)
+        month: Month as 'YYYY-MM'
+
+    Returns:
+        Path: Hive-style partition directory, e.g.
+            landing/data_type=confirmed/year_month=2020-01
+
+    Example:
+        >>> month_directory(Path('data/landing'), 'confirmed', '2020-01')
+        PosixPath('data/landing/data_type=confirmed/year_month=2020-01')
+    """
+    return landing_path / f"data_type={data_type}" / f"{MONTH_COLUMN}={month}"
+
+
+def export_to_parquet(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    data_type: str,
+    landing_path: Path,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    compression: str = PARQUET_COMPRESSION,
+) -> List[str]:
+    """Write the months of a raw table touched by a load to the landing zone.
+
+    The landing zone is a Parquet dataset Hive-partitioned by data type and
+    month (see month_directory), so readers filtering on either only open the
+    matching files. Rows are sorted by date within each file, which keeps the
+    per-row-group date statistics tight for filters on other date ranges.
+    Locations are referenced by location_id; their names and coordinates are
+    exported separately (see export_locations).
+
+    Every month containing a date from since up to until is rewritten whole
+    from the raw table, so the dataset always mirrors the table. Each month
+    is written to a scratch directory first and then swapped in, so readers
+    never see a partly written month. Without since, the data type's whole
+    directory is replaced, which also drops months no longer in the table.
+
+    Args:
+        conn: Open DuckDB connection holding the raw table
+        table_name: Raw table to export (e.g. raw_confirmed)
+        data_type: Type of data in the table, its partition value
+        landing_path: Root of the Parquet landing zone
+        since: First date changed by the load, None for a full load
+        until: Date the changed dates stop before (exclusive), no bound if None
+        compression: Parquet compression codec
+
+    Returns:
+        List[str]: Months written, as 'YYYY-MM'
+    """
+    month = "strftime(date, '%Y-%m')"
+    conditions, params = ["TRUE"], []
+    if since is not None:
+        conditions.append("date >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("date < ?")
+        params.append(until)
+    months = [
+        row[0]
+        for row in conn.execute(
+            f"""SELECT DISTINCT {month} FROM {table_name}
+            WHERE {' AND '.join(conditions)} ORDER BY 1""",
+            params,
+        ).fetchall()
+    ]
+    type_path = landing_path / f"data_type={data_type}"
+    if not months and since is not None:
+        return []
+
+    landing_path.mkdir(parents=True, exist_ok=True)
+    scratch = landing_path / f".scratch_{data_type}_{uuid.uuid4().hex}"
+    try:
+        if months:
+            quoted_months = ", ".join(f"'{value}'" for value in months)
+            conn.execute(
+                f"""COPY (
+                    SELECT *, {month} AS {MONTH_COLUMN} FROM {table_name}
+                    WHERE {month} IN ({quoted_months})
+                    ORDER BY date, location_id
+                ) TO '{scratch}' (
+                    FORMAT PARQUET,
+                    PARTITION_BY ({MONTH_COLUMN}),
+                    COMPRESSION {compression}
+                )"""
+            )
+        else:
+            scratch.mkdir()
+
+        if since is None:
+            # Full load: the scratch directory becomes the data type's directory
+            _swap(scratch, type_path)
+        else:
+            type_path.mkdir(exist_ok=True)
+            for value in months:
+                _swap(scratch / f"{MONTH_COLUMN}={value}", type_path / f"{MONTH_COLUMN}={value}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return months
+
+
+def export_locations(
+    conn: duckdb.DuckDBPyConnection,
+    landing_path: Path,
+    compression: str = PARQUET_COMPRESSION,
+) -> Path:
+    """Write the dim_location table to the landing zone.
+
+    The table has one row per location, so it is rewritten whole after every
+    load, next to the data type directories. The file is written under a
+    scratch name and then renamed, so readers never see a partly written one.
+
+    Args:
+        conn: Open DuckDB connection holding dim_location
+        landing_path: Root of the Parquet landing zone
+        compression: Parquet compression codec
+
+    Returns:
+        Path: The written file, landing/dim_location.parquet
+    """
+    landing_path.mkdir(parents=True, exist_ok=True)
+    target = landing_path / f"{DIM_LOCATION_TABLE}.parquet"
+    scratch = landing_path / f".scratch_{DIM_LOCATION_TABLE}_{uuid.uuid4().hex}.parquet"
+    try:
+        conn.execute(
+            f"""COPY (SELECT * FROM {DIM_LOCATION_TABLE} ORDER BY location_id)
+            TO '{scratch}' (FORMAT PARQUET, COMPRESSION {compression})"""
+        )
+        os.replace(scratch, target)
+    finally:
+        scratch.unlink(missing_ok=True)
+    return target
+
+
+def _swap(source: Path, target: Path) -> None:
+    """Move a directory into place, replacing the previous one."""
+    previous = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+    if target.exists():
+        target.rename(previous)
+    source.rename(target)
+    shutil.rmtree(previous, ignore_errors=True)
@@ -0,0 +1,460 @@
+# Global imports
+import duckdb
+import numpy as np
+import pandas as pd
+
+# Built-in imports
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Table holding the rolling metrics of every country and of the world per day
+ROLLING_METRICS_TABLE = 'main_analytics.rolling_metrics'
+# Moving-average windows in days, the 7-day one being the dbt models'
+DEFAULT_WINDOWS = (7, 14, 28)
+# Cumulative totals of a series, in the order the engine pushes them
+TOTAL_COLUMNS = ['total_confirmed', 'total_deaths', 'total_recovered']
+# Metrics averaged over every window
+AVERAGED_COLUMNS = ['total_confirmed', 'total_deaths', 'new_cases']
+# Tables the metrics are computed from
+SOURCE_TABLES = ['raw_confirmed', 'raw_deaths', 'raw_recovered', 'dim_location']
+
+
+class RollingWindows:
+    """Running moving averages of many series, updated in O(1) per day.
+
+    Every series (a country, or the world) keeps a ring buffer of its last
+    max(windows) values and, for each window, the running sum and count of
+    the non-null values inside it. Pushing a day adds the new value to the
+    sums and subtracts the one leaving each window, for all the series
+    reporting that day at once, instead of re-reading the whole window.
+
+    Values are float64 holding integers, so the sums are exact (below 2**53)
+    and the averages are the same doubles DuckDB's AVG returns. Like AVG,
+    null (NaN) values are skipped, and a window is over the last rows of
+    the series, whatever their dates (ROWS BETWEEN n PRECEDING).
+
+    Attributes:
+        windows (Tuple[int, ...]): Window lengths in rows
+        size (int): Number of series
+
+    Example:
+        >>> state = RollingWindows(windows=(2, 3), size=1)
+        >>> for value in [1.0, 2.0, 6.0]:
+        ...     state.push(np.array([0]), np.array([value]))
+        >>> state.averages(np.array([0]))
+        array([[4.], [3.]])
+    """
+
+    def __init__(self, windows: Sequence[int], size: int):
+        self.windows = tuple(windows)
+        self.size = size
+        capacity = max(self.windows)
+        self._values = np.full((size, capacity), np.nan)
+        self._pushed = np.zeros(size, dtype=np.int64)
+        self._sums = np.zeros((len(self.windows), size))
+        self._counts = np.zeros((len(self.windows), size), dtype=np.int64)
+
+    def push(self, series: np.ndarray, values: np.ndarray) -> None:
+        """Append one value to each of the given series.
+
+        Args:
+            series: Indices of the series reporting, each at most once
+            values: Their new values, NaN for null
+        """
+        capacity = self._values.shape[1]
+        pushed = self._pushed[series]
+        present = ~np.isnan(values)
+        added = np.where(present, values, 0.0)
+        for i, window in enumerate(self.windows):
+            # The value pushed `window` rows ago leaves the window
+            leaving = self._values[series, (pushed - window) % capacity]
+            full = pushed >= window
+            left = full & ~np.isnan(leaving)
+            self._sums[i, series] += added - np.where(left, leaving, 0.0)
+            self._counts[i, series] += present.astype(np.int64) - left
+        self._values[series, pushed % capacity] = values
+        self._pushed[series] = pushed + 1
+
+    def averages(self, series: np.ndarray) -> np.ndarray:
+        """Current average of each window (rows) for each given series (columns).
+
+        Args:
+            series: Indices of the series
+
+        Returns:
+            np.ndarray: Averages, NaN where a window holds no value
+        """
+        counts = self._counts[:, series]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, self._sums[:, series] / counts, np.nan)
+
+
+def round_half_away(values: np.ndarray, decimals: int = 0) -> np.ndarray:
+    """Round like DuckDB's ROUND on doubles: half away from zero.
+
+    ROUND(x, d) is std::round(x * 10^d) / 10^d, whereas np.round rounds
+    halves to even. The fractional part is taken exactly (x - floor(x) is
+    exact in floating point), so 0.49999999999999994 is not rounded up.
+
+    Args:
+        values: Values to round, NaN kept as is
+        decimals: Number of decimals
+
+    Returns:
+        np.ndarray: Rounded values
+    """
+    modifier = 10.0 ** decimals
+    scaled = np.abs(values) * modifier
+    rounded = np.floor(scaled)
+    rounded += (scaled - rounded) >= 0.5
+    return np.copysign(rounded, values) / modifier
+
+
+def growth_rate(totals: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Day-over-day growth of cumulative totals, as a 2-decimal percentage.
+
+    Same expression as the dbt models: 100.0 * (total - previous) /
+    previous, rounded to 2 decimals, null unless previous is positive.
+
+    Args:
+        totals: Totals of the day
+        previous: Totals of each series' previous row, NaN for none
+
+    Returns:
+        np.ndarray: Growth rates, NaN where undefined
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates = round_half_away(100.0 * (totals - previous) / previous, 2)
+    return np.where(previous > 0, rates, np.nan)
+
+
+def rolling_metric_columns(windows: Sequence[int]) -> List[str]:
+    """Columns of the rolling metrics table for the given windows.
+
+    Args:
+        windows: Window lengths in days
+
+    Returns:
+        List[str]: Column names, e.g. confirmed_7day_avg for a 7-day window
+    """
+    columns = [
+        'date', 'grain', 'country_region', *TOTAL_COLUMNS,
+        'new_cases', 'new_deaths', 'new_recovered', 'growth_rate',
+    ]
+    for window in windows:
+        columns += [
+            f"confirmed_{window}day_avg",
+            f"deaths_{window}day_avg",
+            f"new_cases_{window}day_avg",
+        ]
+    return columns
+
+
+def update_rolling_metrics(
+    conn: duckdb.DuckDBPyConnection,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    since: Optional[date] = None,
+    lookback_days: int = 14,
+    full_refresh: bool = False,
+) -> int:
+    """Bring the rolling metrics table up to date with the raw tables.
+
+    Only the days from lookback_days before the latest computed day (or
+    from since, if earlier) are recomputed, so revisions of recent days
+    are picked up like the incremental dbt models do. The window state of
+    each series is seeded from the rows already computed before that day,
+    then every day updates it in O(1) per series (see RollingWindows). The
+    table is rebuilt from the whole history when it does not exist yet, was
+    computed for other windows or full_refresh is set.
+
+    Each row is a day of a country (grain 'country') or of the world
+    (grain 'global', country_region NULL). The values equal the dbt
+    models' on the same raw tables:
+    - totals, new_* and growth_rate of a country: daily_metrics
+      (growth_rate_percentage)
+    - totals of the world: daily_trends (global_*), and its growth_rate
+      its confirmed_growth_rate
+    - new_* of the world: daily_rollup, the sums of the countries' changes
+    - confirmed_7day_avg and deaths_7day_avg of the world: daily_trends
+    - new_cases_7day_avg of the world: global_daily_trends (cases_7day_avg)
+    Averages are over the last `window` rows of the series, rounded to an
+    integer like the dbt models', for every window.
+
+    Args:
+        conn: Open DuckDB connection holding the raw tables
+        windows: Moving-average windows in days
+        since: First day whose raw data may have changed, e.g. the start of
+            a partition load; None to rely on the lookback alone
+        lookback_days: Days before the latest computed day that are always
+            recomputed (keep >= IngestionConfig.revision_window_days)
+        full_refresh: Rebuild the table from the whole history, e.g. after a
+            full load, which can have revised any day
+
+    Returns:
+        int: Number of rows written, 0 if the raw tables are not all loaded
+
+    Raises:
+        ValueError: If a window is not a positive number of days
+
+    Example:
+        >>> update_rolling_metrics(conn, windows=(7, 28), since=date(2023, 3, 1))
+        3225
+    """
+    windows = tuple(windows)
+    if not windows or any(window < 1 for window in windows):
+        raise ValueError(f"Rolling windows must be positive numbers of days, got {windows}")
+
+    existing = {
+        row[0] for row in conn.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'"
+        ).fetchall()
+    }
+    if not set(SOURCE_TABLES) <= existing:
+        return 0
+
+    columns = rolling_metric_columns(windows)
+    start = _first_day_to_update(conn, columns, since, lookback_days, full_refresh)
+
+    countries = _read_country_totals(conn, start)
+    seed = _read_seed(conn, start, max(windows)) if start is not None else None
+    names = set(countries['country_region'])
+    if seed is not None:
+        names |= set(seed['country_region'].dropna())
+    index = {name: i for i, name in enumerate(sorted(names))}
+    state = _SeriesState(windows, len(index))
+    if seed is not None:
+        for _, rows in _days(seed, state.series(seed, index)):
+            state.replay(*rows)
+
+    # One vectorized update of every series per day, in date order; the
+    # metrics are collected as arrays and framed once
+    days, computed = [], []
+    for day, (series, rows) in _days(countries, state.series(countries, index)):
+        days.append(day)
+        computed.append(state.push(series, rows))
+    frame = _frame(days, computed, sorted(index, key=index.get), windows)
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        if start is not None:
+            conn.execute(f"DELETE FROM {ROLLING_METRICS_TABLE} WHERE date >= ?", [start])
+        conn.register('_rolling_metrics_frame', frame[columns])
+        conn.execute(
+            f"INSERT INTO {ROLLING_METRICS_TABLE} SELECT * FROM _rolling_metrics_frame"
+        )
+        conn.unregister('_rolling_metrics_frame')
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return len(frame)
+
+
+class _SeriesState:
+    """Window state and previous totals of every country and of the world."""
+
+    def __init__(self, windows: Tuple[int, ...], countries: int):
+        self.windows = windows
+        # Series 0..countries-1 are the countries, the last one the world
+        self.world = countries
+        self.averages = {
+            column: RollingWindows(windows, countries + 1) for column in AVERAGED_COLUMNS
+        }
+        self.previous = {
+            column: np.full(countries + 1, np.nan) for column in TOTAL_COLUMNS
+        }
+
+    def series(self, rows: pd.DataFrame, index: Dict[str, int]) -> np.ndarray:
+        """Series of each row, the world for rows without a country."""
+        return (
+            rows['country_region'].map(index).fillna(self.world).to_numpy(dtype=np.int64)
+        )
+
+    def replay(self, series: np.ndarray, rows: Dict[str, np.ndarray]) -> None:
+        """Feed a day of already computed rows back into the state."""
+        for column, windows in self.averages.items():
+            windows.push(series, rows[column])
+        for column, previous in self.previous.items():
+            previous[series] = rows[column]
+
+    def push(self, series: np.ndarray, totals: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Compute the metrics of one day from the totals of its countries.
+
+        Returns the metrics of the countries given, in order, then of the
+        world.
+        """
+        # Countries: change over the country's previous row, 0 without one
+        # (daily_metrics' COALESCE), growth only over a positive previous total
+        changes = {
+            column: totals[column] - np.nan_to_num(self.previous[column][series])
+            for column in TOTAL_COLUMNS
+        }
+
+        # The world: sums of the countries, null where every country is null
+        # (SQL SUM), its changes the sums of the countries' changes
+        all_series = np.append(series, self.world)
+        values = {
+            column: np.append(totals[column], _sum(totals[column]))
+            for column in TOTAL_COLUMNS
+        }
+        for column, change in zip(['new_cases', 'new_deaths', 'new_recovered'], changes.values()):
+            values[column] = np.append(change, _sum(change))
+        values['growth_rate'] = growth_rate(
+            values['total_confirmed'], self.previous['total_confirmed'][all_series]
+        )
+
+        self.replay(all_series, values)
+        for column, windows in self.averages.items():
+            # replay pushed the day, the averages now include it
+            values[f"{column}_avg"] = round_half_away(windows.averages(all_series))
+        values['series'] = all_series
+        return values
+
+
+def _days(
+    rows: pd.DataFrame, series: np.ndarray
+) -> Iterator[Tuple[date, Tuple[np.ndarray, Dict[str, np.ndarray]]]]:
+    """Split rows ordered by date into the series and totals of each day."""
+    dates = rows['date'].to_numpy()
+    columns = {
+        column: rows[column].to_numpy(dtype=float, na_value=np.nan)
+        for column in [*TOTAL_COLUMNS, 'new_cases'] if column in rows
+    }
+    bounds = [0, *(np.flatnonzero(dates[1:] != dates[:-1]) + 1), len(rows)]
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        if first < last:
+            yield dates[first], (
+                series[first:last],
+                {column: values[first:last] for column, values in columns.items()},
+            )
+
+
+def _frame(
+    days: List[date],
+    computed: List[Dict[str, np.ndarray]],
+    names: List[str],
+    windows: Tuple[int, ...],
+) -> pd.DataFrame:
+    """Rows of the rolling metrics table from the metrics of each day."""
+    if not computed:
+        return pd.DataFrame(columns=rolling_metric_columns(windows))
+    # Averages are (window, series) arrays, the other metrics one per series
+    values = {
+        column: np.concatenate([day[column] for day in computed], axis=-1)
+        for column in computed[0]
+    }
+    world = len(names)
+    series = values['series']
+    frame = pd.DataFrame({
+        'date': np.repeat(days, [len(day['series']) for day in computed]),
+        'grain': np.where(series == world, 'global', 'country'),
+        'country_region': np.array(names + [None], dtype=object)[series],
+    })
+    for column in [*TOTAL_COLUMNS, 'new_cases', 'new_deaths', 'new_recovered']:
+        # Integers, nulls included
+        frame[column] = pd.array(values[column], dtype='Float64').astype('Int64')
+    frame['growth_rate'] = values['growth_rate']
+    for i, window in enumerate(windows):
+        frame[f"confirmed_{window}day_avg"] = values['total_confirmed_avg'][i]
+        frame[f"deaths_{window}day_avg"] = values['total_deaths_avg'][i]
+        frame[f"new_cases_{window}day_avg"] = values['new_cases_avg'][i]
+    return frame
+
+
+def _sum(values: np.ndarray) -> float:
+    """SQL SUM of a day's values: nulls skipped, null if all are."""
+    return float(np.nansum(values)) if (~np.isnan(values)).any() else np.nan
+
+
+def _first_day_to_update(
+    conn: duckdb.DuckDBPyConnection,
+    columns: List[str],
+    since: Optional[date],
+    lookback_days: int,
+    full_refresh: bool,
+) -> Optional[date]:
+    """First day to recompute, or None to rebuild the table from scratch."""
+    schema, table = ROLLING_METRICS_TABLE.split('.')
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+    existing_columns = [
+        row[0] for row in conn.execute(
+            """SELECT column_name FROM information_schema.columns
+            WHERE table_schema = ? AND table_name = ? ORDER BY ordinal_position""",
+            [schema, table],
+        ).fetchall()
+    ]
+    if full_refresh or existing_columns != columns:
+        # First run, the windows changed or any day may have: every day is
+        # recomputed
+        conn.execute(f"DROP TABLE IF EXISTS {ROLLING_METRICS_TABLE}")
+        averages = ', '.join(
+            f"{column} DOUBLE" for column in columns if column.endswith('day_avg')
+        )
+        conn.execute(
+            f"""CREATE TABLE {ROLLING_METRICS_TABLE} (
+                date DATE,
+                grain VARCHAR,
+                country_region VARCHAR,
+                total_confirmed BIGINT,
+                total_deaths BIGINT,
+                total_recovered BIGINT,
+                new_cases BIGINT,
+                new_deaths BIGINT,
+                new_recovered BIGINT,
+                growth_rate DOUBLE,
+                {averages}
+            )"""
+        )
+        return None
+
+    latest = conn.execute(f"SELECT max(date) FROM {ROLLING_METRICS_TABLE}").fetchone()[0]
+    if latest is None:
+        return None
+    start = latest - timedelta(days=lookback_days)
+    if since is not None and since < start:
+        start = since
+    return start
+
+
+def _read_country_totals(
+    conn: duckdb.DuckDBPyConnection, start: Optional[date]
+) -> pd.DataFrame:
+    """Totals of every country per day from start, ordered by day.
+
+    The joins are stg_covid_metrics': every confirmed row of a known
+    location, with its deaths and recoveries if any.
+    """
+    where = "WHERE c.date >= ?" if start is not None else ""
+    countries = conn.execute(
+        f"""SELECT
+            c.date,
+            l."Country/Region" AS country_region,
+            SUM(c.confirmed) AS total_confirmed,
+            SUM(d.deaths) AS total_deaths,
+            SUM(r.recovered) AS total_recovered
+        FROM raw_confirmed c
+        JOIN dim_location l ON c.location_id = l.location_id
+        LEFT JOIN raw_deaths d ON c.date = d.date AND c.location_id = d.location_id
+        LEFT JOIN raw_recovered r ON c.date = r.date AND c.location_id = r.location_id
+        {where}
+        GROUP BY c.date, l."Country/Region"
+        ORDER BY c.date, country_region""",
+        [start] if start is not None else [],
+    ).df()
+    countries['date'] = countries['date'].dt.date
+    return countries
+
+
+def _read_seed(conn: duckdb.DuckDBPyConnection, start: date, rows: int) -> pd.DataFrame:
+    """Last computed rows of every series before start, oldest first."""
+    return conn.execute(
+        f"""SELECT date, grain, country_region, {', '.join(TOTAL_COLUMNS)}, new_cases
+        FROM {ROLLING_METRICS_TABLE}
+        WHERE date < ?
+        QUALIFY row_number() OVER (
+            PARTITION BY grain, country_region ORDER BY date DESC
+        ) <= ?
+        ORDER BY date""",
+        [start, rows],
+    ).df()
@@ -0,0 +1,333 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+import logging
+import os
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where builds are not serialized
+    fcntl = None
+
+
+# Directory next to the database holding the snapshots of each database
+SNAPSHOT_DIR_NAME = 'snapshots'
+# Directory of the snapshot being built. Every snapshot is a file named like
+# the database in its own directory: DuckDB (and dbt-duckdb) name the catalog
+# after the file, so the models' relation names stay the same in every one
+SHADOW_DIR_NAME = 'shadow'
+# Format of the publication time naming the snapshot directories, sorting
+# chronologically
+SNAPSHOT_TIME_FORMAT = '%Y%m%dT%H%M%S%fZ'
+
+
+class SnapshotStore:
+    """Blue/green snapshots of a DuckDB database behind a symlink.
+
+    The database path (e.g. data/processed/covid_analysis_dev.duckdb) is a
+    symlink to the current snapshot, a file that is never written again once
+    published. Loads and dbt runs write to a shadow copy of it instead, and
+    publish() swaps the symlink to the shadow in one atomic rename when the
+    build is complete. Readers therefore never see a half-built database and
+    never wait for a writer's lock: a reader that opened the previous snapshot
+    keeps reading it, and the next open follows the symlink to the new one.
+
+    The shadow is shared by every writer of a build (the ingestion of each
+    data type, then dbt), which take turns on it as they did on the database
+    itself. A file lock serializes creating, opening and publishing it across
+    processes. The retention most recently published snapshots are kept,
+    including the current one; older ones are deleted.
+
+    Attributes:
+        db_path (Path): Path readers open, the symlink to the current snapshot
+        snapshot_dir (Path): Directory holding the snapshots and the shadow,
+            one subdirectory each
+        shadow_path (Path): Database the current build writes to
+        retention (int): Number of published snapshots kept
+        lock_timeout_seconds (float): How long to wait for the file lock
+            while another process creates or publishes the shadow
+
+    Example:
+        >>> store = SnapshotStore('data/processed/covid_analysis_dev.duckdb')
+        >>> with store.shadow() as shadow_path:
+        ...     conn = duckdb.connect(str(shadow_path))
+        >>> # ... load and build into the shadow, then
+        >>> store.publish()
+        PosixPath('data/processed/snapshots/covid_analysis_dev/20240101T060000000000Z/covid_analysis_dev.duckdb')
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        snapshot_dir: Optional[Path] = None,
+        retention: int = 3,
+        lock_timeout_seconds: float = 300.0,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Describe the snapshots of a database; nothing is created until used.
+
+        Args:
+            db_path: Path readers open
+            snapshot_dir: Directory of the snapshots, snapshots/<database
+                name> next to the database if None
+            retention: Number of published snapshots kept, at least 1
+            lock_timeout_seconds: How long to wait for the file lock
+            logger: Logger for builds and swaps, module logger if None
+
+        Raises:
+            ValueError: If retention is less than 1
+        """
+        if retention < 1:
+            raise ValueError(f"Snapshot retention must be at least 1, got {retention}")
+        self.db_path = Path(db_path)
+        self.snapshot_dir = (
+            Path(snapshot_dir)
+            if snapshot_dir
+            else self.db_path.parent / SNAPSHOT_DIR_NAME / self.db_path.stem
+        )
+        self.shadow_path = self.snapshot_dir / SHADOW_DIR_NAME / self.db_path.name
+        self.retention = retention
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.logger = logger or logging.getLogger(__name__)
+
+    def current(self) -> Optional[Path]:
+        """Return the snapshot readers currently open, if any was published.
+
+        Returns:
+            Optional[Path]: Target of the symlink, the database itself if it
+                is still a plain file, or None if it does not exist
+        """
+        if self.db_path.is_symlink():
+            return self.db_path.resolve()
+        return self.db_path if self.db_path.exists() else None
+
+    def snapshots(self) -> List[Path]:
+        """List the published snapshots, oldest first."""
+        if not self.snapshot_dir.exists():
+            return []
+        return sorted(
+            path
+            for path in self.snapshot_dir.glob(f"*/{self.db_path.name}")
+            if path != self.shadow_path
+        )
+
+    @contextmanager
+    def shadow(self) -> Iterator[Path]:
+        """Hold the shadow of the current snapshot for a write.
+
+        The shadow starts as a copy of the current snapshot, so loads and
+        incremental dbt models build on the published data. It is not
+        published or replaced while the block runs: open the connection
+        inside it (it may be used after the block).
+
+        Yields:
+            Path: Database to write to
+
+        Raises:
+            TimeoutError: If another process holds the lock for longer than
+                lock_timeout_seconds
+        """
+        with self._locked():
+            self._adopt_plain_database()
+            if not self.shadow_path.exists():
+                # A log left by a discarded shadow must not be replayed onto the copy
+                _remove(self.shadow_path)
+                self.shadow_path.parent.mkdir(parents=True)
+                current = self.current()
+                if current is not None:
+                    # Copied under a temporary name, so a crash mid-copy never
+                    # leaves a truncated shadow behind
+                    tmp_path = self.shadow_path.with_name(self.shadow_path.name + '.tmp')
+                    shutil.copyfile(current, tmp_path)
+                    _fsync(tmp_path)
+                    os.replace(tmp_path, self.shadow_path)
+                    self.logger.info(
+                        f"Building the next snapshot of {self.db_path} "
+                        f"from {current.parent.name}"
+                    )
+            yield self.shadow_path
+
+    def publish(self) -> Optional[Path]:
+        """Make the shadow the current snapshot, then apply the retention.
+
+        The shadow is checkpointed (waiting while a writer still holds it),
+        renamed to a timestamped snapshot, and the symlink is replaced by one
+        pointing to it in a single rename.
+
+        Returns:
+            Optional[Path]: The published snapshot, or None if no build was
+                pending
+
+        Raises:
+            TimeoutError: If the lock or the shadow stays held for longer
+                than lock_timeout_seconds
+        """
+        with self._locked():
+            self._adopt_plain_database()
+            if not self.shadow_path.exists():
+                self.logger.info(
+                    f"No snapshot of {self.db_path} is being built, nothing to publish"
+                )
+                return None
+
+            # Writers only open the shadow holding the lock, so once the last
+            # one has let go of it, none can until it is renamed
+            conn = self._connect_exclusive(self.shadow_path)
+            try:
+                # Fold the write-ahead log in: the snapshot must be one file
+                conn.execute("CHECKPOINT")
+            finally:
+                conn.close()
+            snapshot_path = self._snapshot_path()
+            os.replace(self.shadow_path.parent, snapshot_path.parent)
+
+            self._link(snapshot_path)
+            self.logger.info(f"Published snapshot {snapshot_path.parent.name} as {self.db_path}")
+            self._prune()
+            return snapshot_path
+
+    def discard(self) -> bool:
+        """Drop the shadow, e.g. after a failed build.
+
+        Returns:
+            bool: Whether there was a shadow to drop
+        """
+        with self._locked():
+            if not self.shadow_path.exists():
+                return False
+            _remove(self.shadow_path)
+            self.logger.info(f"Discarded the unpublished snapshot of {self.db_path}")
+            return True
+
+    def prune(self) -> List[Path]:
+        """Delete the published snapshots beyond the retention.
+
+        Returns:
+            List[Path]: Deleted snapshots
+        """
+        with self._locked():
+            return self._prune()
+
+    def _prune(self) -> List[Path]:
+        """Delete old snapshots (called holding the lock).
+
+        The current snapshot is always kept. Readers that still have a
+        deleted snapshot open keep reading it until they close it.
+        """
+        current = self.current()
+        expired = [
+            path for path in self.snapshots()[:-self.retention] if path != current
+        ]
+        for path in expired:
+            _remove(path)
+        if expired:
+            self.logger.info(
+                f"Deleted {len(expired)} snapshots of {self.db_path} "
+                f"beyond the last {self.retention}"
+            )
+        return expired
+
+    def _adopt_plain_database(self) -> None:
+        """Turn a database written in place into the first snapshot (called holding the lock)."""
+        if self.db_path.is_symlink() or not self.db_path.exists():
+            return
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        # Also folds in a write-ahead log left by an interrupted writer
+        conn = self._connect_exclusive(self.db_path)
+        try:
+            conn.execute("CHECKPOINT")
+        finally:
+            conn.close()
+        snapshot_path = self._snapshot_path()
+        snapshot_path.parent.mkdir()
+        os.replace(self.db_path, snapshot_path)
+        self._link(snapshot_path)
+        self.logger.info(f"Moved {self.db_path} to snapshot {snapshot_path.parent.name}")
+
+    def _snapshot_path(self) -> Path:
+        """Unused path of a snapshot published now."""
+        while True:
+            published_at = datetime.now(timezone.utc).strftime(SNAPSHOT_TIME_FORMAT)
+            path = self.snapshot_dir / published_at / self.db_path.name
+            if not path.parent.exists():
+                return path
+            time.sleep(0.001)
+
+    def _link(self, snapshot_path: Path) -> None:
+        """Point the database path at a snapshot in one atomic rename."""
+        _fsync(snapshot_path)
+        # Relative, so the link survives moving or mounting the data directory
+        target = os.path.relpath(snapshot_path, self.db_path.parent)
+        tmp_link = self.db_path.with_name(self.db_path.name + '.tmp')
+        if tmp_link.is_symlink() or tmp_link.exists():
+            tmp_link.unlink()
+        os.symlink(target, tmp_link)
+        os.replace(tmp_link, self.db_path)
+        _fsync(self.db_path.parent)
+
+    def _connect_exclusive(self, path: Path) -> duckdb.DuckDBPyConnection:
+        """Open a database read-write, waiting while another process holds it."""
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        delay = 0.1
+        while True:
+            try:
+                return duckdb.connect(str(path))
+            except duckdb.IOException as e:
+                if 'lock' not in str(e).lower():
+                    raise
+                if time.monotonic() + delay > deadline:
+                    raise TimeoutError(
+                        f"{path} was still being written after {self.lock_timeout_seconds}s"
+                    ) from e
+                self.logger.info(f"{path} is being written, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                delay = min(delay * 2, 5.0)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the lock serializing shadow creation, opens and publication."""
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        lock_path = self.snapshot_dir / '.lock'
+        with open(lock_path, 'w') as lock_file:
+            deadline = time.monotonic() + self.lock_timeout_seconds
+            delay = 0.05
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() + delay > deadline:
+                        raise TimeoutError(
+                            f"Snapshots of {self.db_path} were still locked "
+                            f"after {self.lock_timeout_seconds}s"
+                        )
+                    time.sleep(delay)
+                    delay = min(delay * 2, 1.0)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _fsync(path: Path) -> None:
+    """Flush a file or directory to disk, so a swap survives a crash."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove(path: Path) -> None:
+    """Delete the directory of a snapshot, with its write-ahead log if any."""
+    shutil.rmtree(path.parent, ignore_errors=True)
@@ -0,0 +1,78 @@
+"""Pluggable sources ingested next to the JHU global time series.
+
+Every source is a SourcePlugin: it lists the files it publishes, fetches the
+ones that may have changed concurrently, and loads the ones whose content
+changed into its own DuckDB tables, tracking both per file. Sources are
+enabled by name with IngestionConfig.sources and run by
+CovidDataIngestion.download_sources and load_sources.
+
+Available sources (SOURCE_PLUGINS):
+    daily_reports: DailyReportsSource, one JHU daily report per day loaded
+        into raw_daily_reports whatever its header layout
+    us_time_series: USTimeSeriesSource, the JHU US county series loaded into
+        dim_us_county, raw_us_confirmed and raw_us_deaths
+
+Usage Example:
+    config = IngestionConfig.default_config()
+    config.sources = ('daily_reports', 'us_time_series')
+    ingestion = CovidDataIngestion(config)
+    ingestion.download_sources()
+    ingestion.load_sources()
+
+    # A source of your own, e.g. a single day of reports
+    ingestion = CovidDataIngestion(
+        config, sources=[DailyReportsSource(config, start_date=date(2023, 3, 9))]
+    )
+"""
+
+# Built-in imports
+from typing import Dict, List, Optional, Type
+import logging
+
+# Local imports
+from ...config.ingestion_config import IngestionConfig
+from .base import LoadedFile, SourceFile, SourceLoadResult, SourcePlugin
+from .daily_reports import DailyReportsSource
+from .us_time_series import USTimeSeriesSource
+
+
+# Sources that can be enabled by name in IngestionConfig.sources
+SOURCE_PLUGINS: Dict[str, Type[SourcePlugin]] = {
+    DailyReportsSource.name: DailyReportsSource,
+    USTimeSeriesSource.name: USTimeSeriesSource,
+}
+
+
+def create_sources(
+    config: IngestionConfig, logger: Optional[logging.Logger] = None
+) -> List[SourcePlugin]:
+    """Instantiate the sources enabled in a configuration.
+
+    Args:
+        config: Configuration whose sources are created, in order
+        logger: Logger handed to every source
+
+    Returns:
+        List[SourcePlugin]: One source per name in config.sources
+
+    Raises:
+        ValueError: If a name is not in SOURCE_PLUGINS
+    """
+    unknown = [name for name in config.sources if name not in SOURCE_PLUGINS]
+    if unknown:
+        raise ValueError(
+            f"Unknown sources {unknown}. Supported sources: {list(SOURCE_PLUGINS)}"
+        )
+    return [SOURCE_PLUGINS[name](config, logger) for name in config.sources]
+
+
+__all__ = [
+    'DailyReportsSource',
+    'LoadedFile',
+    'SOURCE_PLUGINS',
+    'SourceFile',
+    'SourceLoadResult',
+    'SourcePlugin',
+    'USTimeSeriesSource',
+    'create_sources',
+]
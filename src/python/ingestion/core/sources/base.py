@@ -0,0 +1,420 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+import re
+
+# Local imports
+from ...config.ingestion_config import IngestionConfig
+from ..downloader import DataDownloader, DownloadResult
+from ..fetch_metadata import FetchMetadata, FetchMetadataStore
+from ..load_manifest import fingerprint_file
+
+
+# Table recording which file of which source the tables were loaded from
+SOURCE_FILES_TABLE = '_source_files'
+# Number of changed files loaded per transaction, which bounds the memory of
+# a backfill of a source publishing one file per day
+LOAD_BATCH_FILES = 250
+
+
+@dataclass
+class SourceFile:
+    """A file published by a source.
+
+    Attributes:
+        key: Identifier of the file within its source (e.g. '01-22-2020'),
+            under which its fetch metadata and load are recorded
+        url: URL the file is fetched from
+        path: Local path of the fetched copy
+    """
+
+    key: str
+    url: str
+    path: Path
+
+
+@dataclass
+class LoadedFile:
+    """Outcome of loading one file of a source.
+
+    Attributes:
+        rows: Number of rows the file loaded
+        header_version: Layout of the file's header, for sources whose
+            header changed over time ('' if the source has a single one)
+    """
+
+    rows: int
+    header_version: str = ''
+
+
+@dataclass
+class SourceLoadResult:
+    """Outcome of loading a source into DuckDB.
+
+    Attributes:
+        source: Name of the source
+        files_loaded: Keys of the files loaded, because they are new or
+            changed since their last load
+        files_skipped: Number of files already loaded with the same content
+        rows_loaded: Number of rows loaded from the files
+        header_versions: Number of loaded files per header layout
+    """
+
+    source: str
+    files_loaded: List[str] = field(default_factory=list)
+    files_skipped: int = 0
+    rows_loaded: int = 0
+    header_versions: Dict[str, int] = field(default_factory=dict)
+
+
+class SourcePlugin(ABC):
+    """A source of files ingested next to the global time series.
+
+    A source lists the files it publishes (files), fetches the ones that may
+    have changed concurrently with conditional requests (fetch) and loads
+    the ones whose content changed since their last load into its DuckDB
+    tables (load). Both steps are tracked per file: the fetch metadata of
+    every file is kept in the source's directory of raw files, and the
+    content hash of the last loaded copy in the _source_files table, so a
+    source publishing a thousand files only downloads and loads the few
+    that changed.
+
+    Subclasses name the source and its tables, and implement files and
+    load_files; fetch_candidates narrows down the files worth requesting.
+
+    Attributes:
+        name (str): Name of the source, also its directory of raw files
+        tables (Tuple[str, ...]): DuckDB tables the source loads
+        missing_ok (bool): Whether a listed file may not be published yet
+            (404 Not Found), e.g. the report of the current day
+        config (IngestionConfig): Settings for paths, downloads and the
+            revision window
+        logger (logging.Logger): Logger used to report fetches and loads
+
+    Example:
+        >>> source = DailyReportsSource(config)
+        >>> source.fetch(downloader)
+        >>> result = source.load(conn)
+        >>> result.files_loaded
+        ['03-09-2023']
+    """
+
+    name: str = ''
+    tables: Tuple[str, ...] = ()
+    missing_ok: bool = False
+
+    def __init__(self, config: IngestionConfig, logger: Optional[logging.Logger] = None):
+        """Initialize the source.
+
+        Args:
+            config: Ingestion configuration the source's paths and download
+                settings are taken from
+            logger: Logger for fetches and loads, module logger if None
+        """
+        self.config = config
+        self.logger = logger or logging.getLogger(__name__)
+
+    @property
+    def raw_data_path(self) -> Path:
+        """Directory of the source's raw files, inside the raw data directory."""
+        return self.config.raw_data_path / self.name
+
+    @property
+    def fetch_metadata_path(self) -> Path:
+        """Location of the fetch metadata of the source's files."""
+        return self.raw_data_path / 'fetch_metadata.json'
+
+    @abstractmethod
+    def files(self) -> List[SourceFile]:
+        """List every file the source publishes.
+
+        Returns:
+            List[SourceFile]: Files of the source, in load order
+        """
+
+    def fetch_candidates(
+        self, files: List[SourceFile], fetched: Dict[str, FetchMetadata]
+    ) -> List[SourceFile]:
+        """Select the files worth requesting, every one by default.
+
+        Args:
+            files: Every file of the source
+            fetched: Metadata of the files whose fetched copy is on disk
+
+        Returns:
+            List[SourceFile]: Files to request (conditionally if fetched)
+        """
+        return files
+
+    @abstractmethod
+    def load_files(
+        self, conn: duckdb.DuckDBPyConnection, files: List[SourceFile]
+    ) -> Dict[str, LoadedFile]:
+        """Replace the rows of some files in the source's tables.
+
+        Called inside a transaction, so a failed batch leaves the tables and
+        the _source_files table as they were.
+
+        Args:
+            conn: Open DuckDB connection
+            files: Fetched files to (re)load
+
+        Returns:
+            Dict[str, LoadedFile]: Outcome per file key
+        """
+
+    def fetch(self, downloader: DataDownloader) -> Dict[str, DownloadResult]:
+        """Download the files that may have changed, all at the same time.
+
+        Files whose previous copy is still on disk are requested
+        conditionally, so unchanged ones cost a 304 Not Modified.
+
+        Args:
+            downloader: Downloader whose pool the files are fetched with
+
+        Returns:
+            Dict[str, DownloadResult]: Download outcome per file key, without
+                the files upstream has not published (see missing_ok)
+
+        Raises:
+            RequestException: If a download fails after all retries
+        """
+        self.raw_data_path.mkdir(parents=True, exist_ok=True)
+        files = self.files()
+        store = FetchMetadataStore(self.fetch_metadata_path)
+        fetched = self._fetched(files, store)
+        candidates = self.fetch_candidates(files, fetched)
+        self.logger.info(
+            f"Fetching {len(candidates)} of the {len(files)} files of the {self.name} source"
+        )
+
+        results = downloader.download_all(
+            {source_file.key: (source_file.url, source_file.path) for source_file in candidates},
+            {
+                source_file.key: fetched[source_file.key]
+                for source_file in candidates
+                if source_file.key in fetched
+            },
+            missing_ok=self.missing_ok,
+        )
+        for key, result in results.items():
+            store.set(
+                key,
+                FetchMetadata(
+                    url=result.url,
+                    path=str(result.path),
+                    etag=result.etag,
+                    last_modified=result.last_modified,
+                    content_length=result.content_length,
+                    content_hash=result.content_hash,
+                    fetched_at=datetime.now().isoformat(),
+                ),
+            )
+        store.save()
+        return results
+
+    def load(self, conn: duckdb.DuckDBPyConnection) -> SourceLoadResult:
+        """Load the fetched files whose content changed since their last load.
+
+        Content hashes come from the fetch metadata (files copied into the
+        directory by hand are hashed). Changed files are loaded in batches of
+        LOAD_BATCH_FILES, each batch in one transaction with its entries of
+        the _source_files table.
+
+        Args:
+            conn: Open DuckDB connection
+
+        Returns:
+            SourceLoadResult: Files loaded and skipped, and rows loaded
+
+        Raises:
+            Exception: If a batch fails to load (it is rolled back)
+        """
+        ensure_source_files_table(conn)
+        loaded_hashes = get_loaded_hashes(conn, self.name)
+        store = FetchMetadataStore(self.fetch_metadata_path)
+        result = SourceLoadResult(source=self.name)
+
+        changed: List[Tuple[SourceFile, str]] = []
+        for source_file in self.files():
+            if not source_file.path.exists():
+                continue
+            metadata = store.get(source_file.key)
+            content_hash = (
+                metadata.content_hash
+                if metadata is not None and Path(metadata.path) == source_file.path
+                else fingerprint_file(source_file.path).content_hash
+            )
+            if loaded_hashes.get(source_file.key) == content_hash:
+                result.files_skipped += 1
+            else:
+                changed.append((source_file, content_hash))
+
+        for start in range(0, len(changed), LOAD_BATCH_FILES):
+            batch = changed[start:start + LOAD_BATCH_FILES]
+            conn.begin()
+            try:
+                loaded = self.load_files(conn, [source_file for source_file, _ in batch])
+                entries = []
+                for source_file, content_hash in batch:
+                    loaded_file = loaded.get(source_file.key, LoadedFile(rows=0))
+                    entries.append((source_file.key, content_hash, loaded_file))
+                    result.files_loaded.append(source_file.key)
+                    result.rows_loaded += loaded_file.rows
+                    result.header_versions[loaded_file.header_version] = (
+                        result.header_versions.get(loaded_file.header_version, 0) + 1
+                    )
+                record_source_files(conn, self.name, entries)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                self.logger.error(f"Error loading files of the {self.name} source: {str(e)}")
+                raise
+
+        self.logger.info(
+            f"Loaded {len(result.files_loaded)} files ({result.rows_loaded} rows) of the "
+            f"{self.name} source, {result.files_skipped} unchanged"
+        )
+        return result
+
+    def _fetched(
+        self, files: List[SourceFile], store: FetchMetadataStore
+    ) -> Dict[str, FetchMetadata]:
+        """Fetch metadata of the files whose fetched copy is still on disk."""
+        fetched = {}
+        for source_file in files:
+            metadata = store.get(source_file.key)
+            if metadata is not None and Path(metadata.path).exists():
+                fetched[source_file.key] = metadata
+        return fetched
+
+
+def normalize_column_name(name: str, aliases: Optional[Dict[str, str]] = None) -> str:
+    """Map a header name to its snake_case form, tolerant of JHU's spellings.
+
+    Case, separators (spaces, slashes, dashes, underscores) and a leading
+    byte order mark are ignored, so 'Province/State' and 'Province_State'
+    both become 'province_state' and 'Long_' becomes 'long'.
+
+    Args:
+        name: Column name as written in the header
+        aliases: Names that mean the same column, e.g. {'latitude': 'lat'}
+
+    Returns:
+        str: Canonical column name
+
+    Example:
+        >>> normalize_column_name('Case-Fatality_Ratio')
+        'case_fatality_ratio'
+    """
+    normalized = re.sub(r'[^a-z0-9]+', '_', name.lstrip('\ufeff').strip().lower()).strip('_')
+    return (aliases or {}).get(normalized, normalized)
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a column name as a SQL identifier."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def string_list(values: List[str]) -> str:
+    """Render values as a comma-separated list of SQL string literals."""
+    return ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+
+
+def cast_text(value: str, storage_type: str, timestamp_formats: Tuple[str, ...] = ()) -> str:
+    """Build the SQL converting a column read as text to its storage type.
+
+    Values that do not convert (e.g. an empty count) become NULL rather than
+    failing the load, and blank strings become NULL.
+
+    Args:
+        value: SQL expression of the text value
+        storage_type: DuckDB type to convert to
+        timestamp_formats: strptime formats tried for TIMESTAMP values that
+            are not ISO timestamps
+
+    Returns:
+        str: SQL expression of the converted value
+
+    Example:
+        >>> cast_text('"Confirmed"', 'INTEGER')
+        'try_cast(try_cast("Confirmed" AS DOUBLE) AS INTEGER)'
+    """
+    if storage_type == 'VARCHAR':
+        return f"nullif(trim({value}), '')"
+    if storage_type == 'TIMESTAMP':
+        formats = ', '.join(f"'{fmt}'" for fmt in timestamp_formats)
+        return f"coalesce(try_cast({value} AS TIMESTAMP), try_strptime({value}, [{formats}]))"
+    # Counts and FIPS codes are sometimes written as decimals (e.g. '1001.0')
+    return f"try_cast(try_cast({value} AS DOUBLE) AS {storage_type})"
+
+
+def ensure_source_files_table(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the table of loaded source files if it does not exist yet.
+
+    Args:
+        conn: Open DuckDB connection
+    """
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {SOURCE_FILES_TABLE} (
+            source VARCHAR,
+            file_key VARCHAR,
+            content_hash VARCHAR,
+            row_count BIGINT,
+            header_version VARCHAR,
+            loaded_at TIMESTAMP,
+            PRIMARY KEY (source, file_key)
+        )"""
+    )
+
+
+def get_loaded_hashes(conn: duckdb.DuckDBPyConnection, source: str) -> Dict[str, str]:
+    """Return the content hash of the last loaded copy of every file of a source.
+
+    Args:
+        conn: Open DuckDB connection
+        source: Name of the source
+
+    Returns:
+        Dict[str, str]: Content hash per file key
+    """
+    ensure_source_files_table(conn)
+    rows = conn.execute(
+        f"SELECT file_key, content_hash FROM {SOURCE_FILES_TABLE} WHERE source = ?",
+        [source],
+    ).fetchall()
+    return dict(rows)
+
+
+def record_source_files(
+    conn: duckdb.DuckDBPyConnection,
+    source: str,
+    entries: List[Tuple[str, str, LoadedFile]],
+) -> None:
+    """Record that a source's tables now hold the content of some of its files.
+
+    Args:
+        conn: Open DuckDB connection
+        source: Name of the source
+        entries: Key, content hash of the loaded copy, and outcome of the
+            load of every file
+    """
+    ensure_source_files_table(conn)
+    loaded_at = datetime.now()
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {SOURCE_FILES_TABLE} VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            [
+                source, file_key, content_hash,
+                loaded_file.rows, loaded_file.header_version, loaded_at,
+            ]
+            for file_key, content_hash, loaded_file in entries
+        ],
+    )
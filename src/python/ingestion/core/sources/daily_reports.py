@@ -0,0 +1,325 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+# Local imports
+from ...config.ingestion_config import IngestionConfig
+from ...utils.csv_readers import read_header
+from ...utils.storage_schema import COUNT_TYPE
+from ..fetch_metadata import FetchMetadata
+from .base import (
+    LoadedFile,
+    SourceFile,
+    SourcePlugin,
+    cast_text,
+    normalize_column_name,
+    quote_identifier,
+    string_list,
+)
+
+
+# Directory of the daily reports, next to the time series in the JHU repository
+DAILY_REPORTS_DIR = 'csse_covid_19_daily_reports'
+# First and last day JHU published a daily report for
+FIRST_REPORT_DATE = date(2020, 1, 22)
+LAST_REPORT_DATE = date(2023, 3, 9)
+# Format of the report names (e.g. 01-22-2020.csv)
+REPORT_DATE_FORMAT = '%m-%d-%Y'
+# Storage type of each column of raw_daily_reports, after the report date and
+# the file it was loaded from
+DAILY_REPORT_SCHEMA = {
+    'fips': 'INTEGER',
+    'admin2': 'VARCHAR',
+    'province_state': 'VARCHAR',
+    'country_region': 'VARCHAR',
+    'last_update': 'TIMESTAMP',
+    'lat': 'REAL',
+    'long': 'REAL',
+    'confirmed': COUNT_TYPE,
+    'deaths': COUNT_TYPE,
+    'recovered': COUNT_TYPE,
+    'active': COUNT_TYPE,
+    'combined_key': 'VARCHAR',
+    'incident_rate': 'DOUBLE',
+    'case_fatality_ratio': 'DOUBLE',
+}
+# Other names the columns went by (after normalize_column_name)
+DAILY_REPORT_ALIASES = {
+    'latitude': 'lat',
+    'longitude': 'long',
+    'incidence_rate': 'incident_rate',
+}
+# Columns without which a report cannot be loaded
+REQUIRED_COLUMNS = ['country_region', 'confirmed']
+# Header layouts of the reports, newest first, each identified by the columns
+# it added:
+# - v1 (January 2020): Province/State, Country/Region, Last Update and counts
+# - v2 (March 2020): coordinates as Latitude/Longitude
+# - v3 (22 March 2020): county rows (FIPS, Admin2), snake_case names, Lat/Long_
+# - v4 (late May 2020): Incidence_Rate/Case-Fatality_Ratio, later renamed
+HEADER_VERSIONS = [
+    ('v4', {'incident_rate', 'case_fatality_ratio'}),
+    ('v3', {'fips', 'admin2', 'active', 'combined_key'}),
+    ('v2', {'lat', 'long'}),
+    ('v1', set()),
+]
+# Formats of Last Update other than ISO timestamps (e.g. '1/22/2020 17:00'),
+# two-digit years first: '%Y' would read '3/22/20' as the year 20
+LAST_UPDATE_FORMATS = ('%m/%d/%y %H:%M', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S')
+
+
+class DailyReportsSource(SourcePlugin):
+    """JHU CSSE daily reports: one file per day, down to US counties.
+
+    Each report holds the cumulative counts of every location on its day,
+    about 4,000 rows once US counties were added (v3), and the header of the
+    reports changed four times (see HEADER_VERSIONS). All reports are loaded
+    into raw_daily_reports with one schema (DAILY_REPORT_SCHEMA): the files
+    of a batch are read by DuckDB, one scan per header layout, and stacked
+    matching columns by name; each header name is mapped to its canonical
+    column whatever its spelling (see normalize_column_name), columns
+    missing from a layout are NULL and unknown ones are ignored with a
+    warning.
+
+    Published reports rarely change, so after the first backfill only the
+    reports of the last revision_window_days are requested again; the
+    others are kept as fetched.
+
+    Attributes:
+        base_url (str): URL of the directory of the reports
+        start_date (date): First report fetched
+        end_date (date): Last report fetched
+
+    Example:
+        >>> source = DailyReportsSource(config, start_date=date(2023, 3, 1))
+        >>> source.fetch(downloader)
+        >>> source.load(conn).header_versions
+        {'v4': 9}
+    """
+
+    name = 'daily_reports'
+    tables = ('raw_daily_reports',)
+    missing_ok = True
+
+    def __init__(
+        self,
+        config: IngestionConfig,
+        logger: Optional[logging.Logger] = None,
+        start_date: date = FIRST_REPORT_DATE,
+        end_date: date = LAST_REPORT_DATE,
+        base_url: Optional[str] = None,
+    ):
+        """Initialize the source.
+
+        Args:
+            config: Ingestion configuration
+            logger: Logger for fetches and loads, module logger if None
+            start_date: First report fetched
+            end_date: Last report fetched
+            base_url: URL of the directory of the reports, the
+                csse_covid_19_daily_reports directory next to
+                config.base_url if None
+
+        Raises:
+            ValueError: If end_date is before start_date
+        """
+        super().__init__(config, logger)
+        if end_date < start_date:
+            raise ValueError(
+                f"Daily reports end ({end_date}) is before their start ({start_date})"
+            )
+        self.start_date = start_date
+        self.end_date = end_date
+        self.base_url = base_url or f"{config.base_url.rsplit('/', 1)[0]}/{DAILY_REPORTS_DIR}"
+
+    def files(self) -> List[SourceFile]:
+        """List the report of every day from start_date to end_date."""
+        files = []
+        for offset in range((self.end_date - self.start_date).days + 1):
+            key = (self.start_date + timedelta(days=offset)).strftime(REPORT_DATE_FORMAT)
+            files.append(
+                SourceFile(
+                    key=key,
+                    url=f"{self.base_url}/{key}.csv",
+                    path=self.raw_data_path / f"{key}.csv",
+                )
+            )
+        return files
+
+    def fetch_candidates(
+        self, files: List[SourceFile], fetched: Dict[str, FetchMetadata]
+    ) -> List[SourceFile]:
+        """Select the reports not fetched yet and the recent ones.
+
+        Args:
+            files: Report of every day
+            fetched: Metadata of the reports whose fetched copy is on disk
+
+        Returns:
+            List[SourceFile]: Reports never fetched, and fetched ones within
+                revision_window_days of the latest fetched report
+        """
+        if not fetched:
+            return files
+        latest = max(_report_date(key) for key in fetched)
+        cutoff = latest - timedelta(days=self.config.revision_window_days)
+        return [
+            source_file
+            for source_file in files
+            if source_file.key not in fetched or _report_date(source_file.key) > cutoff
+        ]
+
+    def load_files(
+        self, conn: duckdb.DuckDBPyConnection, files: List[SourceFile]
+    ) -> Dict[str, LoadedFile]:
+        """Replace the rows of some reports in raw_daily_reports.
+
+        Args:
+            conn: Open DuckDB connection
+            files: Fetched reports to (re)load
+
+        Returns:
+            Dict[str, LoadedFile]: Rows and header version per report
+
+        Raises:
+            ValueError: If a report lacks a required column
+        """
+        versions = {}
+        unknown = set()
+        # Reports sharing a header are read by one scan
+        layouts: Dict[Tuple[str, ...], List[SourceFile]] = {}
+        for source_file in files:
+            header = tuple(name.lstrip('\ufeff') for name in read_header(source_file.path))
+            columns = {normalize_column_name(name, DAILY_REPORT_ALIASES) for name in header}
+            missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+            if missing:
+                error_msg = f"Missing required columns in daily report {source_file.key}: {missing}"
+                self.logger.error(error_msg)
+                raise ValueError(error_msg)
+            unknown |= columns - set(DAILY_REPORT_SCHEMA)
+            versions[source_file.key] = header_version(columns)
+            layouts.setdefault(header, []).append(source_file)
+        if unknown:
+            self.logger.warning(f"Ignoring unknown daily report columns: {sorted(unknown)}")
+
+        conn.execute(f"CREATE TABLE IF NOT EXISTS raw_daily_reports ({_table_columns()})")
+        batch = 'daily_reports_batch'
+        # Every column is read as text with the header already known, which
+        # spares DuckDB sniffing each file, and the layouts are stacked by
+        # name, so every spelling of a column is its own column of the batch
+        conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE {batch} AS "
+            + " UNION ALL BY NAME ".join(
+                _read_reports_query(header, layout_files)
+                for header, layout_files in layouts.items()
+            )
+        )
+        batch_columns = [row[0] for row in conn.execute(f"DESCRIBE {batch}").fetchall()]
+        keys = string_list([source_file.key for source_file in files])
+        conn.execute(f"DELETE FROM raw_daily_reports WHERE source_file IN ({keys})")
+        conn.execute(
+            "INSERT INTO raw_daily_reports BY NAME "
+            + build_daily_reports_query(batch, batch_columns)
+        )
+        rows = dict(
+            conn.execute(
+                f"""SELECT source_file, count(*) FROM raw_daily_reports
+                WHERE source_file IN ({keys}) GROUP BY source_file"""
+            ).fetchall()
+        )
+        conn.execute(f"DROP TABLE {batch}")
+
+        return {
+            source_file.key: LoadedFile(
+                rows=rows.get(source_file.key, 0), header_version=versions[source_file.key]
+            )
+            for source_file in files
+        }
+
+
+def header_version(columns: set) -> str:
+    """Name the header layout of a daily report.
+
+    Args:
+        columns: Canonical column names of the report (see normalize_column_name)
+
+    Returns:
+        str: Newest layout (see HEADER_VERSIONS) whose added columns are all present
+
+    Example:
+        >>> header_version({'province_state', 'country_region', 'lat', 'long', 'confirmed'})
+        'v2'
+    """
+    for version, added_columns in HEADER_VERSIONS:
+        if added_columns <= columns:
+            return version
+    return HEADER_VERSIONS[-1][0]
+
+
+def build_daily_reports_query(relation: str, columns: List[str]) -> str:
+    """Build the SQL mapping daily reports of any header layout to raw_daily_reports.
+
+    Every column of DAILY_REPORT_SCHEMA coalesces the spellings of it found
+    in the relation (NULL if there are none) and is converted to its storage
+    type. Values that do not convert (e.g. an empty count) become NULL
+    rather than failing the load.
+
+    Args:
+        relation: Table of reports read as text, with the filename column
+            added by read_csv
+        columns: Column names of the relation
+
+    Returns:
+        str: SELECT statement producing the columns of raw_daily_reports
+
+    Example:
+        >>> build_daily_reports_query('batch', ['Province/State', 'Confirmed', 'filename'])
+    """
+    spellings: Dict[str, List[str]] = {}
+    for name in columns:
+        canonical = normalize_column_name(name, DAILY_REPORT_ALIASES)
+        spellings.setdefault(canonical, []).append(name)
+
+    selects = [
+        # The report's day is its name, Last Update is when JHU last changed a row
+        "strptime(regexp_extract(filename, '([^/\\\\]+)\\.csv$', 1), "
+        f"'{REPORT_DATE_FORMAT}')::DATE AS report_date",
+        "regexp_extract(filename, '([^/\\\\]+)\\.csv$', 1) AS source_file",
+    ]
+    for column, storage_type in DAILY_REPORT_SCHEMA.items():
+        names = spellings.get(column)
+        if not names:
+            selects.append(f"NULL::{storage_type} AS {column}")
+            continue
+        value = (
+            f"coalesce({', '.join(quote_identifier(name) for name in names)})"
+            if len(names) > 1
+            else quote_identifier(names[0])
+        )
+        selects.append(f"{cast_text(value, storage_type, LAST_UPDATE_FORMATS)} AS {column}")
+    return f"SELECT {', '.join(selects)} FROM {relation}"
+
+
+def _read_reports_query(header: Tuple[str, ...], files: List[SourceFile]) -> str:
+    """Build the SQL reading reports of one header as text columns."""
+    columns = ', '.join(f"{string_list([name])}: 'VARCHAR'" for name in header)
+    return f"""SELECT * FROM read_csv(
+        [{string_list([str(source_file.path) for source_file in files])}],
+        header = true, auto_detect = false, delim = ',', quote = '"', escape = '"',
+        null_padding = true, filename = true, columns = {{{columns}}}
+    )"""
+
+
+def _table_columns() -> str:
+    """Column definitions of raw_daily_reports."""
+    columns = {'report_date': 'DATE', 'source_file': 'VARCHAR', **DAILY_REPORT_SCHEMA}
+    return ', '.join(f"{column} {storage_type}" for column, storage_type in columns.items())
+
+
+def _report_date(key: str) -> date:
+    """Day of a report from its key."""
+    return datetime.strptime(key, REPORT_DATE_FORMAT).date()
@@ -0,0 +1,197 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from typing import Dict, List, Optional
+import logging
+import re
+
+# Local imports
+from ...config.ingestion_config import IngestionConfig
+from ...utils.csv_readers import read_header
+from ...utils.sql_transformation import SQL_DATE_FORMAT
+from ...utils.storage_schema import COUNT_TYPE
+from .base import (
+    LoadedFile,
+    SourceFile,
+    SourcePlugin,
+    cast_text,
+    normalize_column_name,
+    quote_identifier,
+    string_list,
+)
+
+
+# File of each US time series in the JHU time series directory
+US_TIME_SERIES_FILES = {
+    'confirmed': 'time_series_covid19_confirmed_US.csv',
+    'deaths': 'time_series_covid19_deaths_US.csv',
+}
+# Storage type of each column of dim_us_county, one row per county (or
+# other US location) keyed by the JHU UID
+US_COUNTY_SCHEMA = {
+    'uid': 'BIGINT',
+    'iso2': 'VARCHAR',
+    'iso3': 'VARCHAR',
+    'code3': 'INTEGER',
+    'fips': 'INTEGER',
+    'admin2': 'VARCHAR',
+    'province_state': 'VARCHAR',
+    'country_region': 'VARCHAR',
+    'lat': 'REAL',
+    'long': 'REAL',
+    'combined_key': 'VARCHAR',
+    'population': 'BIGINT',
+}
+# Date headers of the series (e.g. '1/22/20'); every other column describes
+# the location
+DATE_HEADER = re.compile(r'^\d{1,2}/\d{1,2}/\d{2}$')
+
+
+class USTimeSeriesSource(SourcePlugin):
+    """JHU CSSE US time series: cumulative counts of every US county.
+
+    The confirmed and deaths files hold one row per county (about 3,300)
+    and one column per day, and describe the counties with more columns
+    than the global series (UID, FIPS, Admin2, Combined_Key, and Population
+    in the deaths file only). The counties are kept once in dim_us_county,
+    and each series is unpivoted by DuckDB into raw_us_<data type> keyed by
+    (uid, date), about 3.8 million rows per file that never pass through
+    Python. Header names are matched whatever their spelling (e.g. Long_),
+    and a file that changed upstream replaces its table in one transaction.
+
+    Attributes:
+        base_url (str): URL of the directory of the series
+
+    Example:
+        >>> source = USTimeSeriesSource(config)
+        >>> source.fetch(downloader)
+        >>> source.load(conn).rows_loaded
+        7643154
+    """
+
+    name = 'us_time_series'
+    tables = ('dim_us_county',) + tuple(f"raw_us_{data_type}" for data_type in US_TIME_SERIES_FILES)
+
+    def __init__(
+        self,
+        config: IngestionConfig,
+        logger: Optional[logging.Logger] = None,
+        base_url: Optional[str] = None,
+    ):
+        """Initialize the source.
+
+        Args:
+            config: Ingestion configuration
+            logger: Logger for fetches and loads, module logger if None
+            base_url: URL of the directory of the series, config.base_url
+                (the directory of the global series) if None
+        """
+        super().__init__(config, logger)
+        self.base_url = base_url or config.base_url
+
+    def files(self) -> List[SourceFile]:
+        """List the confirmed and deaths files."""
+        return [
+            SourceFile(
+                key=data_type,
+                url=f"{self.base_url}/{filename}",
+                path=self.raw_data_path / filename,
+            )
+            for data_type, filename in US_TIME_SERIES_FILES.items()
+        ]
+
+    def load_files(
+        self, conn: duckdb.DuckDBPyConnection, files: List[SourceFile]
+    ) -> Dict[str, LoadedFile]:
+        """Upsert the counties of some series and replace their tables.
+
+        Args:
+            conn: Open DuckDB connection
+            files: Fetched series to (re)load
+
+        Returns:
+            Dict[str, LoadedFile]: Rows loaded per series
+
+        Raises:
+            ValueError: If a series has no UID column or a non-numeric count
+        """
+        conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS dim_us_county (
+                {', '.join(f'{col} {col_type}' for col, col_type in US_COUNTY_SCHEMA.items())},
+                PRIMARY KEY (uid)
+            )"""
+        )
+        loaded = {}
+        for source_file in files:
+            loaded[source_file.key] = self._load_series(conn, source_file)
+        return loaded
+
+    def _load_series(self, conn: duckdb.DuckDBPyConnection, source_file: SourceFile) -> LoadedFile:
+        """Load one series into dim_us_county and raw_us_<data type>."""
+        data_type = source_file.key
+        header = read_header(source_file.path)
+        date_columns = [col for col in header if DATE_HEADER.match(col)]
+        # Location columns, by canonical name
+        location_columns = {
+            normalize_column_name(col): col for col in header if not DATE_HEADER.match(col)
+        }
+        if 'uid' not in location_columns:
+            error_msg = f"Missing required column UID in US {data_type} series"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        unknown = sorted(set(location_columns) - set(US_COUNTY_SCHEMA))
+        if unknown:
+            self.logger.warning(f"Ignoring unknown US {data_type} series columns: {unknown}")
+
+        wide = f"us_{data_type}_wide"
+        table_name = f"raw_us_{data_type}"
+        uid = cast_text(quote_identifier(location_columns['uid']), US_COUNTY_SCHEMA['uid'])
+        conn.execute(
+            f"""CREATE OR REPLACE TEMP TABLE {wide} AS
+            SELECT * FROM read_csv([{string_list([str(source_file.path)])}],
+                header = true, all_varchar = true)"""
+        )
+
+        # Counties described by the file are added or updated; columns the
+        # file lacks (Population in the confirmed file) are kept
+        county_columns = [col for col in US_COUNTY_SCHEMA if col in location_columns]
+        updates = ', '.join(f"{col} = excluded.{col}" for col in county_columns if col != 'uid')
+        conn.execute(
+            f"""INSERT INTO dim_us_county ({', '.join(county_columns)})
+            SELECT {', '.join(
+                cast_text(quote_identifier(location_columns[col]), US_COUNTY_SCHEMA[col])
+                for col in county_columns
+            )}
+            FROM {wide}
+            ON CONFLICT (uid) DO {f'UPDATE SET {updates}' if updates else 'NOTHING'}"""
+        )
+
+        date_list = ', '.join(map(quote_identifier, date_columns))
+        try:
+            conn.execute(
+                f"""CREATE OR REPLACE TABLE {table_name} AS
+                WITH unpivoted AS (
+                    UNPIVOT (SELECT {uid} AS uid, {date_list} FROM {wide})
+                    ON {date_list}
+                    INTO NAME date VALUE {data_type}
+                )
+                SELECT
+                    uid,
+                    strptime(date, '{SQL_DATE_FORMAT}')::DATE AS date,
+                    CAST({data_type} AS {COUNT_TYPE}) AS {data_type}
+                FROM unpivoted"""
+            )
+        except duckdb.ConversionException as e:
+            # Raised inside the load's transaction, which is rolled back
+            error_msg = f"Non-numeric values found in date columns of {source_file.path}: {e}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        conn.execute(f"DROP TABLE {wide}")
+
+        rows = conn.execute(f"SELECT count(*) FROM {table_name}").fetchone()[0]
+        self.logger.info(
+            f"Loaded {rows} rows of the US {data_type} series "
+            f"({len(date_columns)} days) into {table_name}"
+        )
+        return LoadedFile(rows=rows, header_version=f"{len(date_columns)} days")
@@ -0,0 +1,59 @@
+"""COVID-19 Reporting Query Service Module.
+
+This module serves the reporting models built by dbt over a local HTTP/JSON
+API, so dashboards and notebooks do not open the DuckDB file themselves.
+
+Main Components:
+    QueryService: Answers model queries with:
+        - A pool of read-only DuckDB connections, released when idle so loads
+          and dbt runs can write
+        - An LRU cache of results, refreshed once a load or dbt run has
+          written the database, and served as stale while one is writing
+    create_server / serve: Threaded HTTP server in front of the service
+
+Usage Examples:
+    # 1. Command line, after the pipeline has run
+    $ python -m src.python.ingestion.serving --port 8765
+    $ curl localhost:8765/models
+    $ curl 'localhost:8765/models/country_time_series?country=Italy&start=2021-01-01'
+    $ curl -X POST localhost:8765/cache/invalidate
+
+    # 2. In Python, without HTTP
+    from src.python.ingestion.config import ServingConfig
+    from src.python.ingestion.serving import QueryService
+
+    service = QueryService(ServingConfig.default_config())
+    result, status = service.query('global_daily_trends', {'start': '2021-01-01'})
+    print(result.columns, len(result.rows), status)  # [...] 797 'miss'
+
+Module Structure:
+    query_service.py - Model queries, parameters and caching
+        - QueryService: Runs and caches the model queries
+        - MODEL_QUERIES: Models and slices served, with their parameters
+        - QueryResult: Rows of a query and their JSON document
+    connection_pool.py - Read-only DuckDB connections
+        - ReadOnlyConnectionPool: Bounded pool, closed when idle
+    result_cache.py - Thread-safe LRU cache with hit and miss statistics
+        - LRUResultCache: Results by model and parameters
+    http_server.py - HTTP/JSON routes (/models, /models/<name>, /health,
+        /cache/invalidate)
+        - create_server: Binds a server to a service
+        - serve: Serves until interrupted
+"""
+
+# Local imports
+from .connection_pool import ReadOnlyConnectionPool
+from .http_server import create_server, serve
+from .query_service import MODEL_QUERIES, QueryResult, QueryService, ServiceUnavailableError
+from .result_cache import LRUResultCache
+
+__all__ = [
+    'LRUResultCache',
+    'MODEL_QUERIES',
+    'QueryResult',
+    'QueryService',
+    'ReadOnlyConnectionPool',
+    'ServiceUnavailableError',
+    'create_server',
+    'serve',
+]
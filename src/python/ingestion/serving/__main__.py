@@ -0,0 +1,44 @@
+# Built-in imports
+from typing import List, Optional
+import argparse
+import sys
+
+# Local imports
+from ..config.serving_config import ServingConfig
+from .http_server import serve
+
+
+def main(argv: Optional[List[str]] = None):
+    """Serve the reporting models over HTTP/JSON.
+
+    Args:
+        argv: Command-line arguments overriding the default ServingConfig
+
+    Example:
+        # From project root directory, after the pipeline has run
+        $ python -m src.python.ingestion.serving --port 8765
+
+        $ curl 'localhost:8765/models/country_time_series?country=Italy&start=2021-01-01'
+    """
+    defaults = ServingConfig.default_config()
+    parser = argparse.ArgumentParser(description="COVID-19 reporting query service")
+    parser.add_argument('--db-path', default=defaults.db_path)
+    parser.add_argument('--host', default=defaults.host)
+    parser.add_argument('--port', type=int, default=defaults.port)
+    parser.add_argument('--pool-size', type=int, default=defaults.pool_size)
+    parser.add_argument('--cache-size', type=int, default=defaults.cache_size)
+    args = parser.parse_args(argv or [])
+
+    serve(
+        ServingConfig(
+            db_path=args.db_path,
+            host=args.host,
+            port=args.port,
+            pool_size=args.pool_size,
+            cache_size=args.cache_size,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
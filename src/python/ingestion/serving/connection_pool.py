@@ -0,0 +1,210 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import logging
+import threading
+import time
+
+
+class ReadOnlyConnectionPool:
+    """Pool of read-only DuckDB connections shared by the query service threads.
+
+    The connections are cursors of a single read-only connection, so they
+    share one database instance and its buffer cache while each runs its own
+    query. At most `size` queries run at once; further callers wait for a
+    connection to be returned.
+
+    A read-only connection holds a shared lock on the database file, which
+    keeps a load or dbt run (the only writers) out. The pool therefore
+    closes every connection once none was used for idle_timeout_seconds,
+    and opening it waits with exponential backoff while a writer holds the
+    file.
+
+    Attributes:
+        db_path (str): Database file the connections read
+        size (int): Maximum number of connections in use at once
+
+    Example:
+        >>> pool = ReadOnlyConnectionPool('data/processed/covid_analysis_dev.duckdb')
+        >>> with pool.connection() as conn:
+        ...     conn.execute("SELECT count(*) FROM main_reporting.global_daily_trends").fetchone()
+        >>> pool.close()
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 4,
+        connect_timeout_seconds: float = 5.0,
+        idle_timeout_seconds: float = 2.0,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Create the pool; the database is opened by the first query.
+
+        Args:
+            db_path: Database file to read
+            size: Maximum number of connections in use at once
+            connect_timeout_seconds: How long to wait for the database while
+                another process holds its write lock
+            idle_timeout_seconds: How long unused connections stay open
+            logger: Logger for lock waits and closes, module logger if None
+
+        Raises:
+            ValueError: If size is not positive
+        """
+        if size < 1:
+            raise ValueError(f"Connection pool size must be positive, got {size}")
+        self.db_path = db_path
+        self.size = size
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # The read-only connection the pooled cursors belong to
+        self._database: Optional[duckdb.DuckDBPyConnection] = None
+        self._idle: List[duckdb.DuckDBPyConnection] = []
+        # Databases closed by close() while some of their cursors were in use
+        self._retired: List[duckdb.DuckDBPyConnection] = []
+        # Incremented every time the database is closed, so cursors of a
+        # closed database are not returned to the pool
+        self._generation = 0
+        self._in_use = 0
+        self._last_used = time.monotonic()
+        self._opens = 0
+        self._closed = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    @contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a connection for the duration of a block.
+
+        Yields:
+            duckdb.DuckDBPyConnection: Read-only connection, not to be shared
+                with other threads
+
+        Raises:
+            duckdb.IOException: If a writer still holds the database after
+                connect_timeout_seconds, or it cannot be opened at all
+        """
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    conn = self._open_database().cursor()
+                generation = self._generation
+                self._in_use += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.monotonic()
+                if generation == self._generation:
+                    self._idle.append(conn)
+                else:
+                    # The pool was closed while the connection was in use
+                    conn.close()
+                    if not self._in_use:
+                        for database in self._retired:
+                            database.close()
+                        self._retired = []
+            self._slots.release()
+
+    def close_idle(self) -> bool:
+        """Close every connection if none was used for idle_timeout_seconds.
+
+        Returns:
+            bool: Whether the connections were closed
+        """
+        with self._lock:
+            idle_for = time.monotonic() - self._last_used
+            if self._database is None or self._in_use or idle_for < self.idle_timeout_seconds:
+                return False
+            self._close_database()
+        self.logger.info(
+            f"Closed the connections to {self.db_path} after {idle_for:.1f}s without queries"
+        )
+        return True
+
+    def close(self) -> None:
+        """Close every connection and stop the idle reaper.
+
+        Connections in use are closed when they are returned. The pool can
+        still be used afterwards, reopening the database.
+        """
+        self._closed.set()
+        with self._lock:
+            self._close_database()
+
+    def stats(self) -> Dict[str, int]:
+        """Connections open and in use, and how many times the database was opened."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': len(self._idle) + self._in_use,
+                'in_use': self._in_use,
+                'opens': self._opens,
+            }
+
+    def _open_database(self) -> duckdb.DuckDBPyConnection:
+        """Open the database if needed, waiting while a writer holds it."""
+        if self._database is not None:
+            return self._database
+
+        deadline = time.monotonic() + self.connect_timeout_seconds
+        delay = 0.05
+        while True:
+            try:
+                self._database = duckdb.connect(self.db_path, read_only=True)
+                break
+            except duckdb.IOException as e:
+                if 'lock' not in str(e).lower() or time.monotonic() + delay > deadline:
+                    raise
+                self.logger.info(
+                    f"Database {self.db_path} is locked by a writer, retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+
+        self._opens += 1
+        self._closed.clear()
+        if self._reaper is None or not self._reaper.is_alive():
+            self._reaper = threading.Thread(
+                target=self._reap, name='connection-pool-reaper', daemon=True
+            )
+            self._reaper.start()
+        return self._database
+
+    def _close_database(self) -> None:
+        """Close the idle connections and the database (called holding the lock).
+
+        A database with cursors still in use is closed when the last of them
+        is returned.
+        """
+        for conn in self._idle:
+            conn.close()
+        self._idle = []
+        if self._database is not None:
+            if self._in_use:
+                self._retired.append(self._database)
+            else:
+                self._database.close()
+            self._database = None
+        self._generation += 1
+
+    def _reap(self) -> None:
+        """Release the database once the service stops querying it."""
+        while not self._closed.wait(self.idle_timeout_seconds / 2):
+            if self.close_idle():
+                return
@@ -0,0 +1,148 @@
+# Built-in imports
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+import json
+
+# Local imports
+from ..config.serving_config import ServingConfig
+from .query_service import QueryService, ServiceUnavailableError
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/JSON front end of the query service.
+
+    Routes:
+        GET /health - Cache and pool statistics
+        GET /models - Models and slices served, with their parameters
+        GET /models/<name>?country=..&start=..&end=..&limit=.. - Rows of a
+            model; the X-Cache header tells whether they came from the cache
+            (hit), a query (miss) or the cache while the database was being
+            written (stale)
+        POST /cache/invalidate - Drop every cached result
+    """
+
+    server: 'QueryHTTPServer'
+    # Keep-alive lets load-test clients reuse their connection
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately: with Nagle's algorithm the body
+    # would wait for the client's delayed ACK (~40ms) on every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+
+        if url.path == '/health':
+            self._send_json(200, {'status': 'ok', **service.stats()})
+        elif url.path == '/models':
+            self._send_json(200, {'models': service.models()})
+        elif url.path.startswith('/models/'):
+            model = url.path[len('/models/'):]
+            try:
+                result, status = service.query(model, dict(parse_qsl(url.query)))
+            except LookupError as e:
+                self._send_json(404, {'error': str(e)})
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+            except ServiceUnavailableError as e:
+                self._send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            except Exception as e:
+                service.logger.error(f"Query of {model} failed: {str(e)}")
+                self._send_json(500, {'error': str(e)})
+            else:
+                self._send_body(200, result.body, {'X-Cache': status})
+        else:
+            self._send_json(404, {'error': f"No route for {url.path}"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path == '/cache/invalidate':
+            self._send_json(200, {'invalidated': self.server.service.invalidate()})
+        else:
+            self._send_json(404, {'error': f"No route for {self.path}"})
+
+    def log_message(self, format, *args):
+        # One line per request would flood the ingestion log under load
+        self.server.service.logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(
+        self, status: int, document: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self._send_body(status, json.dumps(document).encode(), headers)
+
+    def _send_body(
+        self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class QueryHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering requests with a QueryService.
+
+    Attributes:
+        service (QueryService): Service answering the requests
+    """
+
+    daemon_threads = True
+
+    def __init__(self, service: QueryService, host: str, port: int):
+        super().__init__((host, port), QueryRequestHandler)
+        self.service = service
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, with the port actually bound."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def create_server(
+    service: QueryService, host: Optional[str] = None, port: Optional[int] = None
+) -> QueryHTTPServer:
+    """Bind an HTTP server to a query service, without starting it.
+
+    Args:
+        service: Service answering the requests
+        host: Interface to listen on, the service's configured host if None
+        port: Port to listen on (0 for any free port), the configured port if None
+
+    Returns:
+        QueryHTTPServer: Bound server; call serve_forever to handle requests
+
+    Example:
+        >>> server = create_server(QueryService(config), port=0)
+        >>> threading.Thread(target=server.serve_forever, daemon=True).start()
+        >>> requests.get(f"{server.url}/models/global_daily_trends").json()
+    """
+    return QueryHTTPServer(
+        service,
+        host if host is not None else service.config.host,
+        port if port is not None else service.config.port,
+    )
+
+
+def serve(config: Optional[ServingConfig] = None) -> None:
+    """Serve the reporting models until interrupted.
+
+    Args:
+        config: Optional configuration object. If None, uses default config
+    """
+    service = QueryService(config)
+    server = create_server(service)
+    service.logger.info(
+        f"Serving {service.config.db_path} on {server.url} "
+        f"({service.config.pool_size} connections, {service.config.cache_size} cached results)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        service.logger.info("Query service stopped")
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,411 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import json
+import os
+import threading
+
+# Local imports
+from ..config.serving_config import ServingConfig
+from ..utils.logging_setup import setup_logging
+from .connection_pool import ReadOnlyConnectionPool
+from .result_cache import LRUResultCache
+
+
+# Condition each query parameter adds to a query
+PARAMETER_FILTERS = {
+    'country': 'country_region = ?',
+    'start': 'date >= ?',
+    'end': 'date <= ?',
+}
+# Statuses of a served result: read from the cache, computed by a query, or
+# read from the cache although the database changed, because a writer held it
+CACHE_STATUSES = ['hit', 'miss', 'stale']
+
+
+class ServiceUnavailableError(Exception):
+    """The database cannot answer right now: it is locked, missing or not built."""
+
+
+@dataclass(frozen=True)
+class ModelQuery:
+    """A reporting model or slice the service answers.
+
+    Attributes:
+        relation: Schema-qualified table the rows are read from
+        description: What the rows hold, listed by the service
+        order_by: ORDER BY clause giving the rows a deterministic order
+        parameters: Query parameters the model accepts (see PARAMETER_FILTERS)
+        required: Parameters that must be given
+        columns: SELECT list
+        where: Condition applied before the parameters', if any
+    """
+
+    relation: str
+    description: str
+    order_by: str
+    parameters: Tuple[str, ...] = ()
+    required: Tuple[str, ...] = ()
+    columns: str = '*'
+    where: Optional[str] = None
+
+
+# Models and slices served, by name
+MODEL_QUERIES: Dict[str, ModelQuery] = {
+    'global_daily_trends': ModelQuery(
+        relation='main_reporting.global_daily_trends',
+        description='Worldwide daily totals and new cases with their 7-day average',
+        order_by='date',
+        parameters=('start', 'end'),
+    ),
+    'country_mortality_analysis': ModelQuery(
+        relation='main_reporting.country_mortality_analysis',
+        description='Mortality rate and rank of every country above 1000 cases',
+        order_by='total_cases DESC, country_region',
+        parameters=('country',),
+    ),
+    'top_countries_by_records': ModelQuery(
+        relation='main_reporting.top_countries_by_records',
+        description='The five countries with the most records',
+        order_by='record_count DESC, country_region',
+        parameters=('country',),
+    ),
+    'country_time_series': ModelQuery(
+        relation='main_analytics.daily_rollup',
+        description="Daily totals and new counts of one country",
+        order_by='date',
+        parameters=('country', 'start', 'end'),
+        required=('country',),
+        columns=(
+            'date, country_region, location_count, total_confirmed, total_deaths, '
+            'total_recovered, total_active, new_cases, new_deaths, new_recovered, '
+            'avg_growth_rate'
+        ),
+        where="grain = 'country'",
+    ),
+}
+
+
+@dataclass
+class QueryResult:
+    """Rows of a model query, with the JSON document served for them.
+
+    Attributes:
+        model: Name of the model or slice
+        parameters: Parameters the rows were selected with
+        columns: Column names, in SELECT order
+        rows: Selected rows, at most the configured max_rows
+        truncated: Whether rows beyond max_rows (or the limit) were left out
+        database_version: Version of the database file the rows were read
+            from (see QueryService.database_version)
+        body: JSON document of the result, encoded once and served as is
+    """
+
+    model: str
+    parameters: Dict[str, Any]
+    columns: List[str]
+    rows: List[Tuple[Any, ...]]
+    truncated: bool
+    database_version: Tuple[int, ...]
+    body: bytes = field(default=b'', repr=False)
+
+    def __post_init__(self):
+        if not self.body:
+            self.body = json.dumps(
+                {
+                    'model': self.model,
+                    'parameters': self.parameters,
+                    'columns': self.columns,
+                    'rows': self.rows,
+                    'row_count': len(self.rows),
+                    'truncated': self.truncated,
+                },
+                default=_json_default,
+            ).encode()
+
+
+class QueryService:
+    """Read-only query service over the reporting models of the DuckDB database.
+
+    Queries run on a pool of read-only connections (see
+    ReadOnlyConnectionPool), and their results are kept in an LRU cache
+    (see LRUResultCache). Each cached result records the version of the
+    database file it was read from: once a load or dbt run has written the
+    file, the next request for it runs the query again. While a writer still
+    holds the file, the previous result is served as stale instead of
+    failing the request.
+
+    Attributes:
+        config (ServingConfig): Database, pool and cache settings
+        pool (ReadOnlyConnectionPool): Connections the queries run on
+        cache (LRUResultCache): Results by model and parameters
+
+    Example:
+        >>> service = QueryService(ServingConfig.default_config())
+        >>> result, status = service.query('country_time_series', {'country': 'Italy'})
+        >>> result.columns[:2], status
+        (['date', 'country_region'], 'miss')
+        >>> service.close()
+    """
+
+    def __init__(self, config: Optional[ServingConfig] = None):
+        """Create the service; the database is opened by the first query.
+
+        Args:
+            config: Optional configuration object. If None, uses default config
+        """
+        self.config = config or ServingConfig.default_config()
+        self.logger = setup_logging(__name__)
+        self.pool = ReadOnlyConnectionPool(
+            self.config.db_path,
+            size=self.config.pool_size,
+            connect_timeout_seconds=self.config.connect_timeout_seconds,
+            idle_timeout_seconds=self.config.idle_timeout_seconds,
+            logger=self.logger,
+        )
+        self.cache: LRUResultCache[QueryResult] = LRUResultCache(self.config.cache_size)
+        self._lock = threading.Lock()
+        # Version of the database file the pool's connections were opened on
+        self._pool_version: Optional[Tuple[int, ...]] = None
+        self._stale_served = 0
+
+    def models(self) -> List[Dict[str, Any]]:
+        """Describe the models and slices the service answers.
+
+        Returns:
+            List[Dict[str, Any]]: Name, description and parameters of each model
+        """
+        return [
+            {
+                'name': name,
+                'description': query.description,
+                'parameters': list(query.parameters) + ['limit'],
+                'required': list(query.required),
+            }
+            for name, query in MODEL_QUERIES.items()
+        ]
+
+    def query(
+        self, model: str, parameters: Optional[Mapping[str, str]] = None
+    ) -> Tuple[QueryResult, str]:
+        """Return the rows of a model, from the cache if the database is unchanged.
+
+        Args:
+            model: Name of a model or slice of MODEL_QUERIES
+            parameters: Query parameters as strings: country, start and end
+                (ISO dates, inclusive) where the model accepts them, and
+                limit (at most max_rows)
+
+        Returns:
+            Tuple[QueryResult, str]: The result and how it was served, one of
+                CACHE_STATUSES
+
+        Raises:
+            LookupError: If the model is unknown
+            ValueError: If a parameter is unknown, missing or malformed
+            ServiceUnavailableError: If the database is missing, has not been
+                built by dbt yet, or a writer holds it past
+                connect_timeout_seconds with no cached result to serve
+        """
+        definition = MODEL_QUERIES.get(model)
+        if definition is None:
+            raise LookupError(
+                f"Unknown model '{model}', expected one of {list(MODEL_QUERIES)}"
+            )
+        values = self._parse_parameters(model, definition, parameters or {})
+        key = (model, tuple(sorted(values.items())))
+
+        version = self.database_version()
+        cached = self.cache.get(key)
+        if cached is not None and cached.database_version == version:
+            return cached, 'hit'
+
+        try:
+            result = self._run(model, definition, values, version)
+        except duckdb.IOException as e:
+            if 'lock' not in str(e).lower():
+                raise
+            if cached is not None:
+                self.logger.warning(
+                    f"Database {self.config.db_path} is being written, "
+                    f"serving the previous {model} result"
+                )
+                with self._lock:
+                    self._stale_served += 1
+                return cached, 'stale'
+            raise ServiceUnavailableError(
+                f"Database {self.config.db_path} is being written, try again later"
+            ) from e
+        except duckdb.CatalogException as e:
+            raise ServiceUnavailableError(
+                f"{definition.relation} does not exist yet, run the dbt models first"
+            ) from e
+
+        self.cache.put(key, result)
+        return result, 'miss'
+
+    def database_version(self) -> Tuple[int, ...]:
+        """Identify the current content of the database file.
+
+        The file (and its write-ahead log, if any) changes identity, size or
+        modification time whenever a load or dbt run writes to it.
+
+        Returns:
+            Tuple[int, ...]: Inode, size and modification time of the file and
+                its write-ahead log
+
+        Raises:
+            ServiceUnavailableError: If the database file does not exist
+        """
+        try:
+            stat = os.stat(self.config.db_path)
+        except FileNotFoundError as e:
+            raise ServiceUnavailableError(
+                f"Database {self.config.db_path} does not exist, run the pipeline first"
+            ) from e
+        version = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        try:
+            wal = os.stat(f"{self.config.db_path}.wal")
+            version += (wal.st_size, wal.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return version
+
+    def invalidate(self) -> int:
+        """Drop every cached result and close the connections.
+
+        Returns:
+            int: Number of results dropped
+        """
+        count = self.cache.clear()
+        self.pool.close()
+        self.logger.info(f"Query cache invalidated, {count} results dropped")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache and pool statistics and the number of stale results served."""
+        with self._lock:
+            stale_served = self._stale_served
+        return {
+            'database': self.config.db_path,
+            'cache': self.cache.stats(),
+            'pool': self.pool.stats(),
+            'stale_served': stale_served,
+        }
+
+    def close(self) -> None:
+        """Close the connections; the service reopens them if queried again."""
+        self.pool.close()
+
+    def _parse_parameters(
+        self, model: str, definition: ModelQuery, parameters: Mapping[str, str]
+    ) -> Dict[str, Any]:
+        """Check and convert the parameters of a query.
+
+        Args:
+            model: Name of the model
+            definition: Query of the model
+            parameters: Parameters as received
+
+        Returns:
+            Dict[str, Any]: Parameters converted to their types
+
+        Raises:
+            ValueError: If a parameter is unknown, missing or malformed
+        """
+        unknown = set(parameters) - set(definition.parameters) - {'limit'}
+        if unknown:
+            raise ValueError(
+                f"Unknown parameters {sorted(unknown)} for {model}, "
+                f"expected {list(definition.parameters) + ['limit']}"
+            )
+        missing = [name for name in definition.required if not parameters.get(name)]
+        if missing:
+            raise ValueError(f"Missing parameters {missing} for {model}")
+
+        values: Dict[str, Any] = {}
+        for name, value in parameters.items():
+            if name in ('start', 'end'):
+                try:
+                    values[name] = date.fromisoformat(value)
+                except ValueError:
+                    raise ValueError(f"Parameter {name} must be a YYYY-MM-DD date, got '{value}'")
+            elif name == 'limit':
+                if not value.isdigit() or not 0 < int(value) <= self.config.max_rows:
+                    raise ValueError(
+                        f"Parameter limit must be between 1 and {self.config.max_rows}, "
+                        f"got '{value}'"
+                    )
+                values[name] = int(value)
+            else:
+                values[name] = value
+        return values
+
+    def _run(
+        self,
+        model: str,
+        definition: ModelQuery,
+        values: Dict[str, Any],
+        version: Tuple[int, ...],
+    ) -> QueryResult:
+        """Run a model query on a pooled connection.
+
+        Args:
+            model: Name of the model
+            definition: Query of the model
+            values: Converted parameters
+            version: Version of the database file the query reads
+
+        Returns:
+            QueryResult: Selected rows
+        """
+        with self._lock:
+            if self._pool_version != version:
+                # Connections opened on an earlier file would read stale pages
+                self.pool.close()
+                self._pool_version = version
+
+        conditions = [definition.where] if definition.where else []
+        arguments = []
+        for name in definition.parameters:
+            if name in values:
+                conditions.append(PARAMETER_FILTERS[name])
+                arguments.append(values[name])
+        limit = values.get('limit', self.config.max_rows)
+
+        # One row past the limit tells whether rows were left out
+        query = f"SELECT {definition.columns} FROM {definition.relation}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {definition.order_by} LIMIT {limit + 1}"
+
+        with self.pool.connection() as conn:
+            cursor = conn.execute(query, arguments)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+
+        return QueryResult(
+            model=model,
+            parameters={
+                name: value.isoformat() if isinstance(value, date) else value
+                for name, value in values.items()
+            },
+            columns=columns,
+            rows=rows[:limit],
+            truncated=len(rows) > limit,
+            database_version=version,
+        )
+
+
+def _json_default(value: Any) -> Any:
+    """Convert the DuckDB values JSON cannot encode (dates, decimals)."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} values as JSON")
@@ -0,0 +1,97 @@
+# Built-in imports
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+import threading
+
+
+T = TypeVar('T')
+
+
+class LRUResultCache(Generic[T]):
+    """Thread-safe cache of query results, evicting the least recently used.
+
+    Attributes:
+        max_entries (int): Maximum number of results kept, 0 to cache nothing
+
+    Example:
+        >>> cache = LRUResultCache(max_entries=2)
+        >>> cache.put(('top_countries_by_records', ()), result)
+        >>> cache.get(('top_countries_by_records', ())) is result
+        True
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Create an empty cache.
+
+        Args:
+            max_entries: Maximum number of results kept, 0 to cache nothing
+
+        Raises:
+            ValueError: If max_entries is negative
+        """
+        if max_entries < 0:
+            raise ValueError(f"Cache size cannot be negative, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, T]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """Return the result cached under key, marking it as recently used.
+
+        Args:
+            key: Query name and parameters
+
+        Returns:
+            Optional[T]: Cached result, or None if there is none
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: T) -> None:
+        """Cache a result, evicting the least recently used one if full.
+
+        Args:
+            key: Query name and parameters
+            value: Result to cache
+        """
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> int:
+        """Drop every cached result.
+
+        Returns:
+            int: Number of results dropped
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the cache and its hit, miss and eviction counts."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+            }
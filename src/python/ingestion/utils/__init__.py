@@ -5,9 +5,15 @@ including logging setup, data validation, cleaning, and transformation operation
 
 Main Components:
     setup_logging: Configures logging with appropriate handlers and formatters
+    read_time_series_csv: Parses raw files with a pluggable reader backend
     validate_data: Performs validation checks on input data
     clean_data: Cleanses and standardizes data
+    validate_and_clean_data: Single-pass validation and cleaning used by the pipeline
     transform_time_series: Converts time series data from wide to long format
+    reshape_time_series: Vectorized wide-to-long reshape with compact dtypes
+    load_time_series_sql: Reads, cleans and unpivots a raw file inside DuckDB
+    raw_table_schema: Declared column types of the raw tables
+    upsert_locations: Assigns location_ids and maintains the dim_location table
 
 Usage Examples:
     # 1. Setting up logging
@@ -16,13 +22,23 @@ Usage Examples:
     logger = setup_logging(__name__)
     logger.info("Starting data processing")
 
-    # 2. Data validation and cleaning
+    # 2. Reading a raw file with the DuckDB reader backend
+    from ingestion.utils import read_time_series_csv
+
+    df = read_time_series_csv(Path('data/raw/confirmed_20240315.csv'), 'duckdb', logger)
+
+    # 3. Data validation and cleaning
     from ingestion.utils import validate_data, clean_data
     
     validate_data(df, data_type='confirmed', logger=logger)
     cleaned_df = clean_data(df, logger)
 
-    # 3. Time series transformation
+    # Or both in one pass, with the negative counts clamped per column
+    from ingestion.utils import validate_and_clean_data
+
+    cleaned_df, negatives = validate_and_clean_data(df, 'confirmed', logger)
+
+    # 4. Time series transformation
     from ingestion.utils import transform_time_series
     
     transformed_df = transform_time_series(
@@ -31,15 +47,44 @@ Usage Examples:
         logger=logger
     )
 
+    # 5. Vectorized reshape used by the ingestion pipeline
+    from ingestion.utils import reshape_time_series
+
+    long_df = reshape_time_series(cleaned_df, metric_name='confirmed', logger=logger)
+
+    # 6. Loading a raw file without pandas (SQL UNPIVOT ingestion mode)
+    from ingestion.utils import load_time_series_sql
+
+    load_time_series_sql(conn, path, 'confirmed', 'raw_confirmed', logger)
+
 Module Structure:
     logging_setup.py - Logging configuration utilities
+    csv_readers.py - CSV reader backends (pandas, DuckDB) for raw files
     data_validation.py - Data validation and cleaning functions
     data_transformation.py - Data reshaping and transformation utilities
+    sql_transformation.py - SQL (DuckDB UNPIVOT) equivalent of the pandas steps
+    storage_schema.py - Storage types of the raw tables written by both modes
+    locations.py - Surrogate location key and dim_location table
 """
 
 # Local imports
-from .data_transformation import transform_time_series
-from .data_validation import validate_data, clean_data
+from .csv_readers import read_time_series_csv
+from .data_transformation import transform_time_series, reshape_time_series
+from .data_validation import validate_data, clean_data, validate_and_clean_data
+from .sql_transformation import load_time_series_sql
+from .storage_schema import raw_table_schema
+from .locations import upsert_locations
 from .logging_setup import setup_logging
 
-__all__ = ['setup_logging', 'validate_data', 'clean_data', 'transform_time_series']
+__all__ = [
+    'setup_logging',
+    'read_time_series_csv',
+    'validate_data',
+    'clean_data',
+    'validate_and_clean_data',
+    'transform_time_series',
+    'reshape_time_series',
+    'load_time_series_sql',
+    'raw_table_schema',
+    'upsert_locations',
+]
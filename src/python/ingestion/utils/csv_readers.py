@@ -0,0 +1,156 @@
+# Global imports
+import pandas as pd
+import duckdb
+
+# Built-in imports
+from pathlib import Path
+from typing import Callable, Dict, List
+import csv
+import logging
+
+
+# Location identifiers in the JHU time series files
+GEO_COLUMNS = ['Province/State', 'Country/Region']
+# Coordinates of each location
+COORDINATE_COLUMNS = ['Lat', 'Long']
+
+
+def read_header(path: Path) -> List[str]:
+    """Read the column names from the first line of a CSV file.
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        List[str]: Column names in file order
+    """
+    with open(path, newline='') as f:
+        return next(csv.reader(f))
+
+
+def time_series_schema(columns: List[str]) -> Dict[str, str]:
+    """Build the explicit DuckDB schema of a JHU time series file.
+
+    Geographic columns are read as strings, coordinates as doubles and every
+    other (date) column as a 32-bit integer, so no type inference has to run
+    over the 1000+ date columns.
+
+    Args:
+        columns: Column names in file order
+
+    Returns:
+        Dict[str, str]: Mapping of column name to DuckDB type, in file order
+
+    Example:
+        >>> time_series_schema(['Province/State', 'Country/Region', 'Lat', 'Long', '1/22/20'])
+        {'Province/State': 'VARCHAR', 'Country/Region': 'VARCHAR',
+         'Lat': 'DOUBLE', 'Long': 'DOUBLE', '1/22/20': 'INTEGER'}
+    """
+    schema = {}
+    for col in columns:
+        if col in GEO_COLUMNS:
+            schema[col] = 'VARCHAR'
+        elif col in COORDINATE_COLUMNS:
+            schema[col] = 'DOUBLE'
+        else:
+            schema[col] = 'INTEGER'
+    return schema
+
+
+def read_csv_pandas(path: Path) -> pd.DataFrame:
+    """Read a time series file with pandas' default type inference.
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        pd.DataFrame: Wide-format data as parsed by ``pd.read_csv``
+    """
+    return pd.read_csv(path)
+
+
+def read_csv_duckdb(path: Path) -> pd.DataFrame:
+    """Read a time series file with DuckDB's multithreaded CSV reader.
+
+    The file is parsed with the explicit schema from time_series_schema, so
+    date columns come back as compact int32 columns (nullable Int32 where the
+    file has empty cells) instead of inferred int64/float64 columns.
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        pd.DataFrame: Wide-format data with the same columns as the file
+
+    Raises:
+        ValueError: If the file does not match the expected schema (e.g.
+            non-numeric values in a date column)
+    """
+    schema = time_series_schema(read_header(path))
+
+    # Use a private in-memory connection so concurrent readers never share state
+    conn = duckdb.connect(':memory:')
+    try:
+        return conn.execute(
+            f"SELECT * FROM read_csv(?, {duckdb_csv_options(schema)})", [str(path)]
+        ).df()
+    except duckdb.Error as e:
+        raise ValueError(f"Could not parse {path} with the time series schema: {e}")
+    finally:
+        conn.close()
+
+
+def duckdb_csv_options(schema: Dict[str, str]) -> str:
+    """Render ``read_csv`` options that parse a file with an explicit schema.
+
+    Type sniffing is disabled: with 1000+ columns it costs far more than the
+    parse itself.
+
+    Args:
+        schema: Mapping of column name to DuckDB type, in file order
+
+    Returns:
+        str: Options to splice into a ``read_csv(<path>, ...)`` call
+    """
+    columns = ", ".join(
+        f"'{_sql_string(name)}': '{col_type}'" for name, col_type in schema.items()
+    )
+    return f"header = true, auto_detect = false, columns = {{{columns}}}"
+
+
+def _sql_string(value: str) -> str:
+    """Escape a value for use inside a single-quoted SQL string literal."""
+    return value.replace("'", "''")
+
+
+# Available reader backends, selected by IngestionConfig.csv_reader
+CSV_READERS: Dict[str, Callable[[Path], pd.DataFrame]] = {
+    'pandas': read_csv_pandas,
+    'duckdb': read_csv_duckdb,
+}
+
+
+def read_time_series_csv(path: Path, reader: str, logger: logging.Logger) -> pd.DataFrame:
+    """Read a raw JHU time series file with the selected reader backend.
+
+    Args:
+        path: Path to the CSV file
+        reader: Name of the reader backend (see CSV_READERS)
+        logger: Logger instance for recording the read
+
+    Returns:
+        pd.DataFrame: Wide-format data (dates as columns)
+
+    Raises:
+        ValueError: If the reader backend is unknown or the file cannot be parsed
+
+    Example:
+        >>> df = read_time_series_csv(Path('data/raw/confirmed_20240315.csv'), 'duckdb', logger)
+    """
+    if reader not in CSV_READERS:
+        error_msg = f"Unknown CSV reader '{reader}', expected one of {list(CSV_READERS)}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    logger.info(f"Reading {path} with the {reader} reader")
+    return CSV_READERS[reader](path)
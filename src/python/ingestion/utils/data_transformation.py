@@ -1,4 +1,5 @@
-# Global import
+# Global imports
+import numpy as np
 import pandas as pd
 
 # Built-in import
@@ -59,3 +60,139 @@ def transform_time_series(
     except Exception as e:
         logger.error(f"Error transforming {metric_name} data: {str(e)}")
         raise
+
+
+# Columns identifying a location; every other column is a date
+ID_COLUMNS = ['Province/State', 'Country/Region', 'Lat', 'Long']
+# Geographic columns emitted as categoricals by reshape_time_series
+GEO_COLUMNS = ['Province/State', 'Country/Region']
+# Format of the JHU date headers (e.g. '1/22/20')
+DATE_FORMAT = '%m/%d/%y'
+
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def reshape_time_series(
+    df: pd.DataFrame, metric_name: str, logger: logging.Logger
+) -> pd.DataFrame:
+    """Vectorized wide-to-long reshape of COVID-19 time series data.
+
+    Produces the same rows, in the same order, as transform_time_series, but
+    parses each date header once (instead of once per location and day) and
+    builds the long frame directly from the underlying NumPy block with
+    repeat/tile instead of DataFrame.melt.
+
+    The output is also more compact:
+    - Province/State and Country/Region are categoricals with string
+      categories (non-string values such as the 0 left by clean_data are
+      stored as their string form, exactly as DuckDB stores them)
+    - Counts are int32 when every value is integral and fits, int64 when
+      integral but larger, and unchanged otherwise
+
+    Args:
+        df: DataFrame in wide format (dates as columns)
+        metric_name: Name of the metric (confirmed, deaths, recovered)
+        logger: Logger instance for recording transformation steps
+
+    Returns:
+        pd.DataFrame: Transformed DataFrame with columns:
+            - Province/State (category)
+            - Country/Region (category)
+            - Lat
+            - Long
+            - date (datetime)
+            - metric_name (value for the given date)
+
+    Raises:
+        Exception: If transformation fails (e.g., invalid date format)
+
+    Example:
+        >>> df_long = reshape_time_series(df_wide, 'confirmed', logger)
+    """
+    logger.info(f"Reshaping {metric_name} data from wide to long format")
+
+    date_cols = [col for col in df.columns if col not in ID_COLUMNS]
+    n_locations, n_dates = len(df), len(date_cols)
+
+    try:
+        # Parse each date header once (~1100 parses instead of ~300k)
+        dates = pd.to_datetime(pd.Index(date_cols), format=DATE_FORMAT)
+
+        # melt emits all locations for the first date, then the second date,
+        # and so on: ids are tiled, dates repeated, and the values block is
+        # read column by column (Fortran order)
+        long_df = pd.DataFrame(
+            {
+                'Province/State': _tile_categorical(df['Province/State'], n_dates),
+                'Country/Region': _tile_categorical(df['Country/Region'], n_dates),
+                'Lat': np.tile(df['Lat'].to_numpy(), n_dates),
+                'Long': np.tile(df['Long'].to_numpy(), n_dates),
+                'date': np.repeat(dates.to_numpy(), n_locations),
+                metric_name: _compact_counts(
+                    _values_block(df[date_cols]).ravel(order='F')
+                ),
+            }
+        )
+
+        logger.info(f"Successfully reshaped {metric_name} data")
+        return long_df
+
+    except Exception as e:
+        logger.error(f"Error reshaping {metric_name} data: {str(e)}")
+        raise
+
+
+def _tile_categorical(column: pd.Series, reps: int) -> pd.Categorical:
+    """Repeat a geo column as a categorical without materializing strings.
+
+    Args:
+        column: Values for each location
+        reps: Number of times the whole column is repeated
+
+    Returns:
+        pd.Categorical: Tiled column with string categories
+    """
+    # Only one value per location is converted; the tiling works on codes
+    values = [value if pd.isna(value) else str(value) for value in column]
+    categorical = pd.Categorical(values)
+    return pd.Categorical.from_codes(
+        np.tile(categorical.codes, reps), categories=categorical.categories
+    )
+
+
+def _values_block(date_df: pd.DataFrame) -> np.ndarray:
+    """Return the date columns as a single 2-D NumPy array.
+
+    Args:
+        date_df: The date columns of a wide frame
+
+    Returns:
+        np.ndarray: Array of shape (locations, dates)
+    """
+    # Nullable extension columns (e.g. Int32 from the DuckDB reader) would
+    # otherwise come back as a slow object array
+    if any(isinstance(dtype, pd.api.extensions.ExtensionDtype) for dtype in date_df.dtypes):
+        return date_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    return date_df.to_numpy()
+
+
+def _compact_counts(values: np.ndarray) -> np.ndarray:
+    """Downcast count values to the smallest lossless integer type.
+
+    Args:
+        values: 1-D array of counts
+
+    Returns:
+        np.ndarray: int32 if all values are integral and fit, int64 if they
+            are integral but larger, otherwise the input unchanged
+    """
+    if values.size == 0 or values.dtype.kind not in 'iuf':
+        return values
+    if values.dtype.kind == 'f' and not (
+        np.isfinite(values).all() and np.array_equal(values, np.trunc(values))
+    ):
+        return values
+
+    if values.min() >= INT32_MIN and values.max() <= INT32_MAX:
+        return values.astype(np.int32)
+    return values.astype(np.int64)
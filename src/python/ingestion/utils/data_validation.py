@@ -1,9 +1,14 @@
-# Global import
+# Global imports
+import numpy as np
 import pandas as pd
 
-# Built-in import
+# Built-in imports
+from typing import Dict, List, Optional, Tuple
 import logging
 
+# Local import
+from .data_transformation import ID_COLUMNS
+
 
 def validate_data(df: pd.DataFrame, data_type: str, logger: logging.Logger) -> None:
     """Validate the structure and content of COVID-19 data.
@@ -94,3 +99,135 @@ def clean_data(df: pd.DataFrame, logger: logging.Logger) -> pd.DataFrame:
 
     logger.info("Data cleaning completed successfully")
     return df
+
+
+def validate_and_clean_data(
+    df: pd.DataFrame,
+    data_type: str,
+    logger: logging.Logger,
+    date_columns: Optional[List[str]] = None,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """Validate and clean COVID-19 data in a single vectorized pass.
+
+    Produces the same frame, logs the same messages and raises the same
+    errors as validate_data followed by clean_data, but handles the date
+    columns as 2-D NumPy blocks (one per dtype, usually a single one) instead
+    of one Python-level iteration per column:
+    - The numeric check looks at the dtypes only (of an empty slice)
+    - Missing values are filled and negatives counted and clamped in place,
+      on one copy of each block instead of a copy per fillna and per .loc
+      assignment
+
+    The four identifier columns go through the same per-column steps as in
+    clean_data, so their values and dtypes match exactly (including the 0
+    left where a province is missing, and negative coordinates set to 0).
+
+    Args:
+        df: DataFrame containing COVID-19 data in wide format
+        data_type: Type of data being validated (confirmed, deaths, recovered)
+        logger: Logger instance for recording validation and cleaning results
+        date_columns: Date columns to clean and keep, all of them if None;
+            the whole frame is validated either way
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, int]]: Cleaned DataFrame, and the number
+            of negative values replaced in each column that had any
+
+    Raises:
+        ValueError: If required columns are missing or data types are incorrect
+
+    Example:
+        >>> cleaned_df, negatives = validate_and_clean_data(df, 'confirmed', logger)
+    """
+    logger.info(f"Validating {data_type} data")
+
+    missing_cols = [col for col in ID_COLUMNS if col not in df.columns]
+    if missing_cols:
+        error_msg = f"Missing required columns in {data_type} data: {missing_cols}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    date_cols = [col for col in df.columns if col not in ID_COLUMNS]
+
+    # Dtype check on an empty slice: same rules as validate_data, no data copied
+    non_numeric = df.iloc[:0][date_cols].select_dtypes(exclude=['number']).columns
+    if len(non_numeric) > 0:
+        error_msg = f"Non-numeric values found in date columns: {non_numeric}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    logger.info(f"Validation successful for {data_type} data")
+    logger.info("Starting data cleaning process")
+
+    # Column order of the result, as clean_data would return it
+    columns = list(df.columns)
+    if date_columns is not None:
+        date_cols = list(date_columns)
+        columns = ID_COLUMNS + date_cols
+
+    # Identifier columns: few and mixed-type, cleaned exactly like clean_data
+    ids = df[ID_COLUMNS].fillna(0)
+    negatives: Dict[str, int] = {}
+    for col in ids.iloc[:0].select_dtypes(include=['number']).columns:
+        mask = (ids[col] < 0).to_numpy()
+        if mask.any():
+            negatives[col] = int(mask.sum())
+            ids.loc[mask, col] = 0
+
+    # Date columns: one block per dtype, filled and clamped in place
+    blocks = []
+    dtypes = df.dtypes
+    for dtype in dtypes[date_cols].unique():
+        cols = [col for col in date_cols if dtypes[col] == dtype]
+        block_df, counts = _clean_block(df[cols], dtype)
+        blocks.append(block_df)
+        negatives.update({col: int(count) for col, count in zip(cols, counts) if count})
+    logger.info("Replaced missing values with 0")
+
+    for col in columns:
+        if col in negatives:
+            logger.warning(
+                f"Found {negatives[col]} negative values in {col}, replacing with 0"
+            )
+
+    cleaned = pd.concat([ids] + blocks, axis=1)
+    if list(cleaned.columns) != columns:
+        cleaned = cleaned.reindex(columns=columns)
+
+    cleaned['Country/Region'] = cleaned['Country/Region'].str.strip()
+    logger.info("Standardized country/region names")
+
+    logger.info("Data cleaning completed successfully")
+    return cleaned, negatives
+
+
+def _clean_block(block_df: pd.DataFrame, dtype) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Fill missing values and clamp negatives of same-dtype columns.
+
+    Args:
+        block_df: Columns sharing one numeric dtype; a copy of the input
+            frame's columns, so it can be modified
+        dtype: Their dtype
+
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray]: Cleaned columns with the same dtype,
+            and the number of negative values found in each column
+    """
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        # Nullable columns (e.g. Int32 from the DuckDB reader) keep their dtype
+        block_df = block_df.fillna(0)
+        mask = (block_df < 0).to_numpy(dtype=bool)
+        counts = mask.sum(axis=0)
+        if counts.any():
+            block_df = block_df.mask(mask, 0)
+        return block_df, counts
+
+    # A single-dtype frame is one block: no further copy is made here
+    values = block_df.to_numpy()
+    if values.dtype.kind == 'f':
+        values[np.isnan(values)] = 0
+    mask = values < 0
+    counts = mask.sum(axis=0)
+    if counts.any():
+        values[mask] = 0
+    return pd.DataFrame(values, index=block_df.index, columns=block_df.columns), counts
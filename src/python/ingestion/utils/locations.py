@@ -0,0 +1,136 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from typing import Optional, Tuple
+
+# Local import
+from .storage_schema import LOCATION_SCHEMA
+
+
+# Table holding one row per (country, province) with its surrogate key
+DIM_LOCATION_TABLE = 'dim_location'
+# Columns identifying a location
+LOCATION_KEY = ['Country/Region', 'Province/State']
+# Columns describing a location
+LOCATION_ATTRIBUTES = ['Lat', 'Long']
+# Data type whose coordinates are kept: the JHU files of different types
+# disagree on some locations' coordinates
+COORDINATES_DATA_TYPE = 'confirmed'
+
+
+def ensure_dim_location(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the dim_location table if it does not exist yet.
+
+    Args:
+        conn: Open DuckDB connection
+    """
+    columns = ",\n            ".join(
+        f'"{col}" {col_type}' for col, col_type in LOCATION_SCHEMA.items()
+    )
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {DIM_LOCATION_TABLE} (
+            {columns},
+            PRIMARY KEY (location_id)
+        )"""
+    )
+
+
+def upsert_locations(
+    conn: duckdb.DuckDBPyConnection, relation: str, data_type: Optional[str] = None
+) -> Tuple[int, int]:
+    """Add the new locations of a relation to dim_location.
+
+    Every (country, province) gets a location_id the first time it is seen,
+    and keeps it for good: ids are never reused or renumbered, so the raw
+    tables of different loads and data types always agree. New locations of
+    a load are numbered after the current largest id, in (country, province)
+    order, so both ingestion modes assign the same ids to the same data.
+    New locations take the coordinates of the relation; those of known
+    locations are only updated by loads of COORDINATES_DATA_TYPE, so they do
+    not depend on which data type was loaded last.
+
+    Args:
+        conn: Open DuckDB connection
+        relation: Table, view or subquery with the cleaned Province/State,
+            Country/Region, Lat and Long columns (one or more rows per location)
+        data_type: Data type of the relation, whose coordinates update known
+            locations if it is COORDINATES_DATA_TYPE
+
+    Returns:
+        Tuple[int, int]: Number of locations added and number updated
+    """
+    ensure_dim_location(conn)
+    key_match = _key_match('l', 's')
+    coordinates = ", ".join(
+        f'any_value("{col}")::{LOCATION_SCHEMA[col]} AS "{col}"' for col in LOCATION_ATTRIBUTES
+    )
+    keys = ", ".join(f'"{col}"::VARCHAR AS "{col}"' for col in LOCATION_KEY)
+    # One row per location of the relation
+    locations = f"(SELECT {keys}, {coordinates} FROM {relation} GROUP BY ALL)"
+
+    updated = 0
+    if data_type == COORDINATES_DATA_TYPE:
+        is_changed = " OR ".join(
+            f'l."{col}" IS DISTINCT FROM s."{col}"' for col in LOCATION_ATTRIBUTES
+        )
+        assignments = ", ".join(f'"{col}" = s."{col}"' for col in LOCATION_ATTRIBUTES)
+        updated = conn.execute(
+            f"""UPDATE {DIM_LOCATION_TABLE} AS l
+            SET {assignments}
+            FROM {locations} AS s
+            WHERE {key_match} AND ({is_changed})"""
+        ).fetchone()[0]
+
+    inserted = conn.execute(
+        f"""INSERT INTO {DIM_LOCATION_TABLE}
+        SELECT
+            (SELECT coalesce(max(location_id), 0) FROM {DIM_LOCATION_TABLE})
+                + row_number() OVER (ORDER BY "Country/Region", "Province/State")
+                AS location_id,
+            "Province/State", "Country/Region", "Lat", "Long"
+        FROM (
+            SELECT "Country/Region", "Province/State", "Lat", "Long"
+            FROM {locations} AS s
+            WHERE NOT EXISTS (SELECT 1 FROM {DIM_LOCATION_TABLE} AS l WHERE {key_match})
+        )"""
+    ).fetchone()[0]
+    return inserted, updated
+
+
+def with_location_ids(relation: str) -> str:
+    """Build a query replacing the location columns of a relation by location_id.
+
+    Every location of the relation must be in dim_location already (see
+    upsert_locations).
+
+    Args:
+        relation: Table, view or subquery with the Province/State,
+            Country/Region, Lat and Long columns
+
+    Returns:
+        str: Subquery with location_id followed by the relation's other
+            columns
+
+    Example:
+        >>> upsert_locations(conn, 'frame_view')
+        >>> conn.execute(f"SELECT * FROM {with_location_ids('frame_view')}")
+    """
+    location_columns = ", ".join(f'"{col}"' for col in LOCATION_KEY + LOCATION_ATTRIBUTES)
+    return f"""(
+        SELECT l.location_id, s.* EXCLUDE ({location_columns})
+        FROM {relation} AS s
+        JOIN {DIM_LOCATION_TABLE} AS l ON {_key_match('l', 's')}
+    )"""
+
+
+def _key_match(dim_alias: str, source_alias: str) -> str:
+    """Join condition of a relation to dim_location on the location key.
+
+    Keys are compared with IS NOT DISTINCT FROM so a missing country still
+    matches its location.
+    """
+    return " AND ".join(
+        f'{dim_alias}."{col}" IS NOT DISTINCT FROM {source_alias}."{col}"::VARCHAR'
+        for col in LOCATION_KEY
+    )
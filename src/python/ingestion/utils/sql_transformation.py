@@ -0,0 +1,194 @@
+# Global import
+import duckdb
+
+# Built-in imports
+from pathlib import Path
+from typing import List, Optional
+import logging
+
+# Local imports
+from .csv_readers import duckdb_csv_options, read_header, time_series_schema
+from .data_transformation import ID_COLUMNS
+from .locations import upsert_locations, with_location_ids
+from .storage_schema import cast_to_storage_schema
+
+
+# DuckDB strptime format of the JHU date headers (e.g. '1/22/20')
+SQL_DATE_FORMAT = '%m/%d/%y'
+
+
+def build_cleaned_query(
+    path: Path,
+    columns: List[str],
+    date_columns: Optional[List[str]] = None,
+) -> str:
+    """Build the SQL that reads and cleans a JHU time series file.
+
+    The query applies the same rules as clean_data, so it produces the same
+    values as the pandas path:
+    1. Missing provinces become '0' (clean_data fills every gap with 0)
+    2. Missing coordinates and counts become 0, negative ones are clamped to 0
+    3. Country/region names are stripped of surrounding whitespace
+
+    Args:
+        path: Path to the CSV file
+        columns: Column names of the file, in file order
+        date_columns: Date columns to keep, all of them if None. DuckDB
+            skips converting the other columns entirely
+
+    Returns:
+        str: SELECT statement producing the cleaned wide-format rows
+
+    Raises:
+        ValueError: If there are no date columns to keep
+
+    Example:
+        >>> sql = build_cleaned_query(path, read_header(path))
+    """
+    schema = time_series_schema(columns)
+    if date_columns is None:
+        date_columns = [col for col in columns if col not in ID_COLUMNS]
+    if not date_columns:
+        raise ValueError(f"No date columns to read from {path}")
+    path_literal = _string_list([str(path)])
+
+    return f"""
+        WITH source AS (
+            SELECT * FROM read_csv({path_literal}, {duckdb_csv_options(schema)})
+        )
+        SELECT
+            coalesce("Province/State", '0') AS "Province/State",
+            trim("Country/Region") AS "Country/Region",
+            greatest(coalesce("Lat", 0), 0) AS "Lat",
+            greatest(coalesce("Long", 0), 0) AS "Long",
+            greatest(coalesce(COLUMNS(c -> c IN ({_string_list(date_columns)})), 0), 0)
+        FROM source
+    """
+
+
+def build_unpivot_query(relation: str, metric_name: str, date_columns: List[str]) -> str:
+    """Build the SQL that unpivots keyed wide-format rows into a raw table.
+
+    Date columns are unpivoted into (date, metric) pairs, which are cast to
+    the storage schema (see cast_to_storage_schema). Rows come out
+    location-major (all dates of the first location, then the next one)
+    rather than in the date-major order of DataFrame.melt: restoring that
+    order would need a full sort of the long table, which costs more memory
+    than the rest of the load.
+
+    Args:
+        relation: Table, view or subquery with location_id and the date
+            columns (see with_location_ids)
+        metric_name: Name of the metric column (confirmed, deaths, recovered)
+        date_columns: Date columns to unpivot
+
+    Returns:
+        str: SELECT statement producing the long-format table
+
+    Raises:
+        ValueError: If there are no date columns to unpivot
+
+    Example:
+        >>> sql = build_unpivot_query(with_location_ids('cleaned'), 'confirmed', dates)
+        >>> conn.execute(f"CREATE TABLE raw_confirmed AS {sql}")
+    """
+    if not date_columns:
+        raise ValueError(f"No date columns to unpivot in {relation}")
+    date_list = ", ".join(_identifier(col) for col in date_columns)
+    return f"""
+        WITH unpivoted AS (
+            UNPIVOT {relation}
+            ON {date_list}
+            INTO NAME date VALUE {_identifier(metric_name)}
+        ), long_format AS (
+            SELECT
+                location_id,
+                strptime(date, '{SQL_DATE_FORMAT}') AS date,
+                {_identifier(metric_name)}
+            FROM unpivoted
+        )
+        {cast_to_storage_schema('long_format', metric_name)}
+    """
+
+
+def load_time_series_sql(
+    conn: duckdb.DuckDBPyConnection,
+    path: Path,
+    metric_name: str,
+    table_name: str,
+    logger: logging.Logger,
+    date_columns: Optional[List[str]] = None,
+    temporary: bool = False,
+) -> None:
+    """Load a JHU time series file into DuckDB entirely in SQL.
+
+    DuckDB reads, validates and cleans the file into a small temporary table
+    of wide rows (one per location), adds its new locations to dim_location
+    (see upsert_locations), then unpivots the rows keyed by location_id. The
+    data never passes through Python, and the resulting tables are identical
+    to the ones built by the pandas path (read, validate_data, clean_data,
+    reshape).
+
+    Args:
+        conn: Open DuckDB connection to load into
+        path: Path to the CSV file
+        metric_name: Name of the metric column (confirmed, deaths, recovered)
+        table_name: Name of the table to create or replace
+        logger: Logger instance for recording the load
+        date_columns: Date columns to load, all of them if None
+        temporary: Create a temporary table (used for incremental staging)
+
+    Raises:
+        ValueError: If required columns are missing, there are no date columns
+            to load or a date column contains non-numeric values
+
+    Example:
+        >>> load_time_series_sql(conn, path, 'confirmed', 'raw_confirmed', logger)
+    """
+    logger.info(f"Loading {metric_name} data into {table_name} with SQL UNPIVOT")
+
+    # Same structural check as validate_data, done on the header alone
+    columns = read_header(path)
+    missing_cols = [col for col in ID_COLUMNS if col not in columns]
+    if missing_cols:
+        error_msg = f"Missing required columns in {metric_name} data: {missing_cols}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    if date_columns is None:
+        date_columns = [col for col in columns if col not in ID_COLUMNS]
+    if not date_columns:
+        error_msg = f"No date columns to load in {metric_name} data from {path}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    cleaned_table = f"{table_name}_cleaned"
+    table_kind = "TEMP TABLE" if temporary else "TABLE"
+    try:
+        conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE {cleaned_table} AS "
+            f"{build_cleaned_query(path, columns, date_columns)}"
+        )
+        upsert_locations(conn, cleaned_table, metric_name)
+        conn.execute(
+            f"CREATE OR REPLACE {table_kind} {table_name} AS "
+            f"{build_unpivot_query(with_location_ids(cleaned_table), metric_name, date_columns)}"
+        )
+    except duckdb.ConversionException as e:
+        # The explicit schema rejects non-numeric counts while parsing
+        error_msg = f"Non-numeric values found in date columns of {path}: {e}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    finally:
+        conn.execute(f"DROP TABLE IF EXISTS {cleaned_table}")
+
+    logger.info(f"Successfully loaded {metric_name} data into {table_name}")
+
+
+def _identifier(name: str) -> str:
+    """Quote a column name as a SQL identifier."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _string_list(values: List[str]) -> str:
+    """Render values as a comma-separated list of SQL string literals."""
+    return ", ".join("'" + value.replace("'", "''") + "'" for value in values)
@@ -0,0 +1,71 @@
+# Built-in import
+from typing import Dict
+
+
+# Storage type of each key column of a raw (fact) table:
+# - Locations are referenced by their dim_location key (see locations.py)
+# - Dates are DATE: the series are daily, a timestamp only adds a zero time
+RAW_TABLE_SCHEMA = {
+    'location_id': 'INTEGER',
+    'date': 'DATE',
+}
+# Storage type of the metric column: cumulative counts fit a 32-bit integer
+# (the largest JHU value is ~1e8, the limit ~2.1e9)
+COUNT_TYPE = 'INTEGER'
+# Storage type of each column of the dim_location table:
+# - Geographic names are VARCHAR, stored once per location
+# - Coordinates are REAL: JHU publishes them with at most ~7 significant digits
+LOCATION_SCHEMA = {
+    'location_id': 'INTEGER',
+    'Province/State': 'VARCHAR',
+    'Country/Region': 'VARCHAR',
+    'Lat': 'REAL',
+    'Long': 'REAL',
+}
+
+
+def raw_table_schema(metric_name: str) -> Dict[str, str]:
+    """Declared storage schema of a raw table.
+
+    Args:
+        metric_name: Name of the metric column (confirmed, deaths, recovered)
+
+    Returns:
+        Dict[str, str]: Mapping of column name to DuckDB type, in table order
+
+    Example:
+        >>> raw_table_schema('confirmed')
+        {'location_id': 'INTEGER', 'date': 'DATE', 'confirmed': 'INTEGER'}
+    """
+    return {**RAW_TABLE_SCHEMA, metric_name: COUNT_TYPE}
+
+
+def cast_to_storage_schema(relation: str, metric_name: str) -> str:
+    """Build a SELECT converting a keyed long-format relation to the storage schema.
+
+    Both ingestion modes write through this query, so their tables always
+    have the declared types whatever the in-memory types were (int32 or
+    float64 counts, timestamps).
+
+    Args:
+        relation: Table, view or subquery with location_id, date and metric
+            columns (see with_location_ids)
+        metric_name: Name of the metric column (confirmed, deaths, recovered)
+
+    Returns:
+        str: SELECT statement producing the columns of raw_table_schema, in
+            order
+
+    Example:
+        >>> conn.execute(
+        ...     f"CREATE TABLE raw_confirmed AS "
+        ...     f"{cast_to_storage_schema('keyed_view', 'confirmed')}"
+        ... )
+    """
+    columns = ",\n            ".join(
+        f'"{col}"::{col_type} AS "{col}"'
+        for col, col_type in raw_table_schema(metric_name).items()
+    )
+    return f"""SELECT
+            {columns}
+        FROM {relation}"""
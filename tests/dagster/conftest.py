@@ -0,0 +1,8 @@
+# Local imports
+from covid_dagster.dbt_runner import DBT_PROJECT_DIR, MANIFEST_PATH, prepare_manifest
+
+
+# The code location reads the manifest the image build prepares; a new
+# checkout prepares it once before the tests import the assets
+if not (DBT_PROJECT_DIR / MANIFEST_PATH).exists():
+    prepare_manifest(DBT_PROJECT_DIR)
@@ -2,20 +2,51 @@
 import pytest
 import dagster as dg
 
-# Built-in import
+# Built-in imports
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 # Local imports
-from covid_dagster.assets.ingestion_assets import ingest_covid_data
-from covid_dagster.assets.dbt_assets import run_dbt_models
+from covid_dagster.assets.ingestion_assets import (
+    build_raw_data_asset,
+    raw_data_assets,
+)
+from covid_dagster.assets.dbt_assets import build_dbt_model_assets, build_dbt_model_specs
+from covid_dagster.dbt_runner import DbtCommandError
+from covid_dagster.partitions import BACKFILL_BATCH_DAYS, daily_partitions
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.metrics import InMemoryCollector, StageMetrics
+
+
+# Ingestion asset of the first configured data type
+raw_confirmed = raw_data_assets[0]
 
 
 class MockCovidDataIngestion:
+    load_modes = {"confirmed": "range"}
+    load_ranges = {"confirmed": (datetime(2021, 3, 1), datetime(2021, 3, 2))}
+    stage_timings = {"confirmed": {"read": 0.1, "write": 0.2}}
+    memory_footprint = {"confirmed": 1024}
+    database_path = "data/processed/snapshots/missing.duckdb"
+
+    def __init__(self):
+        self.metrics = InMemoryCollector()
+        self.metrics.record(StageMetrics(
+            "confirmed", "download", 0.5, counters={"bytes_downloaded": 2048}
+        ))
+        self.metrics.record(StageMetrics(
+            "confirmed", "write", 0.2, 0.1, 4096, counters={"rows_loaded": 289}
+        ))
+
     def download_data(self):
         pass
 
-    def load_to_duckdb(self):
-        pass
+    def load_to_duckdb(self, date_range=None):
+        self.date_range = date_range
+        return ["confirmed"]
 
     def cleanup_old_files(self):
         pass
@@ -28,25 +59,65 @@ def mock_ingestion():
 
 @pytest.fixture
 def dagster_context():
-    context = dg.build_op_context()
+    context = dg.build_asset_context(partition_key="2021-03-01")
     yield context
     # Cleanup after test
     if hasattr(context, 'instance'):
         context.instance.dispose()
 
 
-def test_ingest_covid_data_success(mock_ingestion, dagster_context):
-    """Test successful execution of the ingestion asset."""
+def test_raw_data_assets_per_data_type():
+    """Test that every configured data type gets its own retried asset."""
+    assert [asset.key.to_user_string() for asset in raw_data_assets] == [
+        "raw_confirmed", "raw_deaths", "raw_recovered"
+    ]
+    for asset in raw_data_assets:
+        assert asset.op.retry_policy.max_retries == 3
+
+
+def test_raw_data_asset_success(mock_ingestion, dagster_context):
+    """Test successful execution of an ingestion asset."""
+    with patch(
+        'covid_dagster.assets.ingestion_assets.CovidDataIngestion',
+        return_value=mock_ingestion,
+    ) as mock_class:
+        result = raw_confirmed(dagster_context)
+        assert result == "range"
+
+        # The asset only ingests its own data type, for its partition's day,
+        # merging recent revisions when it is the latest day
+        config = mock_class.call_args[0][0]
+        assert list(config.data_types) == ["confirmed"]
+        assert config.load_mode == "incremental"
+        assert mock_ingestion.date_range == (datetime(2021, 3, 1), datetime(2021, 3, 2))
+
+
+def test_raw_data_asset_stage_metrics(mock_ingestion, dagster_context):
+    """Test that an ingestion asset reports the metrics of its stages."""
     with patch(
         'covid_dagster.assets.ingestion_assets.CovidDataIngestion',
         return_value=mock_ingestion,
     ):
-        result = ingest_covid_data(dagster_context)
-        assert result is True
+        raw_confirmed(dagster_context)
+
+    metadata = dagster_context.get_output_metadata("result")
+    assert metadata["stage_metrics"].data["write"]["counters"] == {"rows_loaded": 289}
+    assert metadata["bytes_downloaded"] == 2048
+    assert metadata["rows_loaded"] == 289
+    assert metadata["peak_rss_growth_bytes"] == 4096
+
 
+def test_raw_data_assets_partitioned_by_day():
+    """Test that the ingestion assets are daily partitions backfilled in batches."""
+    for asset in raw_data_assets:
+        assert asset.partitions_def == daily_partitions
+        assert asset.backfill_policy.max_partitions_per_run == BACKFILL_BATCH_DAYS
+    assert daily_partitions.get_first_partition_key() == "2020-01-22"
+    assert daily_partitions.get_last_partition_key() == "2023-03-09"
 
-def test_ingest_covid_data_failure(mock_ingestion, dagster_context):
-    """Test failure handling in the ingestion asset."""
+
+def test_raw_data_asset_failure(mock_ingestion, dagster_context):
+    """Test failure handling in an ingestion asset."""
     mock_ingestion.download_data = MagicMock(side_effect=Exception("Download failed"))
 
     with patch(
@@ -54,77 +125,360 @@ def test_ingest_covid_data_failure(mock_ingestion, dagster_context):
         return_value=mock_ingestion,
     ):
         with pytest.raises(Exception):
-            ingest_covid_data(dagster_context)
-
-
-def test_run_dbt_models_success(dagster_context):
-    """Test successful execution of the dbt asset."""
-    # Mock the ingest_covid_data dependency first
-    with patch('covid_dagster.assets.ingestion_assets.ingest_covid_data', return_value=True):
-        # Then mock subprocess.run
-        with patch('subprocess.run') as mock_run:
-            # Create mock return values for all four commands
-            deps_result = MagicMock()
-            deps_result.returncode = 0
-            deps_result.stdout = "dbt deps success"
-            deps_result.stderr = ""
-
-            compile_result = MagicMock()
-            compile_result.returncode = 0
-            compile_result.stdout = "dbt compile success"
-            compile_result.stderr = ""
-
-            run_result = MagicMock()
-            run_result.returncode = 0
-            run_result.stdout = "dbt run success"
-            run_result.stderr = ""
-
-            test_result = MagicMock()
-            test_result.returncode = 0
-            test_result.stdout = "dbt test success"
-            test_result.stderr = ""
-
-            # Set up the side effect to return our mocks in the correct order
-            mock_run.side_effect = [deps_result, compile_result, run_result, test_result]
-
-            # Execute the test
-            result = run_dbt_models(dagster_context, True)
-            
-            # Verify results
-            assert result is True
-            assert mock_run.call_count == 4  # Called for deps, compile, run, and test
-            
-            # Verify the correct commands were called in the correct order
-            deps_call = mock_run.call_args_list[0]
-            compile_call = mock_run.call_args_list[1]
-            run_call = mock_run.call_args_list[2]
-            test_call = mock_run.call_args_list[3]
-            
-            assert deps_call[0][0] == ["dbt", "deps"]
-            assert compile_call[0][0] == ["dbt", "compile"]
-            assert run_call[0][0] == ["dbt", "run"]
-            assert test_call[0][0] == ["dbt", "test"]
-
-
-def test_run_dbt_models_test_failure(dagster_context):
-    """Test handling of dbt test failures."""
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value.returncode = 1
-        mock_run.return_value.stdout = ""
-        mock_run.return_value.stderr = "Test failed"
+            raw_confirmed(dagster_context)
 
-        with pytest.raises(Exception):
-            run_dbt_models(dagster_context, True)
 
+def test_raw_data_asset_unchanged(mock_ingestion, dagster_context):
+    """Test that an asset reports no change when its load was skipped."""
+    mock_ingestion.load_to_duckdb = MagicMock(return_value=[])
 
-def test_run_dbt_models_run_failure(dagster_context):
-    """Test handling of dbt run failures."""
-    with patch('subprocess.run') as mock_run:
-        # First call (test) succeeds
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout="Success", stderr=""),
-            MagicMock(returncode=1, stdout="", stderr="Run failed"),
-        ]
+    with patch(
+        'covid_dagster.assets.ingestion_assets.CovidDataIngestion',
+        return_value=mock_ingestion,
+    ):
+        result = raw_confirmed(dagster_context)
+        assert result is None
 
-        with pytest.raises(Exception):
-            run_dbt_models(dagster_context, True)
+
+def test_build_raw_data_asset_name():
+    """Test that the factory names assets after their raw table."""
+    asset = build_raw_data_asset("vaccinations", "vaccinations.csv")
+    assert asset.key == dg.AssetKey("raw_vaccinations")
+
+
+# Manifest of a small project: raw_confirmed -> stg -> (mart_a, mart_b)
+MANIFEST = {
+    "sources": {
+        "source.tiny.covid.raw_confirmed": {
+            "resource_type": "source", "name": "raw_confirmed", "source_name": "covid",
+        },
+    },
+    "nodes": {
+        "model.tiny.stg": {
+            "resource_type": "model", "name": "stg", "fqn": ["tiny", "staging", "stg"],
+            "depends_on": {"nodes": ["source.tiny.covid.raw_confirmed"]},
+            "config": {"materialized": "incremental"}, "description": "Staging model",
+        },
+        "model.tiny.mart_a": {
+            "resource_type": "model", "name": "mart_a", "fqn": ["tiny", "marts", "mart_a"],
+            "depends_on": {"nodes": ["model.tiny.stg"]},
+            "config": {"materialized": "table"}, "description": "",
+        },
+        "model.tiny.mart_b": {
+            "resource_type": "model", "name": "mart_b", "fqn": ["tiny", "marts", "mart_b"],
+            "depends_on": {"nodes": ["model.tiny.stg"]},
+            "config": {"materialized": "table"}, "description": "",
+        },
+        "test.tiny.not_null_stg_id": {
+            "resource_type": "test", "name": "not_null_stg_id", "fqn": ["tiny", "not_null_stg_id"],
+            "depends_on": {"nodes": ["model.tiny.stg"]},
+            "config": {"materialized": "test"}, "description": "",
+        },
+    },
+}
+MODELS = ["stg", "mart_a", "mart_b"]
+# The same project with the staging model partitioned by day
+PARTITIONED_MANIFEST = {
+    "sources": MANIFEST["sources"],
+    "nodes": {
+        **MANIFEST["nodes"],
+        "model.tiny.stg": {**MANIFEST["nodes"]["model.tiny.stg"], "tags": ["partitioned"]},
+    },
+}
+
+
+def _build_result(models, failed=()):
+    """dbt build result with the models in dependency order."""
+    results = [
+        SimpleNamespace(
+            node=SimpleNamespace(
+                resource_type="model", name=name, unique_id=f"model.tiny.{name}"
+            ),
+            status="error" if name in failed else "success",
+            execution_time=0.1,
+            message="OK",
+        )
+        for name in MODELS
+        if name in models
+    ]
+    return MagicMock(result=MagicMock(results=results))
+
+
+@pytest.fixture
+def mock_runner(tmp_path):
+    """DbtRunner stand-in that finds nothing modified and builds what it is asked."""
+    runner = MagicMock()
+    runner.project_dir = tmp_path
+    runner.deps.return_value = False
+    runner.has_state.return_value = True
+    runner.phase_timings = {"deps": 0.0, "parse": 1.0, "ls": 0.1, "build": 2.0}
+    # Only the models downstream of a changed source or model are stale
+    runner.list_models.side_effect = lambda select, state: (
+        MODELS if any(not s.startswith("state:") for s in select) else []
+    )
+    runner.build.side_effect = lambda select, full_refresh=False, vars=None: (
+        _build_result(select)
+    )
+    with patch('covid_dagster.assets.dbt_assets.DbtRunner', return_value=runner):
+        yield runner
+
+
+@pytest.fixture
+def instance():
+    with dg.instance_for_test() as instance:
+        yield instance
+
+
+def _materialize_models(
+    instance, selection=None, run_config=None, manifest=MANIFEST, partition_key=None,
+    snapshots=None,
+):
+    """Materialize the small project's model assets; returns the built models."""
+    assets = build_dbt_model_assets(manifest, Path("tiny"), snapshots=snapshots)
+    result = dg.materialize(
+        assets,
+        instance=instance,
+        selection=[dg.AssetKey(name) for name in selection] if selection else None,
+        run_config=run_config,
+        partition_key=partition_key,
+        raise_on_error=False,
+    )
+    built = [event.asset_key.path[-1] for event in result.get_asset_materialization_events()]
+    return result, built
+
+
+def _load_raw(instance, table, load_mode):
+    """Record a materialization of a raw_* asset, as the ingestion assets do."""
+    instance.report_runless_asset_event(
+        dg.AssetMaterialization(asset_key=table, metadata={"load_mode": load_mode})
+    )
+
+
+def test_dbt_model_specs_lineage():
+    """Test that every model is an asset depending on its refs and raw tables."""
+    specs = {spec.key.to_user_string(): spec for spec in build_dbt_model_specs(MANIFEST)}
+
+    assert set(specs) == set(MODELS)
+    assert {dep.asset_key for dep in specs["stg"].deps} == {dg.AssetKey("raw_confirmed")}
+    assert {dep.asset_key for dep in specs["mart_b"].deps} == {dg.AssetKey("stg")}
+    assert specs["stg"].group_name == "staging"
+    assert specs["mart_a"].group_name == "marts"
+    assert specs["stg"].metadata["materialized"] == "incremental"
+
+
+def test_dbt_model_specs_partitioned():
+    """Test that models tagged 'partitioned' get their own daily-partitioned asset."""
+    partitioned = build_dbt_model_specs(PARTITIONED_MANIFEST, partitioned=True)
+    assert [spec.key.to_user_string() for spec in partitioned] == ["stg"]
+
+    assets = build_dbt_model_assets(PARTITIONED_MANIFEST, Path("tiny"))
+    assert [asset.op.name for asset in assets] == ["dbt_partitioned_models", "dbt_models"]
+    assert assets[0].partitions_def == daily_partitions
+    assert assets[1].partitions_def is None
+    # Without partitioned models there is only the unpartitioned asset
+    assert len(build_dbt_model_assets(MANIFEST, Path("tiny"))) == 1
+
+
+def test_dbt_models_first_build(instance, mock_runner):
+    """Test that every model is built when no earlier build can be compared against."""
+    mock_runner.has_state.return_value = False
+
+    result, built = _materialize_models(instance)
+
+    assert result.success
+    assert built == MODELS
+    mock_runner.build.assert_called_once_with(select=sorted(MODELS), full_refresh=False)
+    mock_runner.save_state.assert_called_once()
+
+
+def test_dbt_models_skipped_when_unchanged(instance, mock_runner):
+    """Test that dbt builds nothing when no model or raw table changed."""
+    result, built = _materialize_models(instance)
+
+    assert result.success
+    assert built == []
+    mock_runner.build.assert_not_called()
+
+
+def test_dbt_models_rebuilt_after_raw_load(instance, mock_runner):
+    """Test that a raw table load rebuilds its downstream models, once."""
+    _load_raw(instance, "raw_confirmed", "incremental")
+
+    result, built = _materialize_models(instance)
+
+    assert built == MODELS
+    assert "source:covid.raw_confirmed+" in mock_runner.list_models.call_args_list[0][0][0]
+    # The source's own tests run with the models
+    mock_runner.build.assert_called_once_with(
+        select=sorted(MODELS) + ["source:covid.raw_confirmed"], full_refresh=False
+    )
+
+    # The load was consumed by the first build
+    _, built = _materialize_models(instance)
+    assert built == []
+
+
+def test_dbt_models_full_refresh_after_raw_rebuild(instance, mock_runner):
+    """Test that incremental models are rebuilt when a raw table was rebuilt."""
+    _load_raw(instance, "raw_confirmed", "full")
+    _load_raw(instance, "raw_confirmed", "")
+
+    _materialize_models(instance)
+
+    assert mock_runner.build.call_args.kwargs["full_refresh"] is True
+
+
+def test_dbt_models_subset_keeps_changes_pending(instance, mock_runner):
+    """Test that models left out of a partial build are still built later."""
+    _load_raw(instance, "raw_confirmed", "incremental")
+
+    _, built = _materialize_models(instance, selection=["stg", "mart_a"])
+
+    assert built == ["stg", "mart_a"]
+    mock_runner.save_state.assert_not_called()
+
+    # mart_b is still stale although raw_confirmed was not loaded again
+    _, built = _materialize_models(instance, selection=["mart_b"])
+    assert built == ["mart_b"]
+
+
+def test_dbt_models_build_failure(instance, mock_runner):
+    """Test that models built before a failure are reported and the run fails."""
+    mock_runner.has_state.return_value = False
+    mock_runner.build.side_effect = DbtCommandError(
+        "build", "1 model failed", ["model.tiny.mart_a: error"],
+        result=_build_result(MODELS, failed=["mart_a"]),
+    )
+
+    result, built = _materialize_models(instance)
+
+    assert not result.success
+    assert built == ["stg", "mart_b"]
+    mock_runner.save_state.assert_not_called()
+
+
+def test_dbt_models_rebuild_all(instance, mock_runner):
+    """Test that rebuild_all builds the models even if nothing changed."""
+    result, built = _materialize_models(
+        instance, run_config={"ops": {"dbt_models": {"config": {"rebuild_all": True}}}}
+    )
+
+    assert result.success
+    assert built == MODELS
+
+
+def test_dbt_partitioned_models_build_their_range(instance, mock_runner):
+    """Test that a partition run builds its models for the partition's days only."""
+    result, built = _materialize_models(
+        instance, selection=["stg"], manifest=PARTITIONED_MANIFEST,
+        partition_key="2021-03-01",
+    )
+
+    assert result.success
+    assert built == ["stg"]
+    mock_runner.build.assert_called_once_with(
+        select=["stg"],
+        vars={"partition_start": "2021-03-01", "partition_end": "2021-03-02"},
+    )
+    # Partition runs never compare against nor replace the last build
+    mock_runner.list_models.assert_not_called()
+    mock_runner.save_state.assert_not_called()
+
+
+def test_dbt_models_rebuilt_after_partitioned_model(instance, mock_runner):
+    """Test that a partition run makes the unpartitioned models downstream stale."""
+    _materialize_models(
+        instance, selection=["stg"], manifest=PARTITIONED_MANIFEST,
+        partition_key="2021-03-01",
+    )
+
+    result, built = _materialize_models(
+        instance, selection=["mart_a", "mart_b"], manifest=PARTITIONED_MANIFEST
+    )
+
+    assert result.success
+    assert built == ["mart_a", "mart_b"]
+    assert "stg+" in mock_runner.list_models.call_args_list[0][0][0]
+    mock_runner.build.assert_called_with(select=["mart_a", "mart_b"], full_refresh=False)
+    mock_runner.save_state.assert_called_once()
+
+
+def test_dbt_models_publish_snapshot(instance, mock_runner):
+    """Test that the snapshot is built into, and published once every stale model is built."""
+    snapshots = MagicMock()
+    snapshots.shadow.return_value.__enter__.return_value = Path("covid.shadow.duckdb")
+    mock_runner.has_state.return_value = False
+
+    with patch('covid_dagster.assets.dbt_assets.DbtRunner', return_value=mock_runner) as runner:
+        # A partial build leaves the snapshot unpublished
+        result, _ = _materialize_models(instance, selection=["stg"], snapshots=snapshots)
+        assert result.success
+        assert runner.call_args.kwargs["db_path"] == Path("covid.shadow.duckdb")
+        snapshots.publish.assert_not_called()
+
+        # ... as does a failed one
+        mock_runner.build.side_effect = DbtCommandError("build", "1 model failed")
+        result, _ = _materialize_models(instance, snapshots=snapshots)
+        assert not result.success
+        snapshots.publish.assert_not_called()
+
+        mock_runner.build.side_effect = lambda select, full_refresh=False, vars=None: (
+            _build_result(select)
+        )
+        result, built = _materialize_models(instance, snapshots=snapshots)
+        assert result.success
+        assert built == MODELS
+        snapshots.publish.assert_called_once()
+
+
+def test_unchanged_partition_skips_load_and_dbt(instance, mock_runner, tmp_path):
+    """Test that rerunning a partition over an unchanged file loads and builds nothing."""
+    raw_path = tmp_path / "raw"
+    raw_path.mkdir()
+    (raw_path / f"confirmed_{datetime.now():%Y%m%d}.csv").write_text(
+        "Province/State,Country/Region,Lat,Long,1/22/20,1/23/20,1/24/20\n"
+        ",Canada,56.1,106.3,1,2,3\n"
+    )
+    partitioned_models = build_dbt_model_assets(PARTITIONED_MANIFEST, Path("tiny"))[0]
+
+    def run_partition(partition_key="2020-01-23"):
+        result = dg.materialize(
+            [raw_confirmed, partitioned_models],
+            instance=instance,
+            selection=[dg.AssetKey("raw_confirmed"), dg.AssetKey("stg")],
+            partition_key=partition_key,
+        )
+        events = result.get_asset_materialization_events()
+        load_mode = next(
+            event.materialization.metadata["load_mode"].value
+            for event in events
+            if event.asset_key == dg.AssetKey("raw_confirmed")
+        )
+        return load_mode, [event.asset_key.path[-1] for event in events]
+
+    def run_models():
+        return _materialize_models(
+            instance, selection=["mart_a", "mart_b"], manifest=PARTITIONED_MANIFEST
+        )[1]
+
+    with patch(
+        'covid_dagster.assets.ingestion_assets.IngestionConfig.default_config',
+        side_effect=lambda: IngestionConfig(
+            base_url="https://test.url",
+            data_types={},
+            raw_data_path=raw_path,
+            db_path=str(tmp_path / "test.duckdb"),
+        ),
+    ), patch.object(CovidDataIngestion, 'download_data'):
+        assert run_partition() == ("range", ["raw_confirmed", "stg"])
+        assert run_models() == ["mart_a", "mart_b"]
+
+        assert run_partition() == ("", ["raw_confirmed"])
+        assert run_models() == []
+        assert mock_runner.build.call_count == 2
+
+        # The latest day also rebuilds the revision window before it
+        run_partition("2020-01-24")
+    assert mock_runner.build.call_args.kwargs["vars"] == {
+        "partition_start": "2020-01-09", "partition_end": "2020-01-25"
+    }
@@ -0,0 +1,213 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import os
+import subprocess
+import sys
+
+# Local imports
+from covid_dagster.dbt_runner import (
+    DEPS_FINGERPRINT_FILE,
+    DbtCommandError,
+    DbtRunner,
+    load_manifest,
+    prepare_manifest,
+    summarize_results,
+)
+
+
+@pytest.fixture
+def dbt_project(tmp_path) -> Path:
+    """Minimal dbt project on DuckDB with one model and one test."""
+    project = tmp_path / "project"
+    (project / "models").mkdir(parents=True)
+    (project / "dbt_project.yml").write_text(
+        "name: tiny\nversion: '1.0'\nprofile: tiny\n"
+    )
+    # The database path is relative to the project, like the pipeline's profile
+    (project / "profiles.yml").write_text(
+        "tiny:\n"
+        "  target: dev\n"
+        "  outputs:\n"
+        "    dev:\n"
+        "      type: duckdb\n"
+        "      path: ../tiny.duckdb\n"
+        "      threads: 1\n"
+    )
+    (project / "models" / "numbers.sql").write_text("select 1 as id")
+    (project / "models" / "numbers.yml").write_text(
+        "version: 2\n"
+        "models:\n"
+        "  - name: numbers\n"
+        "    columns:\n"
+        "      - name: id\n"
+        "        tests: [not_null]\n"
+    )
+    return project
+
+
+def test_runner_parses_once_and_builds(dbt_project, tmp_path):
+    """Test that run and test reuse the parsed manifest and build the models."""
+    runner = DbtRunner(dbt_project)
+    manifest = runner.parse()
+
+    run_result = runner.run()
+    test_result = runner.test()
+
+    assert "model.tiny.numbers" in manifest.nodes
+    assert list(runner.phase_timings) == ["parse", "run", "test"]
+    assert "model.tiny.numbers: success" in summarize_results(run_result)
+    assert "not_null_numbers_id" in summarize_results(test_result)
+
+    # Relative profile paths resolve against the project, not the caller
+    conn = duckdb.connect(str(tmp_path / "tiny.duckdb"))
+    assert conn.execute("SELECT id FROM numbers").fetchall() == [(1,)]
+    conn.close()
+    assert Path.cwd() != dbt_project
+
+
+def test_runner_raises_on_failed_model(dbt_project):
+    """Test that a model error is reported with the failing node."""
+    (dbt_project / "models" / "broken.sql").write_text("select from where")
+    runner = DbtRunner(dbt_project)
+
+    with pytest.raises(DbtCommandError) as error:
+        runner.run()
+
+    assert error.value.command == "run"
+    assert any("model.tiny.broken" in failure for failure in error.value.failures)
+
+
+def test_build_selected_models_and_state(dbt_project, tmp_path):
+    """Test that build honours the selection and state selects modified models."""
+    (dbt_project / "models" / "doubled.sql").write_text(
+        "select id * 2 as id from {{ ref('numbers') }}"
+    )
+    runner = DbtRunner(dbt_project)
+    runner.parse()
+    assert not runner.has_state()
+
+    result = runner.build(select=["numbers"])
+
+    # The model and its test ran, the unselected model did not
+    assert "model.tiny.numbers: success" in summarize_results(result)
+    assert "not_null_numbers_id" in summarize_results(result)
+    assert "doubled" not in summarize_results(result)
+
+    runner.save_state()
+    assert runner.list_models(["state:modified+"], state=True) == []
+
+    # A changed model selects itself and what builds on it
+    (dbt_project / "models" / "numbers.sql").write_text("select 2 as id")
+    runner = DbtRunner(dbt_project)
+    runner.parse()
+    assert runner.list_models(["state:modified+"], state=True) == ["doubled", "numbers"]
+
+
+def test_build_failure_keeps_result(dbt_project):
+    """Test that a failed build still reports the nodes that succeeded."""
+    (dbt_project / "models" / "broken.sql").write_text("select from where")
+    runner = DbtRunner(dbt_project)
+
+    with pytest.raises(DbtCommandError) as error:
+        runner.build()
+
+    assert "model.tiny.numbers: success" in summarize_results(error.value.result)
+
+
+def test_load_manifest_reads_prepared_manifest(dbt_project):
+    """Test that the manifest is only read, once prepared, and never parsed."""
+    with patch.object(DbtRunner, "parse") as parse:
+        with pytest.raises(FileNotFoundError, match="covid_dagster.dbt_runner"):
+            load_manifest(dbt_project)
+        parse.assert_not_called()
+
+    manifest = prepare_manifest(dbt_project)
+    assert "model.tiny.numbers" in manifest["nodes"]
+    with patch.object(DbtRunner, "parse") as parse:
+        assert load_manifest(dbt_project)["nodes"].keys() == manifest["nodes"].keys()
+        parse.assert_not_called()
+
+
+def test_deps_skipped_while_packages_unchanged(dbt_project):
+    """Test that deps only runs when the package files change."""
+    (dbt_project / "packages.yml").write_text("packages: []\n")
+    runner = DbtRunner(dbt_project)
+
+    with patch.object(runner, "_invoke", MagicMock()) as invoke:
+        assert runner.deps() is True
+        assert (dbt_project / "dbt_packages" / DEPS_FINGERPRINT_FILE).exists()
+        assert runner.deps() is False
+        assert invoke.call_count == 1
+
+        # A new package requirement installs again
+        (dbt_project / "packages.yml").write_text(
+            "packages:\n  - package: dbt-labs/dbt_utils\n    version: 1.3.0\n"
+        )
+        assert runner.deps() is True
+        assert invoke.call_count == 2
+
+
+def _hold_database(path: Path, seconds: float) -> subprocess.Popen:
+    """Lock a DuckDB database from another process for a while."""
+    holder = subprocess.Popen(
+        [sys.executable, "-c",
+         "import duckdb, sys, time; conn = duckdb.connect(sys.argv[1]); "
+         "print('locked', flush=True); time.sleep(float(sys.argv[2]))",
+         str(path), str(seconds)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    assert holder.stdout.readline().strip() == "locked"
+    return holder
+
+
+def test_runner_builds_into_given_database(dbt_project, tmp_path):
+    """Test that db_path redirects a profile reading COVID_DUCKDB_PATH."""
+    (dbt_project / "profiles.yml").write_text(
+        "tiny:\n"
+        "  target: dev\n"
+        "  outputs:\n"
+        "    dev:\n"
+        "      type: duckdb\n"
+        "      path: \"{{ env_var('COVID_DUCKDB_PATH', '../tiny.duckdb') }}\"\n"
+        "      threads: 1\n"
+    )
+    DbtRunner(dbt_project, db_path=tmp_path / "shadow.duckdb").run()
+
+    conn = duckdb.connect(str(tmp_path / "shadow.duckdb"))
+    assert conn.execute("SELECT id FROM numbers").fetchall() == [(1,)]
+    conn.close()
+    assert not (tmp_path / "tiny.duckdb").exists()
+    assert "COVID_DUCKDB_PATH" not in os.environ
+
+    # Without a db_path, the profile's default applies
+    DbtRunner(dbt_project).run()
+    assert (tmp_path / "tiny.duckdb").exists()
+
+
+def test_runner_waits_for_locked_database(dbt_project, tmp_path):
+    """Test that a command retries while another process holds the database."""
+    holder = _hold_database(tmp_path / "tiny.duckdb", seconds=2)
+
+    runner = DbtRunner(dbt_project, lock_timeout_seconds=30)
+    result = runner.build(vars={"unused": 1})
+    holder.wait()
+
+    assert "model.tiny.numbers: success" in summarize_results(result)
+    assert runner.phase_timings["build"] > 0.5
+
+
+def test_runner_gives_up_on_locked_database(dbt_project, tmp_path):
+    """Test that a command fails once the lock timeout is reached."""
+    holder = _hold_database(tmp_path / "tiny.duckdb", seconds=30)
+    try:
+        runner = DbtRunner(dbt_project, lock_timeout_seconds=1)
+        with pytest.raises(DbtCommandError, match="Could not set lock"):
+            runner.run()
+    finally:
+        holder.kill()
+        holder.wait()
@@ -4,8 +4,14 @@ import dagster as dg
 # Built-in import
 from typing import cast
 
-# Local import
-from covid_dagster.definitions import defs, covid_pipeline, all_assets
+# Local imports
+from covid_dagster.assets.ingestion_assets import INGESTION_CONCURRENCY_TAG
+from covid_dagster.definitions import (
+    MAX_CONCURRENT_INGESTION_STEPS,
+    all_assets,
+    covid_pipeline,
+    defs,
+)
 
 
 def test_definitions_structure():
@@ -26,21 +32,53 @@ def test_assets_loading():
     asset_keys = []
     for asset in all_assets:
         if isinstance(asset, dg.AssetsDefinition):
-            asset_keys.extend(key.to_string() for key in asset.keys)
+            asset_keys.extend(key.to_user_string() for key in asset.keys)
         else:
             # For other asset types
             asset_keys.append(str(asset))
 
-    expected_assets = {"ingest_covid_data", "run_dbt_models"}
-    assert all(asset in str(asset_keys) for asset in expected_assets)
+    expected_assets = {
+        "raw_confirmed", "raw_deaths", "raw_recovered",
+        "stg_covid_metrics", "daily_metrics", "country_metrics", "daily_trends",
+        "daily_rollup", "country_mortality_analysis", "global_daily_trends",
+        "top_countries_by_records",
+    }
+    assert expected_assets <= set(asset_keys)
 
 
 def test_asset_dependencies():
     """Test that asset dependencies are properly set up."""
-    # Check that run_dbt_models depends on ingest_covid_data
+    deps = {}
     for asset in all_assets:
-        if isinstance(asset, dg.AssetsDefinition) and "run_dbt_models" in str(asset):
-            assert "ingest_covid_data" in str(asset.dependency_keys)
+        if isinstance(asset, dg.AssetsDefinition):
+            deps.update(asset.asset_deps)
+
+    # The staging model reads every per-data-type ingestion asset, and the
+    # dim_location table those assets maintain together
+    assert deps[dg.AssetKey("stg_covid_metrics")] == {
+        dg.AssetKey("raw_confirmed"),
+        dg.AssetKey("raw_deaths"),
+        dg.AssetKey("raw_recovered"),
+        dg.AssetKey("dim_location"),
+    }
+    # Marts build on staging, the rollup on the marts and reports on the rollup
+    assert deps[dg.AssetKey("daily_metrics")] == {dg.AssetKey("stg_covid_metrics")}
+    assert deps[dg.AssetKey("daily_rollup")] == {dg.AssetKey("daily_metrics")}
+    for report in ["global_daily_trends", "country_mortality_analysis", "top_countries_by_records"]:
+        assert deps[dg.AssetKey(report)] == {dg.AssetKey("daily_rollup")}
+
+
+def test_date_keyed_assets_partitioned():
+    """Test that the raw tables and date-keyed models are partitioned by day."""
+    partitioned = set()
+    for asset in all_assets:
+        if isinstance(asset, dg.AssetsDefinition) and asset.partitions_def is not None:
+            partitioned.update(key.to_user_string() for key in asset.keys)
+
+    assert partitioned == {
+        "raw_confirmed", "raw_deaths", "raw_recovered",
+        "stg_covid_metrics", "daily_metrics", "daily_trends", "daily_rollup",
+    }
 
 
 def test_job_asset_selection():
@@ -49,5 +87,28 @@ def test_job_asset_selection():
 
     selected_keys = selection.resolve(cast(list, all_assets))
 
-    assert any("ingest_covid_data" in str(key) for key in selected_keys)
-    assert any("run_dbt_models" in str(key) for key in selected_keys)
+    assert any("raw_confirmed" in str(key) for key in selected_keys)
+    assert any("country_metrics" in str(key) for key in selected_keys)
+
+
+def test_multiprocess_executor():
+    """Test that the ingestion assets run concurrently, up to their own limit."""
+    executor = defs.get_job_def("covid_pipeline").executor_def
+    assert executor.name == "multiprocess"
+
+    config = executor.apply_config_mapping({}).value["config"]
+    # Only the ingestion steps are limited, not the dbt steps after them
+    assert config["max_concurrent"] is None
+    assert config["tag_concurrency_limits"] == [{
+        "key": INGESTION_CONCURRENCY_TAG,
+        "value": {"applyLimitPerUniqueValue": False},
+        "limit": MAX_CONCURRENT_INGESTION_STEPS,
+    }]
+    tagged = {
+        key.to_user_string()
+        for asset in all_assets
+        if isinstance(asset, dg.AssetsDefinition)
+        and INGESTION_CONCURRENCY_TAG in asset.op.tags
+        for key in asset.keys
+    }
+    assert tagged == {"raw_confirmed", "raw_deaths", "raw_recovered"}
@@ -0,0 +1,207 @@
+# Global imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Built-in imports
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+import threading
+import time
+
+# Local import
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+
+
+# First date of the JHU time series
+START = date(2020, 1, 22)
+# Location columns heading every JHU time series file
+ID_HEADER = ['Province/State', 'Country/Region', 'Lat', 'Long']
+
+
+def date_headers(days: int, start: date = START) -> List[str]:
+    """JHU-style date headers (e.g. '1/22/20') of consecutive days."""
+    return [
+        f"{d.month}/{d.day}/{d.strftime('%y')}"
+        for d in (start + timedelta(days=i) for i in range(days))
+    ]
+
+
+def time_series_header(days: int) -> str:
+    """Header line of a raw time series file with days date columns."""
+    return ",".join(ID_HEADER + date_headers(days)) + "\n"
+
+
+def wide_frame(days: int, locations: int = 6, seed: int = 0, offset: int = 0) -> pd.DataFrame:
+    """Build a raw wide frame with a missing province and a padded name.
+
+    Values only depend on the position of a cell, so a frame with more days
+    or locations extends a smaller one without changing it; offset is added
+    to every count to stand in for a revision of the whole file.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.cumsum(rng.integers(0, 50, (100, 100)), axis=1)[:locations, :days] + offset
+    df = pd.DataFrame(values, columns=date_headers(days))
+    df.insert(0, 'Province/State', [None if i % 2 else f"Prov {i}" for i in range(locations)])
+    df.insert(1, 'Country/Region', [f"Country {i // 2} " for i in range(locations)])
+    df.insert(2, 'Lat', [10.0 * i - 10 for i in range(locations)])
+    df.insert(3, 'Long', [10.0 * i + 20 for i in range(locations)])
+    return df
+
+
+@pytest.fixture
+def make_config(tmp_path) -> Callable[..., IngestionConfig]:
+    """Factory of configurations with their raw files and database in tmp_path.
+
+    The configuration loads a single 'test' data type unless the keyword
+    arguments, passed on to IngestionConfig, say otherwise.
+    """
+    def make(**settings) -> IngestionConfig:
+        settings = {
+            'base_url': "https://test.url",
+            'data_types': {"test": "test.csv"},
+            'raw_data_path': tmp_path / "raw",
+            'db_path': str(tmp_path / "test.duckdb"),
+            **settings,
+        }
+        settings['raw_data_path'].mkdir(parents=True, exist_ok=True)
+        return IngestionConfig(**settings)
+
+    return make
+
+
+@pytest.fixture
+def config(make_config) -> IngestionConfig:
+    """Configuration loading a single 'test' data type."""
+    return make_config()
+
+
+@dataclass
+class Route:
+    """A file served by the stand-in server."""
+
+    body: bytes
+    delay: float = 0.0
+    failures: int = 0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    drop_after: Optional[int] = None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal request handler mimicking the JHU raw file host."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        self.server.request_headers.append(dict(self.headers))
+        route = self.server.routes.get(self.path)
+
+        if route is None:
+            self.send_error(404)
+            return
+
+        # Simulate transient upstream errors before succeeding
+        if route.failures > 0:
+            route.failures -= 1
+            self.send_error(503)
+            return
+
+        time.sleep(route.delay)
+
+        # Honour conditional requests like a real static file host
+        if (route.etag and self.headers.get('If-None-Match') == route.etag) or (
+            route.last_modified
+            and self.headers.get('If-Modified-Since') == route.last_modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        # Serve a byte range if asked, unless If-Range names another version
+        start = 0
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and if_range in (None, route.etag, route.last_modified):
+            start = int(range_header.replace('bytes=', '').split('-')[0])
+            # A range starting past the end of the file cannot be served
+            if start >= len(route.body):
+                self.send_error(416)
+                return
+
+        body = memoryview(route.body)[start:]
+        self.send_response(206 if start else 200)
+        self.send_header('Content-Length', str(len(body)))
+        if start:
+            self.send_header(
+                'Content-Range', f'bytes {start}-{len(route.body) - 1}/{len(route.body)}'
+            )
+        if route.etag:
+            self.send_header('ETag', route.etag)
+        if route.last_modified:
+            self.send_header('Last-Modified', route.last_modified)
+        self.end_headers()
+
+        # Simulate a dropped connection part way through the body (once)
+        if route.drop_after is not None:
+            self.wfile.write(body[: route.drop_after])
+            route.drop_after = None
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep test output quiet
+        pass
+
+
+class StandInServer:
+    """Local HTTP server standing in for the upstream data host."""
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes: Dict[str, Route] = {}
+        self.httpd.requests: List[str] = []
+        self.httpd.request_headers: List[Dict[str, str]] = []
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> List[str]:
+        return self.httpd.requests
+
+    @property
+    def request_headers(self) -> List[Dict[str, str]]:
+        return self.httpd.request_headers
+
+    def add(
+        self,
+        path: str,
+        body: bytes,
+        delay: float = 0.0,
+        failures: int = 0,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        drop_after: Optional[int] = None,
+    ):
+        self.httpd.routes[path] = Route(
+            body=body,
+            delay=delay,
+            failures=failures,
+            etag=etag,
+            last_modified=last_modified,
+            drop_after=drop_after,
+        )
+
+
+@pytest.fixture
+def stand_in_server():
+    """Start a local HTTP server for download tests."""
+    server = StandInServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,123 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+from pathlib import Path
+import subprocess
+import sys
+import textwrap
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _write_raw_files(raw_dir: Path) -> None:
+    """Write one small raw file per data type."""
+    raw_dir.mkdir()
+    for i, data_type in enumerate(DATA_TYPES):
+        (raw_dir / f"{data_type}_20230101.csv").write_text(
+            f"""Province/State,Country/Region,Lat,Long,1/1/20,1/2/20
+"",Afghanistan,33.0,65.0,{i},{i + 1}
+Quebec,Canada,52.9,-73.5,{i * 10},{i * 20}"""
+        )
+
+
+def _run_python(code: str) -> subprocess.Popen:
+    """Start a Python process running code from the project root."""
+    return subprocess.Popen(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+
+def _hold_lock(db_path: str, seconds: float) -> subprocess.Popen:
+    """Start a process holding the database write lock for a while."""
+    holder = _run_python(f"""
+        import duckdb, time
+        conn = duckdb.connect({db_path!r})
+        print("locked", flush=True)
+        time.sleep({seconds})
+    """)
+    assert holder.stdout.readline().strip() == "locked"
+    return holder
+
+
+def test_parallel_processes_load_every_type(tmp_path):
+    """Test that one process per data type can load into the same database."""
+    _write_raw_files(tmp_path / "raw")
+    db_path = str(tmp_path / "test.duckdb")
+
+    processes = [
+        _run_python(f"""
+            import logging
+            logging.disable(logging.WARNING)
+            from pathlib import Path
+            from src.python.ingestion.config.ingestion_config import IngestionConfig
+            from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+            config = IngestionConfig(
+                base_url="https://test.url",
+                data_types={{{data_type!r}: "test.csv"}},
+                raw_data_path=Path({str(tmp_path / "raw")!r}),
+                db_path={db_path!r},
+                load_mode="incremental",
+            )
+            CovidDataIngestion(config).load_to_duckdb()
+        """)
+        for data_type in DATA_TYPES
+    ]
+    for process in processes:
+        _, stderr = process.communicate(timeout=120)
+        assert process.returncode == 0, stderr
+
+    conn = duckdb.connect(db_path)
+    for data_type in DATA_TYPES:
+        assert conn.execute(f"SELECT count(*) FROM raw_{data_type}").fetchone()[0] == 4
+    assert conn.execute("SELECT count(*) FROM _load_watermarks").fetchone()[0] == 3
+    conn.close()
+
+
+def test_load_waits_for_database_lock(tmp_path):
+    """Test that a load retries while another process holds the database."""
+    _write_raw_files(tmp_path / "raw")
+    config = IngestionConfig(
+        base_url="https://test.url",
+        data_types={"confirmed": "test.csv"},
+        raw_data_path=tmp_path / "raw",
+        db_path=str(tmp_path / "test.duckdb"),
+    )
+
+    holder = _hold_lock(config.db_path, seconds=1)
+    try:
+        assert CovidDataIngestion(config).load_to_duckdb() == ["confirmed"]
+    finally:
+        holder.kill()
+        holder.wait()
+
+
+def test_load_gives_up_after_lock_timeout(tmp_path):
+    """Test that a load fails once db_lock_timeout_seconds has passed."""
+    _write_raw_files(tmp_path / "raw")
+    config = IngestionConfig(
+        base_url="https://test.url",
+        data_types={"confirmed": "test.csv"},
+        raw_data_path=tmp_path / "raw",
+        db_path=str(tmp_path / "test.duckdb"),
+        db_lock_timeout_seconds=0.5,
+    )
+
+    holder = _hold_lock(config.db_path, seconds=30)
+    try:
+        with pytest.raises(duckdb.IOException, match="lock"):
+            CovidDataIngestion(config).load_to_duckdb()
+    finally:
+        holder.kill()
+        holder.wait()
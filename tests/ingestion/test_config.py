@@ -25,10 +25,35 @@ def test_default_config_creation():
     assert isinstance(config.raw_data_path, Path)
     assert config.raw_data_path == Path('data/raw')
     assert config.db_path == 'data/processed/covid_analysis_dev.duckdb'
+    assert config.fetch_metadata_path == Path('data/raw/fetch_metadata.json')
+    assert config.parquet_path == Path('data/landing')
+    # Loads go to a shadow snapshot, published once built
+    assert config.use_snapshots
+    assert config.snapshot_retention == 3
+    # Rolling metrics are kept for the 7, 14 and 28-day windows
+    assert config.rolling_windows == (7, 14, 28)
+    # Only the global time series are ingested unless sources are enabled
+    assert config.sources == ()
 
     # Check default retention days
     assert config.retention_days == 7
 
+    # Check default download settings
+    assert config.max_concurrent_downloads == 3
+    assert config.request_timeout_seconds == 30.0
+    assert config.max_retries == 3
+    assert config.retry_backoff_seconds == 1.0
+    assert config.download_chunk_size == 1024 * 1024
+
+    # Check default reader backend
+    assert config.csv_reader == 'pandas'
+    assert config.ingestion_mode == 'pandas'
+    assert config.load_mode == 'full'
+    assert config.revision_window_days == 14
+    assert config.max_processing_workers is None
+    assert config.processing_pool == 'thread'
+    assert config.db_lock_timeout_seconds == 300.0
+
 
 def test_custom_config_creation():
     """Test that custom configuration can be created."""
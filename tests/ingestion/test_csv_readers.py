@@ -0,0 +1,80 @@
+# Global imports
+import pandas as pd
+import pytest
+
+# Built-in import
+import logging
+
+# Local import
+from src.python.ingestion.utils.csv_readers import (
+    read_time_series_csv,
+    time_series_schema,
+)
+
+
+TEST_DATA = """Province/State,Country/Region,Lat,Long,1/22/20,1/23/20
+"",Afghanistan,33.0,65.0,0,
+" Quoted, Province",Albania ,41.0,20.0,-1,3
+"""
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    """Write a small JHU-format file."""
+    path = tmp_path / "confirmed_20230101.csv"
+    path.write_text(TEST_DATA)
+    return path
+
+
+def test_time_series_schema():
+    """Test that geo, coordinate and date columns get explicit types."""
+    schema = time_series_schema(
+        ['Province/State', 'Country/Region', 'Lat', 'Long', '1/22/20']
+    )
+
+    assert schema == {
+        'Province/State': 'VARCHAR',
+        'Country/Region': 'VARCHAR',
+        'Lat': 'DOUBLE',
+        'Long': 'DOUBLE',
+        '1/22/20': 'INTEGER',
+    }
+
+
+def test_duckdb_reader_matches_pandas(raw_file):
+    """Test that both backends parse the same values."""
+    logger = logging.getLogger(__name__)
+    pandas_df = read_time_series_csv(raw_file, 'pandas', logger)
+    duckdb_df = read_time_series_csv(raw_file, 'duckdb', logger)
+
+    assert list(duckdb_df.columns) == list(pandas_df.columns)
+    pd.testing.assert_frame_equal(
+        duckdb_df.astype(object).where(duckdb_df.notna(), None),
+        pandas_df.astype(object).where(pandas_df.notna(), None),
+        check_dtype=False,
+    )
+
+
+def test_duckdb_reader_uses_compact_types(raw_file):
+    """Test that date columns are read as 32-bit integers."""
+    df = read_time_series_csv(raw_file, 'duckdb', logging.getLogger(__name__))
+
+    assert str(df['1/22/20'].dtype) == 'int32'
+    # Empty cells are kept as missing values in a nullable column
+    assert str(df['1/23/20'].dtype) == 'Int32'
+    assert df['Lat'].dtype == 'float64'
+
+
+def test_duckdb_reader_rejects_non_numeric_dates(tmp_path):
+    """Test that non-numeric counts fail with a ValueError."""
+    path = tmp_path / "bad.csv"
+    path.write_text("Province/State,Country/Region,Lat,Long,1/22/20\n,Albania,41,20,abc\n")
+
+    with pytest.raises(ValueError):
+        read_time_series_csv(path, 'duckdb', logging.getLogger(__name__))
+
+
+def test_unknown_reader(raw_file):
+    """Test that an unknown backend name is rejected."""
+    with pytest.raises(ValueError):
+        read_time_series_csv(raw_file, 'spark', logging.getLogger(__name__))
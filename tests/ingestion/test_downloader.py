@@ -0,0 +1,324 @@
+# Global imports
+import pytest
+import requests
+
+# Built-in imports
+from pathlib import Path
+import hashlib
+import logging
+import time
+import tracemalloc
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.downloader import DataDownloader
+from src.python.ingestion.core.fetch_metadata import FetchMetadata
+
+
+@pytest.fixture
+def download_config(stand_in_server, tmp_path):
+    """Create a configuration pointing at the stand-in server."""
+    return IngestionConfig(
+        base_url=stand_in_server.url,
+        data_types={
+            "confirmed": "confirmed.csv",
+            "deaths": "deaths.csv",
+            "recovered": "recovered.csv",
+        },
+        raw_data_path=tmp_path,
+        db_path=str(tmp_path / "test.duckdb"),
+        max_concurrent_downloads=3,
+        request_timeout_seconds=5.0,
+        max_retries=2,
+        retry_backoff_seconds=0.01,
+        download_chunk_size=4096,
+    )
+
+
+@pytest.fixture
+def downloader(download_config):
+    """Create a downloader and close it after the test."""
+    downloader = DataDownloader(download_config, logging.getLogger(__name__))
+    yield downloader
+    downloader.close()
+
+
+def _targets(config: IngestionConfig, server_url: str):
+    return {
+        data_type: (f"{server_url}/{filename}", config.raw_data_path / filename)
+        for data_type, filename in config.data_types.items()
+    }
+
+
+def test_download_all_fetches_every_type(downloader, download_config, stand_in_server):
+    """Test that every configured data type is downloaded."""
+    for data_type, filename in download_config.data_types.items():
+        stand_in_server.add(f"/{filename}", data_type.encode())
+
+    results = downloader.download_all(_targets(download_config, stand_in_server.url))
+
+    assert set(results) == set(download_config.data_types)
+    for data_type, result in results.items():
+        assert Path(result.path).read_bytes() == data_type.encode()
+        assert result.bytes_downloaded == len(data_type)
+        assert result.attempts == 1
+
+
+def test_download_all_runs_concurrently(downloader, download_config, stand_in_server):
+    """Test that wall time is bounded by the slowest file, not the sum."""
+    delay = 0.5
+    for filename in download_config.data_types.values():
+        stand_in_server.add(f"/{filename}", b"data", delay=delay)
+
+    start = time.perf_counter()
+    downloader.download_all(_targets(download_config, stand_in_server.url))
+    elapsed = time.perf_counter() - start
+
+    # Sequential downloads would take at least 3 * delay
+    assert elapsed < 2 * delay
+
+
+def test_download_retries_transient_errors(downloader, download_config, stand_in_server):
+    """Test that 5xx responses are retried with backoff."""
+    stand_in_server.add("/confirmed.csv", b"data", failures=2)
+
+    result = downloader.download(
+        "confirmed",
+        f"{stand_in_server.url}/confirmed.csv",
+        download_config.raw_data_path / "confirmed.csv",
+    )
+
+    assert result.attempts == 3
+    assert stand_in_server.requests.count("/confirmed.csv") == 3
+
+
+def test_download_gives_up_after_max_retries(downloader, download_config, stand_in_server):
+    """Test that persistent failures raise after exhausting retries."""
+    stand_in_server.add("/confirmed.csv", b"data", failures=10)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        downloader.download(
+            "confirmed",
+            f"{stand_in_server.url}/confirmed.csv",
+            download_config.raw_data_path / "confirmed.csv",
+        )
+
+    # One initial attempt plus max_retries
+    assert stand_in_server.requests.count("/confirmed.csv") == 3
+
+
+def test_download_does_not_retry_client_errors(downloader, download_config, stand_in_server):
+    """Test that 4xx responses fail immediately."""
+    with pytest.raises(requests.exceptions.HTTPError):
+        downloader.download(
+            "confirmed",
+            f"{stand_in_server.url}/missing.csv",
+            download_config.raw_data_path / "missing.csv",
+        )
+
+    assert stand_in_server.requests.count("/missing.csv") == 1
+
+
+def test_download_all_leaves_out_missing_files(downloader, download_config, stand_in_server):
+    """Test that files upstream has not published are left out when allowed."""
+    stand_in_server.add("/confirmed.csv", b"confirmed")
+    targets = _targets(download_config, stand_in_server.url)
+    targets = {data_type: targets[data_type] for data_type in ["confirmed", "deaths"]}
+
+    results = downloader.download_all(targets, missing_ok=True)
+
+    assert list(results) == ["confirmed"]
+    assert not (download_config.raw_data_path / "deaths.csv").exists()
+    with pytest.raises(requests.exceptions.HTTPError):
+        downloader.download_all(targets)
+
+
+def test_download_times_out(download_config, stand_in_server):
+    """Test that slow responses are cut off by the request timeout."""
+    download_config.request_timeout_seconds = 0.1
+    download_config.max_retries = 0
+    stand_in_server.add("/confirmed.csv", b"data", delay=1.0)
+    downloader = DataDownloader(download_config, logging.getLogger(__name__))
+
+    try:
+        with pytest.raises(requests.exceptions.Timeout):
+            downloader.download(
+                "confirmed",
+                f"{stand_in_server.url}/confirmed.csv",
+                download_config.raw_data_path / "confirmed.csv",
+            )
+    finally:
+        downloader.close()
+
+
+def test_download_sends_conditional_headers(downloader, download_config, stand_in_server):
+    """Test that a 304 response keeps the previous copy without rewriting it."""
+    last_modified = "Wed, 15 Mar 2023 10:00:00 GMT"
+    stand_in_server.add(
+        "/confirmed.csv", b"data", etag='"v1"', last_modified=last_modified
+    )
+    url = f"{stand_in_server.url}/confirmed.csv"
+
+    first = downloader.download(
+        "confirmed", url, download_config.raw_data_path / "confirmed_1.csv"
+    )
+    assert first.changed
+    assert first.etag == '"v1"'
+    assert first.last_modified == last_modified
+
+    previous = FetchMetadata(
+        url=url,
+        path=str(first.path),
+        etag=first.etag,
+        last_modified=first.last_modified,
+        content_length=first.content_length,
+        content_hash=first.content_hash,
+        fetched_at="2023-03-15T10:00:00",
+    )
+    second = downloader.download(
+        "confirmed", url, download_config.raw_data_path / "confirmed_2.csv", previous
+    )
+
+    assert stand_in_server.request_headers[-1]["If-None-Match"] == '"v1"'
+    assert stand_in_server.request_headers[-1]["If-Modified-Since"] == last_modified
+    assert not second.changed
+    assert second.bytes_downloaded == 0
+    assert second.path == first.path
+    assert not (download_config.raw_data_path / "confirmed_2.csv").exists()
+
+
+def test_download_detects_unchanged_content_by_hash(
+    downloader, download_config, stand_in_server
+):
+    """Test that servers without validators still report unchanged content."""
+    stand_in_server.add("/confirmed.csv", b"data")
+    url = f"{stand_in_server.url}/confirmed.csv"
+
+    first = downloader.download(
+        "confirmed", url, download_config.raw_data_path / "confirmed_1.csv"
+    )
+    previous = FetchMetadata(
+        url=url,
+        path=str(first.path),
+        etag=None,
+        last_modified=None,
+        content_length=first.content_length,
+        content_hash=first.content_hash,
+        fetched_at="2023-03-15T10:00:00",
+    )
+    second = downloader.download(
+        "confirmed", url, download_config.raw_data_path / "confirmed_2.csv", previous
+    )
+
+    assert not second.changed
+    assert second.content_hash == first.content_hash
+
+
+def test_download_resumes_interrupted_transfer(
+    downloader, download_config, stand_in_server
+):
+    """Test that a dropped connection is resumed with a Range request."""
+    body = b"".join(b"%08d\n" % i for i in range(10000))
+    stand_in_server.add("/confirmed.csv", body, etag='"v1"', drop_after=30000)
+    output_path = download_config.raw_data_path / "confirmed.csv"
+
+    result = downloader.download(
+        "confirmed", f"{stand_in_server.url}/confirmed.csv", output_path
+    )
+
+    assert output_path.read_bytes() == body
+    assert result.attempts == 2
+    assert result.content_hash == hashlib.sha256(body).hexdigest()
+    # Only the bytes after the last complete chunk are fetched again
+    resumed_at = len(body) - result.bytes_downloaded
+    assert 0 < resumed_at <= 30000
+    assert stand_in_server.request_headers[-1]["Range"] == f"bytes={resumed_at}-"
+    assert stand_in_server.request_headers[-1]["If-Range"] == '"v1"'
+    assert not list(download_config.raw_data_path.glob("*.part*"))
+
+
+def test_download_resumes_partial_file_from_earlier_run(
+    downloader, download_config, stand_in_server
+):
+    """Test that a partial file left by an earlier run is resumed."""
+    body = b"0123456789" * 100
+    stand_in_server.add("/confirmed.csv", body, etag='"v1"')
+    output_path = download_config.raw_data_path / "confirmed.csv"
+    (download_config.raw_data_path / "confirmed.csv.part").write_bytes(body[:400])
+    (download_config.raw_data_path / "confirmed.csv.part.validator").write_text('"v1"')
+
+    result = downloader.download(
+        "confirmed", f"{stand_in_server.url}/confirmed.csv", output_path
+    )
+
+    assert output_path.read_bytes() == body
+    assert result.bytes_downloaded == 600
+    assert result.content_length == 1000
+
+
+def test_download_restarts_partial_file_when_upstream_changed(
+    downloader, download_config, stand_in_server
+):
+    """Test that If-Range discards a partial file of an older version."""
+    body = b"new content " * 50
+    stand_in_server.add("/confirmed.csv", body, etag='"v2"')
+    output_path = download_config.raw_data_path / "confirmed.csv"
+    (download_config.raw_data_path / "confirmed.csv.part").write_bytes(b"old content")
+    (download_config.raw_data_path / "confirmed.csv.part.validator").write_text('"v1"')
+
+    result = downloader.download(
+        "confirmed", f"{stand_in_server.url}/confirmed.csv", output_path
+    )
+
+    assert output_path.read_bytes() == body
+    assert result.bytes_downloaded == len(body)
+
+
+def test_download_restarts_partial_file_longer_than_upstream(
+    downloader, download_config, stand_in_server
+):
+    """Test that a 416 response discards the partial file and starts over."""
+    body = b"0123456789" * 10
+    stand_in_server.add("/confirmed.csv", body, etag='"v1"')
+    output_path = download_config.raw_data_path / "confirmed.csv"
+    # Left by an earlier run, before the file shrank upstream
+    (download_config.raw_data_path / "confirmed.csv.part").write_bytes(body * 2)
+    (download_config.raw_data_path / "confirmed.csv.part.validator").write_text('"v1"')
+
+    result = downloader.download(
+        "confirmed", f"{stand_in_server.url}/confirmed.csv", output_path
+    )
+
+    assert output_path.read_bytes() == body
+    assert result.bytes_downloaded == len(body)
+    assert stand_in_server.requests.count("/confirmed.csv") == 2
+    assert "Range" not in stand_in_server.request_headers[-1]
+    assert not list(download_config.raw_data_path.glob("*.part*"))
+
+
+def test_download_memory_does_not_grow_with_file_size(
+    download_config, stand_in_server
+):
+    """Test that streaming keeps peak download memory bounded by the chunk size."""
+    chunk_size = 64 * 1024
+    download_config.download_chunk_size = chunk_size
+    body = b"x" * (16 * 1024 * 1024)
+    stand_in_server.add("/confirmed.csv", body)
+    downloader = DataDownloader(download_config, logging.getLogger(__name__))
+
+    tracemalloc.start()
+    try:
+        result = downloader.download(
+            "confirmed",
+            f"{stand_in_server.url}/confirmed.csv",
+            download_config.raw_data_path / "confirmed.csv",
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        downloader.close()
+
+    assert result.content_length == len(body)
+    assert result.max_chunk_bytes <= chunk_size
+    # A buffered download would need at least the full 16 MiB body
+    assert peak < 2 * 1024 * 1024
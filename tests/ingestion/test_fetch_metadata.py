@@ -0,0 +1,50 @@
+# Local import
+from src.python.ingestion.core.fetch_metadata import FetchMetadata, FetchMetadataStore
+
+
+def _metadata(**overrides):
+    values = dict(
+        url="https://test.url/test.csv",
+        path="test/raw/test_20230101.csv",
+        etag='"abc"',
+        last_modified="Sun, 01 Jan 2023 00:00:00 GMT",
+        content_length=42,
+        content_hash="deadbeef",
+        fetched_at="2023-01-01T00:00:00",
+    )
+    values.update(overrides)
+    return FetchMetadata(**values)
+
+
+def test_store_starts_empty(tmp_path):
+    """Test that a missing store file yields an empty store."""
+    store = FetchMetadataStore(tmp_path / "fetch_metadata.json")
+    assert store.get("confirmed") is None
+
+
+def test_store_round_trip(tmp_path):
+    """Test that saved metadata is read back by a new store instance."""
+    path = tmp_path / "raw" / "fetch_metadata.json"
+    store = FetchMetadataStore(path)
+    store.set("confirmed", _metadata(etag='"v2"'))
+    store.save()
+
+    reloaded = FetchMetadataStore(path)
+    assert reloaded.get("confirmed") == _metadata(etag='"v2"')
+    assert not path.with_suffix(".json.tmp").exists()
+
+
+def test_concurrent_stores_keep_each_others_entries(tmp_path):
+    """Test that stores saved by parallel loads do not drop each other's entries."""
+    path = tmp_path / "fetch_metadata.json"
+    confirmed_store = FetchMetadataStore(path)
+    deaths_store = FetchMetadataStore(path)
+
+    confirmed_store.set("confirmed", _metadata(etag='"c"'))
+    confirmed_store.save()
+    deaths_store.set("deaths", _metadata(etag='"d"'))
+    deaths_store.save()
+
+    reloaded = FetchMetadataStore(path)
+    assert reloaded.get("confirmed") == _metadata(etag='"c"')
+    assert reloaded.get("deaths") == _metadata(etag='"d"')
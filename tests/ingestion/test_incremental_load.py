@@ -0,0 +1,198 @@
+# Global imports
+import duckdb
+import pandas as pd
+import pytest
+
+# Built-in imports
+from datetime import datetime, timedelta
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.incremental_load import (
+    WATERMARK_TABLE,
+    date_columns_since,
+)
+from .conftest import date_headers, wide_frame
+
+
+@pytest.fixture
+def config(make_config):
+    """Incremental configuration loading a single 'test' data type."""
+    return make_config(load_mode="incremental", revision_window_days=3)
+
+
+def _load(config: IngestionConfig, df: pd.DataFrame, stamp: str) -> dict:
+    """Write a raw file as the latest download, load it and return the load modes."""
+    df.to_csv(config.raw_data_path / f"test_{stamp}.csv", index=False)
+    ingestion = CovidDataIngestion(config=config)
+    ingestion.load_to_duckdb()
+    return ingestion.load_modes
+
+
+def _rows(db_path: str):
+    """All rows of raw_test in a deterministic order."""
+    conn = duckdb.connect(db_path)
+    rows = conn.execute("SELECT * FROM raw_test ORDER BY ALL").fetchall()
+    conn.close()
+    return rows
+
+
+def _watermark(db_path: str):
+    """Watermark row recorded for raw_test."""
+    conn = duckdb.connect(db_path)
+    row = conn.execute(
+        f"SELECT max_date, rows_inserted, rows_updated FROM {WATERMARK_TABLE} "
+        "WHERE table_name = 'raw_test'"
+    ).fetchone()
+    conn.close()
+    return row
+
+
+@pytest.mark.parametrize("ingestion_mode", ["pandas", "sql"])
+def test_incremental_load_matches_full_load(ingestion_mode, config, make_config, tmp_path):
+    """Test that appending a day with revisions equals rebuilding from scratch."""
+    config.ingestion_mode = ingestion_mode
+    day_one = wide_frame(days=20)
+    assert _load(config, day_one, "20230101") == {"test": "full"}
+    assert _watermark(config.db_path) == (datetime(2020, 2, 10), 120, 0)
+
+    # The next file adds a date and revises two recent cells
+    day_two = wide_frame(days=21)
+    day_two.loc[0, '2/9/20'] += 5
+    day_two.loc[3, '2/10/20'] = -1
+    assert _load(config, day_two, "20230102") == {"test": "incremental"}
+
+    # 6 new rows for the new date, 2 revised rows
+    assert _watermark(config.db_path) == (datetime(2020, 2, 11), 6, 2)
+
+    full_config = make_config(db_path=str(tmp_path / "full.duckdb"), ingestion_mode=ingestion_mode)
+    CovidDataIngestion(config=full_config).load_to_duckdb()
+    assert _rows(config.db_path) == _rows(full_config.db_path)
+
+
+def test_incremental_load_inserts_new_locations(config):
+    """Test that a location appearing upstream is inserted for every date read."""
+    _load(config, wide_frame(days=10, locations=4), "20230101")
+    _load(config, wide_frame(days=10, locations=6), "20230102")
+
+    # Dates inside the revision window (the watermark and 3 days before)
+    assert _watermark(config.db_path)[1:] == (2 * 4, 0)
+    assert len(_rows(config.db_path)) == 4 * 10 + 2 * 4
+
+
+def test_revisions_outside_window_are_ignored(config):
+    """Test that only the revision window is re-read on incremental loads."""
+    _load(config, wide_frame(days=10), "20230101")
+
+    revised = wide_frame(days=10)
+    revised.loc[0, '1/22/20'] = 999
+    _load(config, revised, "20230102")
+
+    assert _watermark(config.db_path)[1:] == (0, 0)
+    assert 999 not in [row[-1] for row in _rows(config.db_path)]
+
+
+def test_missing_table_triggers_full_load(config):
+    """Test that a dropped table is rebuilt from the whole file."""
+    _load(config, wide_frame(days=10), "20230101")
+
+    conn = duckdb.connect(config.db_path)
+    conn.execute("DROP TABLE raw_test")
+    conn.close()
+
+    assert _load(config, wide_frame(days=11), "20230102") == {"test": "full"}
+    assert _watermark(config.db_path) == (datetime(2020, 2, 1), 66, 0)
+
+
+def test_date_columns_since():
+    """Test selection of date columns by header date."""
+    columns = ['Province/State', 'Country/Region', 'Lat', 'Long'] + date_headers(5)
+
+    assert date_columns_since(columns, datetime(2020, 1, 24)) == [
+        '1/24/20', '1/25/20', '1/26/20'
+    ]
+    assert date_columns_since(columns, datetime(2021, 1, 1)) == []
+    assert date_columns_since(columns, datetime(2020, 1, 23), datetime(2020, 1, 25)) == [
+        '1/23/20', '1/24/20'
+    ]
+
+
+def test_unknown_load_mode(config):
+    """Test that an unknown load mode is rejected before loading."""
+    config.load_mode = "append"
+
+    with pytest.raises(ValueError, match="Unknown load mode"):
+        CovidDataIngestion(config=config).load_to_duckdb()
+
+
+@pytest.mark.parametrize("ingestion_mode", ["pandas", "sql"])
+def test_date_range_loads_match_full_load(ingestion_mode, config, make_config, tmp_path):
+    """Test that loading disjoint date ranges in any order equals a full load."""
+    config.ingestion_mode = ingestion_mode
+    df = wide_frame(days=20)
+    df.to_csv(config.raw_data_path / "test_20230101.csv", index=False)
+
+    ingestion = CovidDataIngestion(config=config)
+    for start, end in [(10, 20), (0, 5), (5, 10)]:
+        date_range = (datetime(2020, 1, 22) + timedelta(days=start),
+                      datetime(2020, 1, 22) + timedelta(days=end))
+        assert ingestion.load_to_duckdb(date_range=date_range) == ["test"]
+        assert ingestion.load_modes == {"test": "range"}
+
+    full_config = make_config(db_path=str(tmp_path / "full.duckdb"), ingestion_mode=ingestion_mode)
+    CovidDataIngestion(config=full_config).load_to_duckdb()
+    assert _rows(config.db_path) == _rows(full_config.db_path)
+    assert _watermark(config.db_path)[0] == datetime(2020, 2, 10)
+
+
+def test_date_range_load_only_touches_its_dates(config):
+    """Test that a range load replaces its dates and leaves the others alone."""
+    _load(config, wide_frame(days=10), "20230101")
+
+    # Upstream revises one cell inside and one cell outside the range
+    revised = wide_frame(days=10)
+    revised.loc[0, '1/23/20'] = 999
+    revised.loc[0, '1/30/20'] = 888
+    revised.to_csv(config.raw_data_path / "test_20230102.csv", index=False)
+    ingestion = CovidDataIngestion(config=config)
+    ingestion.load_to_duckdb(date_range=(datetime(2020, 1, 23), datetime(2020, 1, 24)))
+
+    values = [row[-1] for row in _rows(config.db_path)]
+    assert 999 in values
+    assert 888 not in values
+    assert len(values) == 6 * 10
+
+
+def test_date_range_outside_file_loads_nothing(config):
+    """Test that a range without any date column of the file is skipped."""
+    wide_frame(days=5).to_csv(config.raw_data_path / "test_20230101.csv", index=False)
+    ingestion = CovidDataIngestion(config=config)
+
+    assert ingestion.load_to_duckdb(date_range=(datetime(2021, 1, 1), datetime(2021, 1, 2))) == []
+    assert ingestion.load_modes == {}
+
+
+def test_latest_date_range_load_replaces_revision_window(config):
+    """Test that a range load reaching the latest date also replaces recent revisions."""
+    _load(config, wide_frame(days=10), "20230101")
+
+    # The next file adds a date and revises a cell inside and one outside the window
+    revised = wide_frame(days=11)
+    revised.loc[0, '1/30/20'] = 999
+    revised.loc[0, '1/23/20'] = 888
+    revised.to_csv(config.raw_data_path / "test_20230102.csv", index=False)
+    ingestion = CovidDataIngestion(config=config)
+    ingestion.load_to_duckdb(date_range=(datetime(2020, 2, 1), datetime(2020, 2, 2)))
+
+    # From 3 days before the watermark of 31 January
+    assert ingestion.load_ranges == {"test": (datetime(2020, 1, 28), datetime(2020, 2, 2))}
+    values = [row[-1] for row in _rows(config.db_path)]
+    assert 999 in values
+    assert 888 not in values
+    assert len(values) == 6 * 11
+
+    # Ranges before the latest date are loaded as they are
+    ingestion.load_to_duckdb(date_range=(datetime(2020, 1, 23), datetime(2020, 1, 24)))
+    assert ingestion.load_ranges == {"test": (datetime(2020, 1, 23), datetime(2020, 1, 24))}
+    assert 888 in [row[-1] for row in _rows(config.db_path)]
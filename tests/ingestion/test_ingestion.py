@@ -1,9 +1,11 @@
-# Global import
+# Global imports
+import duckdb
 import pytest
+import requests
 
 # Built-in import
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, patch
 from pathlib import Path
 
 # Local import
@@ -36,30 +38,34 @@ def test_ingestion_initialization(mock_config):
     assert hasattr(ingestion, 'logger')
 
 
-@patch('requests.get')
-def test_download_data_success(mock_get, mock_ingestion, tmp_path):
+def test_download_data_success(mock_ingestion, stand_in_server, tmp_path):
     """Test successful data download."""
-    # Mock the response
-    mock_response = Mock()
-    mock_response.content = b"test,data\n1,2"
-    mock_get.return_value = mock_response
+    # Serve the test file from the local stand-in server
+    stand_in_server.add("/test.csv", b"test,data\n1,2")
+    mock_ingestion.config.base_url = stand_in_server.url
 
     # Set up test directory
     mock_ingestion.config.raw_data_path = tmp_path / "raw"
 
     # Run download
-    mock_ingestion.download_data()
+    results = mock_ingestion.download_data()
 
     # Verify file was created
     assert len(list((tmp_path / "raw").glob("*.csv"))) == 1
+    assert results["test"].path.read_bytes() == b"test,data\n1,2"
 
+    # The download is recorded with the bytes it received
+    download = mock_ingestion.metrics.by_data_type()["test"]["download"]
+    assert download["counters"] == {"bytes_downloaded": 13, "attempts": 1}
 
-@patch('requests.get')
-def test_download_data_failure(mock_get, mock_ingestion):
+
+def test_download_data_failure(mock_ingestion, stand_in_server, tmp_path):
     """Test data download failure."""
-    mock_get.side_effect = Exception("Download failed")
+    # No route registered, so the server answers 404
+    mock_ingestion.config.base_url = stand_in_server.url
+    mock_ingestion.config.raw_data_path = tmp_path / "raw"
 
-    with pytest.raises(Exception):
+    with pytest.raises(requests.exceptions.HTTPError):
         mock_ingestion.download_data()
 
 
@@ -67,8 +73,8 @@ def test_download_data_failure(mock_get, mock_ingestion):
 @patch('src.python.ingestion.utils.data_validation.validate_data')
 def test_load_to_duckdb_success(mock_validate, mock_connect, mock_ingestion, tmp_path):
     """Test successful data loading to DuckDB."""
-    # Mock DuckDB connection
-    mock_conn = Mock()
+    # Mock DuckDB connection (query results are read back for the watermark)
+    mock_conn = MagicMock()
     mock_connect.return_value = mock_conn
 
     # Mock validation to pass
@@ -107,8 +113,11 @@ def test_cleanup_old_files(mock_datetime, mock_ingestion, tmp_path):
     old_file = mock_ingestion.config.raw_data_path / "test_20220101.csv"
     new_file = mock_ingestion.config.raw_data_path / "test_20230101.csv"
 
+    old_partial = mock_ingestion.config.raw_data_path / "test_20220101.csv.part"
+
     old_file.write_text("old")
     new_file.write_text("new")
+    old_partial.write_text("partial")
 
     # Mock datetime.now() to return a fixed date
     current_date = datetime(2023, 1, 2)
@@ -132,4 +141,65 @@ def test_cleanup_old_files(mock_datetime, mock_ingestion, tmp_path):
 
     # Verify old file was deleted but new file remains
     assert not old_file.exists()
+    assert not old_partial.exists()
     assert new_file.exists()
+
+
+def test_unchanged_sources_skip_load(mock_config, stand_in_server, tmp_path):
+    """Test that a rerun against unchanged upstream files skips the load."""
+    test_data = b"""Province/State,Country/Region,Lat,Long,1/1/20
+"",Afghanistan,33.0,65.0,0
+"",Albania,41.0,20.0,0"""
+    stand_in_server.add("/test.csv", test_data, etag='"v1"')
+
+    mock_config.base_url = stand_in_server.url
+    mock_config.raw_data_path = tmp_path / "raw"
+    mock_config.db_path = str(tmp_path / "test.duckdb")
+
+    # First run downloads and loads the data
+    first_run = CovidDataIngestion(config=mock_config)
+    assert first_run.download_data()["test"].changed
+    assert first_run.load_to_duckdb() == ["test"]
+
+    # Second run gets a 304 and skips the load
+    second_run = CovidDataIngestion(config=mock_config)
+    assert not second_run.download_data()["test"].changed
+    assert second_run.load_to_duckdb() == []
+    assert stand_in_server.request_headers[-1]["If-None-Match"] == '"v1"'
+
+    # A changed upstream file is loaded again
+    stand_in_server.add("/test.csv", test_data + b"\n,Algeria,28.0,1.6,0", etag='"v2"')
+    third_run = CovidDataIngestion(config=mock_config)
+    assert third_run.download_data()["test"].changed
+    assert third_run.load_to_duckdb() == ["test"]
+
+
+@pytest.mark.parametrize("csv_reader", ["pandas", "duckdb"])
+def test_load_to_duckdb_reader_backends(csv_reader, mock_config, tmp_path):
+    """Test that every reader backend loads the same rows."""
+    test_file = tmp_path / "raw" / "test_20230101.csv"
+    test_file.parent.mkdir(parents=True)
+    test_file.write_text("""Province/State,Country/Region,Lat,Long,1/1/20,1/2/20
+"",Afghanistan,33.0,65.0,0,
+Quebec,Canada ,52.9,-73.5,-1,3""")
+
+    mock_config.raw_data_path = tmp_path / "raw"
+    mock_config.db_path = str(tmp_path / "test.duckdb")
+    mock_config.csv_reader = csv_reader
+
+    assert CovidDataIngestion(config=mock_config).load_to_duckdb() == ["test"]
+
+    conn = duckdb.connect(mock_config.db_path)
+    rows = conn.execute(
+        'SELECT "Province/State", "Country/Region", date, test '
+        'FROM raw_test JOIN dim_location USING (location_id) ORDER BY ALL'
+    ).fetchall()
+    conn.close()
+
+    # clean_data fills every missing value, including provinces, with 0
+    assert [row[:2] + (row[2].strftime("%Y-%m-%d"), row[3]) for row in rows] == [
+        ("0", "Afghanistan", "2020-01-01", 0),
+        ("0", "Afghanistan", "2020-01-02", 0),
+        ("Quebec", "Canada", "2020-01-01", 0),
+        ("Quebec", "Canada", "2020-01-02", 3),
+    ]
@@ -0,0 +1,203 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+from datetime import datetime
+import shutil
+
+# Local imports
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.load_manifest import (
+    MANIFEST_TABLE,
+    fingerprint_file,
+    forget_load,
+    forget_ranges,
+    get_loaded_fingerprint,
+    get_loaded_range_fingerprint,
+    record_load,
+    record_range_load,
+)
+from .conftest import time_series_header
+
+
+RAW_DATA = time_series_header(2) + """"",Afghanistan,33.0,65.0,0,1
+Quebec,Canada ,52.9,-73.5,2,3
+"""
+
+
+@pytest.fixture
+def config(make_config):
+    """Configuration loading a single 'test' data type from RAW_DATA."""
+    config = make_config()
+    (config.raw_data_path / "test_20230101.csv").write_text(RAW_DATA)
+    return config
+
+
+def _manifest(db_path: str):
+    """Source file and shape recorded for every table."""
+    conn = duckdb.connect(db_path)
+    rows = conn.execute(
+        f"SELECT table_name, source_file, row_count, column_count FROM {MANIFEST_TABLE}"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_fingerprint_file(tmp_path):
+    """Test that a fingerprint hashes the content and counts rows and columns."""
+    path = tmp_path / "test.csv"
+    path.write_text(RAW_DATA)
+    fingerprint = fingerprint_file(path)
+
+    assert fingerprint.file_size == len(RAW_DATA)
+    assert (fingerprint.row_count, fingerprint.column_count) == (2, 6)
+
+    # A copy has the same fingerprint, whatever its name
+    copy = tmp_path / "copy.csv"
+    shutil.copy(path, copy)
+    assert fingerprint_file(copy) == fingerprint
+
+    # The last line counts even without a trailing line break
+    path.write_text(RAW_DATA.rstrip("\n"))
+    changed = fingerprint_file(path)
+    assert changed.row_count == 2
+    assert changed.content_hash != fingerprint.content_hash
+
+
+def test_manifest_round_trip(tmp_path):
+    """Test recording, reading and forgetting the fingerprint of a table."""
+    path = tmp_path / "test.csv"
+    path.write_text(RAW_DATA)
+    fingerprint = fingerprint_file(path)
+    conn = duckdb.connect(str(tmp_path / "test.duckdb"))
+
+    # No fingerprint for a table that does not exist, even if recorded
+    record_load(conn, "raw_test", str(path), fingerprint)
+    assert get_loaded_fingerprint(conn, "raw_test") is None
+
+    conn.execute("CREATE TABLE raw_test (location_id INTEGER)")
+    assert get_loaded_fingerprint(conn, "raw_test") == fingerprint
+
+    forget_load(conn, "raw_test")
+    assert get_loaded_fingerprint(conn, "raw_test") is None
+    conn.close()
+
+
+def test_unchanged_file_skips_load(config):
+    """Test that a rerun over the file a table was loaded from skips the load."""
+    first_run = CovidDataIngestion(config)
+    assert first_run.load_to_duckdb() == ["test"]
+    assert first_run.skipped_files == {}
+    assert _manifest(config.db_path) == [
+        ("raw_test", str(config.raw_data_path / "test_20230101.csv"), 2, 6)
+    ]
+
+    # An identical copy under a newer name is the same content
+    shutil.copy(
+        config.raw_data_path / "test_20230101.csv",
+        config.raw_data_path / "test_20230102.csv",
+    )
+    second_run = CovidDataIngestion(config)
+    assert second_run.load_to_duckdb() == []
+    assert second_run.skipped_files == {"test": config.raw_data_path / "test_20230102.csv"}
+    assert second_run.load_modes == {}
+
+    # Unless skipping is turned off
+    config.skip_unchanged_files = False
+    assert CovidDataIngestion(config).load_to_duckdb() == ["test"]
+
+
+def test_changed_or_missing_table_is_loaded(config):
+    """Test that a changed file or a dropped table is loaded again."""
+    assert CovidDataIngestion(config).load_to_duckdb() == ["test"]
+
+    (config.raw_data_path / "test_20230102.csv").write_text(
+        RAW_DATA + ",Albania,41.0,20.0,4,5\n"
+    )
+    assert CovidDataIngestion(config).load_to_duckdb() == ["test"]
+    assert _manifest(config.db_path)[0][2] == 3
+
+    conn = duckdb.connect(config.db_path)
+    conn.execute("DROP TABLE raw_test")
+    conn.close()
+    assert CovidDataIngestion(config).load_to_duckdb() == ["test"]
+
+
+def test_range_load_of_another_file_forgets_load(config):
+    """Test that a range load from another file makes the next load run."""
+    assert CovidDataIngestion(config).load_to_duckdb() == ["test"]
+
+    # A range of the file the table was loaded from is loaded already
+    date_range = (datetime(2020, 1, 23), datetime(2020, 1, 24))
+    assert CovidDataIngestion(config).load_to_duckdb(date_range) == []
+    assert len(_manifest(config.db_path)) == 1
+
+    # A range load from a revised file does not
+    (config.raw_data_path / "test_20230102.csv").write_text(RAW_DATA.replace(",3\n", ",7\n"))
+    assert CovidDataIngestion(config).load_to_duckdb(date_range) == ["test"]
+    assert _manifest(config.db_path) == []
+
+    # So removing the revised file reloads the original one in full
+    (config.raw_data_path / "test_20230102.csv").unlink()
+    assert CovidDataIngestion(config).load_to_duckdb() == ["test"]
+
+
+def test_range_manifest_round_trip(tmp_path):
+    """Test that a range entry covers the ranges inside it until a load overlaps it."""
+    path = tmp_path / "test.csv"
+    path.write_text(RAW_DATA)
+    fingerprint = fingerprint_file(path)
+    conn = duckdb.connect(str(tmp_path / "test.duckdb"))
+    conn.execute("CREATE TABLE raw_test (location_id INTEGER)")
+    january = (datetime(2020, 1, 1), datetime(2020, 2, 1))
+
+    record_range_load(conn, "raw_test", january, str(path), fingerprint)
+    assert get_loaded_range_fingerprint(conn, "raw_test", january) == fingerprint
+    assert get_loaded_range_fingerprint(
+        conn, "raw_test", (datetime(2020, 1, 5), datetime(2020, 1, 6))
+    ) == fingerprint
+    assert get_loaded_range_fingerprint(
+        conn, "raw_test", (datetime(2020, 1, 31), datetime(2020, 2, 2))
+    ) is None
+
+    # A load of other dates keeps the entry, one of some of its dates does not
+    forget_ranges(conn, "raw_test", (datetime(2020, 2, 1), datetime(2020, 2, 2)))
+    assert get_loaded_range_fingerprint(conn, "raw_test", january) == fingerprint
+    forget_ranges(conn, "raw_test", (datetime(2020, 1, 31), datetime(2020, 2, 2)))
+    assert get_loaded_range_fingerprint(conn, "raw_test", january) is None
+
+    # A table dropped since holds none of its ranges
+    record_range_load(conn, "raw_test", january, str(path), fingerprint)
+    conn.execute("DROP TABLE raw_test")
+    forget_ranges(conn, "raw_test", (datetime(2020, 3, 1), datetime(2020, 3, 2)))
+    conn.execute("CREATE TABLE raw_test (location_id INTEGER)")
+    assert get_loaded_range_fingerprint(conn, "raw_test", january) is None
+    conn.close()
+
+
+def test_unchanged_range_skips_load(config):
+    """Test that rerunning a range load of an unchanged file skips it."""
+    january = (datetime(2020, 1, 1), datetime(2020, 2, 1))
+    assert CovidDataIngestion(config).load_to_duckdb(january) == ["test"]
+
+    # The same range, or a day of it, was loaded from this content
+    rerun = CovidDataIngestion(config)
+    assert rerun.load_to_duckdb(january) == []
+    assert rerun.load_modes == {}
+    assert rerun.skipped_files == {"test": config.raw_data_path / "test_20230101.csv"}
+    assert CovidDataIngestion(config).load_to_duckdb(
+        (datetime(2020, 1, 23), datetime(2020, 1, 24))
+    ) == []
+
+    # A revised file is loaded again, and only then makes the range current
+    (config.raw_data_path / "test_20230102.csv").write_text(RAW_DATA.replace(",3\n", ",7\n"))
+    assert CovidDataIngestion(config).load_to_duckdb(january) == ["test"]
+    assert CovidDataIngestion(config).load_to_duckdb(january) == []
+
+    # A whole load of other content replaces the range, which the revised
+    # file then no longer matches
+    (config.raw_data_path / "test_20230103.csv").write_text(RAW_DATA)
+    assert CovidDataIngestion(config).load_to_duckdb() == ["test"]
+    (config.raw_data_path / "test_20230104.csv").write_text(RAW_DATA.replace(",3\n", ",7\n"))
+    assert CovidDataIngestion(config).load_to_duckdb(january) == ["test"]
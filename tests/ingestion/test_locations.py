@@ -0,0 +1,120 @@
+# Global imports
+import duckdb
+import pandas as pd
+import pytest
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.utils.locations import upsert_locations, with_location_ids
+from .conftest import time_series_header
+
+
+HEADER = time_series_header(2)
+DATA_TYPES = {"confirmed": "confirmed.csv", "deaths": "deaths.csv"}
+
+
+def _locations(config: IngestionConfig) -> list:
+    conn = duckdb.connect(config.db_path)
+    rows = conn.execute("SELECT * FROM dim_location ORDER BY location_id").fetchall()
+    conn.close()
+    return rows
+
+
+@pytest.mark.parametrize("ingestion_mode", ["pandas", "sql"])
+def test_location_ids_are_stable(ingestion_mode, make_config):
+    """Test that ids are shared by data types and kept when locations are added."""
+    config = make_config(data_types=DATA_TYPES, ingestion_mode=ingestion_mode)
+    for data_type in config.data_types:
+        (config.raw_data_path / f"{data_type}_20230101.csv").write_text(
+            HEADER + ",Canada,56.1,106.3,1,2\nQuebec,Canada,52.9,73.5,3,4\n"
+        )
+    CovidDataIngestion(config=config).load_to_duckdb()
+
+    assert _locations(config) == [
+        (1, "0", "Canada", pytest.approx(56.1), pytest.approx(106.3)),
+        (2, "Quebec", "Canada", pytest.approx(52.9), pytest.approx(73.5)),
+    ]
+
+    # A new location sorting first still gets the next id, and revised
+    # coordinates of confirmed are applied to the existing location
+    for data_type in config.data_types:
+        (config.raw_data_path / f"{data_type}_20230102.csv").write_text(
+            HEADER + ",Albania,41.2,20.2,5,6\n,Canada,57.0,106.3,1,2\nQuebec,Canada,52.9,73.5,3,4\n"
+        )
+    CovidDataIngestion(config=config).load_to_duckdb()
+
+    assert [row[:3] for row in _locations(config)] == [
+        (1, "0", "Canada"), (2, "Quebec", "Canada"), (3, "0", "Albania")
+    ]
+    assert _locations(config)[0][3] == pytest.approx(57.0)
+    conn = duckdb.connect(config.db_path)
+    assert conn.execute(
+        "SELECT DISTINCT location_id FROM raw_deaths ORDER BY 1"
+    ).fetchall() == [(1,), (2,), (3,)]
+    assert conn.execute(
+        "SELECT location_id, confirmed FROM raw_confirmed WHERE date = '2020-01-23' ORDER BY 1"
+    ).fetchall() == [(1, 2), (2, 4), (3, 6)]
+    conn.close()
+
+
+def test_incremental_load_adds_new_location(make_config):
+    """Test that a location first seen by an incremental load is keyed and merged."""
+    config = make_config(data_types={"confirmed": "confirmed.csv"}, load_mode="incremental")
+    (config.raw_data_path / "confirmed_20230101.csv").write_text(
+        HEADER + ",Canada,56.1,106.3,1,2\n"
+    )
+    CovidDataIngestion(config=config).load_to_duckdb()
+
+    (config.raw_data_path / "confirmed_20230102.csv").write_text(
+        time_series_header(3)
+        + ",Canada,56.1,106.3,1,2,3\n,Albania,41.2,20.2,0,0,7\n"
+    )
+    ingestion = CovidDataIngestion(config=config)
+    ingestion.load_to_duckdb()
+
+    assert ingestion.load_modes == {"confirmed": "incremental"}
+    conn = duckdb.connect(config.db_path)
+    rows = conn.execute(
+        """SELECT "Country/Region", date::VARCHAR, confirmed
+        FROM raw_confirmed JOIN dim_location USING (location_id)
+        WHERE date = '2020-01-24' ORDER BY ALL"""
+    ).fetchall()
+    conn.close()
+    assert rows == [("Albania", "2020-01-24", 7), ("Canada", "2020-01-24", 3)]
+
+
+@pytest.mark.parametrize("data_types", [["confirmed", "deaths"], ["deaths", "confirmed"]])
+def test_coordinates_come_from_confirmed(data_types, make_config):
+    """Test that other data types do not overwrite the coordinates of confirmed."""
+    config = make_config(data_types={data_type: f"{data_type}.csv" for data_type in data_types})
+    coordinates = {"confirmed": "56.1,106.3", "deaths": "60.0,-95.0"}
+    for data_type in data_types:
+        (config.raw_data_path / f"{data_type}_20230101.csv").write_text(
+            HEADER + f",Canada,{coordinates[data_type]},1,2\nQuebec,Canada,52.9,73.5,3,4\n"
+        )
+    CovidDataIngestion(config=config).load_to_duckdb()
+
+    assert _locations(config) == [
+        (1, "0", "Canada", pytest.approx(56.1), pytest.approx(106.3)),
+        (2, "Quebec", "Canada", pytest.approx(52.9), pytest.approx(73.5)),
+    ]
+
+
+def test_missing_country_matches_its_location():
+    """Test that a location without a country is keyed like any other."""
+    frame = pd.DataFrame({
+        'Province/State': ['0', '0'],
+        'Country/Region': [None, 'Canada'],
+        'Lat': [1.0, 2.0],
+        'Long': [3.0, 4.0],
+        'value': [10, 20],
+    })
+    conn = duckdb.connect()
+    conn.register('frame_view', frame)
+
+    assert upsert_locations(conn, 'frame_view') == (2, 0)
+    assert upsert_locations(conn, 'frame_view') == (0, 0)
+    assert conn.execute(
+        f"SELECT * FROM {with_location_ids('frame_view')} ORDER BY value"
+    ).fetchall() == [(2, 10), (1, 20)]
@@ -20,8 +20,12 @@ def test_main_success(mock_ingestion_class):
 
     # Verify methods were called in correct order
     mock_ingestion.download_data.assert_called_once()
+    mock_ingestion.download_sources.assert_called_once()
     mock_ingestion.load_to_duckdb.assert_called_once()
+    mock_ingestion.load_sources.assert_called_once()
     mock_ingestion.cleanup_old_files.assert_called_once()
+    # The snapshot is published once dbt has built the models on it
+    mock_ingestion.publish_snapshot.assert_not_called()
 
 
 @patch('src.python.ingestion.__main__.CovidDataIngestion')
@@ -36,5 +40,19 @@ def test_main_failure(mock_ingestion_class):
     with pytest.raises(Exception):
         main()
 
-    # Verify cleanup was not called after error
+    # Verify nothing was published or cleaned up after error
+    mock_ingestion.publish_snapshot.assert_not_called()
     mock_ingestion.cleanup_old_files.assert_not_called()
+
+
+@patch('src.python.ingestion.__main__.CovidDataIngestion')
+def test_main_metrics_json(mock_ingestion_class, tmp_path):
+    """Test that main writes the stage metrics when asked to."""
+    mock_ingestion = MagicMock()
+    mock_ingestion.metrics.to_json.return_value = '{"confirmed": {}}'
+    mock_ingestion_class.return_value = mock_ingestion
+
+    metrics_path = tmp_path / 'logs' / 'metrics.json'
+    main(['--metrics-json', str(metrics_path)])
+
+    assert metrics_path.read_text() == '{"confirmed": {}}'
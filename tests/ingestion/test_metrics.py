@@ -0,0 +1,121 @@
+# Global imports
+import numpy as np
+import pytest
+
+# Built-in imports
+import json
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.metrics import (
+    InMemoryCollector,
+    MetricsCollector,
+    StageMetrics,
+    measure_stage,
+)
+
+
+def test_measure_stage_fills_measurements():
+    """Test that a measured block gets its time, memory and counters."""
+    with measure_stage('confirmed', 'read') as metrics:
+        metrics.counters['rows_parsed'] = 3
+
+    assert metrics.data_type == 'confirmed'
+    assert metrics.stage == 'read'
+    assert metrics.wall_seconds >= 0
+    assert metrics.cpu_seconds >= 0
+    assert metrics.peak_rss_growth_bytes >= 0
+    assert metrics.counters == {'rows_parsed': 3}
+
+
+def test_measure_stage_on_failure():
+    """Test that a failing block is still measured and its error propagates."""
+    with pytest.raises(ValueError):
+        with measure_stage('confirmed', 'write') as metrics:
+            raise ValueError("Test error")
+    assert metrics.peak_rss_growth_bytes >= 0
+
+
+def test_measure_stage_reports_peak_of_the_stage():
+    """Test that a cheap stage after a heavy one reports its own, lower peak."""
+    with measure_stage('confirmed', 'read') as heavy:
+        frame = np.ones(16 * 1024 * 1024)
+    del frame
+    with measure_stage('confirmed', 'reshape') as cheap:
+        frame = np.ones(1024 * 1024)
+    del frame
+
+    assert heavy.peak_rss_growth_bytes >= 100 * 1024 * 1024
+    assert cheap.peak_rss_growth_bytes < heavy.peak_rss_growth_bytes
+
+
+def test_in_memory_collector_groups_by_data_type():
+    """Test the grouping and JSON dump of the collected metrics."""
+    collector = InMemoryCollector()
+    collector.record(StageMetrics('confirmed', 'read', 0.5, counters={'rows_parsed': 3}))
+    collector.record(StageMetrics('confirmed', 'write', 0.25, 0.2, 1024))
+    collector.record(StageMetrics('deaths', 'read', 0.1))
+
+    grouped = collector.by_data_type()
+    assert list(grouped) == ['confirmed', 'deaths']
+    assert list(grouped['confirmed']) == ['read', 'write']
+    assert grouped['confirmed']['write'] == {
+        'wall_seconds': 0.25, 'cpu_seconds': 0.2, 'peak_rss_growth_bytes': 1024, 'counters': {}
+    }
+    assert json.loads(collector.to_json()) == grouped
+
+    collector.clear()
+    assert collector.by_data_type() == {}
+
+
+def test_metrics_collector_requires_record():
+    """Test that a collector must implement record."""
+    with pytest.raises(TypeError, match="record"):
+        MetricsCollector()
+
+
+class ListCollector(MetricsCollector):
+    """Collector remembering the stages it received, in order."""
+
+    def __init__(self):
+        self.received = []
+
+    def record(self, metrics):
+        self.received.append((metrics.data_type, metrics.stage))
+
+
+@pytest.mark.parametrize("processing_pool", ["process", "thread"])
+def test_load_records_stage_metrics(processing_pool, tmp_path):
+    """Test that a load records the counters of every stage, across workers."""
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    raw_file = raw_dir / "confirmed_20230101.csv"
+    raw_file.write_text(
+        """Province/State,Country/Region,Lat,Long,1/1/20,1/2/20,1/3/20
+"",Afghanistan,33.0,65.0,1,,3
+Quebec,Canada ,52.9,-73.5,-1,10,7"""
+    )
+    config = IngestionConfig(
+        base_url="https://test.url",
+        data_types={'confirmed': 'confirmed.csv'},
+        raw_data_path=raw_dir,
+        db_path=str(tmp_path / "test.duckdb"),
+        processing_pool=processing_pool,
+    )
+    collector = ListCollector()
+    ingestion = CovidDataIngestion(config, collectors=[collector])
+    ingestion.load_to_duckdb()
+
+    stages = ingestion.metrics.by_data_type()['confirmed']
+    assert list(stages) == ['fingerprint', 'read', 'validate_clean', 'reshape', 'write']
+    assert stages['fingerprint']['counters'] == {'file_bytes': raw_file.stat().st_size}
+    assert stages['read']['counters'] == {'rows_parsed': 2, 'columns_parsed': 7}
+    # Validation also clamps Quebec's negative longitude
+    assert stages['validate_clean']['counters'] == {
+        'cells_cleaned': 6, 'negatives_clamped': 2
+    }
+    assert stages['reshape']['counters'] == {'rows_reshaped': 6}
+    assert stages['write']['counters'] == {'rows_loaded': 6}
+    assert all(stage['peak_rss_growth_bytes'] >= 0 for stage in stages.values())
+    assert collector.received == [('confirmed', stage) for stage in stages]
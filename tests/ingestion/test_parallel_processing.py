@@ -0,0 +1,139 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+from pathlib import Path
+
+# Local imports
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.parallel_processing import (
+    ProcessingTask,
+    process_all,
+    process_time_series,
+)
+from .conftest import time_series_header
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+DATA_TYPE_FILES = {data_type: f"{data_type}.csv" for data_type in DATA_TYPES}
+
+
+@pytest.fixture
+def raw_dir(tmp_path) -> Path:
+    """Raw directory holding one small file per data type."""
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for i, data_type in enumerate(DATA_TYPES):
+        (raw / f"{data_type}_20230101.csv").write_text(
+            time_series_header(3)
+            + f""""",Afghanistan,33.0,65.0,{i},,{i + 2}
+Quebec,Canada ,52.9,-73.5,-1,{i * 10},7"""
+        )
+    return raw
+
+
+def _tables(db_path: str):
+    """Rows of every raw table in a deterministic order."""
+    conn = duckdb.connect(db_path)
+    tables = {
+        data_type: conn.execute(f"SELECT * FROM raw_{data_type} ORDER BY ALL").fetchall()
+        for data_type in DATA_TYPES
+    }
+    conn.close()
+    return tables
+
+
+@pytest.mark.parametrize("processing_pool", ["process", "thread"])
+def test_parallel_load_matches_sequential_load(processing_pool, raw_dir, make_config):
+    """Test that every pool builds the same tables as a single worker."""
+    sequential = make_config(
+        data_types=DATA_TYPE_FILES,
+        db_path=str(raw_dir.parent / "sequential.duckdb"),
+        max_processing_workers=1,
+    )
+    parallel = make_config(
+        data_types=DATA_TYPE_FILES,
+        db_path=str(raw_dir.parent / "parallel.duckdb"),
+        max_processing_workers=3,
+        processing_pool=processing_pool,
+    )
+
+    assert sorted(CovidDataIngestion(sequential).load_to_duckdb()) == DATA_TYPES
+    ingestion = CovidDataIngestion(parallel)
+    assert sorted(ingestion.load_to_duckdb()) == DATA_TYPES
+
+    assert _tables(parallel.db_path) == _tables(sequential.db_path)
+    assert ingestion.load_modes == {data_type: 'full' for data_type in DATA_TYPES}
+
+
+def test_stage_timings_reported(raw_dir, make_config):
+    """Test that every data type reports the time spent in each stage."""
+    ingestion = CovidDataIngestion(make_config(data_types=DATA_TYPE_FILES, max_processing_workers=2))
+    ingestion.load_to_duckdb()
+
+    assert set(ingestion.stage_timings) == set(DATA_TYPES)
+    for timings in ingestion.stage_timings.values():
+        assert list(timings) == ['read', 'validate_clean', 'reshape', 'write']
+        assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_stage_timings_sql_mode(raw_dir, make_config):
+    """Test that the sql mode, which has no worker stages, reports its write time."""
+    ingestion = CovidDataIngestion(make_config(data_types=DATA_TYPE_FILES, ingestion_mode="sql"))
+    ingestion.load_to_duckdb()
+
+    assert all(list(timings) == ['write'] for timings in ingestion.stage_timings.values())
+    assert ingestion.memory_footprint == {}
+
+
+def test_memory_footprint_reported(raw_dir, make_config):
+    """Test that the memory held by each loaded frame is reported."""
+    ingestion = CovidDataIngestion(make_config(data_types=DATA_TYPE_FILES))
+    ingestion.load_to_duckdb()
+
+    assert set(ingestion.memory_footprint) == set(DATA_TYPES)
+    task = ProcessingTask('confirmed', max(raw_dir.glob("confirmed_*.csv")))
+    frame = process_time_series(task, 'pandas').frame
+    assert ingestion.memory_footprint['confirmed'] == frame.memory_usage(deep=True).sum()
+
+
+def test_worker_error_is_raised(raw_dir, make_config):
+    """Test that a file failing validation in a worker fails the load."""
+    (raw_dir / "deaths_20230101.csv").write_text("Country/Region,1/1/20\nCanada,1\n")
+    config = make_config(data_types=DATA_TYPE_FILES, max_processing_workers=3)
+
+    with pytest.raises(ValueError, match="Missing required columns"):
+        CovidDataIngestion(config).load_to_duckdb()
+
+
+def test_process_all_yields_every_task(raw_dir):
+    """Test that frames are yielded once per task with their worker."""
+    tasks = [
+        ProcessingTask(data_type, raw_dir / f"{data_type}_20230101.csv")
+        for data_type in DATA_TYPES
+    ]
+
+    processed = list(process_all(tasks, 'pandas', max_workers=3, pool='thread'))
+
+    assert sorted(frame.data_type for frame in processed) == DATA_TYPES
+    assert all(len(frame.frame) == 6 for frame in processed)
+    assert all(frame.worker for frame in processed)
+
+
+def test_process_all_rejects_bad_settings(raw_dir):
+    """Test that unknown pools and worker counts below 1 are rejected."""
+    tasks = [ProcessingTask('confirmed', raw_dir / "confirmed_20230101.csv")]
+
+    with pytest.raises(ValueError, match="Unknown processing pool"):
+        list(process_all(tasks, 'pandas', max_workers=2, pool='gpu'))
+    with pytest.raises(ValueError, match="at least 1"):
+        list(process_all(tasks, 'pandas', max_workers=0))
+
+
+def test_unknown_processing_pool(raw_dir, make_config):
+    """Test that an unknown processing pool is rejected before loading."""
+    config = make_config(data_types=DATA_TYPE_FILES, processing_pool="gpu")
+
+    with pytest.raises(ValueError, match="Unknown processing pool"):
+        CovidDataIngestion(config).load_to_duckdb()
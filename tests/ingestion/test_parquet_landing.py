@@ -0,0 +1,96 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+from datetime import datetime
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.parquet_landing import month_directory
+from .conftest import wide_frame
+
+
+@pytest.fixture
+def config(make_config, tmp_path):
+    """Configuration loading a single 'test' data type into a landing zone."""
+    return make_config(parquet_path=tmp_path / "landing")
+
+
+def _table_and_dataset(config: IngestionConfig):
+    """Rows of raw_test and of its landing zone dataset, with their locations."""
+    conn = duckdb.connect(config.db_path)
+    table = conn.execute(
+        "SELECT * FROM raw_test JOIN dim_location USING (location_id) ORDER BY ALL"
+    ).fetchall()
+    dataset = conn.execute(
+        f"""SELECT * EXCLUDE (data_type, year_month) FROM read_parquet(
+            '{config.parquet_path}/data_type=test/*/*.parquet', hive_partitioning = true
+        ) JOIN '{config.parquet_path}/dim_location.parquet' USING (location_id)
+        ORDER BY ALL"""
+    ).fetchall()
+    conn.close()
+    return table, dataset
+
+
+@pytest.mark.parametrize("ingestion_mode", ["pandas", "sql"])
+def test_full_load_writes_partitioned_dataset(ingestion_mode, config):
+    """Test that a load writes a partitioned ZSTD dataset and its locations."""
+    config.ingestion_mode = ingestion_mode
+    wide_frame(days=20, locations=4).to_csv(config.raw_data_path / "test_20230101.csv", index=False)
+
+    ingestion = CovidDataIngestion(config=config)
+    ingestion.load_to_duckdb()
+
+    assert sorted(p.name for p in (config.parquet_path / "data_type=test").iterdir()) == [
+        "year_month=2020-01", "year_month=2020-02"
+    ]
+    table, dataset = _table_and_dataset(config)
+    assert dataset == table
+    assert "export" in ingestion.stage_timings["test"]
+
+    conn = duckdb.connect()
+    encodings = dict(
+        conn.execute(
+            f"""SELECT path_in_schema, encodings || ' ' || compression FROM parquet_metadata(
+                '{month_directory(config.parquet_path, 'test', '2020-01')}/*.parquet'
+            )"""
+        ).fetchall()
+    )
+    conn.close()
+    assert set(encodings) == {"location_id", "date", "test"}
+    assert all(encoding.endswith("ZSTD") for encoding in encodings.values())
+
+
+def test_range_load_rewrites_only_its_months(config):
+    """Test that a range load rewrites the months it changed and no others."""
+    wide_frame(days=20, locations=4).to_csv(config.raw_data_path / "test_20230101.csv", index=False)
+    CovidDataIngestion(config=config).load_to_duckdb()
+    january = next(month_directory(config.parquet_path, "test", "2020-01").iterdir())
+    january_written = january.stat().st_mtime_ns
+
+    # Upstream revises the February dates
+    wide_frame(days=20, locations=4, offset=1000).to_csv(
+        config.raw_data_path / "test_20230102.csv", index=False
+    )
+    CovidDataIngestion(config=config).load_to_duckdb(
+        date_range=(datetime(2020, 2, 1), datetime(2020, 2, 11))
+    )
+
+    assert january.stat().st_mtime_ns == january_written
+    table, dataset = _table_and_dataset(config)
+    assert dataset == table
+    assert max(row[2] for row in dataset) > 1000
+
+
+def test_landing_zone_disabled_by_default(config, tmp_path):
+    """Test that nothing is written without a parquet_path."""
+    config.parquet_path = None
+    wide_frame(days=5, locations=4).to_csv(config.raw_data_path / "test_20230101.csv", index=False)
+
+    ingestion = CovidDataIngestion(config=config)
+    ingestion.load_to_duckdb()
+
+    assert not (tmp_path / "landing").exists()
+    assert "export" not in ingestion.stage_timings["test"]
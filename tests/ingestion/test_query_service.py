@@ -0,0 +1,271 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import json
+import multiprocessing
+import threading
+import time
+
+# Local imports
+from src.python.ingestion.config.serving_config import ServingConfig
+from src.python.ingestion.serving.connection_pool import ReadOnlyConnectionPool
+from src.python.ingestion.serving.http_server import create_server
+from src.python.ingestion.serving.query_service import QueryService, ServiceUnavailableError
+from src.python.ingestion.serving.result_cache import LRUResultCache
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    """Database holding small copies of the served reporting tables."""
+    path = str(tmp_path / "covid.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("CREATE SCHEMA main_reporting")
+    conn.execute("CREATE SCHEMA main_analytics")
+    conn.execute(
+        """CREATE TABLE main_reporting.global_daily_trends AS
+        SELECT DATE '2020-01-22' + i::INTEGER AS date, 10 * i AS total_cases, 10 AS new_cases,
+            i AS total_deaths, 1.5 AS avg_growth_rate, 10.0 AS cases_7day_avg
+        FROM range(5) t(i)"""
+    )
+    conn.execute(
+        """CREATE TABLE main_analytics.daily_rollup AS
+        SELECT DATE '2020-01-22' + i::INTEGER AS date, grain, country_region, 1 AS location_count,
+            i AS total_confirmed, 0 AS total_deaths, 0 AS total_recovered,
+            i AS total_active, 1 AS new_cases, 0 AS new_deaths, 0 AS new_recovered,
+            NULL::DOUBLE AS avg_growth_rate
+        FROM range(5) t(i),
+            (VALUES ('country', 'Italy'), ('country', 'Spain'), ('global', NULL))
+                c(grain, country_region)"""
+    )
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def service(db_path):
+    service = QueryService(ServingConfig(db_path=db_path, connect_timeout_seconds=0.2))
+    yield service
+    service.close()
+
+
+def _write(db_path: str, statement: str) -> None:
+    conn = duckdb.connect(db_path)
+    conn.execute(statement)
+    conn.close()
+
+
+def test_query_filters_and_orders(service):
+    """Test that a slice selects its country and inclusive date range, in order."""
+    result, status = service.query(
+        'country_time_series', {'country': 'Italy', 'start': '2020-01-23', 'end': '2020-01-25'}
+    )
+
+    assert status == 'miss'
+    assert result.columns[:3] == ['date', 'country_region', 'location_count']
+    assert [(str(row[0]), row[1]) for row in result.rows] == [
+        ('2020-01-23', 'Italy'), ('2020-01-24', 'Italy'), ('2020-01-25', 'Italy')
+    ]
+    document = json.loads(result.body)
+    assert document['parameters'] == {
+        'country': 'Italy', 'start': '2020-01-23', 'end': '2020-01-25'
+    }
+    assert document['rows'][0][0] == '2020-01-23'
+    assert document['row_count'] == 3
+
+
+def test_query_limit_truncates(service):
+    """Test that rows beyond the limit are left out and reported."""
+    result, _ = service.query('global_daily_trends', {'limit': '2'})
+    assert len(result.rows) == 2
+    assert result.truncated
+
+    result, _ = service.query('global_daily_trends')
+    assert len(result.rows) == 5
+    assert not result.truncated
+
+
+@pytest.mark.parametrize(
+    "model, parameters, error",
+    [
+        ('unknown', {}, LookupError),
+        ('country_time_series', {}, ValueError),
+        ('global_daily_trends', {'country': 'Italy'}, ValueError),
+        ('global_daily_trends', {'start': '22/01/2020'}, ValueError),
+        ('global_daily_trends', {'limit': '0'}, ValueError),
+        ('global_daily_trends', {'limit': '10001'}, ValueError),
+    ],
+)
+def test_query_rejects_invalid_requests(service, model, parameters, error):
+    """Test that unknown models and bad parameters are rejected before querying."""
+    with pytest.raises(error):
+        service.query(model, parameters)
+    assert service.pool.stats()['opens'] == 0
+
+
+def test_result_cached_until_database_changes(service, db_path):
+    """Test that results are cached until a write changes the database file."""
+    assert service.query('global_daily_trends')[1] == 'miss'
+    assert service.query('global_daily_trends')[1] == 'hit'
+
+    # A load or dbt run can only write once the idle connections are released
+    service.close()
+    _write(
+        db_path,
+        """INSERT INTO main_reporting.global_daily_trends
+        VALUES (DATE '2020-01-27', 50, 10, 5, 1.5, 10.0)""",
+    )
+
+    result, status = service.query('global_daily_trends')
+    assert status == 'miss'
+    assert len(result.rows) == 6
+    assert service.query('global_daily_trends')[1] == 'hit'
+
+    # Explicit invalidation drops every result
+    assert service.invalidate() == 1
+    assert service.query('global_daily_trends')[1] == 'miss'
+
+
+def _hold_write_lock(db_path: str, locked, release) -> None:
+    """Write to the database and keep it open, like a running load."""
+    conn = duckdb.connect(db_path)
+    conn.execute("CREATE TABLE main.loading AS SELECT 1 AS id")
+    conn.execute("CHECKPOINT")
+    locked.set()
+    release.wait(30)
+    conn.close()
+
+
+def test_stale_result_served_while_writer_holds_database(service, db_path):
+    """Test that a cached result is served while another process writes."""
+    service.query('global_daily_trends')
+    service.close()
+
+    context = multiprocessing.get_context('spawn')
+    locked, release = context.Event(), context.Event()
+    writer = context.Process(target=_hold_write_lock, args=(db_path, locked, release))
+    writer.start()
+    try:
+        assert locked.wait(30)
+
+        # The database changed, but the writer still holds it
+        assert service.query('global_daily_trends')[1] == 'stale'
+        with pytest.raises(ServiceUnavailableError):
+            service.query('country_time_series', {'country': 'Italy'})
+        assert service.stats()['stale_served'] == 1
+    finally:
+        release.set()
+        writer.join(30)
+
+    assert service.query('global_daily_trends')[1] == 'miss'
+
+
+def test_unbuilt_database_is_unavailable(tmp_path, db_path):
+    """Test that a missing database or model is reported as unavailable."""
+    missing = QueryService(ServingConfig(db_path=str(tmp_path / "missing.duckdb")))
+    with pytest.raises(ServiceUnavailableError):
+        missing.query('global_daily_trends')
+
+    _write(db_path, "DROP TABLE main_reporting.global_daily_trends")
+    service = QueryService(ServingConfig(db_path=db_path))
+    with pytest.raises(ServiceUnavailableError):
+        service.query('global_daily_trends')
+    service.close()
+
+
+def test_lru_result_cache_evicts_least_recently_used():
+    """Test eviction order and statistics of the result cache."""
+    cache = LRUResultCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats() == {
+        'entries': 2, 'max_entries': 2, 'hits': 3, 'misses': 1,
+        'evictions': 1, 'hit_rate': 0.75,
+    }
+    assert cache.clear() == 2
+
+    # A cache of size 0 caches nothing
+    disabled = LRUResultCache(max_entries=0)
+    disabled.put('a', 1)
+    assert disabled.get('a') is None
+
+
+def test_connection_pool_bounds_and_releases_connections(db_path):
+    """Test that the pool caps concurrent connections and closes them when idle."""
+    pool = ReadOnlyConnectionPool(db_path, size=2, idle_timeout_seconds=0.2)
+    in_use = []
+
+    def query():
+        with pool.connection() as conn:
+            in_use.append(pool.stats()['in_use'])
+            conn.execute("SELECT count(*) FROM main_analytics.daily_rollup").fetchone()
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=query) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(in_use) <= 2
+    assert pool.stats()['opens'] == 1
+
+    # The reaper closes the connections once they sit idle, freeing the file
+    deadline = time.monotonic() + 5
+    while pool.stats()['open'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pool.stats()['open'] == 0
+    _write(db_path, "CREATE TABLE main.after_idle AS SELECT 1 AS id")
+    pool.close()
+
+    with pytest.raises(ValueError):
+        ReadOnlyConnectionPool(db_path, size=0)
+
+
+def _request(url: str, method: str = 'GET'):
+    """Status, X-Cache header and JSON document of a request."""
+    try:
+        with urlopen(Request(url, method=method)) as response:
+            return response.status, response.headers.get('X-Cache'), json.loads(response.read())
+    except HTTPError as e:
+        return e.code, None, json.loads(e.read())
+
+
+def test_http_routes(service):
+    """Test the HTTP routes of the service and their status codes."""
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, _, document = _request(f"{server.url}/models")
+        assert status == 200
+        assert [model['name'] for model in document['models']] == [
+            'global_daily_trends', 'country_mortality_analysis',
+            'top_countries_by_records', 'country_time_series',
+        ]
+
+        url = f"{server.url}/models/country_time_series?country=Spain&end=2020-01-23"
+        status, cache, document = _request(url)
+        assert (status, cache, document['row_count']) == (200, 'miss', 2)
+        assert _request(url)[1] == 'hit'
+
+        assert _request(f"{server.url}/models/unknown")[0] == 404
+        assert _request(f"{server.url}/models/country_time_series")[0] == 400
+        assert _request(f"{server.url}/unknown")[0] == 404
+
+        status, _, document = _request(f"{server.url}/health")
+        assert (status, document['cache']['hits']) == (200, 1)
+
+        status, _, document = _request(f"{server.url}/cache/invalidate", method='POST')
+        assert (status, document) == (200, {'invalidated': 1})
+    finally:
+        server.shutdown()
+        server.server_close()
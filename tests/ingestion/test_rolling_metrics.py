@@ -0,0 +1,303 @@
+# Global imports
+import duckdb
+import numpy as np
+import pytest
+
+# Built-in imports
+from datetime import date, datetime
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.rolling_metrics import (
+    ROLLING_METRICS_TABLE,
+    RollingWindows,
+    growth_rate,
+    round_half_away,
+    update_rolling_metrics,
+)
+from .conftest import wide_frame
+
+
+DATA_TYPES = ['confirmed', 'deaths', 'recovered']
+# The dbt models' expressions over the same raw tables: daily_metrics per
+# country, daily_trends and global_daily_trends (through daily_rollup) globally
+DBT_COUNTRY_METRICS = """
+WITH daily_stats AS (
+    SELECT c.date, l."Country/Region" AS country_region,
+        SUM(c.confirmed) AS total_confirmed, SUM(d.deaths) AS total_deaths,
+        SUM(r.recovered) AS total_recovered
+    FROM raw_confirmed c
+    JOIN dim_location l ON c.location_id = l.location_id
+    LEFT JOIN raw_deaths d ON c.date = d.date AND c.location_id = d.location_id
+    LEFT JOIN raw_recovered r ON c.date = r.date AND c.location_id = r.location_id
+    GROUP BY c.date, l."Country/Region"
+),
+previous_day AS (
+    SELECT *,
+        LAG(total_confirmed) OVER (PARTITION BY country_region ORDER BY date) AS prev_confirmed,
+        LAG(total_deaths) OVER (PARTITION BY country_region ORDER BY date) AS prev_deaths
+    FROM daily_stats
+)
+SELECT date, country_region, total_confirmed, total_deaths,
+    total_confirmed - COALESCE(prev_confirmed, 0) AS new_cases,
+    total_deaths - COALESCE(prev_deaths, 0) AS new_deaths,
+    CASE WHEN prev_confirmed > 0 THEN
+        (100.0 * (total_confirmed - prev_confirmed) / prev_confirmed)::DECIMAL(18, 2)
+    END AS growth_rate
+FROM previous_day
+"""
+
+DBT_GLOBAL_METRICS = f"""
+WITH countries AS ({DBT_COUNTRY_METRICS}),
+daily_totals AS (
+    SELECT date, SUM(total_confirmed) AS global_confirmed, SUM(total_deaths) AS global_deaths,
+        SUM(new_cases)::BIGINT AS new_cases
+    FROM countries GROUP BY date
+)
+SELECT date, global_confirmed, global_deaths, new_cases,
+    ROUND(AVG(global_confirmed) OVER (ORDER BY date ROWS BETWEEN 6 PRECEDING AND CURRENT ROW))
+        AS confirmed_7day_avg,
+    ROUND(AVG(global_deaths) OVER (ORDER BY date ROWS BETWEEN 6 PRECEDING AND CURRENT ROW))
+        AS deaths_7day_avg,
+    ROUND(AVG(new_cases) OVER (ORDER BY date ROWS BETWEEN 6 PRECEDING AND CURRENT ROW), 0)
+        AS cases_7day_avg,
+    CASE WHEN LAG(global_confirmed) OVER (ORDER BY date) > 0 THEN
+        ROUND(100.0 * (global_confirmed - LAG(global_confirmed) OVER (ORDER BY date))
+            / LAG(global_confirmed) OVER (ORDER BY date), 2)
+    END AS growth_rate
+FROM daily_totals
+"""
+
+
+def _write_raw_tables(conn: duckdb.DuckDBPyConnection, days: int, seed: int = 0) -> None:
+    """Raw tables with provinces, a late-starting country and missing deaths."""
+    rng = np.random.default_rng(seed)
+    conn.execute(
+        """CREATE OR REPLACE TABLE dim_location AS SELECT * FROM (VALUES
+            (0, '0', 'Italy', 41.9, 12.6), (1, 'Quebec', 'Canada', 52.9, -73.5),
+            (2, 'Ontario', 'Canada', 51.3, -85.3), (3, '0', 'Spain', 40.5, -3.7)
+        ) t(location_id, "Province/State", "Country/Region", Lat, Long)"""
+    )
+    rows = []
+    for location_id in range(4):
+        # Spain only reports from day 10; counts grow with revisions downwards
+        first = 10 if location_id == 3 else 0
+        totals = np.cumsum(rng.integers(-3, 1000, size=days - first)).clip(0)
+        for offset, total in enumerate(totals):
+            rows.append((location_id, date.fromordinal(737446 + first + offset), int(total)))
+    conn.execute(
+        "CREATE OR REPLACE TABLE raw_confirmed (location_id INTEGER, date DATE, confirmed INTEGER)"
+    )
+    conn.executemany("INSERT INTO raw_confirmed VALUES (?, ?, ?)", rows)
+    # Quebec reports no deaths on odd days; nothing is recovered in Spain
+    conn.execute(
+        """CREATE OR REPLACE TABLE raw_deaths AS
+        SELECT location_id, date, confirmed // 40 AS deaths FROM raw_confirmed
+        WHERE NOT (location_id = 1 AND day(date) % 2 = 1)"""
+    )
+    conn.execute(
+        """CREATE OR REPLACE TABLE raw_recovered AS
+        SELECT location_id, date, confirmed // 2 AS recovered FROM raw_confirmed
+        WHERE location_id <> 3"""
+    )
+
+
+def _rolling(conn: duckdb.DuckDBPyConnection):
+    return conn.execute(
+        f"SELECT * FROM {ROLLING_METRICS_TABLE} ORDER BY date, grain, country_region"
+    ).fetchall()
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    _write_raw_tables(conn, days=60)
+    yield conn
+    conn.close()
+
+
+def test_rolling_windows_match_naive_averages():
+    """Test running averages against averages over the last values, nulls skipped."""
+    rng = np.random.default_rng(1)
+    windows = (1, 3, 7)
+    state = RollingWindows(windows, size=5)
+    history = [[] for _ in range(5)]
+    for _ in range(40):
+        # A random subset of the series reports each day, some values null
+        series = np.flatnonzero(rng.random(5) < 0.7)
+        values = rng.integers(0, 10**9, size=len(series)).astype(float)
+        values[rng.random(len(series)) < 0.2] = np.nan
+        state.push(series, values)
+        for i, value in zip(series, values):
+            history[i].append(value)
+
+        averages = state.averages(series)
+        for column, i in enumerate(series):
+            for row, window in enumerate(windows):
+                last = np.array(history[i][-window:])
+                expected = last[~np.isnan(last)].mean() if (~np.isnan(last)).any() else np.nan
+                np.testing.assert_equal(averages[row, column], expected)
+
+
+def test_rounding_matches_duckdb():
+    """Test that halves round away from zero and growth rates round like ROUND(x, 2)."""
+    values = np.array([0.5, 1.5, 2.5, -2.5, 0.125, 0.49999999999999994, 1234.565, np.nan])
+    conn = duckdb.connect()
+    expected = [
+        conn.execute("SELECT ROUND(?::DOUBLE), ROUND(?::DOUBLE, 2)", [value, value]).fetchone()
+        for value in values[:-1]
+    ]
+    np.testing.assert_equal(round_half_away(values[:-1]), [row[0] for row in expected])
+    np.testing.assert_equal(round_half_away(values[:-1], 2), [row[1] for row in expected])
+    assert np.isnan(round_half_away(values)[-1])
+
+    rates = growth_rate(np.array([3.0, 5.0, 7.0]), np.array([2.0, 0.0, np.nan]))
+    np.testing.assert_equal(rates, [50.0, np.nan, np.nan])
+
+
+def test_metrics_match_dbt_models(conn):
+    """Test that every country and global metric equals the dbt models' expressions."""
+    assert update_rolling_metrics(conn, windows=(7, 14)) == 60 * 3 + 50
+
+    mismatches = conn.execute(
+        f"""SELECT count(*) FROM ({DBT_COUNTRY_METRICS}) d
+        FULL JOIN {ROLLING_METRICS_TABLE} m
+            ON m.grain = 'country' AND m.date = d.date AND m.country_region = d.country_region
+        WHERE (m.grain IS NULL OR m.grain = 'country') AND (
+            d.total_confirmed IS DISTINCT FROM m.total_confirmed
+            OR d.total_deaths IS DISTINCT FROM m.total_deaths
+            OR d.new_cases IS DISTINCT FROM m.new_cases
+            OR d.new_deaths IS DISTINCT FROM m.new_deaths
+            OR d.growth_rate::DOUBLE IS DISTINCT FROM m.growth_rate)"""
+    ).fetchone()[0]
+    assert mismatches == 0
+
+    mismatches = conn.execute(
+        f"""SELECT count(*) FROM ({DBT_GLOBAL_METRICS}) d
+        FULL JOIN (SELECT * FROM {ROLLING_METRICS_TABLE} WHERE grain = 'global') m
+            ON m.date = d.date
+        WHERE d.global_confirmed IS DISTINCT FROM m.total_confirmed
+            OR d.global_deaths IS DISTINCT FROM m.total_deaths
+            OR d.new_cases IS DISTINCT FROM m.new_cases
+            OR d.confirmed_7day_avg IS DISTINCT FROM m.confirmed_7day_avg
+            OR d.deaths_7day_avg IS DISTINCT FROM m.deaths_7day_avg
+            OR d.cases_7day_avg IS DISTINCT FROM m.new_cases_7day_avg
+            OR d.growth_rate IS DISTINCT FROM m.growth_rate"""
+    ).fetchone()[0]
+    assert mismatches == 0
+
+    # Null where the dbt models are null: Spain has no recoveries
+    assert conn.execute(
+        f"""SELECT count(*) FROM {ROLLING_METRICS_TABLE}
+        WHERE country_region = 'Spain' AND total_recovered IS NULL"""
+    ).fetchone()[0] == 50
+
+
+def test_incremental_update_equals_rebuild(conn):
+    """Test that updating from the window state gives the rows of a full rebuild."""
+    # The first 40 days are computed
+    for table in ['raw_confirmed', 'raw_deaths', 'raw_recovered']:
+        conn.execute(f"DELETE FROM {table} WHERE date >= DATE '2020-03-02'")
+    update_rolling_metrics(conn, lookback_days=5)
+
+    # New days arrive and recent days are revised
+    _write_raw_tables(conn, days=60)
+    conn.execute(
+        "UPDATE raw_confirmed SET confirmed = confirmed + 7 WHERE date >= DATE '2020-02-25'"
+    )
+    written = update_rolling_metrics(conn, lookback_days=5)
+    # Only the lookback and the new days are rewritten: days 34 to 59
+    assert written == 26 * 4
+    incremental = _rolling(conn)
+
+    conn.execute(f"DROP TABLE {ROLLING_METRICS_TABLE}")
+    update_rolling_metrics(conn)
+    assert incremental == _rolling(conn)
+
+    # A revision older than the lookback is picked up from since
+    conn.execute(
+        "UPDATE raw_confirmed SET confirmed = confirmed + 1 WHERE date = DATE '2020-01-25'"
+    )
+    update_rolling_metrics(conn, since=date(2020, 1, 25), lookback_days=5)
+    revised = _rolling(conn)
+    conn.execute(f"DROP TABLE {ROLLING_METRICS_TABLE}")
+    update_rolling_metrics(conn)
+    assert revised == _rolling(conn)
+
+
+def test_changed_windows_rebuild_the_table(conn):
+    """Test that other windows rebuild the table, and invalid windows are rejected."""
+    update_rolling_metrics(conn, windows=(7,))
+    assert update_rolling_metrics(conn, windows=(7, 28)) == 60 * 3 + 50
+    columns = [row[0] for row in conn.execute(f"DESCRIBE {ROLLING_METRICS_TABLE}").fetchall()]
+    assert columns[-3:] == ['confirmed_28day_avg', 'deaths_28day_avg', 'new_cases_28day_avg']
+
+    with pytest.raises(ValueError):
+        update_rolling_metrics(conn, windows=(0, 7))
+
+    # Nothing is computed until every raw table is loaded
+    conn.execute("DROP TABLE raw_recovered")
+    assert update_rolling_metrics(conn) == 0
+
+
+def test_loads_update_rolling_metrics(tmp_path):
+    """Test that a load with rolling_windows writes the metrics of the loaded days."""
+    (tmp_path / "raw").mkdir()
+    header = "Province/State,Country/Region,Lat,Long,1/22/20,1/23/20,1/24/20\n"
+    for data_type in ['confirmed', 'deaths', 'recovered']:
+        (tmp_path / "raw" / f"{data_type}_20230101.csv").write_text(
+            header + ",Italy,41.9,12.6,1,3,6\n,Spain,40.5,-3.7,0,2,2\n"
+        )
+    config = IngestionConfig(
+        base_url="https://test.url",
+        data_types={data_type: f"{data_type}.csv" for data_type in DATA_TYPES},
+        raw_data_path=tmp_path / "raw",
+        db_path=str(tmp_path / "test.duckdb"),
+        rolling_windows=(2,),
+    )
+
+    ingestion = CovidDataIngestion(config)
+    ingestion.load_to_duckdb()
+    assert ingestion.metrics.by_data_type()['rolling_metrics']['update']['counters'] == {
+        'rows_written': 9
+    }
+
+    # A range load recomputes from the start of its range
+    ingestion.load_to_duckdb(date_range=(datetime(2020, 1, 24), datetime(2020, 1, 25)))
+    conn = duckdb.connect(config.db_path, read_only=True)
+    assert conn.execute(
+        f"""SELECT date, total_confirmed, new_cases, growth_rate, confirmed_2day_avg
+        FROM {ROLLING_METRICS_TABLE} WHERE grain = 'global' ORDER BY date"""
+    ).fetchall() == [
+        (date(2020, 1, 22), 1, 1, None, 1.0),
+        (date(2020, 1, 23), 5, 4, 400.0, 3.0),
+        (date(2020, 1, 24), 8, 3, 60.0, 7.0),
+    ]
+    conn.close()
+
+
+def test_full_reload_rebuilds_rolling_metrics(make_config):
+    """Test that a full reload revising old days rewrites their rolling metrics."""
+    config = make_config(
+        data_types={data_type: f"{data_type}.csv" for data_type in DATA_TYPES},
+        rolling_windows=(7,),
+    )
+    for offset, name in [(0, "20230101"), (1000, "20230102")]:
+        for data_type in config.data_types:
+            wide_frame(days=60, offset=offset).to_csv(
+                config.raw_data_path / f"{data_type}_{name}.csv", index=False
+            )
+        ingestion = CovidDataIngestion(config)
+        ingestion.load_to_duckdb()
+        assert set(ingestion.load_modes.values()) == {'full'}
+
+    conn = duckdb.connect(config.db_path, read_only=True)
+    assert conn.execute(
+        f"""SELECT date, total_confirmed FROM {ROLLING_METRICS_TABLE}
+        WHERE grain = 'global' AND date = DATE '2020-01-22'"""
+    ).fetchall() == conn.execute(
+        """SELECT date, sum(confirmed) FROM raw_confirmed
+        WHERE date = DATE '2020-01-22' GROUP BY date"""
+    ).fetchall()
+    conn.close()
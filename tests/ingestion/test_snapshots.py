@@ -0,0 +1,136 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+import os
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.snapshots import SnapshotStore
+
+
+RAW_DATA = """Province/State,Country/Region,Lat,Long,1/1/20,1/2/20
+"",Afghanistan,33.0,65.0,0,1
+Quebec,Canada ,52.9,-73.5,2,3
+"""
+
+
+@pytest.fixture
+def store(tmp_path) -> SnapshotStore:
+    return SnapshotStore(tmp_path / "covid.duckdb", retention=2, lock_timeout_seconds=5)
+
+
+def _build(store: SnapshotStore, value: int) -> None:
+    """Write a version number to the shadow, as a load or dbt run would."""
+    with store.shadow() as shadow_path:
+        conn = duckdb.connect(str(shadow_path))
+    conn.execute("CREATE OR REPLACE TABLE version AS SELECT ? AS value", [value])
+    conn.close()
+
+
+def _read(path) -> int:
+    conn = duckdb.connect(str(path), read_only=True)
+    value = conn.execute("SELECT value FROM version").fetchone()[0]
+    conn.close()
+    return value
+
+
+def test_publish_swaps_readers_to_the_shadow(store):
+    """Test that readers keep their snapshot while the next one is built and published."""
+    _build(store, 1)
+    assert not store.db_path.exists()
+    first = store.publish()
+
+    assert store.db_path.is_symlink()
+    assert store.current() == first
+    assert not store.shadow_path.exists()
+    assert _read(store.db_path) == 1
+
+    # A reader holds the current snapshot while the next one is written
+    reader = duckdb.connect(str(store.db_path), read_only=True)
+    _build(store, 2)
+    assert _read(store.shadow_path) == 2
+    assert _read(store.db_path) == 1
+    second = store.publish()
+
+    # The open reader still sees its snapshot, new readers the published one
+    assert reader.execute("SELECT value FROM version").fetchone()[0] == 1
+    reader.close()
+    assert _read(store.db_path) == 2
+    assert store.snapshots() == [first, second]
+    # Relative, so the data directory can be moved or mounted elsewhere
+    assert not os.path.isabs(os.readlink(store.db_path))
+
+
+def test_retention_deletes_older_snapshots(store):
+    """Test that only the retained number of snapshots is kept, the current one last."""
+    published = []
+    for value in range(4):
+        _build(store, value)
+        published.append(store.publish())
+
+    assert store.snapshots() == published[-2:]
+    assert store.current() == published[-1]
+    assert _read(store.db_path) == 3
+
+    with pytest.raises(ValueError):
+        SnapshotStore(store.db_path, retention=0)
+
+
+def test_plain_database_becomes_first_snapshot(store):
+    """Test that a database written in place is kept as the first snapshot."""
+    conn = duckdb.connect(str(store.db_path))
+    conn.execute("CREATE TABLE version AS SELECT 1 AS value")
+    conn.close()
+
+    # The next build starts from its content
+    with store.shadow() as shadow_path:
+        assert _read(shadow_path) == 1
+    assert store.db_path.is_symlink()
+    assert store.snapshots() == [store.current()]
+    assert _read(store.db_path) == 1
+
+
+def test_nothing_to_publish_or_discard(store):
+    """Test that publishing or discarding without a pending build changes nothing."""
+    assert store.publish() is None
+    assert not store.discard()
+
+    _build(store, 1)
+    assert store.discard()
+    assert not store.shadow_path.exists()
+    assert store.publish() is None
+
+
+def test_ingestion_loads_into_the_shadow(tmp_path):
+    """Test that loaded tables reach db_path only once the snapshot is published."""
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "raw" / "test_20230101.csv").write_text(RAW_DATA)
+    config = IngestionConfig(
+        base_url="https://test.url",
+        data_types={"test": "test.csv"},
+        raw_data_path=tmp_path / "raw",
+        db_path=str(tmp_path / "test.duckdb"),
+        use_snapshots=True,
+    )
+
+    ingestion = CovidDataIngestion(config)
+    assert ingestion.load_to_duckdb() == ["test"]
+    assert ingestion.database_path == str(ingestion.snapshots.shadow_path)
+    assert not os.path.exists(config.db_path)
+
+    ingestion.publish_snapshot()
+    conn = duckdb.connect(config.db_path, read_only=True)
+    assert conn.execute("SELECT count(*) FROM raw_test").fetchone()[0] == 4
+    conn.close()
+
+    # The next build starts from the published tables, so the file is skipped
+    rerun = CovidDataIngestion(config)
+    assert rerun.load_to_duckdb() == []
+    assert list(rerun.skipped_files) == ["test"]
+
+    # Loads in place have nothing to publish
+    config.use_snapshots = False
+    assert CovidDataIngestion(config).publish_snapshot() is None
@@ -0,0 +1,285 @@
+# Global imports
+import duckdb
+import pytest
+
+# Built-in imports
+from datetime import date, datetime
+import logging
+
+# Local imports
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.core.downloader import DataDownloader
+from src.python.ingestion.core.sources import (
+    DailyReportsSource,
+    USTimeSeriesSource,
+    create_sources,
+)
+from src.python.ingestion.core.sources.base import (
+    SOURCE_FILES_TABLE,
+    SourcePlugin,
+    normalize_column_name,
+)
+
+
+# One report per header layout of the JHU daily reports
+DAILY_REPORTS = {
+    "01-22-2020": (
+        "Province/State,Country/Region,Last Update,Confirmed,Deaths,Recovered\n"
+        "Hubei,Mainland China,1/22/2020 17:00,444,,\n"
+        ",Japan,1/22/2020 17:00,2,,\n"
+    ),
+    "03-01-2020": (
+        "Province/State,Country/Region,Last Update,Confirmed,Deaths,Recovered,Latitude,Longitude\n"
+        "Hubei,Mainland China,2020-03-01T10:13:19,66907,2761,31536,30.9756,112.2707\n"
+    ),
+    "03-22-2020": (
+        "\ufeffFIPS,Admin2,Province_State,Country_Region,Last_Update,Lat,Long_,"
+        "Confirmed,Deaths,Recovered,Active,Combined_Key\n"
+        "45001.0,Abbeville,South Carolina,US,3/22/20 23:45,34.22,-82.46,1,0,0,0,"
+        '"Abbeville, South Carolina, US"\n'
+        ',,Hubei,China,3/22/20 9:43,30.97,112.27,67800,3144,59433,5223,"Hubei, China"\n'
+    ),
+    "06-01-2020": (
+        "FIPS,Admin2,Province_State,Country_Region,Last_Update,Lat,Long_,"
+        "Confirmed,Deaths,Recovered,Active,Combined_Key,"
+        "Incidence_Rate,Case-Fatality_Ratio,People_Tested\n"
+        "45001,Abbeville,South Carolina,US,2020-06-02 02:33:00,34.22,-82.46,47,0,0,47,"
+        '"Abbeville, South Carolina, US",191.6,0.0,12\n'
+    ),
+}
+
+US_CONFIRMED = (
+    "UID,iso2,iso3,code3,FIPS,Admin2,Province_State,Country_Region,Lat,Long_,Combined_Key,"
+    "1/22/20,1/23/20,1/24/20\n"
+    '84001001,US,USA,840,1001.0,Autauga,Alabama,US,32.53,-86.64,"Autauga, Alabama, US",0,1,2\n'
+    '84001003,US,USA,840,1003.0,Baldwin,Alabama,US,30.72,-87.72,"Baldwin, Alabama, US",3,4,5\n'
+)
+US_DEATHS = (
+    "UID,iso2,iso3,code3,FIPS,Admin2,Province_State,Country_Region,Lat,Long_,Combined_Key,"
+    "Population,1/22/20,1/23/20,1/24/20\n"
+    "84001001,US,USA,840,1001.0,Autauga,Alabama,US,32.53,-86.64,"
+    '"Autauga, Alabama, US",55869,0,0,1\n'
+    "84001003,US,USA,840,1003.0,Baldwin,Alabama,US,30.72,-87.72,"
+    '"Baldwin, Alabama, US",223234,0,1,1\n'
+)
+
+
+@pytest.fixture
+def config(make_config):
+    """Configuration of the sources, without time series data types."""
+    return make_config(
+        base_url="https://test.url/csse_covid_19_time_series",
+        data_types={},
+        max_concurrent_downloads=4,
+        request_timeout_seconds=5.0,
+        max_retries=0,
+    )
+
+
+def _write_reports(source: DailyReportsSource, reports: dict) -> None:
+    source.raw_data_path.mkdir(parents=True, exist_ok=True)
+    for key, body in reports.items():
+        (source.raw_data_path / f"{key}.csv").write_text(body)
+
+
+def test_normalize_column_name():
+    """Test that every spelling of a JHU column maps to one name."""
+    assert normalize_column_name("Province/State") == "province_state"
+    assert normalize_column_name("Province_State") == "province_state"
+    assert normalize_column_name("﻿Last Update") == "last_update"
+    assert normalize_column_name("Long_") == "long"
+    assert normalize_column_name("Latitude", {"latitude": "lat"}) == "lat"
+
+
+def test_source_plugin_requires_files_and_load_files(config):
+    """Test that a source must implement files and load_files."""
+    with pytest.raises(TypeError, match="files.*load_files"):
+        SourcePlugin(config)
+
+
+def test_daily_reports_tolerate_header_drift(config):
+    """Test that reports of every header layout load into one table."""
+    source = DailyReportsSource(config, start_date=date(2020, 1, 22), end_date=date(2020, 6, 1))
+    _write_reports(source, DAILY_REPORTS)
+    conn = duckdb.connect(config.db_path)
+
+    result = source.load(conn)
+
+    assert result.files_loaded == list(DAILY_REPORTS)
+    assert result.rows_loaded == 6
+    assert result.header_versions == {"v1": 1, "v2": 1, "v3": 1, "v4": 1}
+    rows = conn.execute(
+        """SELECT report_date, fips, admin2, province_state, country_region, last_update,
+            round(lat::DOUBLE, 2), confirmed, deaths, incident_rate, case_fatality_ratio
+        FROM raw_daily_reports ORDER BY report_date, country_region"""
+    ).fetchall()
+    assert rows == [
+        (
+            date(2020, 1, 22), None, None, None, "Japan",
+            datetime(2020, 1, 22, 17), None, 2, None, None, None,
+        ),
+        (
+            date(2020, 1, 22), None, None, "Hubei", "Mainland China",
+            datetime(2020, 1, 22, 17), None, 444, None, None, None,
+        ),
+        (
+            date(2020, 3, 1), None, None, "Hubei", "Mainland China",
+            datetime(2020, 3, 1, 10, 13, 19), 30.98, 66907, 2761, None, None,
+        ),
+        (
+            date(2020, 3, 22), None, None, "Hubei", "China",
+            datetime(2020, 3, 22, 9, 43), 30.97, 67800, 3144, None, None,
+        ),
+        (
+            date(2020, 3, 22), 45001, "Abbeville", "South Carolina", "US",
+            datetime(2020, 3, 22, 23, 45), 34.22, 1, 0, None, None,
+        ),
+        (
+            date(2020, 6, 1), 45001, "Abbeville", "South Carolina", "US",
+            datetime(2020, 6, 2, 2, 33), 34.22, 47, 0, 191.6, 0.0,
+        ),
+    ]
+    conn.close()
+
+
+def test_daily_reports_reject_reports_without_required_columns(config):
+    """Test that a report without counts fails its batch, leaving the tables as they were."""
+    source = DailyReportsSource(config, start_date=date(2020, 1, 22), end_date=date(2020, 1, 23))
+    _write_reports(source, {
+        "01-22-2020": DAILY_REPORTS["01-22-2020"],
+        "01-23-2020": "Province/State,Country/Region\nHubei,Mainland China\n",
+    })
+    conn = duckdb.connect(config.db_path)
+
+    with pytest.raises(ValueError, match="01-23-2020"):
+        source.load(conn)
+    assert conn.execute(f"SELECT count(*) FROM {SOURCE_FILES_TABLE}").fetchone()[0] == 0
+    conn.close()
+
+
+def test_daily_reports_load_only_changed_files(config):
+    """Test that a reload replaces the rows of the changed reports only."""
+    source = DailyReportsSource(config, start_date=date(2020, 1, 22), end_date=date(2020, 6, 1))
+    _write_reports(source, DAILY_REPORTS)
+    conn = duckdb.connect(config.db_path)
+    source.load(conn)
+
+    # A revised report, and a report published since
+    _write_reports(source, {
+        "03-01-2020": DAILY_REPORTS["03-01-2020"].replace("66907", "66908"),
+        "06-02-2020": DAILY_REPORTS["06-01-2020"],
+    })
+    source.end_date = date(2020, 6, 2)
+    result = source.load(conn)
+
+    assert result.files_loaded == ["03-01-2020", "06-02-2020"]
+    assert result.files_skipped == 3
+    assert conn.execute(
+        "SELECT confirmed FROM raw_daily_reports WHERE report_date = '2020-03-01'"
+    ).fetchall() == [(66908,)]
+    assert conn.execute("SELECT count(*) FROM raw_daily_reports").fetchone()[0] == 7
+    assert source.load(conn).files_loaded == []
+    conn.close()
+
+
+def test_daily_reports_fetch_concurrently_and_incrementally(config, stand_in_server):
+    """Test that reports are fetched at once, and only the recent ones again."""
+    for day in range(1, 7):
+        stand_in_server.add(
+            f"/csse_covid_19_daily_reports/03-0{day}-2020.csv",
+            DAILY_REPORTS["03-01-2020"].encode(),
+            delay=0.2,
+            etag=f'"{day}"',
+        )
+    config.base_url = f"{stand_in_server.url}/csse_covid_19_time_series"
+    config.revision_window_days = 2
+    # The report of 7 March is not published yet
+    source = DailyReportsSource(config, start_date=date(2020, 3, 1), end_date=date(2020, 3, 7))
+    downloader = DataDownloader(config, logging.getLogger(__name__))
+
+    start = datetime.now()
+    results = source.fetch(downloader)
+    elapsed = (datetime.now() - start).total_seconds()
+    assert sorted(results) == [f"03-0{day}-2020" for day in range(1, 7)]
+    # Six 0.2s downloads four at a time take two rounds, not six
+    assert elapsed < 0.2 * 6
+
+    stand_in_server.requests.clear()
+    results = source.fetch(downloader)
+    downloader.close()
+
+    # Older reports are not requested again, recent ones conditionally
+    assert sorted(stand_in_server.requests) == [
+        f"/csse_covid_19_daily_reports/03-0{day}-2020.csv" for day in (5, 6, 7)
+    ]
+    assert not any(result.changed for result in results.values())
+
+
+def test_us_time_series_load_counties_and_series(config):
+    """Test that the US series load into the county dimension and long tables."""
+    source = USTimeSeriesSource(config)
+    source.raw_data_path.mkdir(parents=True)
+    (source.raw_data_path / "time_series_covid19_confirmed_US.csv").write_text(US_CONFIRMED)
+    (source.raw_data_path / "time_series_covid19_deaths_US.csv").write_text(US_DEATHS)
+    conn = duckdb.connect(config.db_path)
+
+    result = source.load(conn)
+
+    assert result.files_loaded == ["confirmed", "deaths"]
+    assert result.rows_loaded == 12
+    assert conn.execute(
+        "SELECT uid, fips, admin2, population FROM dim_us_county ORDER BY uid"
+    ).fetchall() == [(84001001, 1001, "Autauga", 55869), (84001003, 1003, "Baldwin", 223234)]
+    assert conn.execute(
+        "SELECT date, confirmed FROM raw_us_confirmed WHERE uid = 84001003 ORDER BY date"
+    ).fetchall() == [(date(2020, 1, 22), 3), (date(2020, 1, 23), 4), (date(2020, 1, 24), 5)]
+
+    # A new day of confirmed cases reloads that series, keeping the
+    # population only the deaths series has
+    (source.raw_data_path / "time_series_covid19_confirmed_US.csv").write_text(
+        US_CONFIRMED.replace("1/24/20\n", "1/24/20,1/25/20\n")
+        .replace(",2\n", ",2,6\n")
+        .replace(",5\n", ",5,7\n")
+    )
+    result = source.load(conn)
+
+    assert result.files_loaded == ["confirmed"]
+    assert result.header_versions == {"4 days": 1}
+    assert conn.execute("SELECT count(*) FROM raw_us_confirmed").fetchone()[0] == 8
+    assert conn.execute("SELECT sum(population) FROM dim_us_county").fetchone()[0] == 279103
+    conn.close()
+
+
+def test_ingestion_runs_sources(config, stand_in_server):
+    """Test that the ingestion downloads and loads its sources, with their metrics."""
+    config.base_url = f"{stand_in_server.url}/csse_covid_19_time_series"
+    stand_in_server.add(
+        "/csse_covid_19_time_series/time_series_covid19_confirmed_US.csv", US_CONFIRMED.encode()
+    )
+    stand_in_server.add(
+        "/csse_covid_19_time_series/time_series_covid19_deaths_US.csv", US_DEATHS.encode()
+    )
+    config.sources = ("us_time_series",)
+    ingestion = CovidDataIngestion(config)
+
+    ingestion.download_sources()
+    loads = ingestion.load_sources()
+
+    assert loads["us_time_series"].rows_loaded == 12
+    metrics = ingestion.metrics.by_data_type()["us_time_series"]
+    assert metrics["download"]["counters"]["files_requested"] == 2
+    assert metrics["load"]["counters"]["rows_loaded"] == 12
+
+    # Nothing changed upstream, so nothing is loaded again
+    rerun = CovidDataIngestion(config)
+    rerun.download_sources()
+    assert rerun.load_sources()["us_time_series"].files_skipped == 2
+
+
+def test_unknown_source(config):
+    """Test that only the available sources can be enabled."""
+    config.sources = ("daily_reports", "weekly_reports")
+    with pytest.raises(ValueError, match="weekly_reports"):
+        create_sources(config)
+    with pytest.raises(ValueError):
+        CovidDataIngestion(config)
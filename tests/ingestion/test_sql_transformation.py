@@ -0,0 +1,187 @@
+# Global imports
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+# Built-in imports
+from datetime import date, timedelta
+from pathlib import Path
+import logging
+
+# Local imports
+from src.python.ingestion.config.ingestion_config import IngestionConfig
+from src.python.ingestion.core.covid_ingestion import CovidDataIngestion
+from src.python.ingestion.utils.sql_transformation import (
+    build_cleaned_query,
+    build_unpivot_query,
+    load_time_series_sql,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _write_raw_file(path: Path, seed: int) -> None:
+    """Write a random raw file with gaps, negatives and padded names."""
+    rng = np.random.default_rng(seed)
+    n_locations = int(rng.integers(1, 30))
+    n_dates = int(rng.integers(1, 40))
+    start = date(2020, 1, 22) + timedelta(days=int(rng.integers(0, 900)))
+    date_cols = [
+        f"{d.month}/{d.day}/{d.strftime('%y')}"
+        for d in (start + timedelta(days=i) for i in range(n_dates))
+    ]
+
+    values = pd.DataFrame(
+        rng.integers(-5, 10_000, (n_locations, n_dates)), columns=date_cols
+    ).astype('Int64')
+    values = values.mask(rng.random((n_locations, n_dates)) < 0.1)
+
+    provinces = ['Quebec', 'Ontario', None]
+    geo = pd.DataFrame({
+        'Province/State': [provinces[i] for i in rng.integers(0, 3, n_locations)],
+        'Country/Region': [f" Country {i % 5} " if i % 4 == 0 else f"Country {i % 5}"
+                           for i in range(n_locations)],
+        'Lat': rng.uniform(-60, 70, n_locations).round(4),
+        'Long': rng.uniform(-180, 180, n_locations).round(4),
+    })
+    geo.loc[rng.random(n_locations) < 0.1, 'Lat'] = None
+    pd.concat([geo, values], axis=1).to_csv(path, index=False)
+
+
+def _load_table(tmp_path: Path, ingestion_mode: str, csv_reader: str = 'pandas'):
+    """Load raw_test with the given mode and return its description and rows."""
+    config = IngestionConfig(
+        base_url="https://test.url",
+        data_types={"test": "test.csv"},
+        raw_data_path=tmp_path / "raw",
+        db_path=str(tmp_path / f"{ingestion_mode}_{csv_reader}.duckdb"),
+        csv_reader=csv_reader,
+        ingestion_mode=ingestion_mode,
+    )
+    CovidDataIngestion(config=config).load_to_duckdb()
+
+    conn = duckdb.connect(config.db_path)
+    description = conn.execute("DESCRIBE raw_test").fetchall()
+    rows = conn.execute(
+        "SELECT * FROM raw_test JOIN dim_location USING (location_id) ORDER BY ALL"
+    ).fetchall()
+    conn.close()
+    return description, rows
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("csv_reader", ["pandas", "duckdb"])
+def test_sql_mode_matches_pandas_mode(seed, csv_reader, tmp_path):
+    """Property: the SQL UNPIVOT mode builds the same table as the pandas mode."""
+    raw_file = tmp_path / "raw" / "test_20230101.csv"
+    raw_file.parent.mkdir(parents=True)
+    _write_raw_file(raw_file, seed)
+
+    assert _load_table(tmp_path, 'sql') == _load_table(tmp_path, 'pandas', csv_reader)
+
+
+def test_load_time_series_sql_cleans_values(tmp_path):
+    """Test that gaps and negatives are zeroed and names are stripped."""
+    raw_file = tmp_path / "test.csv"
+    raw_file.write_text("""Province/State,Country/Region,Lat,Long,1/1/20,1/2/20
+"",Afghanistan,33.0,65.0,0,
+Quebec,Canada ,52.9,-73.5,-1,3""")
+
+    conn = duckdb.connect()
+    load_time_series_sql(conn, raw_file, 'confirmed', 'raw_confirmed', logger)
+    rows = conn.execute(
+        'SELECT "Province/State", "Country/Region", "Long", date::VARCHAR, confirmed '
+        'FROM raw_confirmed JOIN dim_location USING (location_id) ORDER BY ALL'
+    ).fetchall()
+
+    assert rows == [
+        ("0", "Afghanistan", 65.0, "2020-01-01", 0),
+        ("0", "Afghanistan", 65.0, "2020-01-02", 0),
+        ("Quebec", "Canada", 0.0, "2020-01-01", 0),
+        ("Quebec", "Canada", 0.0, "2020-01-02", 3),
+    ]
+
+
+def test_load_time_series_sql_missing_columns(tmp_path):
+    """Test that a file without the location columns is rejected."""
+    raw_file = tmp_path / "test.csv"
+    raw_file.write_text("Country/Region,1/1/20\nCanada,1\n")
+
+    with pytest.raises(ValueError, match="Missing required columns"):
+        load_time_series_sql(duckdb.connect(), raw_file, 'confirmed', 'raw_confirmed', logger)
+
+
+def test_load_time_series_sql_without_date_columns(tmp_path):
+    """Test that a file or slice without date columns is rejected before any SQL runs."""
+    raw_file = tmp_path / "test.csv"
+    raw_file.write_text("Province/State,Country/Region,Lat,Long\n,Canada,56.1,106.3\n")
+    conn = duckdb.connect()
+
+    with pytest.raises(ValueError, match="No date columns"):
+        load_time_series_sql(conn, raw_file, 'confirmed', 'raw_confirmed', logger)
+    with pytest.raises(ValueError, match=str(raw_file)):
+        build_cleaned_query(raw_file, ["Province/State", "Country/Region", "1/1/20"], [])
+    with pytest.raises(ValueError, match="cleaned"):
+        build_unpivot_query("cleaned", 'confirmed', [])
+    assert conn.execute("SHOW TABLES").fetchall() == []
+
+
+@pytest.mark.parametrize("ingestion_mode", ["pandas", "sql"])
+def test_tables_use_storage_schema(ingestion_mode, tmp_path):
+    """Test that both modes write the declared compact column types."""
+    raw_file = tmp_path / "raw" / "test_20230101.csv"
+    raw_file.parent.mkdir(parents=True)
+    _write_raw_file(raw_file, seed=0)
+
+    description, _ = _load_table(tmp_path, ingestion_mode)
+
+    assert [(row[0], row[1]) for row in description] == [
+        ('location_id', 'INTEGER'),
+        ('date', 'DATE'),
+        ('test', 'INTEGER'),
+    ]
+    conn = duckdb.connect(str(tmp_path / f"{ingestion_mode}_pandas.duckdb"))
+    locations = conn.execute("DESCRIBE dim_location").fetchall()
+    conn.close()
+    assert [(row[0], row[1]) for row in locations] == [
+        ('location_id', 'INTEGER'),
+        ('Province/State', 'VARCHAR'),
+        ('Country/Region', 'VARCHAR'),
+        ('Lat', 'FLOAT'),
+        ('Long', 'FLOAT'),
+    ]
+
+
+def test_count_beyond_storage_type_rejected(tmp_path):
+    """Test that a count too large for the INTEGER column fails the pandas load."""
+    raw_file = tmp_path / "raw" / "test_20230101.csv"
+    raw_file.parent.mkdir(parents=True)
+    raw_file.write_text("Province/State,Country/Region,Lat,Long,1/1/20\n,Canada,1,2,3000000000\n")
+
+    with pytest.raises(ValueError, match="does not fit the storage schema"):
+        _load_table(tmp_path, 'pandas')
+
+
+def test_load_time_series_sql_non_numeric(tmp_path):
+    """Test that non-numeric counts are rejected like validate_data does."""
+    raw_file = tmp_path / "test.csv"
+    raw_file.write_text("Province/State,Country/Region,Lat,Long,1/1/20\n,Canada,1,2,n/a\n")
+
+    with pytest.raises(ValueError, match="Non-numeric values"):
+        load_time_series_sql(duckdb.connect(), raw_file, 'confirmed', 'raw_confirmed', logger)
+
+
+def test_unknown_ingestion_mode(tmp_path):
+    """Test that an unknown ingestion mode is rejected before loading."""
+    config = IngestionConfig(
+        base_url="https://test.url",
+        data_types={"test": "test.csv"},
+        raw_data_path=tmp_path / "raw",
+        db_path=str(tmp_path / "test.duckdb"),
+        ingestion_mode="spark",
+    )
+
+    with pytest.raises(ValueError, match="Unknown ingestion mode"):
+        CovidDataIngestion(config=config).load_to_duckdb()
@@ -0,0 +1,127 @@
+# Global imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Built-in imports
+from datetime import date, timedelta
+import logging
+
+# Local imports
+from src.python.ingestion.utils.data_transformation import (
+    reshape_time_series,
+    transform_time_series,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _random_wide_frame(seed: int) -> pd.DataFrame:
+    """Build a random cleaned wide frame with a random shape and value dtype."""
+    rng = np.random.default_rng(seed)
+    n_locations = int(rng.integers(1, 40))
+    n_dates = int(rng.integers(1, 60))
+    start = date(2020, 1, 22) + timedelta(days=int(rng.integers(0, 900)))
+    date_cols = [
+        f"{d.month}/{d.day}/{d.strftime('%y')}"
+        for d in (start + timedelta(days=i) for i in range(n_dates))
+    ]
+
+    # Cover every value dtype clean_data can hand over
+    kind = seed % 4
+    if kind == 0:
+        values = rng.integers(0, 10_000, (n_locations, n_dates))
+    elif kind == 1:
+        values = rng.integers(0, 10_000, (n_locations, n_dates)).astype(float)
+    elif kind == 2:
+        values = rng.uniform(0, 100, (n_locations, n_dates))
+    else:
+        values = rng.integers(2**31, 2**40, (n_locations, n_dates))
+
+    df = pd.DataFrame(values, columns=date_cols)
+    # clean_data leaves 0 where a province was missing
+    provinces = ['Quebec', 'Ontario', 'Hubei', 0, None]
+    df.insert(0, 'Province/State', [
+        provinces[i] for i in rng.integers(0, len(provinces), n_locations)
+    ])
+    df.insert(1, 'Country/Region', [f"Country {i % 7}" for i in range(n_locations)])
+    df.insert(2, 'Lat', rng.uniform(-60, 70, n_locations))
+    df.insert(3, 'Long', rng.uniform(-180, 180, n_locations))
+    return df
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Decode categoricals and stringify geo values the way DuckDB stores them."""
+    df = df.copy()
+    for col in ['Province/State', 'Country/Region']:
+        df[col] = [None if pd.isna(value) else str(value) for value in df[col]]
+    return df
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_reshape_matches_transform(seed):
+    """Property: the vectorized reshape reproduces transform_time_series."""
+    wide_df = _random_wide_frame(seed)
+
+    expected = transform_time_series(wide_df.copy(), 'confirmed', logger)
+    actual = reshape_time_series(wide_df, 'confirmed', logger)
+
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(
+        _normalize(actual), _normalize(expected), check_dtype=False
+    )
+    # Values must be equal exactly, not just approximately
+    assert np.array_equal(
+        actual['confirmed'].to_numpy(), expected['confirmed'].to_numpy()
+    )
+
+
+def test_reshape_emits_compact_types():
+    """Test that geo columns are categorical and counts are int32."""
+    wide_df = pd.DataFrame({
+        'Province/State': [0, 'Quebec'],
+        'Country/Region': ['Afghanistan', 'Canada'],
+        'Lat': [33.0, 52.9],
+        'Long': [65.0, -73.5],
+        '1/22/20': [1.0, 2.0],
+        '1/23/20': [3.0, 4.0],
+    })
+
+    long_df = reshape_time_series(wide_df, 'confirmed', logger)
+
+    assert isinstance(long_df['Province/State'].dtype, pd.CategoricalDtype)
+    assert isinstance(long_df['Country/Region'].dtype, pd.CategoricalDtype)
+    assert long_df['confirmed'].dtype == np.int32
+    assert long_df['date'].dtype == 'datetime64[ns]'
+    assert long_df['Province/State'].tolist() == ['0', 'Quebec', '0', 'Quebec']
+
+
+def test_reshape_handles_nullable_integer_columns():
+    """Test frames from the DuckDB reader (nullable Int32 columns)."""
+    wide_df = pd.DataFrame({
+        'Province/State': [None, 'Quebec'],
+        'Country/Region': ['Afghanistan', 'Canada'],
+        'Lat': [33.0, 52.9],
+        'Long': [65.0, -73.5],
+        '1/22/20': pd.array([1, 2], dtype='Int32'),
+    })
+
+    long_df = reshape_time_series(wide_df, 'confirmed', logger)
+
+    assert long_df['confirmed'].tolist() == [1, 2]
+    assert long_df['confirmed'].dtype == np.int32
+
+
+def test_reshape_rejects_invalid_date_headers():
+    """Test that unparseable date headers raise."""
+    wide_df = pd.DataFrame({
+        'Province/State': [None],
+        'Country/Region': ['Afghanistan'],
+        'Lat': [33.0],
+        'Long': [65.0],
+        'not a date': [1],
+    })
+
+    with pytest.raises(Exception):
+        reshape_time_series(wide_df, 'confirmed', logger)
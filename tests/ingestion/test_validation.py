@@ -0,0 +1,113 @@
+# Global imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Built-in imports
+from datetime import date, timedelta
+import logging
+
+# Local imports
+from src.python.ingestion.utils.data_validation import (
+    clean_data,
+    validate_and_clean_data,
+    validate_data,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _random_raw_frame(seed: int) -> pd.DataFrame:
+    """Build a random raw wide frame with gaps, negatives and mixed value dtypes."""
+    rng = np.random.default_rng(seed)
+    n_locations = int(rng.integers(1, 30))
+    n_dates = int(rng.integers(0, 40))
+    date_cols = [
+        f"{d.month}/{d.day}/{d.strftime('%y')}"
+        for d in (date(2020, 1, 22) + timedelta(days=i) for i in range(n_dates))
+    ]
+
+    kind = seed % 4
+    values = rng.integers(-5, 10_000, (n_locations, n_dates))
+    if kind == 0:
+        df = pd.DataFrame(values, columns=date_cols)
+    elif kind == 1:
+        values = values.astype(float)
+        values[rng.random(values.shape) < 0.1] = np.nan
+        df = pd.DataFrame(values, columns=date_cols)
+    elif kind == 2:
+        # Nullable columns, as the DuckDB reader returns for files with gaps
+        df = pd.DataFrame(values, columns=date_cols).astype('Int32')
+        df = df.mask(pd.DataFrame(rng.random(values.shape) < 0.1, columns=date_cols))
+    else:
+        # Some columns parsed as int, others as float
+        df = pd.DataFrame(values, columns=date_cols)
+        for col in date_cols[::3]:
+            df[col] = df[col].astype(float)
+
+    provinces = ['Quebec', 'Ontario', None] if seed % 5 else [None]
+    df.insert(0, 'Province/State', [
+        provinces[i] for i in rng.integers(0, len(provinces), n_locations)
+    ])
+    df.insert(1, 'Country/Region', [
+        f" Country {i % 7}  " if i % 4 else f"Country {i % 7}" for i in range(n_locations)
+    ])
+    df.insert(2, 'Lat', rng.uniform(-60, 70, n_locations))
+    df.insert(3, 'Long', np.where(
+        rng.random(n_locations) < 0.2, np.nan, rng.uniform(-180, 180, n_locations)
+    ))
+    return df
+
+
+def _messages(caplog) -> list:
+    messages = [(record.levelname, record.getMessage()) for record in caplog.records]
+    caplog.clear()
+    return messages
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_validate_and_clean_matches_separate_steps(seed, caplog):
+    """Property: the fused kernel reproduces validate_data + clean_data and their logs."""
+    caplog.set_level(logging.INFO)
+    df = _random_raw_frame(seed)
+    original = df.copy()
+
+    validate_data(df, 'confirmed', logger)
+    expected = clean_data(df, logger)
+    expected_messages = _messages(caplog)
+
+    actual, negatives = validate_and_clean_data(df, 'confirmed', logger)
+
+    pd.testing.assert_frame_equal(actual, expected)
+    assert _messages(caplog) == expected_messages
+    assert negatives == {
+        col: int((original[col] < 0).sum())
+        for col in original.columns[2:]
+        if (original[col] < 0).sum()
+    }
+    # The input frame is left untouched
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_validate_and_clean_selected_dates():
+    """Test that only the selected dates are cleaned, in the order given."""
+    df = _random_raw_frame(1)
+    date_columns = list(df.columns[-1:3:-2])
+
+    actual, _ = validate_and_clean_data(df, 'confirmed', logger, date_columns)
+
+    expected = clean_data(df[['Province/State', 'Country/Region', 'Lat', 'Long'] + date_columns], logger)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_validate_and_clean_rejects_invalid_frames():
+    """Test that the fused kernel raises the same errors as validate_data."""
+    df = _random_raw_frame(0)
+
+    with pytest.raises(ValueError, match="Missing required columns in confirmed data"):
+        validate_and_clean_data(df.drop(columns=['Lat']), 'confirmed', logger)
+
+    df['1/1/21'] = 'n/a'
+    with pytest.raises(ValueError, match="Non-numeric values found in date columns"):
+        validate_and_clean_data(df, 'confirmed', logger, date_columns=[])